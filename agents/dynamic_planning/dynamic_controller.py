@@ -5,14 +5,19 @@
 
 """ This module contains PID controllers to perform lateral and longitudinal control. """
 
-import math
 from collections import deque
 from typing import TYPE_CHECKING
 
 import carla
-import numpy as np
 
-from agents.navigation.controller import PIDLateralController, PIDLongitudinalController, VehiclePIDController
+from agents.navigation.controller import (
+    PIDLateralController,
+    PIDLongitudinalController,
+    VehiclePIDController,
+    _pid_step,
+    _steering_error,
+)
+from agents.tools.config_creation import ConfigView
 
 if TYPE_CHECKING:
     from classes.type_protocols import UseableWithDynamicPlanner
@@ -71,13 +76,14 @@ class DynamicVehiclePIDController(VehiclePIDController):
         """
         acceleration = self._lon_controller.run_step()
         current_steering = self._lat_controller.run_step(waypoint)
+        controls = self._agent.ctx_config_view.controls
         control = carla.VehicleControl()
         if acceleration >= 0.0:
-            control.throttle = min(acceleration, self.config.controls.max_throttle)
+            control.throttle = min(acceleration, controls.max_throttle)
             control.brake = 0.0
         else:
             control.throttle = 0.0
-            control.brake = min(abs(acceleration), self.config.controls.max_brake)
+            control.brake = min(abs(acceleration), controls.max_brake)
 
         # Steering regulation: changes cannot happen abruptly, can't steer too much.
 
@@ -88,9 +94,9 @@ class DynamicVehiclePIDController(VehiclePIDController):
             current_steering = self.past_steering - STEERING_UPDATE_SPEED
 
         if current_steering >= 0:
-            steering = min(self.config.controls.max_steering, current_steering)
+            steering = min(controls.max_steering, current_steering)
         else:
-            steering = max(-self.config.controls.max_steering, current_steering)
+            steering = max(-controls.max_steering, current_steering)
 
         control.steer = steering
         control.hand_brake = False
@@ -139,11 +145,12 @@ class DynamicPIDLongitudinalController(PIDLongitudinalController):
             :param debug: boolean for debugging
             :return: throttle control
         """
-        current_speed = self.config.live_info.current_speed
+        config = self._agent.ctx_config_view
+        current_speed = config.live_info.current_speed
         if debug:
             print(f'Current speed = {current_speed}')
 
-        target_speed = self.config.speed.target_speed
+        target_speed = config.speed.target_speed
         return self._pid_control(target_speed, current_speed)
 
     def _pid_control(self, target_speed, current_speed):
@@ -155,17 +162,9 @@ class DynamicPIDLongitudinalController(PIDLongitudinalController):
             :return: throttle/brake control
         """
 
-        error = target_speed - current_speed
-        self._error_buffer.append(error)
-
-        if len(self._error_buffer) >= 2:
-            _de = (self._error_buffer[-1] - self._error_buffer[-2]) / self.config.planner.dt
-            _ie = sum(self._error_buffer) * self.config.planner.dt
-        else:
-            _de = 0.0
-            _ie = 0.0
-
-        return np.clip((self.config.planner.longitudinal_control_dict.K_P * error) + (self.config.planner.longitudinal_control_dict.K_D * _de) + (self.config.planner.longitudinal_control_dict.K_I * _ie), -1.0, 1.0)
+        planner = self._agent.ctx_config_view.planner
+        pid = planner.longitudinal_control_dict
+        return _pid_step(self._error_buffer, target_speed - current_speed, pid.K_P, pid.K_I, pid.K_D, planner.dt)
 
     def change_parameters(self, K_P, K_I, K_D, dt):
         """Changes the PID parameters"""
@@ -173,6 +172,7 @@ class DynamicPIDLongitudinalController(PIDLongitudinalController):
         self.config.planner.longitudinal_control_dict.K_I = K_I
         self.config.planner.longitudinal_control_dict.K_D = K_D
         self.config.planner.dt = dt
+        ConfigView.invalidate()
 
 
 class DynamicPIDLateralController(PIDLateralController):
@@ -208,43 +208,10 @@ class DynamicPIDLateralController(PIDLateralController):
             :param vehicle_transform: current transform of the vehicle
             :return: steering control in the range [-1, 1]
         """
-        # Get the ego's location and forward vector
-        ego_loc = vehicle_transform.location
-        v_vec = vehicle_transform.get_forward_vector()
-        v_vec = np.array([v_vec.x, v_vec.y, 0.0])
-
-        # Get the vector vehicle-target_wp
-        if self.config.planner.offset != 0:
-            # Displace the wp to the side
-            w_tran = waypoint.transform
-            r_vec = w_tran.get_right_vector()
-            w_loc = w_tran.location + carla.Location(x=self.config.planner.offset * r_vec.x,
-                                                     y=self.config.planner.offset * r_vec.y)
-        else:
-            w_loc = waypoint.transform.location
-
-        w_vec = np.array([w_loc.x - ego_loc.x,
-                          w_loc.y - ego_loc.y,
-                          0.0])
-
-        wv_linalg = np.linalg.norm(w_vec) * np.linalg.norm(v_vec)
-        if wv_linalg == 0:
-            _dot = 1
-        else:
-            _dot = math.acos(np.clip(np.dot(w_vec, v_vec) / (wv_linalg), -1.0, 1.0))
-        _cross = np.cross(v_vec, w_vec)
-        if _cross[2] < 0:  # TODO: Why is this mentioned as unbound
-            _dot *= -1.0
-
-        self._e_buffer.append(_dot)
-        if len(self._e_buffer) >= 2:
-            _de = (self._e_buffer[-1] - self._e_buffer[-2]) / self.config.planner.dt
-            _ie = sum(self._e_buffer) * self.config.planner.dt
-        else:
-            _de = 0.0
-            _ie = 0.0
-
-        return np.clip((self.config.planner.lateral_control_dict.K_P * _dot) + (self.config.planner.lateral_control_dict.K_D * _de) + (self.config.planner.lateral_control_dict.K_I * _ie), -1.0, 1.0)
+        planner = self._agent.ctx_config_view.planner
+        _dot = _steering_error(waypoint, vehicle_transform, planner.offset)
+        pid = planner.lateral_control_dict
+        return _pid_step(self._e_buffer, _dot, pid.K_P, pid.K_I, pid.K_D, planner.dt)
 
     def change_parameters(self, K_P, K_I, K_D, dt):
         """Changes the PID parameters"""
@@ -252,3 +219,4 @@ class DynamicPIDLateralController(PIDLateralController):
         self.config.planner.lateral_control_dict.K_I = K_I
         self.config.planner.lateral_control_dict.K_D = K_D
         self.config.planner.dt = dt
+        ConfigView.invalidate()
@@ -12,8 +12,10 @@ import carla
 
 from agents.dynamic_planning.dynamic_controller import DynamicVehiclePIDController
 from agents.navigation.local_planner import LocalPlanner, PlannedWaypoint
+from agents.tools.config_creation import ConfigView
 from agents.tools.misc import draw_waypoints, get_speed
 from classes.constants import RoadOption
+from classes.information_manager import RouteTrafficLights
 if TYPE_CHECKING:
     from classes.type_protocols import UseableWithDynamicPlanner
     from classes.rss_sensor import RssSensor
@@ -96,6 +98,9 @@ class DynamicLocalPlanner(LocalPlanner):
         self._waypoints_queue = deque(maxlen=10000)
         self._min_waypoint_queue_length = 100
         self._stop_waypoint_creation = False
+        
+        self.route_traffic_lights: Optional[RouteTrafficLights] = None
+        """Traffic lights and stop signs along the plan, computed in :py:meth:`.LunaticAgent.set_global_plan`."""
 
         # initializing controller
         self._init_controller()
@@ -131,6 +136,7 @@ class DynamicLocalPlanner(LocalPlanner):
             print("WARNING: The max speed is currently set to follow the speed limits. "
                   "Use 'follow_speed_limits' to deactivate this")
         self.config.speed.target_speed = speed
+        ConfigView.invalidate()
 
     def follow_speed_limits(self, value=True):
         """
@@ -140,6 +146,7 @@ class DynamicLocalPlanner(LocalPlanner):
         :return:
         """
         self.config.speed.follow_speed_limits = value
+        ConfigView.invalidate()
 
     @property  # allows to use _compute_next_waypoints of parent
     def _sampling_radius(self):
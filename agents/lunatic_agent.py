@@ -12,7 +12,8 @@ from __future__ import annotations
 import contextlib
 import sys
 from copy import deepcopy
-from typing import TYPE_CHECKING, Any, ClassVar, Dict, Iterable, List, NoReturn, Optional, Sequence, Set, Union
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, Iterable, List, NoReturn, Optional, Sequence, Set, Tuple, Union
 from typing import cast as assure_type
 
 import carla  # pyright: ignore[reportMissingTypeStubs]
@@ -27,6 +28,7 @@ from agents.navigation.global_route_planner import GlobalRoutePlanner
 from agents.rules import rule_from_config
 from agents.tools.config_creation import (
     AgentConfig,
+    ConfigView,
     LaunchConfig,
     LiveInfo,
     LunaticAgentSettings,
@@ -41,7 +43,8 @@ from agents.tools.lunatic_agent_tools import (
     result_to_context,
 )
 from agents.tools.misc import lanes_have_same_direction
-from classes.constants import AD_RSS_AVAILABLE, READTHEDOCS, AgentState, Hazard, HazardSeverity, Phase, RoadOption
+from agents.tools.timings import timings
+from classes.constants import AD_RSS_AVAILABLE, AgentState, Hazard, HazardSeverity, Phase, RoadOption
 from classes.exceptions import (
     AgentDoneException,
     ContinueLoopException,
@@ -54,8 +57,8 @@ from classes.exceptions import (
 )
 from classes.rule import BlockingRule, Context, Rule
 from classes.worldmodel import CarlaDataProvider, WorldModel
-from classes.detection_matrix import AsyncDetectionMatrix, DetectionMatrix
-from classes.information_manager import InformationManager
+from classes.detection_matrix import AsyncDetectionMatrix, DetectionMatrix, ProcessDetectionMatrix
+from classes.information_manager import InformationManager, RouteTrafficLights
 
 if TYPE_CHECKING:
     from agents.tools.hints import ObstacleDetectionResult, TrafficLightDetectionResult
@@ -87,11 +90,61 @@ class LunaticAgent(BehaviorAgent):
     """
     The rules of the this agent.
     When initialized the rules are deep copied from :py:attr:`DEFAULT_RULES`.
+    
+    Note:
+        When modifying the lists directly instead of using :py:meth:`add_rule`, :py:meth:`add_rules`
+        or :py:meth:`remove_rule` call :py:meth:`compile_phase_dispatch` afterwards.
+    """
+    
+    compiled_dispatch: bool = True
+    """
+    If :python:`True` :py:meth:`execute_phase` uses the precompiled per-phase rule tuples of
+    :py:meth:`compile_phase_dispatch`; rules are called without repeating the phase checks.
+    
+    The readiness of the rules is kept in a flat array together with the number of ready rules per phase,
+    so that phases without ready rules are skipped in O(1). The array is only recalculated when the cooldown,
+    enabled or blocked state of a rule has changed.
     """
     
+    _phase_dispatch: Dict[Phase, "tuple[Rule, ...]"]
+    """Compiled rules per phase, cleared when rules are added or removed."""
+    
+    _dispatch_rules: "tuple[Rule, ...]"
+    """The distinct rules of :py:attr:`_phase_dispatch`, the readiness arrays are indexed like it."""
+    
+    _dispatch_indices: Dict[Phase, "tuple[int, ...]"]
+    """Positions of the rules of each phase in :py:attr:`_dispatch_rules`."""
+    
+    _dynamic_readiness: bytearray
+    """1 for rules that override :py:meth:`.Rule.is_ready`, they are checked when they are called."""
+    
+    _rule_ready: bytearray
+    """Result of :py:meth:`.Rule.is_ready` for each rule of :py:attr:`_dispatch_rules`."""
+    
+    _phase_ready: Dict[Phase, int]
+    """Number of ready rules per phase."""
+    
+    _ready_version: int
+    """State version of the rules when :py:attr:`_rule_ready` was calculated, -1 to recalculate it."""
+    
     ctx: Context
     """The context object of the current step"""
     
+    config_view_keys: ClassVar[Tuple[str, ...]] = (
+        "controls.max_brake",
+        "controls.max_steering",
+        "controls.max_throttle",
+        "live_info.current_speed",
+        "planner.dt",
+        "planner.lateral_control_dict",
+        "planner.longitudinal_control_dict",
+        "planner.offset",
+        "speed.target_speed",
+    )
+    """Keys of the config that are resolved into the :py:attr:`ctx_config_view`, the values the controllers read."""
+    
+    _ctx_config_view: Optional[ConfigView] = None
+    
     # Information from the InformationManager
     walkers_nearby: List[carla.Walker]
     vehicles_nearby: List[carla.Vehicle]
@@ -266,6 +319,8 @@ class LunaticAgent(BehaviorAgent):
         # Rule Framework
         # 1. add all rules from the class, if any - else this is a dict with empty lists
         self.rules = deepcopy(self.__class__.DEFAULT_RULES)  # Copies the ClassVar to the instance
+        self._phase_dispatch = {}
+        self._ready_version = -1
         
         # 2. add rules from the config
         self.add_config_rules()
@@ -339,6 +394,7 @@ class LunaticAgent(BehaviorAgent):
                 self.rules[p].sort(key=lambda r: r.priority, reverse=True)
             else:
                 self.rules[p].insert(position, rule)
+        self._phase_dispatch.clear()
 
     def add_rules(self, rules: "Rule | Iterable[Rule]"):
         """Add a list of rules and sort the agents rules by priority."""
@@ -349,6 +405,50 @@ class LunaticAgent(BehaviorAgent):
                 self.rules[phase].append(rule)
         for phase in self.rules.keys():  # noqa: SIM118
             self.rules[phase].sort(key=lambda r: r.priority, reverse=True)
+        self._phase_dispatch.clear()
+    
+    def remove_rule(self, rule: Rule) -> None:
+        """
+        Removes the rule from all phases of the agent.
+        
+        Raises:
+            ValueError: If the rule was not added to the agent.
+        """
+        found = False
+        for rules in self.rules.values():
+            if rule in rules:
+                rules.remove(rule)
+                found = True
+        self._phase_dispatch.clear()
+        if not found:
+            raise ValueError(f"Rule {rule} is not a rule of this agent.")
+    
+    def compile_phase_dispatch(self) -> Dict[Phase, "tuple[Rule, ...]"]:
+        """
+        Builds the per-phase rule tuples used by :py:meth:`execute_phase`
+        when :py:attr:`compiled_dispatch` is enabled.
+        
+        Is done automatically when rules are added or removed via the agent's methods.
+        """
+        self._phase_dispatch = {phase: tuple(rules) for phase, rules in self.rules.items()}
+        positions: Dict[Rule, int] = {}
+        for rules in self._phase_dispatch.values():
+            for rule in rules:
+                positions.setdefault(rule, len(positions))
+        self._dispatch_rules = tuple(positions)
+        self._dispatch_indices = {phase: tuple(positions[rule] for rule in rules)
+                                  for phase, rules in self._phase_dispatch.items()}
+        self._dynamic_readiness = bytearray(type(rule).is_ready is not Rule.is_ready for rule in self._dispatch_rules)
+        self._ready_version = -1
+        return self._phase_dispatch
+    
+    def _update_readiness(self) -> None:
+        """Recalculates :py:attr:`_rule_ready` and :py:attr:`_phase_ready` from the current state of the rules."""
+        self._ready_version = Rule._state_version  # pyright: ignore[reportPrivateUsage]
+        self._rule_ready = ready = bytearray(dynamic or rule.is_ready()
+                                             for rule, dynamic in zip(self._dispatch_rules, self._dynamic_readiness))
+        self._phase_ready = {phase: sum(ready[index] for index in indices)
+                             for phase, indices in self._dispatch_indices.items()}
             
     def add_config_rules(self, config: Optional[Union[LunaticAgentSettings, List[RuleCreatingParameters]]] = None):
         """
@@ -375,6 +475,19 @@ class LunaticAgent(BehaviorAgent):
     @property
     def live_info(self) -> LiveInfo:
         return self.config.live_info
+    
+    @property
+    def ctx_config_view(self) -> ConfigView:
+        """
+        Fast read-only view of the config of the current :py:attr:`ctx` for hot code paths,
+        it contains the :py:attr:`config_view_keys`.
+        
+        The view is rebuilt on access for a new context and after :py:meth:`.ConfigView.invalidate` was called.
+        """
+        view = self._ctx_config_view
+        if view is None or not view.is_current(self.ctx.config):
+            view = self._ctx_config_view = ConfigView.create(self.ctx.config, self.config_view_keys)
+        return view
 
     @property
     def detection_matrix(self):
@@ -495,6 +608,7 @@ class LunaticAgent(BehaviorAgent):
             
             # --- InformationManager ---
             information: InformationManager.Information = self.information_manager.tick()  # NOTE: # Warning: Currently not route-dependant, might need to be changed later
+            ConfigView.invalidate()  # live_info was updated, e.g. the speed
             self.tick_information = information
             
             self._current_waypoint = information.current_waypoint
@@ -535,6 +649,9 @@ class LunaticAgent(BehaviorAgent):
                     self._detection_matrix.update()  # NOTE: Does nothing if in async mode. self.road_matrix is updated by another thread.
                 else:
                     pass
+            elif isinstance(self._detection_matrix, ProcessDetectionMatrix):
+                # Exchanges snapshot and result with the worker process, does not block
+                self._detection_matrix.update()
             
             # used for self._local_planner.get_incoming_waypoint_and_direction
             self._look_ahead_steps = int((self.live_info.current_speed_limit) / 10)  # TODO: Maybe make this an interpolation and make more use of it
@@ -566,6 +683,7 @@ class LunaticAgent(BehaviorAgent):
         # Information that requires updated waypoint and route information:
         self.live_info.is_taking_turn = self.is_taking_turn()
         self.live_info.is_changing_lane = self.is_changing_lane()
+        ConfigView.invalidate()
             
         #logger.debug(f"Incoming Direction: {str(self.live_info.incoming_direction):<20} - Second Pass: {second_pass}")
 
@@ -595,8 +713,8 @@ class LunaticAgent(BehaviorAgent):
             prior_results : The results of the previous phase, e.g. :py:attr:`detected_hazards`.
             update_controls : Optionally controls that should be used from now onward.
         """
-        normal_next = self.current_phase.next_phase()  # sanity checking if everything is correct
         if self._validate_phases:
+            normal_next = self.current_phase.next_phase()  # sanity checking if everything is correct
             assert (normal_next in {phase, Phase.USER_CONTROLLED}
                     or phase & Phase.EXCEPTIONS
                     or phase & Phase.USER_CONTROLLED),\
@@ -609,26 +727,75 @@ class LunaticAgent(BehaviorAgent):
         self.ctx.prior_result = prior_results
         self.ctx.phase_results[phase] = prior_results
         
-        rules_to_check = self.rules.get(phase, ())  # use get if a custom phase is added, without a rule
+        if not timings.enabled:
+            return self._execute_phase_rules(phase)
+        start = perf_counter_ns()
         try:
-            for rule in rules_to_check:  # todo: maybe dict? grouped by phase?
-                assert self.current_phase in rule.phases, f"Current phase {self.current_phase} not in Rule {rule.phases}"  # TODO remove:
-                rule(self.ctx)
-                # NOTE: Blocking rules can change the and above assertion will fail.
-                if phase != self.current_phase:
-                    logger.warning("Phase was changed by rule %s to %s. "
-                        "Resting self.current_phase to %s. "
-                        "To prevent his raise an exception in the rule or adjust the phase.",
-                        rule, self.current_phase, phase)
-                    self.current_phase = phase
-                    
+            return self._execute_phase_rules(phase)
+        finally:
+            timings.record("phase", phase, perf_counter_ns() - start)
+    
+    def _execute_phase_rules(self, phase: Phase) -> Context:
+        """
+        Executes the rules of the current phase, see :py:meth:`execute_phase`.
+        
+        A :py:exc:`.NoFurtherRulesException` stops the execution of further rules of the phase.
+        """
+        try:
+            if not self.compiled_dispatch:
+                rules_to_check = self.rules.get(phase, ())  # use get if a custom phase is added, without a rule
+                for rule in rules_to_check:  # todo: maybe dict? grouped by phase?
+                    # TODO remove:
+                    assert self.current_phase in rule.phases, \
+                        f"Current phase {self.current_phase} not in Rule {rule.phases}"
+                    rule(self.ctx)
+                    # NOTE: Blocking rules can change the and above assertion will fail.
+                    self._restore_phase(phase, rule)
+                return self.ctx
+            if not self._phase_dispatch:
+                self.compile_phase_dispatch()
+            compiled_rules = self._phase_dispatch.get(phase, ())  # use get if a custom phase is added, without a rule
+            if compiled_rules:
+                self._execute_compiled_phase(phase, compiled_rules)
         except NoFurtherRulesException:
             pass
         except omegaconf.ReadonlyConfigError:
-            print("WARNING: A action likely tried to change `ctx.config` which is non-permanent. Use `ctx.agent.config.` instead.")
+            logger.warning("An action likely tried to change `ctx.config` which is non-permanent. "
+                           "Use `ctx.agent.config` instead.")
             raise
         return self.ctx
     
+    def _execute_compiled_phase(self, phase: Phase, compiled_rules: "tuple[Rule, ...]") -> None:
+        """
+        Executes the rules of a phase from the :py:attr:`_phase_dispatch` table.
+        
+        The rules in the table all belong to the phase, only the readiness is checked
+        before calling the rule. It is taken from :py:attr:`_rule_ready`, which is recalculated
+        whenever a rule, e.g. the previous one, changed the state of any rule.
+        """
+        if self._ready_version != Rule._state_version:  # pyright: ignore[reportPrivateUsage]
+            self._update_readiness()
+        if not self._phase_ready.get(phase):
+            return
+        ctx = self.ctx
+        for rule, index in zip(compiled_rules, self._dispatch_indices[phase]):
+            if self._ready_version != Rule._state_version:  # pyright: ignore[reportPrivateUsage]
+                self._update_readiness()
+            if not self._rule_ready[index]:
+                continue
+            rule(ctx, ignore_phase=True, ignore_cooldown=not self._dynamic_readiness[index])
+            # NOTE: Blocking rules can change the phase
+            self._restore_phase(phase, rule)
+    
+    def _restore_phase(self, phase: Phase, rule: Rule) -> None:
+        """Resets :py:attr:`current_phase` to **phase** if the **rule** changed it."""
+        if phase != self.current_phase:
+            logger.warning("Phase was changed by rule %s to %s. "
+                "Resting self.current_phase to %s. "
+                "To prevent his raise an exception in the rule or adjust the phase.",
+                rule, self.current_phase, phase)
+            self.current_phase = phase
+    
     def _plan_path_phase(self, *, second_pass: bool, debug: bool = False):
         try:
             self.execute_phase(Phase.PLAN_PATH | Phase.BEGIN, prior_results=None)
@@ -643,10 +810,16 @@ class LunaticAgent(BehaviorAgent):
         return None
         
     def _make_context(self, last_context: Union[Context, None], **kwargs: Any) -> Context:
-        """Creates a new context object for the agent at the start of a step."""
+        """
+        Creates a new context object for the agent at the start of a step.
+        
+        The containers of the context from two steps ago, that is released here,
+        are reused by the new context.
+        """
+        released = None
         if last_context is not None:
-            del last_context.last_context
-        ctx = Context(agent=self, last_context=last_context, **kwargs)
+            released = last_context.__dict__.pop("last_context", None)
+        ctx = Context(agent=self, reuse=released, last_context=last_context, **kwargs)
         self.ctx = ctx
         return ctx
     
@@ -940,12 +1113,24 @@ class LunaticAgent(BehaviorAgent):
        
         self.execute_phase(Phase.APPLY_MANUAL_CONTROLS | Phase.END, prior_results=None)
     
-    def apply_control(self, control: Optional[carla.VehicleControl] = None):
+    def apply_control(
+        self,
+        control: Optional[carla.VehicleControl] = None,
+        *,
+        commands: Optional[List["carla.command.ApplyVehicleControl | carla.command.SetVehicleLightState"]] = None,
+    ):
         """
         Applies the control to the agent's actor.
         Will execute the :py:class:`Phase.EXECUTION | Phase.BEGIN <classes.constants.Phase>`
         and :py:class:`Phase.EXECUTION | Phase.END <classes.constants.Phase>` phases.
         
+        Args:
+            control: The control to apply. If :python:`None` the control of :py:meth:`get_control` is used.
+            commands: If given, the control and light state updates are appended to this list
+                as :py:mod:`carla.command` objects instead of being sent to the simulator.
+                The caller has to apply them, e.g. with :external_py_meth:`carla.Client.apply_batch`,
+                before the next tick. Used by the :py:class:`.Fleet`.
+        
         Note:
             The final control object that is applied to the agent's actor
             is stored in the :py:attr:`ctx.control <ctx>` attribute.
@@ -964,8 +1149,11 @@ class LunaticAgent(BehaviorAgent):
             logger.debug("Agent is already in execution phase.")
         # Set automatic control-related vehicle lights
         final_control: carla.VehicleControl = self.get_control()  # type: ignore[assignment]
-        self._update_lights(final_control)
-        self._vehicle.apply_control(final_control)
+        self._update_lights(final_control, commands)
+        if commands is None:
+            self._vehicle.apply_control(final_control)
+        else:
+            commands.append(carla.command.ApplyVehicleControl(self._vehicle.id, final_control))
         self.execute_phase(Phase.EXECUTION | Phase.END, prior_results=final_control)
     
     # ------------------ Hazard Detection & Reaction ------------------ #
@@ -1173,6 +1361,7 @@ class LunaticAgent(BehaviorAgent):
         # Change path to take now
         # NOTE: use super with arguments here.
         super(LunaticAgent, self).set_global_plan(path)  # noqa: UP008
+        self._update_route_traffic_lights()
         # TODO: # CRITICAL: Keep old global plan if it is some end goal -> Restore it.
         
     # TODO: Use generate_lane_change_path to finetune
@@ -1238,8 +1427,13 @@ class LunaticAgent(BehaviorAgent):
         
     # ------------------ Other Function ------------------ #
     
-    def _update_lights(self, vehicle_control: carla.VehicleControl):
-        """Updates the light of the vehicle in the simulation."""
+    def _update_lights(self, vehicle_control: carla.VehicleControl,
+                       commands: Optional[List["carla.command.SetVehicleLightState"]] = None):
+        """
+        Updates the light of the vehicle in the simulation.
+        
+        If **commands** is given the update is appended as a command instead of being sent.
+        """
         current_lights: carla.VehicleLightState = self._vehicle_lights
         if vehicle_control.brake:
             current_lights |= carla.VehicleLightState.Brake
@@ -1251,7 +1445,11 @@ class LunaticAgent(BehaviorAgent):
             current_lights &= carla.VehicleLightState.All ^ carla.VehicleLightState.Reverse
         if current_lights != self._vehicle_lights:  # Change the light state only if necessary
             self._vehicle_lights = current_lights
-            self._vehicle.set_light_state(carla.VehicleLightState(self._vehicle_lights))
+            if commands is None:
+                self._vehicle.set_light_state(carla.VehicleLightState(self._vehicle_lights))
+            else:
+                commands.append(carla.command.SetVehicleLightState(self._vehicle.id,
+                                                                   carla.VehicleLightState(self._vehicle_lights)))
 
     def render_detection_matrix(self, display: "pygame.Surface", **options: Unpack["DetectionMatrix.RenderOptions"]):
         """
@@ -1354,6 +1552,9 @@ class LunaticAgent(BehaviorAgent):
         if self.config.detection_matrix and self.config.detection_matrix.enabled:
             if self.config.detection_matrix.sync and self._world_model.world_settings.synchronous_mode:
                 self._detection_matrix = DetectionMatrix(self._vehicle)
+            elif self.config.detection_matrix.use_process:
+                self._detection_matrix = ProcessDetectionMatrix(self._vehicle,
+                                                                max_staleness=self.config.detection_matrix.max_staleness)
             else:
                 self._detection_matrix = AsyncDetectionMatrix(self._vehicle)
             self._detection_matrix.start()
@@ -1361,14 +1562,6 @@ class LunaticAgent(BehaviorAgent):
             self._detection_matrix = None
         self._road_matrix_counter = 0
         
-    if READTHEDOCS or TYPE_CHECKING:
-        # From the parent class, but without type-hints
-        def set_destination(self,
-                            end_location: carla.Location,
-                            start_location: Optional[carla.Location] = None,
-                            clean_queue: bool = True) -> None:
-            ...
-    
     def set_vehicle(self, vehicle: carla.Actor) -> None:
         """
         Set the vehicle for the agent (experimental if applied a second time)
@@ -1408,6 +1601,7 @@ class LunaticAgent(BehaviorAgent):
             print("WARNING: The max speed is currently set to follow the speed limits. "
                   "Use 'follow_speed_limits' to deactivate this")
         self.config.speed.target_speed = speed  # shared with planner
+        ConfigView.invalidate()
 
     def follow_speed_limits(self, value: bool = True) -> None:
         """
@@ -1417,6 +1611,7 @@ class LunaticAgent(BehaviorAgent):
             value: Whether to activate this behavior
         """
         self.config.speed.follow_speed_limits = value
+        ConfigView.invalidate()
 
     def ignore_traffic_lights(self, active: bool = True) -> None:
         """(De)activates the checks for traffic lights"""
@@ -1483,14 +1678,40 @@ class LunaticAgent(BehaviorAgent):
 
     #def done(self): # from base class self._local_planner.done()
         
-    #def set_global_plan(self, plan, stop_waypoint_creation=True, clean_queue=True):
-    """
-    Adds a specific plan to the agent.
+    def set_destination(self,
+                        end_location: carla.Location,
+                        start_location: Optional[carla.Location] = None,
+                        clean_queue: bool = True) -> None:
+        """
+        Creates a list of waypoints between a starting and ending location,
+        based on the route returned by the global router, and adds it to the local planner.
+        
+        See :py:meth:`BasicAgent.set_destination`, afterwards the :py:class:`.RouteTrafficLights`
+        of the new plan are computed.
+        """
+        super().set_destination(end_location, start_location, clean_queue)
+        self._update_route_traffic_lights()
+    
+    def set_global_plan(self, plan: List[Tuple[carla.Waypoint, RoadOption]],
+                        stop_waypoint_creation: bool = True, clean_queue: bool = True) -> None:
+        """
+        Adds a specific plan to the agent and computes the :py:class:`.RouteTrafficLights` of it.
 
-        :param plan: list of [carla.Waypoint, RoadOption] representing the route to be followed
-        :param stop_waypoint_creation: stops the automatic random creation of waypoints
-        :param clean_queue: resets the current agent's plan
-    """
+            :param plan: list of [carla.Waypoint, RoadOption] representing the route to be followed
+            :param stop_waypoint_creation: stops the automatic random creation of waypoints
+            :param clean_queue: resets the current agent's plan
+        """
+        super().set_global_plan(plan, stop_waypoint_creation, clean_queue)
+        self._update_route_traffic_lights()
+    
+    def _update_route_traffic_lights(self) -> None:
+        """
+        Computes the traffic lights and stop signs along the current plan of the local planner,
+        used by :py:meth:`.InformationManager.detect_next_traffic_light`.
+        """
+        local_planner = self._local_planner
+        local_planner.route_traffic_lights = RouteTrafficLights(
+            local_planner.get_plan(), complete=local_planner._stop_waypoint_creation)
 
     #def trace_route(self, start_waypoint, end_waypoint):
     """
@@ -14,6 +14,52 @@ import numpy as np
 from agents.tools.misc import get_speed
 
 
+def _pid_step(error_buffer, error, k_p, k_i, k_d, dt):
+    # type: (deque, float, float, float, float, float) -> float
+    """
+    Appends the error to the buffer and returns the output of the PID equations clipped to [-1, 1].
+    Pure python, this is faster than numpy for a single controller.
+    """
+    error_buffer.append(error)
+    if len(error_buffer) >= 2:
+        _de = (error_buffer[-1] - error_buffer[-2]) / dt
+        _ie = sum(error_buffer) * dt
+    else:
+        _de = 0.0
+        _ie = 0.0
+    return min(max((k_p * error) + (k_d * _de) + (k_i * _ie), -1.0), 1.0)
+
+
+def _steering_error(waypoint, vehicle_transform, offset):
+    # type: (carla.Waypoint, carla.Transform, float) -> float
+    """
+    Signed angle in radians between the forward vector of the vehicle and the vector
+    from the vehicle to the waypoint, displaced by **offset** to the right.
+    1 if one of the vectors has no length.
+    """
+    ego_loc = vehicle_transform.location
+    v_vec = vehicle_transform.get_forward_vector()
+    w_tran = waypoint.transform
+    w_x = w_tran.location.x
+    w_y = w_tran.location.y
+    if offset != 0:
+        # Displace the wp to the side
+        r_vec = w_tran.get_right_vector()
+        w_x += offset * r_vec.x
+        w_y += offset * r_vec.y
+    w_x -= ego_loc.x
+    w_y -= ego_loc.y
+
+    wv_linalg = math.hypot(w_x, w_y) * math.hypot(v_vec.x, v_vec.y)
+    if wv_linalg == 0:
+        _dot = 1
+    else:
+        _dot = math.acos(min(max((w_x * v_vec.x + w_y * v_vec.y) / wv_linalg, -1.0), 1.0))
+    if v_vec.x * w_y - v_vec.y * w_x < 0:  # z component of the cross product
+        _dot *= -1.0
+    return _dot
+
+
 class VehiclePIDController:
     """
     VehiclePIDController is the combination of two PID controllers
@@ -148,17 +194,7 @@ class PIDLongitudinalController:
             :return: throttle/brake control
         """
 
-        error = target_speed - current_speed
-        self._error_buffer.append(error)
-
-        if len(self._error_buffer) >= 2:
-            _de = (self._error_buffer[-1] - self._error_buffer[-2]) / self._dt
-            _ie = sum(self._error_buffer) * self._dt
-        else:
-            _de = 0.0
-            _ie = 0.0
-
-        return np.clip((self._k_p * error) + (self._k_d * _de) + (self._k_i * _ie), -1.0, 1.0)
+        return _pid_step(self._error_buffer, target_speed - current_speed, self._k_p, self._k_i, self._k_d, self._dt)
 
     def change_parameters(self, K_P, K_I, K_D, dt):
         """Changes the PID parameters"""
@@ -213,43 +249,8 @@ class PIDLateralController:
             :param vehicle_transform: current transform of the vehicle
             :return: steering control in the range [-1, 1]
         """
-        # Get the ego's location and forward vector
-        ego_loc = vehicle_transform.location
-        v_vec = vehicle_transform.get_forward_vector()
-        v_vec = np.array([v_vec.x, v_vec.y, 0.0])
-
-        # Get the vector vehicle-target_wp
-        if self._offset != 0:
-            # Displace the wp to the side
-            w_tran = waypoint.transform
-            r_vec = w_tran.get_right_vector()
-            w_loc = w_tran.location + carla.Location(x=self._offset * r_vec.x,
-                                                     y=self._offset * r_vec.y)
-        else:
-            w_loc = waypoint.transform.location
-
-        w_vec = np.array([w_loc.x - ego_loc.x,
-                          w_loc.y - ego_loc.y,
-                          0.0])
-
-        wv_linalg = np.linalg.norm(w_vec) * np.linalg.norm(v_vec)
-        if wv_linalg == 0:
-            _dot = 1
-        else:
-            _dot = math.acos(np.clip(np.dot(w_vec, v_vec) / (wv_linalg), -1.0, 1.0))
-        _cross = np.cross(v_vec, w_vec)
-        if _cross[2] < 0:
-            _dot *= -1.0
-
-        self._e_buffer.append(_dot)
-        if len(self._e_buffer) >= 2:
-            _de = (self._e_buffer[-1] - self._e_buffer[-2]) / self._dt
-            _ie = sum(self._e_buffer) * self._dt
-        else:
-            _de = 0.0
-            _ie = 0.0
-
-        return np.clip((self._k_p * _dot) + (self._k_d * _de) + (self._k_i * _ie), -1.0, 1.0)
+        _dot = _steering_error(waypoint, vehicle_transform, self._offset)
+        return _pid_step(self._e_buffer, _dot, self._k_p, self._k_i, self._k_d, self._dt)
 
     def change_parameters(self, K_P, K_I, K_D, dt):
         """Changes the PID parameters"""
@@ -257,3 +258,137 @@ class PIDLateralController:
         self._k_i = K_I
         self._k_d = K_D
         self._dt = dt
+
+
+class PIDControllerBank:
+    """
+    Lateral and longitudinal PID controllers of many vehicles that are computed together.
+
+    The gains, time differentials and error histories of the vehicles are stored in arrays,
+    one row per vehicle, and :py:meth:`run_step` calculates the controls of all vehicles with a few numpy operations.
+    The equations are the same as the ones of :py:class:`VehiclePIDController`.
+    """
+
+    BUFFER_SIZE = 10
+    """Number of past errors used for the integral term, like the deque of the single controllers."""
+
+    def __init__(self, num_vehicles, args_lateral, args_longitudinal, offset=0, max_throttle=0.75, max_brake=0.3,
+                 max_steering=0.8):
+        """
+        Constructor method.
+
+        :param num_vehicles: number of controlled vehicles
+        :param args_lateral: dictionary with K_P, K_I, K_D and dt of the lateral controllers,
+            the values can be scalars or sequences with one value per vehicle
+        :param args_longitudinal: dictionary like args_lateral for the longitudinal controllers
+        :param offset: lateral offset(s) of the target locations, see :py:class:`VehiclePIDController`
+        """
+        self.num_vehicles = num_vehicles
+        self._lat_gains = np.zeros((num_vehicles, 3))  # K_P, K_I, K_D
+        self._lat_dt = np.full(num_vehicles, 0.03)
+        self._lon_gains = np.zeros((num_vehicles, 3))
+        self._lon_dt = np.full(num_vehicles, 0.03)
+        self.set_parameters(slice(None), args_lateral, args_longitudinal)
+        self.offset = np.broadcast_to(np.asarray(offset, dtype=float), (num_vehicles,)).copy()
+        self.max_throttle = np.broadcast_to(np.asarray(max_throttle, dtype=float), (num_vehicles,)).copy()
+        self.max_brake = np.broadcast_to(np.asarray(max_brake, dtype=float), (num_vehicles,)).copy()
+        self.max_steering = np.broadcast_to(np.asarray(max_steering, dtype=float), (num_vehicles,)).copy()
+        self.past_steering = np.zeros(num_vehicles)
+
+        # Ring buffers of the errors, unused entries are 0 and do not change the sums
+        self._lat_errors = np.zeros((num_vehicles, self.BUFFER_SIZE))
+        self._lon_errors = np.zeros((num_vehicles, self.BUFFER_SIZE))
+        self._num_errors = np.zeros(num_vehicles, dtype=int)
+        self._position = -1
+
+    def set_parameters(self, vehicles, args_lateral=None, args_longitudinal=None):
+        """
+        Changes the PID parameters of the selected vehicles.
+
+        :param vehicles: index, slice or mask of the vehicles
+        :param args_lateral: dictionary with K_P, K_I, K_D and optionally dt
+        :param args_longitudinal: dictionary with K_P, K_I, K_D and optionally dt
+        """
+        for args, gains, dt in ((args_lateral, self._lat_gains, self._lat_dt),
+                                (args_longitudinal, self._lon_gains, self._lon_dt)):
+            if args is None:
+                continue
+            for i, key in enumerate(('K_P', 'K_I', 'K_D')):
+                if key in args:
+                    gains[vehicles, i] = args[key]
+            if 'dt' in args:
+                dt[vehicles] = args['dt']
+
+    def reset(self, vehicles):
+        """
+        Clears the error histories of the selected vehicles, e.g. when a new vehicle is controlled.
+
+        :param vehicles: index, slice or mask of the vehicles
+        """
+        self._lat_errors[vehicles] = 0.0
+        self._lon_errors[vehicles] = 0.0
+        self._num_errors[vehicles] = 0
+
+    @staticmethod
+    def _pid(errors, position, error, has_history, gains, dt):
+        errors[:, position] = error
+        _de = np.where(has_history, (error - errors[:, position - 1]) / dt, 0.0)
+        _ie = np.where(has_history, errors.sum(axis=1) * dt, 0.0)
+        return np.clip(gains[:, 0] * error + gains[:, 2] * _de + gains[:, 1] * _ie, -1.0, 1.0)
+
+    @staticmethod
+    def steering_errors(locations, forward_vectors, targets):
+        """
+        Vectorized version of the angle between the vehicles' forward vectors and their targets.
+
+        :param locations: array of shape (N, 2) or (N, 3) with the locations of the vehicles
+        :param forward_vectors: array of shape (N, 2) or (N, 3) with the forward vectors of the vehicles
+        :param targets: array of shape (N, 2) or (N, 3) with the target locations
+        :return: array of shape (N,) with the signed angles in radians
+        """
+        v_x, v_y = forward_vectors[:, 0], forward_vectors[:, 1]
+        w_x = targets[:, 0] - locations[:, 0]
+        w_y = targets[:, 1] - locations[:, 1]
+        wv_linalg = np.hypot(w_x, w_y) * np.hypot(v_x, v_y)
+        no_length = wv_linalg == 0
+        cosine = np.clip((w_x * v_x + w_y * v_y) / np.where(no_length, 1.0, wv_linalg), -1.0, 1.0)
+        angle = np.where(no_length, 1.0, np.arccos(cosine))
+        return np.where(v_x * w_y - v_y * w_x < 0, -angle, angle)
+
+    def run_step(self, target_speeds, current_speeds, locations, forward_vectors, targets, target_right_vectors=None):
+        """
+        Execute one step of control of all vehicles, like :py:meth:`VehiclePIDController.run_step`.
+
+        :param target_speeds: desired speeds in Km/h, shape (N,)
+        :param current_speeds: current speeds in Km/h, shape (N,)
+        :param locations: locations of the vehicles, shape (N, 2) or (N, 3)
+        :param forward_vectors: forward vectors of the vehicles, shape (N, 2) or (N, 3)
+        :param targets: locations of the target waypoints, shape (N, 2) or (N, 3)
+        :param target_right_vectors: right vectors of the target waypoints, needed if an offset is set
+        :return: tuple of arrays (throttle, brake, steer) with shape (N,)
+        """
+        targets = np.asarray(targets, dtype=float)
+        if target_right_vectors is not None and self.offset.any():
+            target_right_vectors = np.asarray(target_right_vectors, dtype=float)
+            targets = targets[:, :2] + self.offset[:, None] * target_right_vectors[:, :2]
+
+        self._position = (self._position + 1) % self.BUFFER_SIZE
+        np.minimum(self._num_errors + 1, self.BUFFER_SIZE, out=self._num_errors)
+        has_history = self._num_errors >= 2
+
+        acceleration = self._pid(self._lon_errors, self._position,
+                                 np.asarray(target_speeds, dtype=float) - np.asarray(current_speeds, dtype=float),
+                                 has_history, self._lon_gains, self._lon_dt)
+        current_steering = self._pid(self._lat_errors, self._position,
+                                     self.steering_errors(np.asarray(locations, dtype=float),
+                                                          np.asarray(forward_vectors, dtype=float), targets),
+                                     has_history, self._lat_gains, self._lat_dt)
+
+        throttle = np.where(acceleration >= 0.0, np.minimum(acceleration, self.max_throttle), 0.0)
+        brake = np.where(acceleration >= 0.0, 0.0, np.minimum(-acceleration, self.max_brake))
+
+        # Steering regulation: changes cannot happen abruptly, can't steer too much.
+        current_steering = np.clip(current_steering, self.past_steering - 0.1, self.past_steering + 0.1)
+        steering = np.clip(current_steering, -self.max_steering, self.max_steering)
+        self.past_steering = steering
+        return throttle, brake, steering
@@ -9,12 +9,16 @@ This module provides GlobalRoutePlanner implementation.
 """
 
 import math
+from collections import namedtuple
+from heapq import heappop, heappush
 
 import carla
 import networkx as nx
 import numpy as np
+from cachetools import LRUCache
 
 from agents.navigation.local_planner import RoadOption
+from agents.tools.map_cache import load_map_cache, save_map_cache
 
 # Python 2 compatibility
 TYPE_CHECKING = False
@@ -46,13 +50,150 @@ if TYPE_CHECKING:
             'net_vector': list[float],
             'intersection': bool,
             'type': RoadOption,
-            'change_waypoint': NotRequired[carla.Waypoint]
+            'change_waypoint': NotRequired[carla.Waypoint],
+            'locations': np.ndarray,
+            'lane_keys': np.ndarray,
         })
 
 
+_GRAPH_CACHE_VERSION = 2
+"""Version of the format of the graph in the map cache."""
+
+_WAYPOINT_KEYS = ('entry_waypoint', 'exit_waypoint', 'change_waypoint')
+"""Edge attributes that hold a single waypoint."""
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+"""Statistics of a cache of the :py:class:`GlobalRoutePlanner`, like :py:func:`functools.lru_cache`."""
+
+
+class _LazyEdgeData(dict):
+    """
+    Edge attributes of a graph that was loaded from the map cache.
+    The waypoints are created from the stored coordinates on first access.
+    """
+    __slots__ = ('_planner', '_refs')
+
+    def __missing__(self, key):
+        refs = self._refs
+        if key not in refs:
+            raise KeyError(key)
+        if key == 'path':
+            value = [self._planner._cached_waypoint(i) for i in range(*refs[key])]
+        else:
+            value = self._planner._cached_waypoint(refs[key])
+        self[key] = value
+        return value
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in self._refs
+
+
+class _CSRGraph:
+    """
+    Compact copy of the route graph for the A* search.
+
+    The successors of the nodes are stored in compressed sparse row (CSR) arrays,
+    the node locations in one contiguous array. The search expands the nodes in the same
+    order as :py:func:`networkx.astar_path` and returns the same paths.
+    """
+
+    def __init__(self, graph):
+        # type: (nx.DiGraph) -> None
+        self.nodes = list(graph.nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        indptr = [0]
+        indices = []  # type: list[int]
+        weights = []
+        for node in self.nodes:
+            for neighbor, data in graph.adj[node].items():  # same order as networkx
+                indices.append(self.index[neighbor])
+                weights.append(data.get('length', 1))
+            indptr.append(len(indices))
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.indices = np.array(indices, dtype=np.int64)
+        self.weights = np.array(weights, dtype=np.float64)
+        self.coordinates = np.array([graph.nodes[node]['vertex'] for node in self.nodes],
+                                    dtype=np.float64).reshape(-1, 3)
+        # Indexing python lists is faster than numpy arrays in the search loop;
+        # keep the original weights so that the costs are the same as with networkx.
+        self._successors = [list(zip(indices[indptr[i]:indptr[i + 1]], weights[indptr[i]:indptr[i + 1]]))
+                            for i in range(len(self.nodes))]
+
+    def heuristic(self, target):
+        # type: (int) -> list[float]
+        """Euclidean distance of all nodes to the node with index target."""
+        return np.linalg.norm(self.coordinates - self.coordinates[target], axis=1).tolist()
+
+    def astar_path(self, source, target):
+        # type: (int, int) -> list[int]
+        """
+        Shortest path between the nodes source and target, see :py:func:`networkx.astar_path`.
+
+        Raises:
+            networkx.NodeNotFound: If source or target are not in the graph.
+            networkx.NetworkXNoPath: If there is no path.
+        """
+        if source not in self.index or target not in self.index:
+            raise nx.NodeNotFound("Either source {} or target {} is not in G".format(source, target))
+        start = self.index[source]
+        goal = self.index[target]
+        heuristic = self.heuristic(goal)
+        successors = self._successors
+        counter = 1
+        queue = [(0, 0, start, 0, -1)]
+        enqueued = {}  # type: dict[int, float]
+        explored = {}  # type: dict[int, int]
+        while queue:
+            _, _, current, dist, parent = heappop(queue)
+            if current == goal:
+                path = [self.nodes[current]]
+                node = parent
+                while node != -1:
+                    path.append(self.nodes[node])
+                    node = explored[node]
+                path.reverse()
+                return path
+            if current in explored:
+                # Already expanded, skip if it has been reached on a shorter path
+                if explored[current] == -1 or enqueued[current] < dist:
+                    continue
+            explored[current] = parent
+            for neighbor, cost in successors[current]:
+                new_cost = dist + cost
+                if neighbor in enqueued and enqueued[neighbor] <= new_cost:
+                    continue
+                enqueued[neighbor] = new_cost
+                heappush(queue, (new_cost + heuristic[neighbor], counter, neighbor, new_cost, current))
+                counter += 1
+        raise nx.NetworkXNoPath("Node {} not reachable from {}".format(target, source))
+
+
 class GlobalRoutePlanner:
     """
     This class provides a very high level route plan.
+
+    The graph is stored in the map cache, see :py:mod:`agents.tools.map_cache`, keyed by the map and
+    the sampling resolution. Later instances load it from there instead of querying the server;
+    the waypoints of an edge are only created when a route uses the edge.
+    """
+
+    use_cache = True
+    """Load and store the graph in the map cache."""
+
+    route_cache_size = 256
+    """
+    Number of routes, keyed by the (start edge, end edge) pair, for which the node path
+    and the turn decisions are kept. Only the trimming of the first and last edge
+    is recalculated for a cached route.
+    """
+
+    search_cache_size = 1024
+    """Number of graph searches, keyed by the (source node, target node) pair, that are kept."""
+
+    search_backend = 'csr'
+    """
+    Implementation of the A* search: :code:`"csr"` uses compact arrays of the graph,
+    :code:`"networkx"` uses :py:func:`networkx.astar_path`. Both return the same paths.
     """
 
     def __init__(self, wmap, sampling_resolution):
@@ -67,11 +208,21 @@ class GlobalRoutePlanner:
         self._intersection_end_node = -1
         self._previous_decision = RoadOption.VOID
 
+        self._route_cache = LRUCache(maxsize=self.route_cache_size)
+        self._search_cache = LRUCache(maxsize=self.search_cache_size)  # type: LRUCache[tuple[int, int], list[int]]
+        self._cache_stats = {'route': [0, 0], 'search': [0, 0]}  # [hits, misses]
+        self._csr_graph = None  # type: _CSRGraph | None  # created on the first search
+
         # Build the graph
+        if self.use_cache and self._load_graph():
+            return  # NOTE: _topology stays empty
         self._build_topology()
         self._build_graph()
         self._find_loose_ends()
         self._lane_change_link()
+        self._build_edge_arrays()
+        if self.use_cache:
+            self._save_graph()
 
     def trace_route(self, origin, destination):
         # type: (carla.Location, carla.Location) -> list[tuple[carla.Waypoint, RoadOption]]
@@ -80,45 +231,208 @@ class GlobalRoutePlanner:
         from origin to destination
         """
         route_trace = []  # type: list[tuple[carla.Waypoint, RoadOption]]
-        route = self._path_search(origin, destination)
+        route, road_options = self._plan_route(origin, destination)
         current_waypoint = self._wmap.get_waypoint(origin)
         destination_waypoint = self._wmap.get_waypoint(destination)
+        # Distances are calculated with the coordinate arrays of the edges, see _build_edge_arrays
+        current_location = self._location_array(current_waypoint.transform.location)
+        destination_location = self._location_array(destination)
+        destination_waypoint_location = self._location_array(destination_waypoint.transform.location)
+        destination_key = np.array([destination_waypoint.road_id, destination_waypoint.section_id,
+                                    destination_waypoint.lane_id], dtype=np.int32)
 
         for i in range(len(route) - 1):
-            road_option = self._turn_decision(i, route)
+            road_option = road_options[i]
             edge = self._graph.edges[route[i], route[i + 1]]  # type: EdgeDict
-            path = []  # type: list[carla.Waypoint]
 
             if edge['type'] != RoadOption.LANEFOLLOW and edge['type'] != RoadOption.VOID:
                 route_trace.append((current_waypoint, road_option))
-                exit_wp = edge['exit_waypoint']
-                n1, n2 = self._road_id_to_edge[exit_wp.road_id][exit_wp.section_id][exit_wp.lane_id]
+                road_id, section_id, lane_id = edge['lane_keys'][-1].tolist()  # exit waypoint
+                n1, n2 = self._road_id_to_edge[road_id][section_id][lane_id]
                 next_edge = self._graph.edges[n1, n2]  # type: EdgeDict
-                if next_edge['path']:
-                    closest_index = self._find_closest_in_list(current_waypoint, next_edge['path'])
-                    closest_index = min(len(next_edge['path']) - 1, closest_index + 5)
+                if len(next_edge['locations']) > 2:  # non-empty path
+                    path_locations = next_edge['locations'][1:-1]
+                    closest_index = self._find_closest_index(current_location, path_locations)
+                    closest_index = min(len(path_locations) - 1, closest_index + 5)
                     current_waypoint = next_edge['path'][closest_index]
+                    current_location = path_locations[closest_index]
                 else:
                     current_waypoint = next_edge['exit_waypoint']
+                    current_location = next_edge['locations'][-1]
                 route_trace.append((current_waypoint, road_option))
 
             else:
-                path = path + [edge['entry_waypoint']] + edge['path'] + [edge['exit_waypoint']]
-                closest_index = self._find_closest_in_list(current_waypoint, path)
-                for waypoint in path[closest_index:]:
-                    current_waypoint = waypoint
-                    route_trace.append((current_waypoint, road_option))
-                    if len(route) - i <= 2 and waypoint.transform.location.distance(
-                            destination) < 2 * self._sampling_resolution:
-                        break
-                    elif len(
-                            route) - i <= 2 and current_waypoint.road_id == destination_waypoint.road_id and current_waypoint.section_id == destination_waypoint.section_id and current_waypoint.lane_id == destination_waypoint.lane_id:
-                        destination_index = self._find_closest_in_list(destination_waypoint, path)
-                        if closest_index > destination_index:
-                            break
+                locations = edge['locations']
+                closest_index = self._find_closest_index(current_location, locations)
+                stop_index = len(locations)
+                if len(route) - i <= 2:
+                    # Last edge, stop close to the destination
+                    remaining = locations[closest_index:]
+                    at_destination = np.linalg.norm(remaining - destination_location, axis=1) \
+                        < 2 * self._sampling_resolution
+                    destination_index = self._find_closest_index(destination_waypoint_location, locations)
+                    if closest_index > destination_index:
+                        at_destination |= (edge['lane_keys'][closest_index:] == destination_key).all(axis=1)
+                    stops = np.flatnonzero(at_destination)
+                    if len(stops):
+                        stop_index = closest_index + int(stops[0]) + 1
+                path = [edge['entry_waypoint']] + edge['path'] + [edge['exit_waypoint']]
+                for waypoint in path[closest_index:stop_index]:
+                    route_trace.append((waypoint, road_option))
+                current_waypoint = path[stop_index - 1]
+                current_location = locations[stop_index - 1]
 
         return route_trace
 
+    def cache_info(self):
+        # type: () -> dict[str, CacheInfo]
+        """
+        Returns the statistics of the route cache and of the graph search cache,
+        keyed by :code:`"route"` and :code:`"search"`.
+        """
+        return {
+            'route': CacheInfo(self._cache_stats['route'][0], self._cache_stats['route'][1],
+                               self._route_cache.maxsize, self._route_cache.currsize),
+            'search': CacheInfo(self._cache_stats['search'][0], self._cache_stats['search'][1],
+                                self._search_cache.maxsize, self._search_cache.currsize),
+        }
+
+    def cache_clear(self):
+        """Clears the route and the graph search cache and resets their statistics."""
+        self._route_cache.clear()
+        self._search_cache.clear()
+        self._cache_stats = {'route': [0, 0], 'search': [0, 0]}
+
+    def _plan_route(self, origin, destination):
+        # type: (carla.Location, carla.Location) -> tuple[list[int], list[RoadOption]]
+        """
+        Returns the node path from origin to destination and the turn decision
+        for each of its edges. The result is cached by the localized start and end edge.
+        """
+        start, end = self._localize(origin), self._localize(destination)
+        key = (start, end)
+        cached = self._route_cache.get(key)
+        if cached is not None:
+            self._cache_stats['route'][0] += 1
+            return cached
+        self._cache_stats['route'][1] += 1
+        route = self._search(start[0], end[0]) + [end[1]]
+        # The decisions must only depend on the route, not on the previously traced one
+        self._intersection_end_node = -1
+        road_options = [self._turn_decision(i, route) for i in range(len(route) - 1)]
+        self._route_cache[key] = (route, road_options)
+        return route, road_options
+
+    def _search(self, source, target):
+        # type: (int, int) -> list[int]
+        """
+        Shortest node path from source to target, the results are cached.
+
+        Note:
+            The returned list is shared with the cache and must not be modified.
+        """
+        key = (source, target)
+        route = self._search_cache.get(key)
+        if route is not None:
+            self._cache_stats['search'][0] += 1
+            return route
+        self._cache_stats['search'][1] += 1
+        if self.search_backend == 'csr':
+            route = self._search_csr(source, target)
+        else:
+            route = self._search_networkx(source, target)
+        self._search_cache[key] = route
+        return route
+
+    def _search_networkx(self, source, target):
+        # type: (int, int) -> list[int]
+        return nx.astar_path(
+            self._graph, source=source, target=target,
+            heuristic=self._distance_heuristic, weight='length')
+
+    def _search_csr(self, source, target):
+        # type: (int, int) -> list[int]
+        if self._csr_graph is None:
+            # The graph does not change after __init__
+            self._csr_graph = _CSRGraph(self._graph)
+        return self._csr_graph.astar_path(source, target)
+
+    def _cache_kind(self):
+        return 'route_graph_{:g}'.format(self._sampling_resolution)
+
+    def _save_graph(self):
+        """
+        Stores the graph in the map cache. Waypoints are stored by their
+        road, section and lane id, s value and location.
+        """
+        waypoints = []  # type: list[carla.Waypoint]
+        edges = []
+        for n1, n2, data in self._graph.edges(data=True):
+            attributes = {key: value for key, value in data.items() if key != 'path' and key not in _WAYPOINT_KEYS}
+            refs = {}
+            for key in _WAYPOINT_KEYS:
+                if key in data:
+                    refs[key] = len(waypoints)
+                    waypoints.append(data[key])
+            refs['path'] = (len(waypoints), len(waypoints) + len(data['path']))
+            waypoints.extend(data['path'])
+            edges.append((n1, n2, attributes, refs))
+        keys = np.array([(wp.road_id, wp.section_id, wp.lane_id) for wp in waypoints], dtype=np.int32).reshape(-1, 3)
+        s_values = np.array([wp.s for wp in waypoints], dtype=np.float64)
+        locations = [wp.transform.location for wp in waypoints]
+        coordinates = np.array([(loc.x, loc.y, loc.z) for loc in locations], dtype=np.float64).reshape(-1, 3)
+        data = {
+            'nodes': [(node, self._graph.nodes[node]['vertex']) for node in self._graph.nodes],
+            'edges': edges,
+            'id_map': self._id_map,
+            'road_id_to_edge': self._road_id_to_edge,
+            'waypoint_keys': keys,
+            'waypoint_s': s_values,
+            'waypoint_locations': coordinates,
+        }
+        save_map_cache(self._cache_kind(), self._wmap, data, _GRAPH_CACHE_VERSION)
+
+    def _load_graph(self):
+        # type: () -> bool
+        """
+        Loads the graph from the map cache.
+
+        Returns:
+            True if the graph was loaded.
+        """
+        data = load_map_cache(self._cache_kind(), self._wmap, _GRAPH_CACHE_VERSION)
+        if data is None:
+            return False
+        self._cached_waypoint_keys = data['waypoint_keys']
+        self._cached_waypoint_s = data['waypoint_s']
+        self._cached_waypoint_locations = data['waypoint_locations']
+        self._cached_waypoints = {}  # type: dict[int, carla.Waypoint]
+        self._id_map = data['id_map']
+        self._road_id_to_edge = data['road_id_to_edge']
+        self._graph = nx.DiGraph()
+        self._graph.edge_attr_dict_factory = _LazyEdgeData
+        for node, vertex in data['nodes']:
+            self._graph.add_node(node, vertex=vertex)
+        for n1, n2, attributes, refs in data['edges']:
+            self._graph.add_edge(n1, n2, **attributes)
+            edge = self._graph.edges[n1, n2]  # type: _LazyEdgeData
+            edge._planner = self
+            edge._refs = refs
+        return True
+
+    def _cached_waypoint(self, index):
+        # type: (int) -> carla.Waypoint
+        """Creates the waypoint with the given index of the map cache."""
+        waypoint = self._cached_waypoints.get(index)
+        if waypoint is None:
+            road_id, _, lane_id = self._cached_waypoint_keys[index]
+            waypoint = self._wmap.get_waypoint_xodr(int(road_id), int(lane_id), float(self._cached_waypoint_s[index]))
+            if waypoint is None:
+                x, y, z = self._cached_waypoint_locations[index]
+                waypoint = self._wmap.get_waypoint(carla.Location(float(x), float(y), float(z)))
+            self._cached_waypoints[index] = waypoint
+        return waypoint
+
     def _build_topology(self):
         """
         This function retrieves topology from the server as a list of
@@ -301,6 +615,19 @@ class GlobalRoutePlanner:
                 if left_found and right_found:
                     break
 
+    def _build_edge_arrays(self):
+        """
+        Adds the coordinates of the waypoints of each edge, entry, path and exit,
+        as :code:`locations` and their (road id, section id, lane id) as :code:`lane_keys`
+        to the edge. trace_route uses these arrays instead of the waypoints.
+        """
+        for _, _, edge in self._graph.edges(data=True):
+            waypoints = [edge['entry_waypoint']] + edge['path'] + [edge['exit_waypoint']]
+            locations = [waypoint.transform.location for waypoint in waypoints]
+            edge['locations'] = np.array([(loc.x, loc.y, loc.z) for loc in locations], dtype=np.float64)
+            edge['lane_keys'] = np.array([(waypoint.road_id, waypoint.section_id, waypoint.lane_id)
+                                          for waypoint in waypoints], dtype=np.int32)
+
     def _localize(self, location):
         # type: (carla.Location) -> None | tuple[int, int]
         """
@@ -335,12 +662,7 @@ class GlobalRoutePlanner:
         connecting origin and destination
         """
         start, end = self._localize(origin), self._localize(destination)
-
-        route = nx.astar_path(
-            self._graph, source=start[0], target=end[0],
-            heuristic=self._distance_heuristic, weight='length')
-        route.append(end[1])
-        return route
+        return self._search(start[0], end[0]) + [end[1]]
 
     def _successive_last_intersection_edge(self, index, route):
         # type: (int, list[int]) -> tuple[int | None, EdgeDict | None]
@@ -397,13 +719,17 @@ class GlobalRoutePlanner:
                     cv, nv = current_edge['exit_vector'], next_edge['exit_vector']
                     if cv is None or nv is None:
                         return next_edge['type']
-                    cross_list = []
+                    select_vectors = []
                     for neighbor in self._graph.successors(current_node):
                         select_edge = self._graph.edges[current_node, neighbor]
                         if select_edge['type'] == RoadOption.LANEFOLLOW and neighbor != route[index + 1]:
-                            sv = select_edge['net_vector']
-                            cross_list.append(np.cross(cv, sv)[2])
-                    next_cross = np.cross(cv, nv)[2]
+                            select_vectors.append(select_edge['net_vector'])
+                    # z component of the cross products of cv with all vectors at once
+                    cross_list = []
+                    if select_vectors:
+                        sv = np.array(select_vectors, dtype=np.float64)
+                        cross_list = (cv[0] * sv[:, 1] - cv[1] * sv[:, 0]).tolist()
+                    next_cross = cv[0] * nv[1] - cv[1] * nv[0]
                     deviation = math.acos(np.clip(
                         np.dot(cv, nv) / (np.linalg.norm(cv) * np.linalg.norm(nv)), -1.0, 1.0))
                     if not cross_list:
@@ -427,6 +753,17 @@ class GlobalRoutePlanner:
         self._previous_decision = decision
         return decision
 
+    @staticmethod
+    def _location_array(location):
+        # type: (carla.Location) -> np.ndarray
+        return np.array([location.x, location.y, location.z], dtype=np.float64)
+
+    @staticmethod
+    def _find_closest_index(location, locations):
+        # type: (np.ndarray, np.ndarray) -> int
+        """Index of the first of the locations that is closest to location."""
+        return int(np.argmin(np.einsum('ij,ij->i', locations - location, locations - location)))
+
     def _find_closest_in_list(self, current_waypoint, waypoint_list):
         min_distance = float('inf')
         closest_index = -1
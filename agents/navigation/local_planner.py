@@ -14,6 +14,7 @@ import carla
 
 from agents.navigation.controller import VehiclePIDController
 from agents.tools.misc import draw_waypoints, get_speed
+from agents.tools.timings import timed
 
 
 class RoadOption(IntEnum):
@@ -232,6 +233,7 @@ class LocalPlanner:
 
         self._stop_waypoint_creation = stop_waypoint_creation
 
+    @timed()
     def run_step(self, debug=False):
         """
         Execute one step of local planning which involves running the longitudinal and lateral PID controllers to
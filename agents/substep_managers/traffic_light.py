@@ -10,7 +10,6 @@ from carla import TrafficLightState
 
 from agents.tools.hints import TrafficLightDetectionResult
 from agents.tools.logs import logger
-from agents.tools.misc import is_within_distance
 from classes.constants import AgentState
 from classes.information_manager import InformationManager
 from launch_tools import CarlaDataProvider
@@ -40,6 +39,10 @@ def affected_by_traffic_light(self: "CanDetectNearbyTrafficLights",
             If None, all traffic lights in the scene are used.
         max_distance: max distance for a traffic lights to be considered relevant.
             If None, the base threshold value is used.
+
+    Note:
+        The lights are looked up in the :py:class:`.TrafficLightTriggerIndex`: only lights whose trigger
+        is on the road of the ego, in its driving direction and ahead of it are checked, nearest first.
     """
     if self.config.obstacles.ignore_traffic_lights:
         return TrafficLightDetectionResult(False, None)
@@ -68,27 +71,17 @@ def affected_by_traffic_light(self: "CanDetectNearbyTrafficLights",
     ego_vehicle_location = self.config.live_info.current_location
     ego_vehicle_waypoint = self._current_waypoint
 
-    filtered_lights = filter(_is_red_or_yellow if detect_yellow_tlighs else _is_red_light, lights_list)  # type: ignore
+    is_relevant = _is_red_or_yellow if detect_yellow_tlighs else _is_red_light
+    light_ids = {traffic_light.id for traffic_light in lights_list}
     
-    for traffic_light in filtered_lights:
-        trigger_wp = InformationManager.get_trafficlight_trigger_waypoint(traffic_light)
-
-        if trigger_wp.road_id != ego_vehicle_waypoint.road_id:
+    for trigger in InformationManager.get_traffic_light_trigger_index().lights_ahead(ego_vehicle_waypoint):
+        traffic_light = trigger.traffic_light
+        if traffic_light.id not in light_ids or not is_relevant(traffic_light):
             continue
-        
-        if trigger_wp.transform.location.distance(ego_vehicle_location) > max_distance:
+        if trigger.waypoint.transform.location.distance(ego_vehicle_location) > max_distance:
             continue
-
-        ve_dir = ego_vehicle_waypoint.transform.get_forward_vector()
-        wp_dir = trigger_wp.transform.get_forward_vector()
-        dot_ve_wp = ve_dir.x * wp_dir.x + ve_dir.y * wp_dir.y + ve_dir.z * wp_dir.z
-
-        if dot_ve_wp < 0:
-            continue
-
-        if is_within_distance(trigger_wp.transform, self._vehicle.get_transform(), max_distance, [0, 90]):
-            self._last_traffic_light = traffic_light
-            return TrafficLightDetectionResult(True, traffic_light)
+        self._last_traffic_light = traffic_light
+        return TrafficLightDetectionResult(True, traffic_light)
 
     return TrafficLightDetectionResult(False, None)
 
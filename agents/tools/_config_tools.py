@@ -7,6 +7,7 @@ from __future__ import annotations
 import ast
 import inspect
 import io
+import keyword
 import logging
 import os
 from pathlib import Path
@@ -18,7 +19,7 @@ import yaml
 # pyright: reportUnknownVariableType=information, reportUnknownMemberType=information
 import sys
 from dataclasses import is_dataclass
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union, cast, get_type_hints
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, Iterable, List, Optional, Tuple, Union, cast, get_type_hints
 
 import carla
 import omegaconf.errors
@@ -55,7 +56,8 @@ def look_ahead_time(speed: float, time_to_collision: float, plus: float = 0) ->
 
 
 # need this check for readthedocs
-if not READTHEDOCS and os.environ.get("_OMEGACONF_RESOLVERS_REGISTERED", "0") == "0":
+# not an environment variable, it would be inherited by spawned processes, e.g. the workers of a ProcessFleet
+if not READTHEDOCS and not OmegaConf.has_resolver("look_ahead_time"):
     import random
     import operator
     OmegaConf.register_new_resolver("add", operator.add)  # type: ignore[arg-type]
@@ -67,7 +69,6 @@ if not READTHEDOCS and os.environ.get("_OMEGACONF_RESOLVERS_REGISTERED", "0") ==
     OmegaConf.register_new_resolver("randint", random.randint)
     OmegaConf.register_new_resolver("randuniform", random.uniform)
     OmegaConf.register_new_resolver("look_ahead_time", look_ahead_time)
-    os.environ["_OMEGACONF_RESOLVERS_REGISTERED"] = "1"
 
 
 CONFIG_SCHEMA_NAME = "launch_config_schema.yaml"
@@ -663,3 +664,116 @@ def flatten_config(config: "type[AgentConfig] | AgentConfig", *, resolve: bool =
     options: Dict[str, Any] = {}
     _flatten_dict(resolved, options, resolve=resolve)
     return options
+
+
+# --------------- Config View -----------------
+
+class ConfigView:
+    """
+    Read-only snapshot of a :py:class:`omegaconf.DictConfig` with pre-resolved values for hot code paths.
+
+    Attribute access on a :py:class:`DictConfig` goes through the node machinery of OmegaConf,
+    which is slow if done many times per tick. A view resolves the values of the selected keys once,
+    interpolations included, and stores them in the ``__slots__`` of classes that are
+    compiled from the keys of the config. Reading from the view is a plain attribute access.
+
+    The :py:class:`DictConfig` stays the source of truth, a view is never updated.
+    Use :py:meth:`is_current` to check if a view has to be rebuilt with :py:meth:`create`;
+    this is the case when the config object was exchanged or :py:meth:`invalidate` was called.
+    :py:meth:`.AgentConfig.update`, the merges of a :py:class:`.Rule` and the :py:class:`.LunaticAgent`,
+    after it updated its :py:attr:`live_info` or its settings, call :py:meth:`invalidate`.
+
+    Attention:
+        Other code that writes to the config, e.g. :python:`config.controls.max_brake = 0.5`,
+        has to call :py:meth:`invalidate` afterwards; until then existing views return the old value.
+
+    Note:
+        Values that cannot be resolved, e.g. missing values, are not part of the view,
+        reading them raises an :py:exc:`AttributeError`.
+
+    Usage:
+        .. code-block:: python
+
+            view = ConfigView.create(agent.config, keys=("obstacles",))
+            view.obstacles.nearby_vehicles_max_distance
+            ...
+            if not view.is_current(agent.config):
+                view = ConfigView.create(agent.config, keys=("obstacles",))
+    """
+
+    __slots__ = ("_generation", "_source")
+
+    _invalidations: ClassVar[int] = 0
+    """Incremented by :py:meth:`invalidate`; views built before are outdated."""
+
+    _view_classes: ClassVar[Dict[Tuple[str, ...], "type[ConfigView]"]] = {}
+
+    _generation: int
+    """Value of :py:attr:`_invalidations` when the view was built. Only set for the root view."""
+    _source: DictConfig
+    """The config the view was built from. Only set for the root view."""
+
+    @classmethod
+    def create(cls, config: DictConfig, keys: "Optional[Iterable[str]]" = None) -> "ConfigView":
+        """
+        Resolves the values of **config** into a new view.
+
+        Parameters:
+            config: The config to create the view for.
+            keys: The keys that are part of the view, nested keys are separated by dots,
+                e.g. :code:`"planner.dt"`. A key selects its whole subtree. By default all keys.
+        """
+        view = cls._build(config, config.keys() if keys is None else keys, set())
+        object.__setattr__(view, "_generation", ConfigView._invalidations)
+        object.__setattr__(view, "_source", config)
+        return view
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Marks all views as outdated."""
+        ConfigView._invalidations += 1
+
+    def is_current(self, config: DictConfig) -> bool:
+        """Whether the view was built from **config** and :py:meth:`invalidate` was not called since then."""
+        return self._source is config and self._generation == ConfigView._invalidations
+
+    @classmethod
+    def _build(cls, config: DictConfig, keys: "Iterable[Any]", visited: "set[int]") -> "ConfigView":
+        visited.add(id(config))
+        sub_keys: "Dict[str, List[str]]" = {}
+        for key in keys:
+            name, _, sub_key = key.partition(".") if isinstance(key, str) else (key, "", "")
+            sub_keys.setdefault(name, []).append(sub_key)  # an empty sub key selects the whole node
+        values: "Dict[str, Any]" = {}
+        for name, selected in sub_keys.items():
+            if (not isinstance(name, str) or not name.isidentifier() or keyword.iskeyword(name)
+                    or name.startswith("_") or hasattr(ConfigView, name)):
+                continue  # not accessible as attribute
+            try:
+                value = config[name]
+            except omegaconf.errors.OmegaConfBaseException:
+                continue  # missing value or unresolvable interpolation
+            if isinstance(value, DictConfig) and id(value) not in visited:
+                value = cls._build(value, value.keys() if "" in selected else selected, visited)
+            values[name] = value
+        view = object.__new__(cls._get_view_class(tuple(values)))
+        for name, value in values.items():
+            object.__setattr__(view, name, value)
+        return view
+
+    @classmethod
+    def _get_view_class(cls, names: "Tuple[str, ...]") -> "type[ConfigView]":
+        try:
+            return cls._view_classes[names]
+        except KeyError:
+            pass
+        view_class = type(cls.__name__, (cls,), {"__slots__": names})
+        cls._view_classes[names] = view_class
+        return view_class
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is read-only. Modify the underlying DictConfig instead.")
+
+    def __repr__(self) -> str:
+        names = (name for name in self.__slots__ if hasattr(self, name))
+        return f"{self.__class__.__name__}({', '.join(f'{name}={getattr(self, name)!r}' for name in names)})"
@@ -41,6 +41,7 @@ from agents.tools._config_tools import (  # Type Alias & special objects
     _T,
     AsDictConfig,
     ConfigType,
+    ConfigView,
     DictConfigAlias,
     DictConfigLike,
     NestedConfigDict,
@@ -88,6 +89,7 @@ __all__ = [
     "BehaviorAgentSettings",
     "CallFunctionFromConfig",
     "CameraConfig",
+    "ConfigView",
     "ContextSettings",
     "CreateRuleFromConfig",
     "LaunchConfig",
@@ -534,6 +536,7 @@ class AgentConfig(DictConfigLike if TYPE_CHECKING else object):
         """
         Updates the options with a new dictionary. Will call :py:meth:`update` recursively
         for nested :py:class:`AgentConfig` objects.
+        Afterwards all :py:class:`ConfigView` objects are marked as outdated.
         
         Parameters:
             options: The new options to update with.
@@ -557,6 +560,8 @@ class AgentConfig(DictConfigLike if TYPE_CHECKING else object):
         except Exception as e:
             print("\n ERROR updating", self.__class__.__name__, "with >", options, "< Error:", e, "\n")
             raise
+        finally:
+            ConfigView.invalidate()
         
     @classmethod
     def uses_overwrite_interface(cls) -> bool:
@@ -1530,6 +1535,17 @@ class DetectionMatrixSettings(AgentConfig):
     The interval in frames after which the detection matrix should be updated. Sync must be true.
     """
     
+    use_process: bool = False
+    """
+    If the detection matrix is not updated synchronously, calculate it in a separate process instead of a thread.
+    The calculation is pure Python, a thread competes with the agent for the GIL.
+    """
+    
+    max_staleness: int = 10
+    """
+    Only with use_process: A result that is older than this number of frames is discarded.
+    """
+    
     hud: Never = MISSING
     """
     TODO: Do not have this in Agent config; instead use an interpolation
@@ -2028,6 +2044,12 @@ class CameraConfig(AgentConfig):
         font: str = "arial"
         """Font of the HUD. Not Implemented"""
         # ----------------------------
+        
+        refresh_rate: float = 10.0
+        """
+        How often per second the info text of the HUD is updated.
+        If 0 it is updated every frame.
+        """
     
         @config_path("camera/hud/detection_matrix")
         @dataclass
@@ -2053,6 +2075,12 @@ class CameraConfig(AgentConfig):
             
             text_settings: Dict[str, Any] = field(default_factory=lambda: {'color': 'orange'})
             """Settings for the text of pyplot.text when drawing the numerical values"""
+            
+            backend: str = "pygame"
+            """
+            Either "pygame" or "matplotlib".
+            pygame only redraws the changed cells, matplotlib draws a new figure every frame.
+            """
 
         detection_matrix: DetectionMatrixHUDConfig = field(default_factory=DetectionMatrixHUDConfig)
         """.. <take doc|DetectionMatrixHUDConfig>"""
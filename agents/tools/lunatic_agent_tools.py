@@ -15,10 +15,12 @@ import sys
 from functools import partial, wraps
 from inspect import isclass
 from operator import attrgetter
-from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Sequence, Tuple, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional, Sequence, Tuple, Union
 from typing import cast as assure_type
 
 import carla
+import numpy as np
+import shapely
 from omegaconf import DictConfig
 from shapely.geometry import Polygon
 from typing_extensions import Concatenate, Literal, ParamSpec, TypeVar, assert_never
@@ -27,9 +29,10 @@ from agents.tools.config_creation import AgentConfig
 from agents.tools.hints import ObstacleDetectionResult
 from agents.tools.logs import logger
 from agents.tools.misc import is_within_distance
+from agents.tools.timings import timed
 from classes.constants import Phase, RoadOption
 from classes.exceptions import EmergencyStopException, LunaticAgentException
-from launch_tools import CarlaDataProvider
+from classes.information_manager import InformationManager
 
 if TYPE_CHECKING:
     from classes.type_protocols import (
@@ -263,6 +266,111 @@ def detect_obstacles_in_path(self: "CanDetectNearbyObstacles",
     return detection_result
 
 
+class _DetectionCache:
+    """
+    Cache of :py:func:`detect_obstacles` that is shared by all calls during the same frame,
+    e.g. by the different phases of a tick.
+
+    Holds the transforms and waypoints of the ego and of the checked actors, the bounding box
+    vertices of the actors, the route corridors and the detection results.
+    """
+
+    __slots__ = ("corridors", "ego", "frame", "results", "targets", "vertices")
+
+    def __init__(self, frame: Optional[int]):
+        self.frame = frame
+        self.ego: Optional[Tuple[carla.Transform, carla.Waypoint]] = None
+        self.targets: Dict[int, Tuple[carla.Transform, Optional[carla.Waypoint]]] = {}
+        self.vertices: Dict[int, np.ndarray] = {}
+        self.corridors: Dict[Tuple[Any, ...], Optional[Polygon]] = {}
+        self.results: Dict[Tuple[Any, ...], ObstacleDetectionResult] = {}
+
+    @staticmethod
+    def get(agent: Any) -> "_DetectionCache":
+        """
+        The cache of the agent for :py:attr:`.InformationManager.frame`.
+
+        If the frame is not known a new cache is returned that is not reused.
+        """
+        frame = InformationManager.frame
+        if frame is None:
+            return _DetectionCache(None)
+        cache: Optional[_DetectionCache] = getattr(agent, "_detection_cache", None)
+        if cache is None or cache.frame != frame:
+            cache = _DetectionCache(frame)
+            agent._detection_cache = cache
+        return cache
+
+    def ego_data(self, vehicle: carla.Actor) -> Tuple[carla.Transform, carla.Waypoint]:
+        if self.ego is None:
+            ego_transform = vehicle.get_transform()
+            self.ego = (ego_transform, InformationManager.get_waypoint(vehicle, location=ego_transform.location))
+        return self.ego
+
+    def target_data(self, actor: carla.Actor) -> Tuple[carla.Transform, Optional[carla.Waypoint]]:
+        data = self.targets.get(actor.id)
+        if data is None:
+            transform = actor.get_transform()
+            data = (transform, InformationManager.get_waypoint(actor, carla.LaneType.Any, location=transform.location))
+            self.targets[actor.id] = data
+        return data
+
+    def target_vertices(self, actor: carla.Actor) -> np.ndarray:
+        vertices = self.vertices.get(actor.id)
+        if vertices is None:
+            world_vertices = actor.bounding_box.get_world_vertices(self.target_data(actor)[0])
+            vertices = np.array([[v.x, v.y, v.z] for v in world_vertices])
+            self.vertices[actor.id] = vertices
+        return vertices
+
+
+def _plan_key(plan: "Sequence[Any]") -> Tuple[int, int, int, int]:
+    """
+    Identifies the state of the plan within a frame.
+    The first and last entry are alive while they are in the plan, so their ids are unique.
+    """
+    if not plan:
+        return (id(plan), 0, 0, 0)
+    return (id(plan), len(plan), id(plan[0]), id(plan[-1]))
+
+
+def _route_polygon(self: "CanDetectObstacles",
+                   ego_transform: carla.Transform,
+                   offset: float,
+                   max_distance: float) -> Optional[Polygon]:
+    """
+    The corridor along the plan up to **max_distance** with the width of the ego vehicle,
+    shifted by **offset**. The polygon is prepared for repeated intersection tests.
+    """
+    route_bb: list[list[float]] = []
+    ego_location = ego_transform.location
+    extent_y = self._vehicle.bounding_box.extent.y
+    r_ext = extent_y + offset
+    l_ext = -extent_y + offset
+    r_vec = ego_transform.get_right_vector()
+    p1 = ego_location + carla.Location(r_ext * r_vec.x, r_ext * r_vec.y)
+    p2 = ego_location + carla.Location(l_ext * r_vec.x, l_ext * r_vec.y)
+    route_bb.extend([[p1.x, p1.y, p1.z], [p2.x, p2.y, p2.z]])
+
+    for wp, _ in self._local_planner.get_plan():
+        if ego_location.distance(wp.transform.location) > max_distance:
+            break
+
+        r_vec = wp.transform.get_right_vector()
+        p1 = wp.transform.location + carla.Location(r_ext * r_vec.x, r_ext * r_vec.y)
+        p2 = wp.transform.location + carla.Location(l_ext * r_vec.x, l_ext * r_vec.y)
+        route_bb.extend([[p1.x, p1.y, p1.z], [p2.x, p2.y, p2.z]])
+
+    # Two points don't create a polygon, nothing to check
+    if len(route_bb) < 3:
+        return None
+
+    polygon = Polygon(route_bb)
+    shapely.prepare(polygon)
+    return polygon
+
+
+@timed()
 def detect_obstacles(self: "CanDetectObstacles",
                     actor_list: Optional[Sequence[carla.Actor] | carla.ActorList] = None,
                     max_distance: Optional[float] = None,
@@ -286,6 +394,12 @@ def detect_obstacles(self: "CanDetectObstacles",
     The angle between the location and reference transform will also be taken into account.
     Being 0 a location in front and 180, one behind, i.e, the vector between has to satisfy:
     **low_angle_th** < angle < **up_angle_th**.
+
+    Note:
+        The transforms and waypoints of the actors, the route corridor and the results are cached
+        for the current :py:attr:`.InformationManager.frame`; repeated calls during the same tick
+        with the same arguments and plan return the cached result.
+        The bounding boxes of all actors that are checked against the corridor are tested at once.
     
     Tip:
         As the first argument is the agent, this function can be used as a method, i.e
@@ -306,79 +420,74 @@ def detect_obstacles(self: "CanDetectObstacles",
 
     if not max_distance:
         max_distance = self.config.obstacles.base_vehicle_threshold  # TODO: This is not modified with the dynamic threshold
-    
-    def get_route_polygon() -> None | Polygon:
-        # Note nested functions can access variables from the outer scope
-        route_bb = []  # type: list[list[float]]
-        extent_y = self._vehicle.bounding_box.extent.y
-        r_ext = extent_y + self.config.planner.offset
-        l_ext = -extent_y + self.config.planner.offset
-        r_vec = ego_transform.get_right_vector()
-        p1 = ego_location + carla.Location(r_ext * r_vec.x, r_ext * r_vec.y)
-        p2 = ego_location + carla.Location(l_ext * r_vec.x, l_ext * r_vec.y)
-        route_bb.extend([[p1.x, p1.y, p1.z], [p2.x, p2.y, p2.z]])
-
-        for wp, _ in self._local_planner.get_plan():
-            if ego_location.distance(wp.transform.location) > max_distance:
-                break
-
-            r_vec = wp.transform.get_right_vector()
-            p1 = wp.transform.location + carla.Location(r_ext * r_vec.x, r_ext * r_vec.y)
-            p2 = wp.transform.location + carla.Location(l_ext * r_vec.x, l_ext * r_vec.y)
-            route_bb.extend([[p1.x, p1.y, p1.z], [p2.x, p2.y, p2.z]])
-
-        # Two points don't create a polygon, nothing to check
-        if len(route_bb) < 3:
-            return None
-
-        return Polygon(route_bb)
+    offset = self.config.planner.offset
+    use_bbs_detection = self.config.obstacles.use_bbs_detection
+
+    cache = _DetectionCache.get(self)
+    plan_key = _plan_key(self._local_planner.get_plan())
+    result_key = (plan_key, tuple(actor.id for actor in actor_list), max_distance,
+                  up_angle_th, low_angle_th, lane_offset, offset, use_bbs_detection)
+    result = cache.results.get(result_key)
+    if result is not None:
+        return result
 
     # TODO: can get this from CDP
-    ego_transform = self._vehicle.get_transform()
-    ego_location = ego_transform.location  # NOTE: property access creates a new location object, i.e. ego_location != ego_front_transform
-    ego_wpt = CarlaDataProvider.get_map().get_waypoint(ego_location)
+    ego_transform, ego_wpt = cache.ego_data(self._vehicle)
+    ego_location = ego_transform.location  # NOTE: property access creates a new location object
 
     # Get the right offset
     if ego_wpt.lane_id < 0 and lane_offset != 0:
         lane_offset *= -1
 
-    # Get the transform of the front of the ego
-    ego_front_transform = ego_transform
-    ego_front_transform.location += carla.Location(
-        ego_transform.get_forward_vector() * self._vehicle.bounding_box.extent.x)
+    # Get the transform of the front of the ego, the cached transform must not be modified
+    ego_front_transform = carla.Transform(
+        ego_location + carla.Location(ego_transform.get_forward_vector() * self._vehicle.bounding_box.extent.x),
+        ego_transform.rotation)
 
-    opposite_invasion = abs(self.config.planner.offset) + self._vehicle.bounding_box.extent.y > ego_wpt.lane_width / 2
-    use_bbs = self.config.obstacles.use_bbs_detection or opposite_invasion or ego_wpt.is_junction
+    opposite_invasion = abs(offset) + self._vehicle.bounding_box.extent.y > ego_wpt.lane_width / 2
+    use_bbs = use_bbs_detection or opposite_invasion or ego_wpt.is_junction
 
     # Get the route bounding box
-    route_polygon = get_route_polygon()
+    corridor_key = (plan_key, offset, max_distance)
+    if corridor_key in cache.corridors:
+        route_polygon = cache.corridors[corridor_key]
+    else:
+        route_polygon = cache.corridors[corridor_key] = _route_polygon(self, ego_transform, offset, max_distance)
 
+    # Select the candidates and test all bounding boxes against the route at once
+    candidates: list[tuple[carla.Actor, carla.Transform, carla.Waypoint, bool]] = []
+    bbs_vertices: list[np.ndarray] = []
     for target_vehicle in actor_list:
         if target_vehicle.id == self._vehicle.id:
             continue
 
-        target_transform = target_vehicle.get_transform()
+        target_transform, target_wpt = cache.target_data(target_vehicle)
         if target_transform.location.distance(ego_location) > max_distance:
             continue
 
-        target_wpt = CarlaDataProvider.get_map().get_waypoint(target_transform.location, lane_type=carla.LaneType.Any)
         if not target_wpt:
             logger.warning("No waypoint found for the checked obstacle."
                            "This might be a bug in the map but ok for static obstacles.")
             continue
 
         # General approach for junctions and vehicles invading other lanes due to the offset
-        if (use_bbs or target_wpt.is_junction) and route_polygon:
-
-            target_bb = target_vehicle.bounding_box
-            target_vertices = target_bb.get_world_vertices(target_vehicle.get_transform())
-            target_list = [[v.x, v.y, v.z] for v in target_vertices]
-            target_polygon = Polygon(target_list)
-
-            if route_polygon.intersects(target_polygon):
-                return ObstacleDetectionResult(True,
-                                               target_vehicle,
-                                               target_vehicle.get_location().distance(ego_location))
+        check_bb = bool((use_bbs or target_wpt.is_junction) and route_polygon)
+        if check_bb:
+            bbs_vertices.append(cache.target_vertices(target_vehicle))
+        candidates.append((target_vehicle, target_transform, target_wpt, check_bb))
+
+    intersections: Iterator[bool] = iter(())
+    if bbs_vertices:
+        intersections = iter(shapely.intersects(route_polygon, shapely.polygons(np.stack(bbs_vertices))).tolist())
+
+    result = ObstacleDetectionResult(False, None, -1)
+    for target_vehicle, target_transform, target_wpt, check_bb in candidates:
+        if check_bb:
+            if next(intersections):
+                result = ObstacleDetectionResult(True,
+                                                 target_vehicle,
+                                                 target_transform.location.distance(ego_location))
+                break
 
         # Simplified approach, using only the plan waypoints (similar to TM)
         else:
@@ -392,21 +501,23 @@ def detect_obstacles(self: "CanDetectObstacles",
 
             target_forward_vector = target_transform.get_forward_vector()
             target_extent = target_vehicle.bounding_box.extent.x
-            target_rear_transform = target_transform
-            
-            target_rear_transform.location -= carla.Location(
-                x=target_extent * target_forward_vector.x,
-                y=target_extent * target_forward_vector.y,
-            )
+            target_rear_transform = carla.Transform(
+                target_transform.location - carla.Location(
+                    x=target_extent * target_forward_vector.x,
+                    y=target_extent * target_forward_vector.y,
+                ),
+                target_transform.rotation)
             
             if is_within_distance(target_rear_transform, ego_front_transform, max_distance,
                                     [low_angle_th, up_angle_th]):
-                return ObstacleDetectionResult(True,
-                                               target_vehicle,
-                                               target_rear_transform.location.distance(
-                                                                ego_front_transform.location))
+                result = ObstacleDetectionResult(True,
+                                                 target_vehicle,
+                                                 target_rear_transform.location.distance(
+                                                                  ego_front_transform.location))
+                break
 
-    return ObstacleDetectionResult(False, None, -1)
+    cache.results[result_key] = result
+    return result
 
 
 def detect_vehicles(self: "CanDetectObstacles",
@@ -0,0 +1,109 @@
+"""
+Disk cache for data that is derived from a CARLA map and is expensive to calculate,
+e.g. the lane topology of the detection matrix.
+
+Entries are keyed by the name of the map and a hash of its OpenDRIVE content,
+so that a changed map does not load outdated data.
+The cache directory can be set with the environment variable :code:`LUNATIC_MAP_CACHE`,
+an empty value disables the cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+from agents.tools.logs import logger
+
+if TYPE_CHECKING:
+    import carla
+
+__all__ = [
+    "get_cache_dir",
+    "load_map_cache",
+    "map_cache_key",
+    "save_map_cache",
+]
+
+DEFAULT_CACHE_DIR = Path(__file__).parents[2] / ".cache" / "maps"
+"""Default directory of the cache files, located in the root of the repository."""
+
+
+def get_cache_dir() -> Optional[Path]:
+    """
+    Returns the directory of the cache files;
+    :python:`None` if the cache is disabled by an empty :code:`LUNATIC_MAP_CACHE` variable.
+    """
+    path = os.environ.get("LUNATIC_MAP_CACHE", None)
+    if path == "":
+        return None
+    return Path(path) if path else DEFAULT_CACHE_DIR
+
+
+def map_cache_key(world_map: carla.Map) -> str:
+    """
+    Key of the map for the cache files: :code:`<map name>_<OpenDRIVE hash>`.
+
+    Note:
+        The key is not memoized, a changed map with the same name has to get a new key.
+        It is only needed when a cache file is loaded or saved and by the in-memory cache of
+        :py:func:`.informationUtils.get_all_road_lane_ids`.
+    """
+    digest = hashlib.sha1(world_map.to_opendrive().encode()).hexdigest()[:16]  # noqa: S324 # not used for security
+    return f"{world_map.name.replace('/', '_')}_{digest}"
+
+
+def _cache_file(kind: str, world_map: carla.Map) -> Optional[Path]:
+    directory = get_cache_dir()
+    if directory is None:
+        return None
+    return directory / f"{map_cache_key(world_map)}.{kind}.pkl"
+
+
+def load_map_cache(kind: str, world_map: carla.Map, version: int) -> Optional[Any]:
+    """
+    Loads the cached data of type **kind** for **world_map**.
+
+    Parameters:
+        kind: Name of the cached data, used in the file name.
+        world_map: The map the data belongs to.
+        version: Version of the data format; entries with a different version are ignored.
+
+    Returns:
+        The cached data or :python:`None` if there is no valid entry.
+    """
+    path = _cache_file(kind, world_map)
+    if path is None or not path.exists():
+        return None
+    try:
+        with path.open("rb") as f:
+            cached_version, data = pickle.load(f)  # noqa: S301 # local files created by save_map_cache
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Could not load map cache %s: %s", path, e)
+        return None
+    if cached_version != version:
+        logger.info("Ignoring map cache %s with version %s, expected %s", path, cached_version, version)
+        return None
+    return data
+
+
+def save_map_cache(kind: str, world_map: carla.Map, data: Any, version: int) -> None:
+    """
+    Saves **data** of type **kind** for **world_map**, see :py:func:`load_map_cache`.
+
+    Errors are logged but not raised, the cache is optional.
+    """
+    path = _cache_file(kind, world_map)
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with temp_path.open("wb") as f:
+            pickle.dump((version, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        temp_path.replace(path)  # atomic, parallel processes might write the same file
+    except OSError as e:
+        logger.warning("Could not save map cache %s: %s", path, e)
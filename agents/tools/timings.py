@@ -0,0 +1,254 @@
+"""
+Opt-in timing of the phases, rules and components of the agent.
+
+The measurements are collected by the module level :py:data:`timings` object.
+While it is disabled, which is the default, the instrumented code only checks
+:py:attr:`Timings.enabled`. When enabled, the durations are measured with
+:py:func:`time.perf_counter_ns` and the last :py:attr:`Timings.window` durations of
+each section are kept to calculate the percentiles.
+
+Sections are identified by a category and a name:
+
+- ``"phase"``: :py:meth:`.LunaticAgent.execute_phase`, named by the :py:class:`.Phase`.
+- ``"rule"``, ``"condition"``, ``"action"``: the complete :py:meth:`.Rule.__call__`, the condition
+  and the executed action, named by the rule.
+- ``"component"``: functions decorated with :py:func:`timed`, e.g. :py:meth:`.InformationManager.tick`,
+  :py:meth:`.DetectionMatrix.update`, :py:func:`.detect_obstacles` and :py:meth:`.LocalPlanner.run_step`.
+
+The environment variable :code:`LUNATIC_TIMINGS` enables the timings on import, if its value
+is a path ending on ``.csv`` or ``.json`` the results are exported to it when the program exits.
+
+Usage:
+    .. code-block:: python
+
+        from agents.tools.timings import timings
+        timings.enable(export_path="timings.csv")
+        ...
+        for row in timings.slowest(5):
+            print(row["category"], row["name"], row["p95_ms"])
+"""
+
+from __future__ import annotations
+
+import atexit
+import csv
+import json
+import math
+import os
+from array import array
+from functools import wraps
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar, Union
+
+from agents.tools.logs import logger
+
+__all__ = [
+    "TimingWindow",
+    "Timings",
+    "timed",
+    "timings",
+]
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+PERCENTILES = (50, 95, 99)
+"""Percentiles of the rows of :py:meth:`Timings.summary`."""
+
+DEFAULT_WINDOW = 1000
+"""Default number of durations per section that are used for the percentiles."""
+
+
+class TimingWindow:
+    """Durations in nanoseconds of one section; the latest ones are kept in a ring buffer."""
+
+    __slots__ = ("_index", "_samples", "_window_total", "count", "max_ns", "total_ns")
+
+    def __init__(self, size: int = DEFAULT_WINDOW):
+        self._samples = array("q", bytes(8 * size))
+        self._index = 0
+        self._window_total = 0
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, duration_ns: int) -> None:
+        samples = self._samples
+        index = self._index
+        self._window_total += duration_ns - samples[index]
+        samples[index] = duration_ns
+        self._index = index + 1 if index + 1 < len(samples) else 0
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def samples(self) -> List[int]:
+        """The durations in the window, oldest first."""
+        if self.count < len(self._samples):
+            return self._samples[:self.count].tolist()
+        return self._samples[self._index:].tolist() + self._samples[:self._index].tolist()
+
+    @property
+    def window_mean_ns(self) -> float:
+        """Mean of the durations in the window."""
+        filled = min(self.count, len(self._samples))
+        return self._window_total / filled if filled else 0.0
+
+    def percentiles(self, *percentiles: float) -> Tuple[float, ...]:
+        """Nearest-rank percentiles of the durations in the window."""
+        ordered = sorted(self.samples())
+        if not ordered:
+            return tuple(0.0 for _ in percentiles)
+        last = len(ordered) - 1
+        return tuple(float(ordered[min(last, max(0, math.ceil(len(ordered) * p / 100) - 1))]) for p in percentiles)
+
+
+class Timings:
+    """
+    Collects the durations of the timed sections.
+
+    Use the module level :py:data:`timings` object instead of creating a new one.
+    """
+
+    enabled: bool
+    """Whether the instrumented code measures the durations."""
+
+    window: int
+    """Number of durations per section that are used for the percentiles."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.enabled = False
+        self.window = window
+        self._sections: Dict[Tuple[str, Hashable], TimingWindow] = {}
+        self._export_path: Optional[Path] = None
+        self._exit_registered = False
+
+    def enable(self, export_path: Union[str, Path, None] = None, window: Optional[int] = None) -> None:
+        """
+        Starts measuring.
+
+        Args:
+            export_path: If given, the results are written to this .csv or .json file when the program exits.
+            window: Changes the number of durations per section, only affects sections that are new.
+        """
+        if window is not None:
+            self.window = window
+        if export_path is not None:
+            self._export_path = Path(export_path)
+            if not self._exit_registered:
+                atexit.register(self._export_at_exit)
+                self._exit_registered = True
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stops measuring, the collected durations are kept."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Removes all collected durations."""
+        self._sections.clear()
+
+    def record(self, category: str, name: Hashable, duration_ns: int) -> None:
+        """Adds a duration to a section."""
+        section = self._sections.get((category, name))
+        if section is None:
+            section = self._sections[(category, name)] = TimingWindow(self.window)
+        section.add(duration_ns)
+
+    def get(self, category: str, name: Hashable) -> Optional[TimingWindow]:
+        return self._sections.get((category, name))
+
+    @staticmethod
+    def _row(category: str, name: Hashable, section: TimingWindow) -> Dict[str, Any]:
+        row: Dict[str, Any] = {
+            "category": category,
+            "name": getattr(name, "name", None) or str(name),  # Phase.name is None for combined phases before 3.11
+            "count": section.count,
+            "total_ms": section.total_ns / 1e6,
+            "mean_ms": section.total_ns / section.count / 1e6,
+        }
+        for percentile, value in zip(PERCENTILES, section.percentiles(*PERCENTILES)):
+            row[f"p{percentile}_ms"] = value / 1e6
+        row["max_ms"] = section.max_ns / 1e6
+        return row
+
+    def summary(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        One row per section with the count, the total, mean and maximum duration
+        and the percentiles of :py:data:`PERCENTILES` in milliseconds.
+        """
+        return [self._row(section_category, name, section)
+                for (section_category, name), section in self._sections.items()
+                if category is None or section_category == category]
+
+    def slowest(self, n: int = 5, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        The rows of :py:meth:`summary` of the `n` sections with the highest mean duration in the window.
+
+        Only the percentiles of these sections are calculated, this is cheap enough to be called
+        every time the :py:class:`.HUD` refreshes.
+        """
+        sections = [(key, section) for key, section in self._sections.items()
+                    if category is None or key[0] == category]
+        sections.sort(key=lambda item: item[1].window_mean_ns, reverse=True)
+        return [self._row(section_category, name, section) for (section_category, name), section in sections[:n]]
+
+    def export(self, path: Union[str, Path]) -> None:
+        """Writes the :py:meth:`summary` to a .json file, or a .csv file for all other suffixes."""
+        path = Path(path)
+        rows = self.summary()
+        if path.suffix.lower() == ".json":
+            with open(path, "w") as file:
+                json.dump(rows, file, indent=2)
+            return
+        fields = ["category", "name", "count", "total_ms", "mean_ms",
+                  *(f"p{percentile}_ms" for percentile in PERCENTILES), "max_ms"]
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def _export_at_exit(self) -> None:
+        if self._export_path is None or not self._sections:
+            return
+        try:
+            self.export(self._export_path)
+        except OSError as e:
+            logger.error("Could not export the timings to %s: %s", self._export_path, e)
+        else:
+            logger.info("Exported the timings to %s", self._export_path)
+
+
+timings = Timings()
+"""The timings of the agent, see the module description."""
+
+
+def timed(category: str = "component", name: Optional[Hashable] = None) -> Callable[[_F], _F]:
+    """
+    Decorator that records the duration of each call while :py:data:`timings` is enabled.
+
+    Args:
+        category: Category of the section.
+        name: Name of the section, defaults to the qualified name of the function.
+    """
+    def decorator(func: _F) -> _F:
+        section_name = name if name is not None else func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not timings.enabled:
+                return func(*args, **kwargs)
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings.record(category, section_name, perf_counter_ns() - start)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+_env_value = os.environ.get("LUNATIC_TIMINGS", "")
+if _env_value and _env_value.lower() not in ("0", "false"):
+    timings.enable(export_path=_env_value if _env_value.lower().endswith((".csv", ".json")) else None)
+del _env_value
@@ -11,8 +11,7 @@ from __future__ import annotations
 
 import collections
 import math
-from operator import attrgetter
-from typing import List, NamedTuple, Optional, Sequence, Set, Tuple
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
 from typing_extensions import TypeAlias
 
 import carla
@@ -20,6 +19,8 @@ import numpy as np
 from cachetools import LRUCache, cached
 
 from agents.tools.logs import logger
+from agents.tools.map_cache import load_map_cache, map_cache_key, save_map_cache
+from classes.information_manager import InformationManager
 from launch_tools import CarlaDataProvider
 
 
@@ -36,6 +37,54 @@ RoadLaneIds: TypeAlias = Set[RoadLaneId]
 Iterable of :py:class:`RoadLaneId` for the current map collected by :py:func:`get_all_road_lane_ids`.
 """
 
+
+class LaneTopology(FrozenSet[RoadLaneId]):
+    """
+    Set of all :py:class:`RoadLaneId` of a map with an index of the lanes per road.
+    
+    Returned by :py:func:`get_all_road_lane_ids`; the functions of this module use the index
+    instead of scanning the whole set.
+    """
+    
+    lanes_by_road: Dict[int, Tuple[int, ...]]
+    """Sorted lane ids of each road."""
+    
+    highway_roads: FrozenSet[int]
+    """
+    Roads with at least six lanes or with at least three lanes with consecutive lane ids;
+    see :py:func:`check_ego_on_highway`.
+    """
+    
+    def __new__(cls, road_lane_ids: Iterable[Tuple[int, int]]):
+        self = super().__new__(cls, (RoadLaneId(*rl_id) for rl_id in road_lane_ids))
+        lanes_by_road: Dict[int, List[int]] = {}
+        for road_id, lane_id in self:
+            lanes_by_road.setdefault(road_id, []).append(lane_id)
+        self.lanes_by_road = {road_id: tuple(sorted(lanes)) for road_id, lanes in lanes_by_road.items()}
+        self.highway_roads = frozenset(road_id for road_id, lanes in self.lanes_by_road.items()
+                                       if len(lanes) >= 6
+                                       or (len(lanes) >= 3 and lanes[-1] - lanes[0] == len(lanes) - 1))
+        return self
+    
+    def __reduce__(self):
+        return (self.__class__, (tuple(self),))
+    
+    def lanes_of(self, road_id: int) -> Tuple[int, ...]:
+        """Sorted lane ids of the road; empty if the road is unknown."""
+        return self.lanes_by_road.get(road_id, ())
+    
+    def is_highway_road(self, road_id: int) -> bool:
+        """Whether the road is classified as a highway, see :py:attr:`highway_roads`."""
+        return road_id in self.highway_roads
+    
+    @classmethod
+    def of(cls, road_lane_ids: "Union[RoadLaneIds, LaneTopology]") -> "LaneTopology":
+        """Returns **road_lane_ids** if it already is a :py:class:`LaneTopology`, otherwise creates one."""
+        if isinstance(road_lane_ids, LaneTopology):
+            return road_lane_ids
+        return cls(road_lane_ids)
+
+
 JunctionWaypointList: TypeAlias = Sequence[Tuple[carla.Waypoint, carla.Waypoint]]
 """wps (list): List of one waypoint cluster of grouped highway junction waypoints.
     Format: [(start_wp, "start"), (start_wp, "start"), ..]"""
@@ -44,7 +93,8 @@ HighWayShape: TypeAlias = Tuple[str, int, JunctionWaypointList, JunctionWaypoint
 """(highway_type: string, straight_lanes: int, entry_wps: ([wp,..], [wp,..]), exit_wps: ([wp,..], [wp,..]))"""
 
 
-def check_ego_on_highway(ego_vehicle_location: carla.Location, road_lane_ids: RoadLaneIds, world_map):
+def check_ego_on_highway(ego_vehicle_location: carla.Location, road_lane_ids: RoadLaneIds, world_map,
+                         *, ego_waypoint: Optional[carla.Waypoint] = None):
     """
     Check if the ego vehicle is on a highway based on its location. The function considers the ego vehicle to be on a highway if:
         - it's on a road that has at least six lanes
@@ -56,13 +106,16 @@ def check_ego_on_highway(ego_vehicle_location: carla.Location, road_lane_ids: Ro
         road_lane_ids (list): A list of all road-lane identifiers of the map, where each identifier is a string
             in the format "roadId_laneId". For example, ["1_2", "2_1", "3_2"].
         world_map (carla.Map): A carla object representing the map of the world.
+        ego_waypoint (carla.Waypoint): The waypoint of the ego vehicle if it is already known,
+            e.g. from :py:meth:`.InformationManager.get_waypoint`.
 
     Returns:
         bool: True if the ego vehicle is on a highway, False otherwise.
     """
     # get waypoints of ego and its left and right lanes
     waypoints: List[carla.Waypoint] = []
-    ego_waypoint = CarlaDataProvider.get_map().get_waypoint(ego_vehicle_location)
+    if ego_waypoint is None:
+        ego_waypoint = CarlaDataProvider.get_map().get_waypoint(ego_vehicle_location)
     waypoints.append(ego_waypoint)
     left_wp = ego_waypoint.get_left_lane()
     if left_wp is not None:
@@ -72,45 +125,43 @@ def check_ego_on_highway(ego_vehicle_location: carla.Location, road_lane_ids: Ro
         waypoints.append(right_wp)
     
     # check for all waypoints if they are on a highway, in case they have different road_id's
-    for wp in waypoints:
-        ego_vehicle_road_id = wp.road_id
-        # get all lanes of the respective road
-        lanes = [rl_id[1] for rl_id in road_lane_ids if ego_vehicle_road_id == rl_id[0]]
-        # cast lane_id's to int and check for highway condition
-        lanes = [int(lane) for lane in lanes]
-        if len(lanes) >= 6 or (
-            sorted(lanes) == list(range(min(lanes), max(lanes) + 1)) and len(lanes) >= 3
-        ):
-            return True
-
-    return False
+    topology = LaneTopology.of(road_lane_ids)
+    return any(topology.is_highway_road(wp.road_id) for wp in waypoints)
 
 
 _all_lane_ids: 'list[Set[RoadLaneId]]' = []
 """List of length 1 of RoadLaneId sets to check if the lane ids are consistent"""
 
+_LANE_TOPOLOGY_CACHE_VERSION = 1
+"""Version of the format of the lane topology in the map cache."""
+
 
 # @functools.lru_cache(maxsize=1) # Faster but not safe when changing the map without changing the map object/ or clearing the cache
-@cached(cache=LRUCache(maxsize=1), key=attrgetter("name"))
-def get_all_road_lane_ids(world_map: carla.Map) -> RoadLaneIds:
+@cached(cache=LRUCache(maxsize=1), key=map_cache_key)
+def get_all_road_lane_ids(world_map: carla.Map) -> LaneTopology:
     """
     Retrieve a set of unique road and lane identifiers in the format "roadId_laneId" from the given world map.
+    
+    The result is stored in the map cache, see :py:mod:`agents.tools.map_cache`, and loaded from it
+    on later calls instead of iterating over the waypoints of the whole map.
+    Like the files of the map cache the result in memory is keyed by :py:func:`.map_cache_key`,
+    a changed map with the same name is not served the lane ids of the old one.
 
     Args:
         world_map (carla.Map): The map of the world from which road and lane identifiers are obtained.
 
     Returns:
-        set: A set containing unique road and lane identifiers in the format "roadId_laneId".
+        LaneTopology: A set containing unique road and lane identifiers in the format "roadId_laneId".
     """
-    road_lane_ids: Set[RoadLaneId] = set()
-
-    # iterate through all waypoints in the world map
-    for waypoint in world_map.generate_waypoints(1.0):
-        # extract lane and road id's
-        lane_id = waypoint.lane_id
-        road_id = waypoint.road_id
-        # add road and lane identifiers to set
-        road_lane_ids.add(RoadLaneId(road_id, lane_id))
+    cached_ids = load_map_cache("lane_topology", world_map, _LANE_TOPOLOGY_CACHE_VERSION)
+    if cached_ids is not None:
+        road_lane_ids = LaneTopology(cached_ids)
+    else:
+        # iterate through all waypoints in the world map
+        road_lane_ids = LaneTopology((waypoint.road_id, waypoint.lane_id)
+                                     for waypoint in world_map.generate_waypoints(1.0))
+        save_map_cache("lane_topology", world_map, [tuple(rl_id) for rl_id in sorted(road_lane_ids)],
+                       _LANE_TOPOLOGY_CACHE_VERSION)
 
     _all_lane_ids.append(road_lane_ids)
     if len(_all_lane_ids) > 1:
@@ -127,7 +178,11 @@ def create_city_matrix(ego_vehicle_location: carla.Location,
                        road_lane_ids: "set[RoadLaneId]",
                        world_map: carla.Map,
                        ghost: bool = False,
-                       ego_on_bad_highway_street: bool = False) -> Optional["dict[str | tuple[int, int], list[int]]"]:
+                       ego_on_bad_highway_street: bool = False,
+                       out: Optional[np.ndarray] = None,
+                       *,
+                       ego_waypoint: Optional[carla.Waypoint] = None
+                       ) -> Optional["dict[str | tuple[int, int], list[int]]"]:
     """
     Create a matrix representing the lanes around the ego vehicle.
 
@@ -138,6 +193,9 @@ def create_city_matrix(ego_vehicle_location: carla.Location,
         world_map (carla.Map): The map representing the environment.
         ghost (bool): Ghost mode when ego is exiting/entering a highway - fix a location of an imaginary vehicle on highway to correctly build matrix from this ghost perspective.
         ego_on_bad_highway_street (bool): Indicates that ego is on the right lane of a highway that is an exit/entry and accounts as another road_id
+        out (np.ndarray): Optional preallocated array with at least one row of length 8 per lane. If given,
+            the values of the returned dictionary are views of its first rows instead of lists, one row per key.
+        ego_waypoint (carla.Waypoint): The waypoint at **ego_vehicle_location** if it is already known.
 
     Returns:
         collections.OrderedDict: An ordered dictionary representing the city matrix. The keys for existing lanes are the lane IDs in the format "road_id_lane_id".
@@ -155,14 +213,13 @@ def create_city_matrix(ego_vehicle_location: carla.Location,
             }
     """
     # Get lane & road id for ego_vehicle
-    ego_vehicle_waypoint = world_map.get_waypoint(ego_vehicle_location)
+    ego_vehicle_waypoint = ego_waypoint or world_map.get_waypoint(ego_vehicle_location)
     ego_vehicle_lane_id = ego_vehicle_waypoint.lane_id
     #logger.info("ego_vehicle_lane_id: ", ego_vehilce_lane_id)
     ego_vehicle_road_id = ego_vehicle_waypoint.road_id
 
     # get all lanes of ego's road
-    lanes = sorted(rl_id[1] for rl_id in road_lane_ids if ego_vehicle_road_id == rl_id[0])
-    lanes = [int(l_id) for l_id in lanes]  # TODO: should be redundant
+    lanes = list(LaneTopology.of(road_lane_ids).lanes_of(ego_vehicle_road_id))
     
     # split lanes into directions & sort, e.g. [-2,-1,1,2] -> [[-2,-1],[2,1]]
     lanes_splitted: list[list[int]] = []
@@ -321,7 +378,17 @@ def create_city_matrix(ego_vehicle_location: carla.Location,
         logger.info("Could not infer road type to create city matrix")
 
     # Update matrix
-    if key_value_pairs:
+    if key_value_pairs and out is not None:
+        # Placeholder keys can occur twice, e.g. "No_opposing_direction"; like the dictionary use one row per key
+        key_value_pairs = list(collections.OrderedDict(key_value_pairs).items())
+        if len(key_value_pairs) > len(out):
+            logger.info("City matrix has %d lanes, but the output array has %d rows", len(key_value_pairs), len(out))
+            return None
+        # All initial rows are constant, fill the rows in-place and use them as values
+        for row, (_, values) in zip(out, key_value_pairs):
+            row.fill(values[0])
+        matrix = collections.OrderedDict((key, row) for (key, _), row in zip(key_value_pairs, out))
+    elif key_value_pairs:
         matrix = collections.OrderedDict(key_value_pairs)
     
     # Insert ego in matrix, in case ego is not entering/exiting a highway
@@ -374,27 +441,17 @@ def check_road_change(ego_vehicle_location: carla.Location, road_lane_ids: RoadL
                 break
 
     # get road_id and lanes of road in front of / behind ego vehicle
+    topology = LaneTopology.of(road_lane_ids)
     next_lanes = None
     next_road_id = None
     if next_waypoint.road_id != ego_vehicle_waypoint.road_id:
         next_road_id = next_waypoint.road_id
-        next_lanes = [
-            rl_id[1]
-            for rl_id in road_lane_ids
-            if next_road_id == rl_id[0]
-        ]
+        next_lanes = list(topology.lanes_of(next_road_id))
         
-    # get lanes of ego vehicle's road
-    our_lanes = [
-        rl_id[1]
-        for rl_id in road_lane_ids
-        if ego_vehicle_waypoint.road_id == rl_id[0]
-    ]
+    # get lanes of ego vehicle's road, both are sorted
+    our_lanes = list(topology.lanes_of(ego_vehicle_waypoint.road_id))
     
     # return next_road_id and next_lanes if they exist, otherwise return None
-    if next_lanes:
-        next_lanes.sort()
-        our_lanes.sort()
     if next_lanes == our_lanes:
         return (next_road_id, next_lanes)  # TODO: add semantics
     else:
@@ -453,7 +510,10 @@ def detect_surrounding_cars(
 
     """
     world_map = CarlaDataProvider.get_map()
-    ego_vehicle_waypoint = world_map.get_waypoint(ego_location)
+    if ghost:
+        ego_vehicle_waypoint = world_map.get_waypoint(ego_location)
+    else:
+        ego_vehicle_waypoint = InformationManager.get_waypoint(ego_vehicle, location=ego_location)
     ego_vehicle_road_id = ego_vehicle_waypoint.road_id
 
     # Get all surrounding cars in specified radius
@@ -469,7 +529,7 @@ def detect_surrounding_cars(
     _, next_lanes = check_road_change(ego_location, road_lane_ids, True, world_map)
     _, prev_lanes = check_road_change(ego_location, road_lane_ids, False, world_map)
     lanes_exist_further = False
-    lanes = [rl_id[1] for rl_id in road_lane_ids if ego_vehicle_road_id == rl_id[0]]
+    lanes = LaneTopology.of(road_lane_ids).lanes_of(ego_vehicle_road_id)
     try:
         if next_lanes and matrix:
             # lanes = [road_lane.split("_")[1] for road_lane in matrix.keys()]
@@ -540,12 +600,12 @@ def detect_surrounding_cars(
     ):
         surrounding_cars_on_highway_entryExit.append(ego_vehicle)
     
-    ego_on_highway = check_ego_on_highway(ego_location, road_lane_ids, world_map)
+    ego_on_highway = check_ego_on_highway(ego_location, road_lane_ids, world_map, ego_waypoint=ego_vehicle_waypoint)
     
     # Update matrix based on the lane and position/distance to ego vehicle of other car
     for car in surrounding_cars:
         # Get road and lane_id of other car
-        other_car_waypoint = world_map.get_waypoint(car.get_location())
+        other_car_waypoint = InformationManager.get_waypoint(car)
         other_car_lane_id = other_car_waypoint.lane_id
         other_car_road_id = other_car_waypoint.road_id
         other_car_road_lane_id = RoadLaneId(other_car_road_id, other_car_lane_id)
@@ -1531,14 +1591,14 @@ def get_all_lanes(ego_vehicle: carla.Vehicle,
         "straight": [],
         "right": [],
     }  # direction from ego perspective
-    for lane_id in road_lane_ids:  # iterate through all lanes of map
-        for road in junction_roads:  # for each road that goes into the junction
-            if road[0] == lane_id[0]:
-                if (junction_waypoints[0][0].get_junction().id == 1368) and lane_id[1] * np.sign(
-                        ego_wp.lane_id) < 0 and road[0] != 23:
-                    continue
-                else:
-                    lanes_all[road[1]].append(lane_id[1])  # append lane id
+    topology = LaneTopology.of(road_lane_ids)
+    for road in junction_roads:  # for each road that goes into the junction
+        for lane_id in topology.lanes_of(road[0]):
+            if (junction_waypoints[0][0].get_junction().id == 1368) and lane_id * np.sign(
+                    ego_wp.lane_id) < 0 and road[0] != 23:
+                continue
+            else:
+                lanes_all[road[1]].append(lane_id)  # append lane id
     
     return lanes_all, junction_roads
 
@@ -14,6 +14,7 @@ import random
 from copy import deepcopy
 
 from classes.constants import StreetType
+from classes.information_manager import InformationManager
 
 #########################################
 # general help functions:
@@ -3521,9 +3522,9 @@ def get_dist_to_lane_center(ego_vehicle, world):
 
 
 def get_speed_of_vehicle_ahead(ego_waypoint, world, max_distance=10):
-    world_map = world.get_map()
     #camera_data = camera_sensor.listen()
-    actor_locations = [(get_speed(actor), world_map.get_waypoint(actor.get_location()).transform.location) for actor in world.get_actors()]
+    actor_locations = [(get_speed(actor), InformationManager.get_waypoint(actor).transform.location)
+                       for actor in world.get_actors()]
     for i in range(1, max_distance + 1):
         next_waypoint = ego_waypoint.next(i)[0]
         for actor_speed, actor_location in actor_locations:
@@ -3533,9 +3534,9 @@ def get_speed_of_vehicle_ahead(ego_waypoint, world, max_distance=10):
             
 
 def get_speed_of_vehicle_ahead_efficient(ego_waypoint, world, max_distance=10):
-    world_map = world.get_map()
     #camera_data = camera_sensor.listen()
-    actor_locations = [(get_speed(actor), world_map.get_waypoint(actor.get_location()).transform.location) for actor in world.get_actors()]
+    actor_locations = [(get_speed(actor), InformationManager.get_waypoint(actor).transform.location)
+                       for actor in world.get_actors()]
 
     for i, actor_speed, actor_location in itertools.product(range(1, max_distance + 1), *zip(*actor_locations)):
         next_waypoint = ego_waypoint.next(i)[0]
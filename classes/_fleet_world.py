@@ -0,0 +1,682 @@
+"""
+Read-only copy of the world for the worker processes of the :py:class:`.ProcessFleet`.
+
+Only the main process talks to the simulator. For each frame it creates a :py:class:`FrameData` with
+:py:meth:`FrameCapture.capture`, a picklable summary of the actors: their transforms and velocities from the
+:py:class:`carla.WorldSnapshot`, the controls and light states of the vehicles and the states of the
+traffic lights. The :py:class:`WorldProxy` of a worker applies it to proxies of the actors, which implement
+the reading part of the :py:class:`carla.World` and :py:class:`carla.Actor` API. The map of a worker is
+a :py:class:`carla.Map` created from the OpenDRIVE content of the main process and is queried locally.
+
+Sensors spawned by the agents of a worker, e.g. the collision sensor, are local :py:class:`SensorProxy`
+objects that never receive data. Everything else that would change the world raises a :py:exc:`RuntimeError`,
+the controls of the agents are sent back to the main process as commands.
+"""
+
+from __future__ import annotations
+
+import itertools
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import carla
+
+from classes.information_manager import ActorCategory, ActorRegistry
+
+__all__ = [
+    "ActorDescription",
+    "ActorProxy",
+    "FrameCapture",
+    "FrameData",
+    "SensorProxy",
+    "TrafficLightProxy",
+    "VehicleProxy",
+    "WorldDescription",
+    "WorldProxy",
+]
+
+_TransformTuple = Tuple[float, float, float, float, float, float]
+"""x, y, z, pitch, yaw, roll"""
+_BoxTuple = Tuple[float, float, float, float, float, float, float, float, float]
+"""Location, extent and rotation (pitch, yaw, roll) of a :py:class:`carla.BoundingBox`."""
+_ControlTuple = Tuple[float, float, float, bool, bool, bool, int]
+"""throttle, steer, brake, hand_brake, reverse, manual_gear_shift, gear"""
+_ActorState = Tuple[int, float, float, float, float, float, float, float, float, float,
+                    float, float, float, float, float, float]
+"""Actor id, transform, velocity, angular velocity and acceleration"""
+_VehicleState = Tuple[int, _ControlTuple, int, float, int]
+"""Actor id, control, light state, speed limit and the id of the traffic light it is at (0 if none)."""
+
+
+class ActorDescription(NamedTuple):
+    """The parts of an actor that do not change while it exists."""
+
+    id: int
+    type_id: str
+    attributes: Dict[str, str]
+    parent_id: int
+    """Id of the parent actor, 0 if it has none."""
+    transform: _TransformTuple
+    """Initial transform, static actors keep it."""
+    bounding_box: _BoxTuple
+    trigger_volume: Optional[_BoxTuple] = None
+    """Traffic lights and signs only."""
+    traffic_light: Optional[Tuple[str, int, Tuple[int, ...], Tuple[Tuple[int, int, float], ...],
+                                  Tuple[Tuple[int, int, float], ...], Tuple[float, float, float]]] = None
+    """
+    Traffic lights only: OpenDRIVE id, pole index, ids of the group, stop waypoints and affected lane waypoints
+    as (road id, lane id, s) and the green, yellow and red time.
+    """
+
+
+class FrameData(NamedTuple):
+    """The state of the relevant actors in one frame, sent from the main process to the workers."""
+
+    frame: int
+    elapsed_seconds: float
+    delta_seconds: float
+    platform_timestamp: float
+    new_actors: List[ActorDescription]
+    """Actors that appeared since the previous frame."""
+    removed_ids: List[int]
+    """Actors that were destroyed since the previous frame."""
+    actor_states: List[_ActorState]
+    """Vehicles and walkers; the other actors are static."""
+    vehicle_states: List[_VehicleState]
+    traffic_light_states: List[Tuple[int, str, bool]]
+    """Actor id, name of the :py:class:`carla.TrafficLightState` and whether the light is frozen."""
+
+
+class WorldDescription(NamedTuple):
+    """Sent once to each worker to create its :py:class:`WorldProxy`."""
+
+    world_id: int
+    map_name: str
+    opendrive: str
+    settings: Dict[str, Any]
+    """Attributes of the :py:class:`carla.WorldSettings`."""
+    first_frame: FrameData
+
+
+def _transform_tuple(transform: carla.Transform) -> _TransformTuple:
+    location, rotation = transform.location, transform.rotation
+    return (location.x, location.y, location.z, rotation.pitch, rotation.yaw, rotation.roll)
+
+
+def _box_tuple(box: carla.BoundingBox) -> _BoxTuple:
+    location, extent, rotation = box.location, box.extent, box.rotation
+    return (location.x, location.y, location.z, extent.x, extent.y, extent.z,
+            rotation.pitch, rotation.yaw, rotation.roll)
+
+
+def _waypoint_tuples(waypoints: Iterable[carla.Waypoint]) -> Tuple[Tuple[int, int, float], ...]:
+    return tuple((waypoint.road_id, waypoint.lane_id, waypoint.s) for waypoint in waypoints)
+
+
+def _make_transform(values: Sequence[float]) -> carla.Transform:
+    return carla.Transform(carla.Location(values[0], values[1], values[2]),
+                           carla.Rotation(pitch=values[3], yaw=values[4], roll=values[5]))
+
+
+def _make_box(values: Sequence[float]) -> carla.BoundingBox:
+    box = carla.BoundingBox(carla.Location(values[0], values[1], values[2]),
+                            carla.Vector3D(values[3], values[4], values[5]))
+    box.rotation = carla.Rotation(pitch=values[6], yaw=values[7], roll=values[8])
+    return box
+
+
+def _is_relevant(type_id: str) -> bool:
+    """Actors the workers mirror: traffic participants, obstacles, traffic lights and signs."""
+    return type_id.startswith("traffic.") or ActorRegistry.categorize(type_id) is not ActorCategory.OTHER
+
+
+def _is_dynamic(type_id: str) -> bool:
+    return type_id.startswith(("vehicle.", "walker."))
+
+
+# ------------------ Main Process ------------------ #
+
+class FrameCapture:
+    """
+    Creates the :py:class:`FrameData` of the current frame in the main process.
+
+    New actors are looked up once with :py:meth:`carla.World.get_actors`; the per-frame values come from the
+    :py:class:`carla.WorldSnapshot` and from the vehicles and traffic lights, whose states the client
+    already received with the frame.
+    """
+
+    def __init__(self, world: carla.World):
+        self._world = world
+        self._known: Set[int] = set()
+        """Ids of the mirrored actors."""
+        self._ignored: Set[int] = set()
+        """Ids of actors that are not mirrored, e.g. sensors and the spectator."""
+        self._dynamic: List[int] = []
+        self._vehicles: Dict[int, carla.Vehicle] = {}
+        self._traffic_lights: Dict[int, carla.TrafficLight] = {}
+
+    def describe_world(self) -> WorldDescription:
+        """
+        The :py:class:`WorldDescription` for the workers; its first frame contains all actors.
+
+        Call it before the first :py:meth:`capture`, the later frames only contain the changes since then.
+        """
+        world_map = self._world.get_map()
+        settings = self._world.get_settings()
+        settings_dict = {name: getattr(settings, name)
+                         for name in ("synchronous_mode", "no_rendering_mode", "fixed_delta_seconds")}
+        return WorldDescription(self._world.id, world_map.name, world_map.to_opendrive(), settings_dict,
+                                self.capture())
+
+    def _describe(self, actor: carla.Actor) -> ActorDescription:
+        trigger_volume = None
+        traffic_light = None
+        if actor.type_id.startswith("traffic."):
+            trigger_volume = _box_tuple(actor.trigger_volume)
+        if isinstance(actor, carla.TrafficLight):
+            traffic_light = (actor.get_opendrive_id(), actor.get_pole_index(),
+                             tuple(light.id for light in actor.get_group_traffic_lights()),
+                             _waypoint_tuples(actor.get_stop_waypoints()),
+                             _waypoint_tuples(actor.get_affected_lane_waypoints()),
+                             (actor.get_green_time(), actor.get_yellow_time(), actor.get_red_time()))
+        parent = actor.parent
+        return ActorDescription(actor.id, actor.type_id, dict(actor.attributes), parent.id if parent else 0,
+                                _transform_tuple(actor.get_transform()), _box_tuple(actor.bounding_box),
+                                trigger_volume, traffic_light)
+
+    def capture(self) -> FrameData:
+        """The :py:class:`FrameData` of the current frame."""
+        snapshot = self._world.get_snapshot()
+        snapshot_ids = {actor_snapshot.id for actor_snapshot in snapshot}
+        new_actors: List[ActorDescription] = []
+        unseen = snapshot_ids - self._known - self._ignored
+        if unseen:
+            for actor in self._world.get_actors(list(unseen)):
+                if not _is_relevant(actor.type_id):
+                    self._ignored.add(actor.id)
+                    continue
+                new_actors.append(self._describe(actor))
+                self._known.add(actor.id)
+                if _is_dynamic(actor.type_id):
+                    self._dynamic.append(actor.id)
+                if isinstance(actor, carla.Vehicle):
+                    self._vehicles[actor.id] = actor
+                elif isinstance(actor, carla.TrafficLight):
+                    self._traffic_lights[actor.id] = actor
+        removed_ids = [actor_id for actor_id in self._known if actor_id not in snapshot_ids]
+        if removed_ids:
+            self._known.difference_update(removed_ids)
+            self._dynamic = [actor_id for actor_id in self._dynamic if actor_id in self._known]
+            for actor_id in removed_ids:
+                self._vehicles.pop(actor_id, None)
+                self._traffic_lights.pop(actor_id, None)
+        self._ignored &= snapshot_ids
+
+        actor_states: List[_ActorState] = []
+        for actor_id in self._dynamic:
+            actor_snapshot = snapshot.find(actor_id)
+            transform = actor_snapshot.get_transform()
+            location, rotation = transform.location, transform.rotation
+            velocity = actor_snapshot.get_velocity()
+            angular_velocity = actor_snapshot.get_angular_velocity()
+            acceleration = actor_snapshot.get_acceleration()
+            actor_states.append((actor_id, location.x, location.y, location.z,
+                                 rotation.pitch, rotation.yaw, rotation.roll,
+                                 velocity.x, velocity.y, velocity.z,
+                                 angular_velocity.x, angular_velocity.y, angular_velocity.z,
+                                 acceleration.x, acceleration.y, acceleration.z))
+        vehicle_states: List[_VehicleState] = []
+        for actor_id, vehicle in self._vehicles.items():
+            control = vehicle.get_control()
+            traffic_light = vehicle.get_traffic_light()
+            vehicle_states.append((actor_id,
+                                   (control.throttle, control.steer, control.brake, control.hand_brake,
+                                    control.reverse, control.manual_gear_shift, control.gear),
+                                   int(vehicle.get_light_state()), vehicle.get_speed_limit(),
+                                   traffic_light.id if traffic_light is not None else 0))
+        traffic_light_states = [(actor_id, traffic_light.state.name, traffic_light.is_frozen())
+                                for actor_id, traffic_light in self._traffic_lights.items()]
+        timestamp = snapshot.timestamp
+        return FrameData(snapshot.frame, timestamp.elapsed_seconds, timestamp.delta_seconds,
+                         timestamp.platform_timestamp, new_actors, removed_ids,
+                         actor_states, vehicle_states, traffic_light_states)
+
+
+# ------------------ Worker Process ------------------ #
+
+def _read_only(*args, **kwargs):  # noqa: ARG001
+    raise RuntimeError("The world of a fleet worker is read-only, only the main process changes the simulation.")
+
+
+class ActorProxy:
+    """Read-only stand-in of a :py:class:`carla.Actor` of the main process."""
+
+    def __init__(self, world: WorldProxy, description: ActorDescription):
+        self._world = world
+        self.id = description.id
+        self.type_id = description.type_id
+        self.attributes = description.attributes
+        self._parent_id = description.parent_id
+        self.bounding_box = _make_box(description.bounding_box)
+        self.semantic_tags: List[int] = []
+        self.is_alive = True
+        self.is_active = True
+        self.is_dormant = False
+        self._state: Sequence[float] = (self.id, *description.transform, 0.0, 0.0, 0.0,
+                                        0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+    @property
+    def parent(self) -> Optional[ActorProxy]:
+        return self._world._actors.get(self._parent_id) if self._parent_id else None
+
+    def get_world(self) -> WorldProxy:
+        return self._world
+
+    def get_transform(self) -> carla.Transform:
+        return _make_transform(self._state[1:7])
+
+    def get_location(self) -> carla.Location:
+        state = self._state
+        return carla.Location(state[1], state[2], state[3])
+
+    def get_velocity(self) -> carla.Vector3D:
+        state = self._state
+        return carla.Vector3D(state[7], state[8], state[9])
+
+    def get_angular_velocity(self) -> carla.Vector3D:
+        state = self._state
+        return carla.Vector3D(state[10], state[11], state[12])
+
+    def get_acceleration(self) -> carla.Vector3D:
+        state = self._state
+        return carla.Vector3D(state[13], state[14], state[15])
+
+    destroy = set_transform = set_location = set_target_velocity = set_target_angular_velocity = _read_only
+    set_simulate_physics = set_enable_gravity = add_impulse = add_force = add_torque = _read_only
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ActorProxy) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(id={self.id}, type={self.type_id})"
+
+
+class VehicleProxy(ActorProxy):
+    """Read-only stand-in of a :py:class:`carla.Vehicle`, the agents send their controls as commands."""
+
+    def __init__(self, world: WorldProxy, description: ActorDescription):
+        super().__init__(world, description)
+        self._control: _ControlTuple = (0.0, 0.0, 0.0, False, False, False, 0)
+        self._light_state = 0
+        self._speed_limit = 30.0
+        self._traffic_light_id = 0
+
+    def get_control(self) -> carla.VehicleControl:
+        throttle, steer, brake, hand_brake, reverse, manual_gear_shift, gear = self._control
+        return carla.VehicleControl(throttle=throttle, steer=steer, brake=brake, hand_brake=hand_brake,
+                                    reverse=reverse, manual_gear_shift=manual_gear_shift, gear=gear)
+
+    def get_light_state(self) -> carla.VehicleLightState:
+        return carla.VehicleLightState(self._light_state)
+
+    def get_speed_limit(self) -> float:
+        return self._speed_limit
+
+    def get_physics_control(self) -> carla.VehiclePhysicsControl:
+        """Default values, the physics of the vehicles are not sent to the workers."""
+        return carla.VehiclePhysicsControl()
+
+    def get_traffic_light(self) -> Optional[TrafficLightProxy]:
+        return self._world._actors.get(self._traffic_light_id) if self._traffic_light_id else None  # type: ignore[return-value]
+
+    def get_traffic_light_state(self) -> carla.TrafficLightState:
+        traffic_light = self.get_traffic_light()
+        return traffic_light.state if traffic_light is not None else carla.TrafficLightState.Green
+
+    def is_at_traffic_light(self) -> bool:
+        return self._traffic_light_id != 0
+
+    apply_control = set_light_state = set_autopilot = apply_physics_control = _read_only
+
+
+class TrafficLightProxy(ActorProxy):
+    """Read-only stand-in of a :py:class:`carla.TrafficLight`."""
+
+    def __init__(self, world: WorldProxy, description: ActorDescription):
+        super().__init__(world, description)
+        self.trigger_volume = _make_box(description.trigger_volume)  # type: ignore[arg-type]
+        (self._opendrive_id, self._pole_index, self._group_ids, self._stop_waypoints,
+         self._affected_waypoints, self._times) = description.traffic_light  # type: ignore[misc]
+        self.state = carla.TrafficLightState.Red
+        self._frozen = False
+
+    def get_state(self) -> carla.TrafficLightState:
+        return self.state
+
+    def is_frozen(self) -> bool:
+        return self._frozen
+
+    def get_opendrive_id(self) -> str:
+        return self._opendrive_id
+
+    def get_pole_index(self) -> int:
+        return self._pole_index
+
+    def get_group_traffic_lights(self) -> List[TrafficLightProxy]:
+        actors = self._world._actors
+        return [actors[light_id] for light_id in self._group_ids if light_id in actors]  # type: ignore[misc]
+
+    def _waypoints(self, waypoints: Iterable[Tuple[int, int, float]]) -> List[carla.Waypoint]:
+        world_map = self._world.get_map()
+        found = (world_map.get_waypoint_xodr(road_id, lane_id, s) for road_id, lane_id, s in waypoints)
+        return [waypoint for waypoint in found if waypoint is not None]
+
+    def get_stop_waypoints(self) -> List[carla.Waypoint]:
+        return self._waypoints(self._stop_waypoints)
+
+    def get_affected_lane_waypoints(self) -> List[carla.Waypoint]:
+        return self._waypoints(self._affected_waypoints)
+
+    def get_green_time(self) -> float:
+        return self._times[0]
+
+    def get_yellow_time(self) -> float:
+        return self._times[1]
+
+    def get_red_time(self) -> float:
+        return self._times[2]
+
+    set_state = set_green_time = set_yellow_time = set_red_time = freeze = reset_group = _read_only
+
+    def __repr__(self) -> str:
+        return f"TrafficLightProxy(id={self.id}, state={self.state})"
+
+
+class SensorProxy:
+    """
+    A sensor spawned by an agent of a worker. It exists only in the worker and never receives data.
+    """
+
+    _ids = itertools.count(-1, -1)
+
+    def __init__(self, world: WorldProxy, type_id: str, attributes: Dict[str, str],
+                 transform: carla.Transform, parent: Optional[ActorProxy]):
+        self._world = world
+        self.id = next(SensorProxy._ids)
+        self.type_id = type_id
+        self.attributes = attributes
+        self.parent = parent
+        self._transform = transform
+        self.bounding_box = carla.BoundingBox()
+        self.semantic_tags: List[int] = []
+        self.is_alive = True
+        self.is_active = True
+        self.is_dormant = False
+        self._callback: Optional[Callable[[Any], None]] = None
+
+    def get_world(self) -> WorldProxy:
+        return self._world
+
+    def get_transform(self) -> carla.Transform:
+        return self.parent.get_transform() if self.parent is not None else self._transform
+
+    def get_location(self) -> carla.Location:
+        return self.get_transform().location
+
+    def listen(self, callback: Callable[[Any], None]) -> None:
+        self._callback = callback
+
+    def stop(self) -> None:
+        self._callback = None
+
+    def is_listening(self) -> bool:
+        return self._callback is not None
+
+    def destroy(self) -> bool:
+        self._callback = None
+        was_alive, self.is_alive = self.is_alive, False
+        return was_alive
+
+    def __repr__(self) -> str:
+        return f"SensorProxy(id={self.id}, type={self.type_id})"
+
+
+class _SpectatorProxy(SensorProxy):
+    """A local spectator, moving it has no effect."""
+
+    def set_transform(self, transform: carla.Transform) -> None:
+        self._transform = transform
+
+
+class BlueprintProxy:
+    """Blueprint of a :py:class:`SensorProxy`, attributes are stored but have no effect."""
+
+    def __init__(self, blueprint_id: str):
+        self.id = blueprint_id
+        self.tags = blueprint_id.split(".")[1:]
+        self._attributes: Dict[str, str] = {}
+
+    def has_attribute(self, name: str) -> bool:
+        return name in self._attributes
+
+    def has_tag(self, tag: str) -> bool:
+        return tag in self.tags
+
+    def set_attribute(self, name: str, value: str) -> None:
+        self._attributes[name] = str(value)
+
+    def match_tags(self, wildcard_pattern: str) -> bool:
+        return any(fnmatchcase(tag, wildcard_pattern) for tag in self.tags)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(())
+
+    def __repr__(self) -> str:
+        return f"BlueprintProxy(id={self.id})"
+
+
+class _BlueprintLibraryProxy:
+
+    def find(self, blueprint_id: str) -> BlueprintProxy:
+        return BlueprintProxy(blueprint_id)
+
+    def filter(self, wildcard_pattern: str) -> List[BlueprintProxy]:  # noqa: ARG002
+        return []
+
+
+class _ActorListProxy(list):
+
+    def filter(self, wildcard_pattern: str) -> _ActorListProxy:
+        return _ActorListProxy(actor for actor in self if fnmatchcase(actor.type_id, wildcard_pattern))
+
+    def find(self, actor_id: int) -> Optional[ActorProxy]:
+        for actor in self:
+            if actor.id == actor_id:
+                return actor
+        return None
+
+
+class _DebugHelperProxy:
+    """Drawing is a no-op in a worker."""
+
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        if not name.startswith("draw_"):
+            raise AttributeError(name)
+        return lambda *_args, **_kwargs: None
+
+
+class _TimestampProxy(NamedTuple):
+    frame: int
+    elapsed_seconds: float
+    delta_seconds: float
+    platform_timestamp: float
+
+
+class _ActorSnapshotProxy:
+    __slots__ = ("_actor", "id")
+
+    def __init__(self, actor: ActorProxy):
+        self.id = actor.id
+        self._actor = actor
+
+    def get_transform(self) -> carla.Transform:
+        return self._actor.get_transform()
+
+    def get_velocity(self) -> carla.Vector3D:
+        return self._actor.get_velocity()
+
+    def get_angular_velocity(self) -> carla.Vector3D:
+        return self._actor.get_angular_velocity()
+
+    def get_acceleration(self) -> carla.Vector3D:
+        return self._actor.get_acceleration()
+
+
+class _WorldSnapshotProxy:
+    """Stand-in of a :py:class:`carla.WorldSnapshot` of the mirrored actors."""
+
+    def __init__(self, world_id: int, timestamp: _TimestampProxy, actors: Iterable[ActorProxy]):
+        self.id = world_id
+        self.timestamp = timestamp
+        self.frame = timestamp.frame
+        self._snapshots = {actor.id: _ActorSnapshotProxy(actor) for actor in actors}
+
+    def find(self, actor_id: int) -> Optional[_ActorSnapshotProxy]:
+        return self._snapshots.get(actor_id)
+
+    def has_actor(self, actor_id: int) -> bool:
+        return actor_id in self._snapshots
+
+    def __iter__(self) -> Iterator[_ActorSnapshotProxy]:
+        return iter(self._snapshots.values())
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+
+class WorldProxy:
+    """
+    Read-only stand-in of the :py:class:`carla.World` of the main process inside a worker.
+
+    Updated by :py:meth:`apply_frame`, which also calls the :py:meth:`on_tick` callbacks.
+    """
+
+    def __init__(self, description: WorldDescription):
+        self.id = description.world_id
+        self._map = carla.Map(description.map_name, description.opendrive)
+        self._settings = carla.WorldSettings()
+        for name, value in description.settings.items():
+            setattr(self._settings, name, value)
+        self._actors: Dict[int, ActorProxy] = {}
+        self._tick_callbacks: Dict[int, Callable[[_WorldSnapshotProxy], None]] = {}
+        self._callback_ids = itertools.count(1)
+        self._blueprint_library = _BlueprintLibraryProxy()
+        self._spectator = _SpectatorProxy(self, "spectator", {}, carla.Transform(), None)
+        self.debug = _DebugHelperProxy()
+        self._snapshot: _WorldSnapshotProxy = None  # type: ignore[assignment]
+        self.apply_frame(description.first_frame)
+
+    def apply_frame(self, data: FrameData) -> Tuple[List[ActorProxy], List[ActorProxy]]:
+        """
+        Updates the actors to the state of **data** and calls the :py:meth:`on_tick` callbacks.
+
+        Returns:
+            The new and the removed actors.
+        """
+        actors = self._actors
+        removed = []
+        for actor_id in data.removed_ids:
+            actor = actors.pop(actor_id, None)
+            if actor is not None:
+                actor.is_alive = False
+                removed.append(actor)
+        added = []
+        for description in data.new_actors:
+            if description.type_id.startswith("vehicle."):
+                actor_class = VehicleProxy
+            elif description.traffic_light is not None:
+                actor_class = TrafficLightProxy
+            else:
+                actor_class = ActorProxy
+            actor = actors[description.id] = actor_class(self, description)
+            added.append(actor)
+        for state in data.actor_states:
+            actors[state[0]]._state = state
+        for actor_id, control, light_state, speed_limit, traffic_light_id in data.vehicle_states:
+            vehicle: VehicleProxy = actors[actor_id]  # type: ignore[assignment]
+            vehicle._control = control
+            vehicle._light_state = light_state
+            vehicle._speed_limit = speed_limit
+            vehicle._traffic_light_id = traffic_light_id
+        for actor_id, state, frozen in data.traffic_light_states:
+            traffic_light: TrafficLightProxy = actors[actor_id]  # type: ignore[assignment]
+            traffic_light.state = getattr(carla.TrafficLightState, state)
+            traffic_light._frozen = frozen
+        timestamp = _TimestampProxy(data.frame, data.elapsed_seconds, data.delta_seconds, data.platform_timestamp)
+        self._snapshot = _WorldSnapshotProxy(self.id, timestamp, actors.values())
+        for callback in list(self._tick_callbacks.values()):
+            callback(self._snapshot)
+        return added, removed
+
+    # ---- Reading ----
+
+    def get_map(self) -> carla.Map:
+        return self._map
+
+    def get_settings(self) -> carla.WorldSettings:
+        settings = carla.WorldSettings()
+        for name in ("synchronous_mode", "no_rendering_mode", "fixed_delta_seconds"):
+            setattr(settings, name, getattr(self._settings, name))
+        return settings
+
+    def get_snapshot(self) -> _WorldSnapshotProxy:
+        return self._snapshot
+
+    def get_actors(self, actor_ids: Optional[Iterable[int]] = None) -> _ActorListProxy:
+        if actor_ids is None:
+            return _ActorListProxy(self._actors.values())
+        return _ActorListProxy(self._actors[actor_id] for actor_id in actor_ids if actor_id in self._actors)
+
+    def get_actor(self, actor_id: int) -> Optional[ActorProxy]:
+        return self._actors.get(actor_id)
+
+    def get_blueprint_library(self) -> _BlueprintLibraryProxy:
+        return self._blueprint_library
+
+    def get_spectator(self) -> _SpectatorProxy:
+        return self._spectator
+
+    def get_weather(self) -> carla.WeatherParameters:
+        return carla.WeatherParameters()
+
+    def on_tick(self, callback: Callable[[_WorldSnapshotProxy], None]) -> int:
+        callback_id = next(self._callback_ids)
+        self._tick_callbacks[callback_id] = callback
+        return callback_id
+
+    def remove_on_tick(self, callback_id: int) -> None:
+        self._tick_callbacks.pop(callback_id, None)
+
+    # ---- Changes ----
+
+    def try_spawn_actor(self, blueprint: BlueprintProxy, transform: carla.Transform,
+                        attach_to: Optional[ActorProxy] = None, *args, **kwargs) -> SensorProxy:  # noqa: ARG002
+        """Only sensors can be spawned, see :py:class:`SensorProxy`."""
+        if not blueprint.id.startswith("sensor."):
+            _read_only()
+        return SensorProxy(self, blueprint.id, dict(blueprint._attributes), transform, attach_to)
+
+    spawn_actor = try_spawn_actor
+
+    def tick(self, seconds: float = 10.0) -> int:  # noqa: ARG002
+        """The main process ticks the world, returns the current frame."""
+        return self._snapshot.frame
+
+    def wait_for_tick(self, seconds: float = 10.0) -> _WorldSnapshotProxy:  # noqa: ARG002
+        """The main process ticks the world, returns the current snapshot."""
+        return self._snapshot
+
+    apply_settings = set_weather = _read_only
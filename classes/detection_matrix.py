@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import contextlib
+import multiprocessing
 import threading
 import time
 from agents.tools.logs import logger
+from agents.tools.timings import timed
+from classes.information_manager import ActorCategory, InformationManager
 from classes._data_gathering.car_detection_matrix.informationUtils import (
+    LaneTopology,
     RoadLaneId,
     check_ego_on_highway,
     create_city_matrix,
@@ -14,43 +18,58 @@ from classes._data_gathering.car_detection_matrix.informationUtils import (
 
 from launch_tools import CarlaDataProvider
 
-import matplotlib  # noqa: ICN001
-matplotlib.use('Agg')
-import matplotlib.backends.backend_agg as agg
-import matplotlib.pyplot as plt
 import numpy as np
 import pygame
 
 import signal
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 from typing_extensions import TypedDict
 
 if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
     import carla
     from _data_gathering.car_detection_matrix.informationUtils import HighWayShape
+    import matplotlib.backends.backend_agg as agg
     from matplotlib.axes import Axes as MplAxes
 
 
-def matrix_for_actor(ego_vehicle: carla.Actor,
-                     road_lane_ids: "set[RoadLaneId]",
-                     radius: float = 100.0,
-                     highway_shape: Optional["HighWayShape"] = None):
+MATRIX_SHAPE = (8, 8)
+"""Shape of the detection matrix: (lanes, columns)."""
+
+
+def fill_matrix_for_actor(out: np.ndarray,
+                          ego_vehicle: carla.Actor,
+                          road_lane_ids: "set[RoadLaneId]",
+                          radius: float = 100.0,
+                          highway_shape: Optional["HighWayShape"] = None,
+                          *,
+                          world: Optional[carla.World] = None,
+                          world_map: Optional[carla.Map] = None) -> "list[str | RoadLaneId] | None":
     """
-    Calculates the detection matrix for the given actor.
+    Calculates the detection matrix for the given actor and writes it into **out**.
     
     Parameters:
+        out: Array of shape :py:data:`MATRIX_SHAPE` the matrix is written to. Roads with less
+            lanes, e.g. without an opposing direction, only use the first rows.
         ego_vehicle: The ego vehicle
         highway_shape (tuple): Tuple containing highway_type, number of straight highway lanes, entry waypoint tuple and/ exit waypoint tuple.
             Format: (highway_type: string, straight_lanes: int, entry_wps: ([wp,..], [wp,..]), exit_wps: ([wp,..], [wp,..]))
+        world: The world to get the other actors from. Defaults to :py:meth:`.CarlaDataProvider.get_world`.
+        world_map: The map of the world. Defaults to :py:meth:`.CarlaDataProvider.get_map`.
+    
+    Returns:
+        The lane keys of the used rows of **out**, i.e. the matrix is :python:`out[:len(lane_keys)]`,
+        or :python:`None` if the matrix could not be created. In this case the content of **out** is undefined.
     
     Note:
         :py:class:`.CarlaDataProvider` needs to be set up before calling this function.
     """
-    world = CarlaDataProvider.get_world()
-    world_map = CarlaDataProvider.get_map()
+    world = world or CarlaDataProvider.get_world()
+    world_map = world_map or CarlaDataProvider.get_map()
     ego_location = ego_vehicle.get_location()
-    #ego_waypoint = world_map.get_waypoint(ego_location)
-    ego_on_highway = check_ego_on_highway(ego_location, road_lane_ids, world_map)
+    ego_waypoint = InformationManager.get_waypoint(ego_vehicle, location=ego_location)
+    ego_on_highway = check_ego_on_highway(ego_location, road_lane_ids, world_map, ego_waypoint=ego_waypoint)
 
     #current_lanes = [rl_id[1] for rl_id in road_lane_ids if rl_id[0] == ego_waypoint.road_id]
 
@@ -61,50 +80,164 @@ def matrix_for_actor(ego_vehicle: carla.Actor,
     #    street_type = StreetType.NON_HIGHWAY_STREET
     
     # NOTE: in rare unsupported cases, the function will return None
-    matrix = create_city_matrix(ego_location, road_lane_ids, world_map)
+    # The values of the matrix are row views of out
+    matrix = create_city_matrix(ego_location, road_lane_ids, world_map, out=out, ego_waypoint=ego_waypoint)
 
-    if matrix:
-        matrix, _ = detect_surrounding_cars(
-            ego_location, ego_vehicle, matrix, road_lane_ids, world, radius, ego_on_highway, highway_shape
-        )
-    else:
+    if not matrix:
+        return None
+    detect_surrounding_cars(
+        ego_location, ego_vehicle, matrix, road_lane_ids, world, radius, ego_on_highway, highway_shape
+    )
+    return list(matrix.keys())
+
+
+def matrix_for_actor(ego_vehicle: carla.Actor,
+                     road_lane_ids: "set[RoadLaneId]",
+                     radius: float = 100.0,
+                     highway_shape: Optional["HighWayShape"] = None):
+    """
+    Calculates the detection matrix for the given actor.
+    
+    Parameters:
+        ego_vehicle: The ego vehicle
+        highway_shape (tuple): Tuple containing highway_type, number of straight highway lanes,
+            entry waypoint tuple and/ exit waypoint tuple.
+            Format: (highway_type: string, straight_lanes: int, entry_wps: ([wp,..], [wp,..]),
+            exit_wps: ([wp,..], [wp,..]))
+    
+    See Also:
+        :py:func:`fill_matrix_for_actor` to write the matrix into a preallocated array.
+    
+    Note:
+        :py:class:`.CarlaDataProvider` needs to be set up before calling this function.
+    """
+    out = np.empty(MATRIX_SHAPE, dtype=np.int8)
+    lane_keys = fill_matrix_for_actor(out, ego_vehicle, road_lane_ids, radius, highway_shape)
+    if lane_keys is None:
         return None
     # Removes the information about "left_outer_lane" by replacing it with numeric values.
     # TODO: Should possibly revert this to be more compatible with source and differentiate cases!
-    #new_matrix = dict(enumerate(matrix.values()))
-    #matrix = new_matrix
-    #return matrix
-    return dict(enumerate(matrix.values()))
+    return dict(enumerate(out[:len(lane_keys)].tolist()))
 
 
-class DetectionMatrix:
+def _jet(x: float) -> Tuple[int, int, int]:
+    """Piecewise linear approximation of matplotlib's *jet* colormap for :python:`0 <= x <= 1`."""
+    def channel(center: int) -> int:
+        return round(255 * min(max(1.5 - abs(4 * x - center), 0.0), 1.0))
+    return channel(3), channel(2), channel(1)
+
+
+class MatrixRenderer:
     """
-    Automatically create a matrix representing the lanes around the ego vehicle
-    on each :py:meth:`update` call.
+    Renders a detection matrix with :py:mod:`pygame` onto a cached surface.
+
+    The colors of the possible entries are looked up in a table that is created once
+    and the text of each value is rendered only once.
+    On each :py:meth:`draw` only the cells that changed since the last frame are redrawn.
+
+    The settings are interpreted like the ones of the matplotlib backend of :py:meth:`DetectionMatrix.render`,
+    but only the keys *cmap*, *vmin* and *vmax* of the imshow settings and *color* and *fontsize*
+    of the text settings are used. Unlike :py:meth:`matplotlib.pyplot.imshow` the color range
+    is fixed to :py:data:`VALUE_RANGE` if not given, the colors do not depend on the current values.
     """
 
-    matrix: Dict[int, List[int]]
+    SIZE = (200, 200)
+    """Size of the surface in pixels, the same as the figure of the matplotlib backend."""
+
+    VALUE_RANGE = (0, 3)
+    """Smallest and largest value of the matrix entries."""
+
+    def __init__(self,
+                 imshow_settings: Dict[str, Any],
+                 draw_values: bool,
+                 text_settings: Dict[str, Any],
+                 size: Tuple[int, int] = SIZE):
+        self.surface = pygame.Surface(size)
+        vmin = imshow_settings.get('vmin', None)
+        vmax = imshow_settings.get('vmax', None)
+        self._vmin: int = self.VALUE_RANGE[0] if vmin is None else int(vmin)
+        self._vmax: int = self.VALUE_RANGE[1] if vmax is None else int(vmax)
+        self._colors = self._color_table(imshow_settings.get('cmap', 'jet'), self._vmin, self._vmax)
+        self._glyphs: Dict[int, pygame.Surface] = {}
+        self._font: Optional[pygame.font.Font] = None
+        if draw_values:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self._font = pygame.font.Font(None, round(18 * text_settings.get('fontsize', 10) / 10))
+            self._text_color = self._to_rgb(text_settings.get('color', 'orange'))
+        self._drawn: Optional[np.ndarray] = None
+        """The matrix that is currently drawn on :py:attr:`surface`."""
+
+    @staticmethod
+    def _color_table(cmap: str, vmin: int, vmax: int) -> Dict[int, Tuple[int, int, int]]:
+        try:
+            import matplotlib  # noqa: ICN001, PLC0415 # optional
+            colormap = matplotlib.colormaps[cmap]
+        except (ImportError, AttributeError, KeyError):
+            if cmap != 'jet':
+                logger.warning("Colormap %r is not available without matplotlib, using 'jet'.", cmap)
+            colormap = None
+        table = {}
+        for value in range(vmin, vmax + 1):
+            x = (value - vmin) / (vmax - vmin) if vmax > vmin else 0.0
+            if colormap is None:
+                table[value] = _jet(x)
+            else:
+                table[value] = tuple(round(255 * c) for c in colormap(x)[:3])
+        return table
+
+    @staticmethod
+    def _to_rgb(color: Any) -> Tuple[int, int, int]:
+        try:
+            from matplotlib.colors import to_rgb  # noqa: PLC0415 # optional
+            return tuple(round(255 * c) for c in to_rgb(color))  # pyright: ignore[reportReturnType]
+        except ImportError:
+            return tuple(pygame.Color(color))[:3]  # pyright: ignore[reportReturnType]
+
+    def _glyph(self, value: int) -> pygame.Surface:
+        glyph = self._glyphs.get(value)
+        if glyph is None:
+            glyph = self._glyphs[value] = self._font.render(str(value), True, self._text_color)  # pyright: ignore[reportOptionalMemberAccess]
+        return glyph
+
+    def draw(self, matrix: np.ndarray) -> pygame.Surface:
+        """
+        Updates the cells of :py:attr:`surface` that differ from the last drawn matrix.
+
+        Returns:
+            The updated :py:attr:`surface`.
+        """
+        if self._drawn is not None and self._drawn.shape == matrix.shape:
+            changed = np.argwhere(matrix != self._drawn)
+            if len(changed) == 0:
+                return self.surface
+        else:
+            changed = np.ndindex(matrix.shape)
+        rows, columns = matrix.shape
+        width, height = self.surface.get_size()
+        for index in changed:
+            i, j = int(index[0]), int(index[1])
+            value = int(matrix[i, j])
+            left, top = j * width // columns, i * height // rows
+            cell = pygame.Rect(left, top, (j + 1) * width // columns - left, (i + 1) * height // rows - top)
+            self.surface.fill(self._colors[min(max(value, self._vmin), self._vmax)], cell)
+            if self._font is not None:
+                glyph = self._glyph(value)
+                self.surface.blit(glyph, glyph.get_rect(center=cell.center))
+        self._drawn = matrix.copy()
+        return self.surface
+
+
+class DetectionMatrix:
     """
-    A :py:class:`collections.OrderedDict`: An ordered dictionary representing the city matrix. The keys for existing lanes are the lane IDs in the format "road_id_lane_id".
-    For non-existing lanes different placeholder exist, e.g.  left_outer_lane, left_inner_lane, No_4th_lane, No_opposing_direction
-    The values indicate whether a vehicle is present: 0 - No vehicle, 1 - Ego vehicle, 3 - No road.
-    Format example:
-
-    .. code-block:: python
-
-        {
-            "left_outer_lane": [3, 3, 3, 3, 3, 3, 3, 3],
-            "left_inner_lane": [3, 3, 3, 3, 3, 3, 3, 3],
-            "1_2": [0, 0, 0, 0, 0, 0, 0, 0],
-            "1_1": [0, 0, 0, 0, 0, 0, 0, 0],
-            "1_-1": [0, 0, 0, 0, 0, 0, 0, 0],
-            "1_-2": [0, 0, 0, 0, 0, 0, 0, 0],
-            "right_inner_lane": [3, 3, 3, 3, 3, 3, 3, 3],
-            "right_outer_lane": [3, 3, 3, 3, 3, 3, 3, 3],
-        }
-
-    Attention:
-        Currently the keys are replaces by numbers.
+    Automatically create a matrix representing the lanes around the ego vehicle
+    on each :py:meth:`update` call.
+    
+    The matrix is stored in a preallocated :py:data:`numpy.int8` array of shape :py:data:`MATRIX_SHAPE`,
+    :py:meth:`to_numpy` returns a copy of it. It has one row per lane in :py:attr:`lane_keys`,
+    i.e. less than eight rows on some roads, e.g. seven on roads without an opposing direction.
+    The dictionary of :py:attr:`matrix` and the lists of :py:meth:`to_list` are only created when accessed
+    and are cached until the next update.
     """
 
     def __init__(self,
@@ -115,22 +248,120 @@ class DetectionMatrix:
         self.running = True
         """If the matrix will perform updates."""
         self._sync = True
-        self._road_lane_ids = road_lane_ids or get_all_road_lane_ids(CarlaDataProvider._map)
+        self._road_lane_ids = LaneTopology.of(road_lane_ids or get_all_road_lane_ids(CarlaDataProvider._map))
         """A set containing unique road and lane identifiers in the format "roadId_laneId"."""
-        self.matrix = None  # type: ignore[assignment]
+        # Two buffers, the update is calculated in the back buffer and then swapped to the front.
+        self._buffers = (np.zeros(MATRIX_SHAPE, dtype=np.int8), np.zeros(MATRIX_SHAPE, dtype=np.int8))
+        self._front = 0
+        self._lane_keys: "list[str | RoadLaneId] | None" = None
+        """Keys of the rows of the current matrix; :python:`None` if there is no matrix."""
+        self._back_lane_keys: "list[str | RoadLaneId] | None" = None
+        self._matrix_view: "Dict[int, List[int]] | None" = None
         self._add_signal_handler()
         self._radius = radius
+        self._renderer: Optional[MatrixRenderer] = None
+        self._renderer_key: Optional[Tuple[str, bool, str]] = None
+
+    @property
+    def matrix(self) -> Dict[int, List[int]]:
+        """
+        A dictionary representing the lanes around the ego vehicle; :python:`None` if there is no matrix.
+        The keys are the row numbers, for the original keys of the lanes see :py:attr:`lane_keys`.
+        For non-existing lanes different placeholder exist, e.g.  left_outer_lane, left_inner_lane, No_4th_lane,
+        No_opposing_direction
+        The values indicate whether a vehicle is present:
+        0 - No vehicle, 1 - Ego vehicle, 2 - Other vehicle, 3 - No road.
+        Format example of the original lanes:
+
+        .. code-block:: python
+
+            {
+                "left_outer_lane": [3, 3, 3, 3, 3, 3, 3, 3],
+                "left_inner_lane": [3, 3, 3, 3, 3, 3, 3, 3],
+                "1_2": [0, 0, 0, 0, 0, 0, 0, 0],
+                "1_1": [0, 0, 0, 0, 0, 0, 0, 0],
+                "1_-1": [0, 0, 0, 0, 0, 0, 0, 0],
+                "1_-2": [0, 0, 0, 0, 0, 0, 0, 0],
+                "right_inner_lane": [3, 3, 3, 3, 3, 3, 3, 3],
+                "right_outer_lane": [3, 3, 3, 3, 3, 3, 3, 3],
+            }
+
+        Attention:
+            Currently the keys are replaces by numbers.
+        
+        Note:
+            The dictionary is created from the array on first access after an update.
+            Prefer :py:meth:`to_numpy` in code that is executed often.
+        """
+        if self._lane_keys is None:
+            return None  # type: ignore[return-value]
+        if self._matrix_view is None:
+            self._matrix_view = dict(enumerate(self._buffers[self._front][:len(self._lane_keys)].tolist()))
+        return self._matrix_view
+
+    @matrix.setter
+    def matrix(self, value: "Dict[int, List[int]] | None"):
+        if value is None:
+            self._lane_keys = None
+            self._matrix_view = None
+            return
+        if len(value) > MATRIX_SHAPE[0]:
+            raise ValueError(f"The matrix can have at most {MATRIX_SHAPE[0]} lanes, got {len(value)}.")
+        self._buffers[self._front][:len(value)] = list(value.values())
+        self._lane_keys = list(value.keys())
+        self._matrix_view = None
 
-    def _calculate_update(self):
-        return matrix_for_actor(self._ego_vehicle, self._road_lane_ids, radius=self._radius)
+    @property
+    def lane_keys(self) -> "list[str | RoadLaneId] | None":
+        """
+        The keys of the rows of the matrix, i.e. :py:class:`RoadLaneId` for existing lanes
+        and placeholders like :python:`"left_outer_lane"` otherwise.
+        :python:`None` if there is no matrix.
+        """
+        return self._lane_keys
 
+    def lane_index(self, key: "str | RoadLaneId") -> int:
+        """
+        Returns the row of the lane **key** in the matrix.
+        
+        Raises:
+            ValueError: If there is no matrix or the lane is not part of it.
+        """
+        if self._lane_keys is None:
+            raise ValueError("The detection matrix has not been calculated.")
+        return self._lane_keys.index(key)
+
+    def _calculate_update(self) -> bool:
+        """
+        Calculates the matrix into the back buffer.
+        
+        Returns:
+            :python:`True` if the matrix could be calculated and the buffers can be swapped.
+        """
+        back = self._buffers[1 - self._front]
+        lane_keys = fill_matrix_for_actor(back, self._ego_vehicle, self._road_lane_ids, radius=self._radius)
+        if lane_keys is None:
+            self._back_lane_keys = None
+            return False
+        self._back_lane_keys = lane_keys
+        return True
+
+    def _swap_buffers(self, success: bool) -> None:
+        if success:
+            self._front = 1 - self._front
+            self._lane_keys = self._back_lane_keys
+        else:
+            self._lane_keys = None
+        self._matrix_view = None
+
+    @timed()
     def update(self) -> "Dict[int, List[int]] | None":
         """
         If the matrix is :py:attr:`running`, it will update the matrix and return it,
         otherwise returns :python:`None`.
         """
         if self.running:
-            self.matrix = self._calculate_update()
+            self._swap_buffers(self._calculate_update())
             return self.matrix
         return None
 
@@ -147,11 +378,15 @@ class DetectionMatrix:
 
     def to_numpy(self) -> "None | np.ndarray[int, Any]":
         """
-        Returns the values of :py:attr:`matrix` as a numpy array.
+        Returns a copy of the matrix as :py:data:`numpy.int8` array.
+        
+        Note:
+            The buffers of the matrix are overwritten by later updates, therefore a copy
+            is returned. With at most :py:data:`MATRIX_SHAPE` entries the copy is cheap.
         """
-        if self.matrix is None:
+        if self._lane_keys is None:
             return None
-        return np.array(self.to_list())
+        return self._buffers[self._front][:len(self._lane_keys)].copy()
 
     if TYPE_CHECKING:
         class RenderOptions(TypedDict, total=False, closed=True):
@@ -160,6 +395,7 @@ class DetectionMatrix:
             vertical: bool
             draw_values: bool
             text_settings: dict[str, Any]
+            backend: str
             draw: bool
 
     def render(self,
@@ -169,9 +405,13 @@ class DetectionMatrix:
                draw_values: bool = True,
                text_settings: dict[str, Any] = {'color': 'orange'},  # noqa: B006
                *,
+               backend: str = "pygame",
                draw: bool = True) -> None:
         """
-        Renders the matrix on the given **surface** using :py:mod:`matplotlib`.
+        Renders the matrix on the given **surface**.
+
+        The :code:`"pygame"` backend uses a :py:class:`MatrixRenderer` that keeps the drawn matrix
+        and only redraws the changed cells. The :code:`"matplotlib"` backend draws a new figure on every call.
         
         Parameters:
             display: The surface to render the matrix on.
@@ -181,6 +421,7 @@ class DetectionMatrix:
             draw_values: If the entries should be displayed as text. Defaults to :python:`True`.
             text_settings: The settings for :py:meth:`matplotlib.pyplot.text` when **draw_values**.
                 Defaults to :python:`{'color': 'orange'}`.
+            backend: Either :code:`"pygame"` or :code:`"matplotlib"`. Defaults to :code:`"pygame"`.
             draw: If the matrix should be drawn. If :code:`False`, this function will do nothing.
         """
         if not draw:
@@ -188,10 +429,31 @@ class DetectionMatrix:
         matrix = self.to_numpy()  # lanes are horizontal, OneLane: left to right, Left Lane at the top.
         if matrix is None:
             return
-        ax: MplAxes
-        fig, ax = plt.subplots(figsize=(2, 2), dpi=100)
         if vertical:
             matrix = np.rot90(matrix)  # 1st/3rd perspective
+        if backend == "matplotlib":
+            surf = self._render_matplotlib(matrix, imshow_settings, draw_values, text_settings)
+        elif backend == "pygame":
+            key = (str(imshow_settings), draw_values, str(text_settings))
+            if self._renderer is None or self._renderer_key != key:
+                self._renderer = MatrixRenderer(imshow_settings, draw_values, text_settings)
+                self._renderer_key = key
+            surf = self._renderer.draw(matrix)
+        else:
+            raise ValueError(f"Unknown backend {backend!r} for rendering the detection matrix.")
+        display.blit(surf, (220, display.get_height() - surf.get_height() - 40))
+
+    @staticmethod
+    def _render_matplotlib(matrix: np.ndarray,
+                           imshow_settings: dict[str, Any],
+                           draw_values: bool,
+                           text_settings: dict[str, Any]) -> pygame.Surface:
+        import matplotlib  # noqa: ICN001, PLC0415 # optional
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt  # noqa: PLC0415
+
+        ax: MplAxes
+        fig, ax = plt.subplots(figsize=(2, 2), dpi=100)
         ax.imshow(matrix, **imshow_settings)
         if draw_values:
             for (i, j), val in np.ndenumerate(matrix):
@@ -204,10 +466,10 @@ class DetectionMatrix:
         buffer_data: memoryview = canvas.buffer_rgba()
 
         size = canvas.get_width_height()
-        surf = pygame.image.frombuffer(buffer_data, size, "RGBA")
-
-        display.blit(surf, (220, display.get_height() - surf.get_height() - 40))
+        # copy, the buffer is released with the figure
+        surf = pygame.image.frombuffer(bytes(buffer_data), size, "RGBA")
         plt.close(fig)
+        return surf
 
     @property
     def sync(self):
@@ -261,6 +523,11 @@ class AsyncDetectionMatrix(DetectionMatrix):
     Asynchronous version of the :py:class:`DetectionMatrix`.
 
     Will calculate the matrix update in a separate thread.
+    
+    Note:
+        The worker writes into the back buffer and swaps the buffers under the :py:attr:`lock`.
+        :py:meth:`to_numpy` and :py:meth:`getMatrix` hold the lock while reading the front buffer,
+        as the worker starts to overwrite it with the update after the swap.
     """
     
     def __init__(self, ego_vehicle: carla.Actor, *,
@@ -286,9 +553,9 @@ class AsyncDetectionMatrix(DetectionMatrix):
     def _worker(self) -> None:
         while self.running:
             try:
-                new_matrix = self._calculate_update()
+                success = self._calculate_update()
                 with self.lock:
-                    self.matrix = new_matrix
+                    self._swap_buffers(success)
             except (RuntimeError, OSError) as e:
                 print(f"Fatal Error in matrix calculation: {e}")
                 raise
@@ -301,6 +568,10 @@ class AsyncDetectionMatrix(DetectionMatrix):
         with self.lock:
             return self.matrix
 
+    def to_numpy(self) -> "None | np.ndarray[int, Any]":
+        with self.lock:
+            return super().to_numpy()
+
     def start(self):
         self.running = True
         self.worker_thread.start()  # NOTE: This does not allow restart
@@ -325,3 +596,176 @@ class AsyncDetectionMatrix(DetectionMatrix):
         with contextlib.suppress(Exception):
             self.worker_thread.join(3.0)
         self.matrix = None  # type: ignore[assignment]
+
+
+class _ActorStandIn:
+    """Minimal replacement of a :py:class:`carla.Actor` in the worker process of :py:class:`ProcessDetectionMatrix`."""
+    
+    __slots__ = ("_transform", "id", "type_id")
+    
+    def __init__(self, actor_id: int, transform: carla.Transform):
+        self.id = actor_id
+        self.type_id = "vehicle"
+        self._transform = transform
+    
+    def get_location(self) -> carla.Location:
+        return self._transform.location
+    
+    def get_transform(self) -> carla.Transform:
+        return self._transform
+
+
+class _WorldStandIn:
+    """Minimal replacement of a :py:class:`carla.World` in the worker process of :py:class:`ProcessDetectionMatrix`."""
+    
+    __slots__ = ("_actors",)
+    
+    def __init__(self, actors: List[_ActorStandIn]):
+        self._actors = actors
+    
+    def get_actors(self) -> List[_ActorStandIn]:
+        return self._actors
+
+
+def _detection_matrix_worker(connection: Connection,
+                             map_name: str,
+                             opendrive: str,
+                             road_lane_ids: LaneTopology,
+                             radius: float) -> None:
+    """
+    Target of the worker process of :py:class:`ProcessDetectionMatrix`.
+    
+    Receives :code:`(frame, ego_id, ids, locations, yaw)` snapshots and answers each with
+    :code:`(frame, lane_keys, matrix)`; :python:`None` stops the worker.
+    """
+    import carla  # noqa: PLC0415
+    
+    # The worker has no connection to the simulator, the map is created from the OpenDRIVE content.
+    world_map = carla.Map(map_name, opendrive)
+    CarlaDataProvider._map = world_map  # used by the functions of informationUtils
+    out = np.empty(MATRIX_SHAPE, dtype=np.int8)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        frame, ego_id, ids, locations, yaw = message
+        actors = [_ActorStandIn(int(actor_id), carla.Transform(carla.Location(*map(float, location)),
+                                                               carla.Rotation(yaw=float(actor_yaw))))
+                  for actor_id, location, actor_yaw in zip(ids, locations, yaw)]
+        ego = next((actor for actor in actors if actor.id == ego_id), None)
+        lane_keys = None
+        if ego is not None:
+            try:
+                lane_keys = fill_matrix_for_actor(out, ego, road_lane_ids, radius,  # pyright: ignore[reportArgumentType]
+                                                  world=_WorldStandIn(actors), world_map=world_map)  # pyright: ignore[reportArgumentType]
+            except Exception as e:  # noqa: BLE001
+                logger.warning("Error in matrix calculation: %s", e)
+        connection.send((frame, lane_keys, out if lane_keys is not None else None))
+
+
+class ProcessDetectionMatrix(DetectionMatrix):
+    """
+    Version of the :py:class:`DetectionMatrix` that calculates the matrix in a separate process.
+    
+    The matrix code is pure Python, a thread like in :py:class:`AsyncDetectionMatrix` competes with
+    the agent for the GIL. Instead :py:meth:`update` sends a compact snapshot of the vehicles
+    near the ego vehicle, taken from :py:attr:`.InformationManager.actor_table`, to a worker process
+    and copies the latest result into the matrix; it never waits for the worker.
+    
+    The worker creates the map from its OpenDRIVE content and uses the cached lane topology,
+    vehicles are only represented by their location and yaw.
+    
+    Note:
+        :py:meth:`update` should be called every tick after :py:meth:`.InformationManager.global_tick`.
+    """
+    
+    def __init__(self, ego_vehicle: carla.Actor, *,
+                 road_lane_ids: Optional[Set[RoadLaneId]] = None,
+                 radius: float = 100.0,
+                 max_staleness: int = 10):
+        """
+        Parameters:
+            ego_vehicle: The ego vehicle.
+            road_lane_ids: The road and lane IDs to consider. If not provided, all will be considered.
+            radius: Vehicles in this radius are sent to the worker.
+            max_staleness: Results that are older than this number of frames are discarded,
+                i.e. the matrix is :python:`None` until a newer result arrives.
+        """
+        super().__init__(ego_vehicle, road_lane_ids, radius)
+        self._sync = False
+        self.max_staleness = max_staleness
+        """Results that are older than this number of frames are discarded."""
+        self.result_frame: Optional[int] = None
+        """Frame of the snapshot the current matrix was calculated from."""
+        self._connection: Optional[Connection] = None
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+        self._pending = False
+        """If a snapshot was sent and the result was not yet received."""
+    
+    def start(self):
+        self.running = True
+        if self._process is not None:
+            return
+        world_map = CarlaDataProvider.get_map()
+        context = multiprocessing.get_context("spawn")  # forking the carla client is not safe
+        self._connection, child_connection = context.Pipe()
+        self._process = context.Process(target=_detection_matrix_worker,
+                                        args=(child_connection, world_map.name, world_map.to_opendrive(),
+                                              self._road_lane_ids, self._radius),
+                                        name="DetectionMatrixWorker",
+                                        daemon=True)
+        self._process.start()
+        child_connection.close()
+    
+    @timed()
+    def update(self) -> "Dict[int, List[int]] | None":
+        """
+        Copies the latest result of the worker into the matrix and sends the current snapshot
+        if the worker is idle. Does not block.
+        """
+        if not self.running or self._connection is None:
+            return None
+        table = InformationManager.actor_table
+        frame = table.frame if table is not None else None
+        try:
+            if self._pending and self._connection.poll():
+                result_frame, lane_keys, result = self._connection.recv()
+                self._pending = False
+                if lane_keys is not None:
+                    self._buffers[1 - self._front][:] = result
+                    self._back_lane_keys = lane_keys
+                    self._swap_buffers(True)
+                    self.result_frame = result_frame
+            if not self._pending and table is not None:
+                indices, _ = table.index.query_radius(CarlaDataProvider.get_location(self._ego_vehicle), self._radius)
+                indices = indices[table.type_codes[indices] == ActorCategory.VEHICLE]
+                self._connection.send((frame, self._ego_vehicle.id, table.ids[indices],
+                                       table.locations[indices], table.yaw[indices]))
+                self._pending = True
+        except (BrokenPipeError, EOFError) as e:
+            logger.error("DetectionMatrix worker is not available: %s. Stopping.", e)
+            self.stop()
+            return None
+        if (self._lane_keys is not None and frame is not None and self.result_frame is not None
+                and frame - self.result_frame > self.max_staleness):
+            self._swap_buffers(False)  # too old
+        return self.matrix
+    
+    def stop(self, timeout: Optional[float] = 3.0):
+        self.running = False
+        if self._connection is not None:
+            with contextlib.suppress(OSError):
+                self._connection.send(None)
+            self._connection.close()
+            self._connection = None
+        if self._process is not None:
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+        self._pending = False
+        self.matrix = None  # prevent rendering # type: ignore[assignment]
+    
+    def __del__(self):
+        with contextlib.suppress(Exception):
+            self.stop(0.5)
@@ -0,0 +1,468 @@
+"""
+Runs multiple :py:class:`.LunaticAgent` instances in one process against one world.
+
+The :py:class:`Fleet` calculates the controls of all agents on the same frame and sends them,
+together with the vehicle light updates, to the simulator in a single
+:external_py_meth:`carla.Client.apply_batch` call.
+
+Example:
+    .. code-block:: python
+
+        fleet = Fleet(agents)
+        while fleet.agents:
+            with game_framework(agents[0]):  # ticks the world and renders the first agent
+                fleet.run_step()
+        print(fleet.stats())
+
+    Without a :py:class:`.GameFramework` call :py:meth:`Fleet.tick_world` before each :py:meth:`Fleet.run_step`.
+
+The :py:class:`ProcessFleet` distributes the agents over worker processes. Only the main process talks to
+the simulator, it sends a snapshot of each frame to the workers, whose agents read a read-only copy of the world,
+and applies the commands they send back. See :code:`examples/benchmark_process_fleet.py` for its scaling.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import multiprocessing
+import os
+import time
+import traceback
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import carla
+from typing_extensions import Self
+
+from agents.tools.logs import logger
+from classes._fleet_world import ActorProxy, FrameCapture, WorldDescription, WorldProxy
+from classes.exceptions import AgentDoneException
+from classes.information_manager import ActorCategory, ActorRegistry, InformationManager
+from launch_tools import CarlaDataProvider
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+    from agents.lunatic_agent import LunaticAgent
+
+_Command = Union["carla.command.ApplyVehicleControl", "carla.command.SetVehicleLightState"]
+
+__all__ = [
+    "Fleet",
+    "ProcessFleet",
+    "StepTimeStats",
+]
+
+
+class StepTimeStats:
+    """Accumulated durations of repeated steps in seconds."""
+
+    __slots__ = ("count", "last", "maximum", "total")
+
+    def __init__(self):
+        self.count = 0
+        """Number of measured steps"""
+        self.total = 0.0
+        """Sum of all durations"""
+        self.maximum = 0.0
+        """Longest duration"""
+        self.last = 0.0
+        """Duration of the last step"""
+
+    def add(self, duration: float) -> None:
+        """Adds the **duration** of a step."""
+        self.count += 1
+        self.total += duration
+        self.last = duration
+        self.maximum = max(duration, self.maximum)
+
+    @property
+    def mean(self) -> float:
+        """Mean duration of a step; 0 if nothing was measured."""
+        return self.total / self.count if self.count else 0.0
+
+    def __repr__(self):
+        return (f"{self.__class__.__name__}(count={self.count}, mean={self.mean * 1e3:.2f}ms, "
+                f"max={self.maximum * 1e3:.2f}ms, last={self.last * 1e3:.2f}ms)")
+
+
+def _format_stats(fleet: "Fleet | ProcessFleet", agent_stats: Iterable[Tuple[int, StepTimeStats]]) -> str:
+    lines = [f"steps: {fleet.step_stats}",
+             f"batch: {fleet.batch_stats}",
+             f"frame: {fleet.frame_stats}"]
+    lines.extend(f"{vehicle_id:>6}: {stats}" for vehicle_id, stats in agent_stats)
+    return "\n".join(lines)
+
+
+class Fleet:
+    """
+    Steps a group of :py:class:`.LunaticAgent` instances together.
+
+    Each :py:meth:`run_step` updates the global information of the :py:class:`.InformationManager` once
+    for the current frame, executes :py:meth:`.LunaticAgent.run_step` and :py:meth:`.LunaticAgent.apply_control`
+    of every agent and sends the collected :py:class:`carla.command.ApplyVehicleControl` and
+    :py:class:`carla.command.SetVehicleLightState` commands in one batch.
+
+    Agents that raise an :py:exc:`.AgentDoneException` are moved to :py:attr:`done_agents`.
+
+    Note:
+        The keyboard input is not parsed for the agents of the fleet.
+        :py:meth:`.LunaticAgent.parse_keyboard_input` can still be used on a single agent
+        before :py:meth:`run_step` is called.
+    """
+
+    def __init__(self, agents: Iterable[LunaticAgent], client: Optional[carla.Client] = None):
+        self.agents: List[LunaticAgent] = list(agents)
+        """The agents that are stepped"""
+        self.done_agents: List[LunaticAgent] = []
+        """Agents that have reached their destination"""
+        self._client = client
+        self.agent_stats: Dict[LunaticAgent, StepTimeStats] = {agent: StepTimeStats() for agent in self.agents}
+        """Durations of :py:meth:`.LunaticAgent.run_step` and :py:meth:`.LunaticAgent.apply_control` per agent"""
+        self.step_stats = StepTimeStats()
+        """Durations of the steps of all agents together, without the batch"""
+        self.batch_stats = StepTimeStats()
+        """Durations of sending the commands"""
+        self.frame_stats = StepTimeStats()
+        """Durations of the whole :py:meth:`run_step`"""
+
+    @property
+    def client(self) -> carla.Client:
+        """The client the commands are sent with, by default the one of the :py:class:`.CarlaDataProvider`."""
+        return self._client or CarlaDataProvider.get_client()
+
+    def add_agent(self, agent: LunaticAgent) -> None:
+        """Adds **agent** to the fleet, it is stepped from the next :py:meth:`run_step` on."""
+        self.agents.append(agent)
+        self.agent_stats.setdefault(agent, StepTimeStats())
+
+    @staticmethod
+    def tick_world(timeout: float = 10.0) -> int:
+        """
+        Ticks the world in synchronous mode or waits for the next tick otherwise.
+
+        Not needed when :py:meth:`run_step` is used inside a :py:class:`.GameFramework` context that
+        handles the ticks.
+
+        Returns:
+            The id of the new frame.
+        """
+        world = CarlaDataProvider.get_world()
+        if CarlaDataProvider.is_sync_mode():
+            frame = world.tick(timeout)
+        else:
+            frame = world.wait_for_tick(timeout).frame
+        CarlaDataProvider.on_carla_tick()
+        return frame
+
+    def run_step(self, debug: bool = False) -> Dict[LunaticAgent, carla.VehicleControl]:
+        """
+        Calculates and applies the controls of all agents for the current frame.
+
+        Returns:
+            The applied controls of the agents that performed a step.
+        """
+        frame_start = time.perf_counter()
+        commands: List[_Command] = []
+        controls = self._step_agents(debug, commands)
+        steps_end = time.perf_counter()
+        self.step_stats.add(steps_end - frame_start)
+
+        if commands:
+            self.client.apply_batch(commands)
+        self.batch_stats.add(time.perf_counter() - steps_end)
+        self.frame_stats.add(time.perf_counter() - frame_start)
+        return controls
+
+    def _step_agents(self, debug: bool, commands: List[_Command]) -> Dict[LunaticAgent, carla.VehicleControl]:
+        """Steps all agents on the current frame and appends their commands to **commands**."""
+        snapshot = CarlaDataProvider.get_world().get_snapshot()
+        InformationManager.global_tick(snapshot.frame, snapshot)
+
+        controls: Dict[LunaticAgent, carla.VehicleControl] = {}
+        done: List[LunaticAgent] = []
+        for agent in self.agents:
+            start = time.perf_counter()
+            try:
+                agent.run_step(debug)
+                agent.apply_control(commands=commands)
+            except AgentDoneException:
+                done.append(agent)
+                continue
+            finally:
+                self.agent_stats[agent].add(time.perf_counter() - start)
+            controls[agent] = agent.get_control()  # pyright: ignore[reportArgumentType]
+
+        for agent in done:
+            logger.info("Fleet: agent of %s is done.", agent._vehicle)  # pyright: ignore[reportPrivateUsage]
+            self.agents.remove(agent)
+            self.done_agents.append(agent)
+        return controls
+
+    def stats(self) -> str:
+        """Summary of the step times of the fleet and each agent."""
+        return _format_stats(self, ((agent._vehicle.id, stats)  # pyright: ignore[reportPrivateUsage]
+                                    for agent, stats in self.agent_stats.items()))
+
+    def destroy(self) -> None:
+        """Destroys all agents of the fleet."""
+        for agent in self.agents + self.done_agents:
+            agent.destroy()
+        self.agents.clear()
+        self.done_agents.clear()
+
+
+# ------------------ Process Pool ------------------ #
+
+_EncodedCommand = Tuple[int, Union[Tuple[float, float, float, bool, bool, bool, int], int]]
+
+
+def _encode_commands(commands: List[_Command]) -> List[_EncodedCommand]:
+    """Converts the commands to tuples that can be sent between processes."""
+    encoded: List[_EncodedCommand] = []
+    for command in commands:
+        if isinstance(command, carla.command.ApplyVehicleControl):
+            control = command.control
+            encoded.append((command.actor_id, (control.throttle, control.steer, control.brake, control.hand_brake,
+                                               control.reverse, control.manual_gear_shift, control.gear)))
+        else:
+            encoded.append((command.actor_id, int(command.light_state)))
+    return encoded
+
+
+def _decode_commands(encoded: List[_EncodedCommand]) -> List[_Command]:
+    """Inverse of :py:func:`_encode_commands`."""
+    commands: List[_Command] = []
+    for actor_id, payload in encoded:
+        if isinstance(payload, tuple):
+            throttle, steer, brake, hand_brake, reverse, manual_gear_shift, gear = payload
+            control = carla.VehicleControl(throttle=throttle, steer=steer, brake=brake, hand_brake=hand_brake,
+                                           reverse=reverse, manual_gear_shift=manual_gear_shift, gear=gear)
+            commands.append(carla.command.ApplyVehicleControl(actor_id, control))
+        else:
+            commands.append(carla.command.SetVehicleLightState(actor_id, carla.VehicleLightState(payload)))
+    return commands
+
+
+def _sync_actor_pool(added: Iterable[ActorProxy], removed: Iterable[ActorProxy]) -> None:
+    """
+    Mirrors the vehicles, walkers and static obstacles of the :py:class:`.WorldProxy` of a worker in the
+    actor pool of the :py:class:`.CarlaDataProvider` and registers the new ones.
+
+    The pool of a worker process starts empty, the actors are spawned by the main process and
+    the agents of the other workers drive in it.
+    """
+    pool = CarlaDataProvider._carla_actor_pool  # pyright: ignore[reportPrivateUsage]
+    for actor in removed:
+        pool.pop(actor.id, None)
+    for actor in added:
+        if ActorRegistry.categorize(actor.type_id) is ActorCategory.OTHER:
+            continue
+        pool[actor.id] = actor
+        with contextlib.suppress(KeyError):  # the vehicles of the agents are already registered
+            CarlaDataProvider.register_actor(actor, actor.get_transform())  # pyright: ignore[reportUnknownMemberType]
+
+
+def _fleet_worker(connection: Connection,
+                  description: WorldDescription,
+                  agent_factory: Callable[[carla.Vehicle], LunaticAgent],
+                  vehicle_ids: List[int]) -> None:
+    """
+    Target of the worker processes of :py:class:`ProcessFleet`.
+
+    The worker has no client, the agents read the :py:class:`.WorldProxy` created from **description**;
+    ticks and controls are handled by the main process. After the agents are created the number of agents is sent.
+    Receives :code:`(frame_data, debug)` and answers each with :code:`(frame, commands, done_ids, durations)`
+    or an exception; :python:`None` stops the worker.
+    """
+    try:
+        world = WorldProxy(description)
+        CarlaDataProvider.set_world(world)
+        _sync_actor_pool(world.get_actors(), ())
+        fleet = Fleet([agent_factory(world.get_actor(vehicle_id)) for vehicle_id in vehicle_ids])
+    except Exception:  # noqa: BLE001
+        connection.send(RuntimeError(f"Fleet worker could not be initialized:\n{traceback.format_exc()}"))
+        return
+    connection.send(len(fleet.agents))
+    try:
+        while True:
+            message = connection.recv()
+            if message is None:
+                break
+            frame_data, debug = message
+            stepped = list(fleet.agents)
+            commands: List[_Command] = []
+            try:
+                _sync_actor_pool(*world.apply_frame(frame_data))
+                CarlaDataProvider.on_carla_tick()
+                fleet._step_agents(debug, commands)  # noqa: SLF001
+            except Exception:  # noqa: BLE001
+                connection.send(RuntimeError(f"Error in fleet worker at frame {frame_data.frame}:\n"
+                                             f"{traceback.format_exc()}"))
+                continue
+            done_ids = [agent._vehicle.id for agent in stepped if agent not in fleet.agents]  # pyright: ignore[reportPrivateUsage]
+            durations = [(agent._vehicle.id, fleet.agent_stats[agent].last) for agent in stepped]  # pyright: ignore[reportPrivateUsage]
+            connection.send((frame_data.frame, _encode_commands(commands), done_ids, durations))
+    finally:
+        with contextlib.suppress(Exception):
+            fleet.destroy()
+
+
+class ProcessFleet:
+    """
+    Version of the :py:class:`Fleet` that steps the agents in a pool of worker processes.
+
+    The vehicles are distributed over the workers, each worker creates the agents of its vehicles with
+    **agent_factory** and keeps them, i.e. their rules and planners, for the whole run.
+    Only the main process talks to the simulator: on each :py:meth:`run_step` it sends a
+    :py:class:`.FrameData` with the transforms, velocities, controls and light states of the actors to the workers.
+    The workers have no client, they apply it to the read-only :py:class:`.WorldProxy` their agents use
+    and step them. The commands they return are converted back and applied by the main process in one batch.
+
+    Note:
+        **agent_factory** has to be picklable, e.g. a function defined at module level,
+        and should create the agent without a display, e.g. :python:`LunaticAgent(settings, vehicle=vehicle)`.
+        The agents do not exist in the main process, results are keyed by the id of the vehicle.
+
+    Note:
+        Sensors of the agents, e.g. the collision sensor, only exist in the workers and receive no data.
+        Other changes of the agents to the world, e.g. to the physics control of their vehicle, are not applied.
+        Use :code:`examples/benchmark_process_fleet.py` to compare the step time with the single process
+        :py:class:`Fleet`, it runs on the offline stand-in of :py:mod:`launch_tools.offline_carla`.
+
+    Use as a context manager or call :py:meth:`start` and :py:meth:`stop`.
+    """
+
+    def __init__(self,
+                 agent_factory: Callable[[carla.Vehicle], LunaticAgent],
+                 vehicles: Iterable[carla.Vehicle | int],
+                 processes: Optional[int] = None,
+                 *,
+                 client: Optional[carla.Client] = None):
+        """
+        Parameters:
+            agent_factory: Creates the agent for a vehicle in the worker processes.
+            vehicles: The vehicles or their ids.
+            processes: Number of worker processes, by default the number of CPUs.
+                Not more processes than vehicles are started.
+            client: Client of the main process to send the commands with,
+                by default the one of the :py:class:`.CarlaDataProvider`.
+        """
+        self.vehicle_ids: List[int] = [vehicle if isinstance(vehicle, int) else vehicle.id for vehicle in vehicles]
+        """Ids of the vehicles whose agents are stepped"""
+        self.done_vehicle_ids: List[int] = []
+        """Ids of the vehicles whose agents have reached their destination"""
+        processes = max(1, min(processes or os.cpu_count() or 1, len(self.vehicle_ids)))
+        self.shards: List[List[int]] = [self.vehicle_ids[i::processes] for i in range(processes)]
+        """The vehicle ids of each worker"""
+        self._agent_factory = agent_factory
+        self._client = client
+        self._capture: Optional[FrameCapture] = None
+        self._connections: List[Connection] = []
+        self._processes: List[multiprocessing.process.BaseProcess] = []
+        self.agent_stats: Dict[int, StepTimeStats] = {vehicle_id: StepTimeStats() for vehicle_id in self.vehicle_ids}
+        """Durations of the steps of each agent measured in the workers, by vehicle id"""
+        self.step_stats = StepTimeStats()
+        """Durations from capturing the frame to receiving the commands of all workers"""
+        self.batch_stats = StepTimeStats()
+        """Durations of sending the commands"""
+        self.frame_stats = StepTimeStats()
+        """Durations of the whole :py:meth:`run_step`"""
+
+    client = Fleet.client
+    tick_world = staticmethod(Fleet.tick_world)
+
+    def start(self) -> None:
+        """Starts the worker processes and waits until they created their agents."""
+        if self._processes:
+            return
+        self._capture = FrameCapture(CarlaDataProvider.get_world())
+        description = self._capture.describe_world()
+        context = multiprocessing.get_context("spawn")  # forking the carla client is not safe
+        for i, shard in enumerate(self.shards):
+            connection, child_connection = context.Pipe()
+            process = context.Process(target=_fleet_worker,
+                                      args=(child_connection, description, self._agent_factory, shard),
+                                      name=f"FleetWorker-{i}",
+                                      daemon=True)
+            process.start()
+            child_connection.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+        for connection in self._connections:
+            ready = connection.recv()
+            if isinstance(ready, BaseException):
+                self.stop()
+                raise ready
+
+    def run_step(self, debug: bool = False) -> Dict[int, carla.VehicleControl]:
+        """
+        Lets the workers calculate the controls of their agents for the current frame and applies them.
+
+        Returns:
+            The applied controls by vehicle id.
+
+        Raises:
+            RuntimeError: If a worker failed, the message contains its traceback.
+        """
+        if not self._processes:
+            raise RuntimeError("ProcessFleet is not started.")
+        frame_start = time.perf_counter()
+        frame_data = self._capture.capture()  # pyright: ignore[reportOptionalMemberAccess]
+        active = [connection for connection, shard in zip(self._connections, self.shards) if shard]
+        for connection in active:
+            connection.send((frame_data, debug))
+
+        commands: List[_Command] = []
+        error: Optional[BaseException] = None
+        for connection, shard in zip(self._connections, self.shards):
+            if not shard:
+                continue
+            result = connection.recv()  # receive all answers to keep the workers in sync
+            if isinstance(result, BaseException):
+                error = error or result
+                continue
+            _, encoded, done_ids, durations = result
+            commands.extend(_decode_commands(encoded))
+            for vehicle_id, duration in durations:
+                self.agent_stats[vehicle_id].add(duration)
+            for vehicle_id in done_ids:
+                logger.info("ProcessFleet: agent of vehicle %d is done.", vehicle_id)
+                shard.remove(vehicle_id)
+                self.vehicle_ids.remove(vehicle_id)
+                self.done_vehicle_ids.append(vehicle_id)
+        if error is not None:
+            raise error
+        steps_end = time.perf_counter()
+        self.step_stats.add(steps_end - frame_start)
+
+        if commands:
+            self.client.apply_batch(commands)
+        self.batch_stats.add(time.perf_counter() - steps_end)
+        self.frame_stats.add(time.perf_counter() - frame_start)
+        return {command.actor_id: command.control for command in commands
+                if isinstance(command, carla.command.ApplyVehicleControl)}
+
+    def stats(self) -> str:
+        """Summary of the step times of the fleet and each agent."""
+        return _format_stats(self, self.agent_stats.items())
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Stops the workers, they destroy their agents."""
+        for connection in self._connections:
+            with contextlib.suppress(OSError):
+                connection.send(None)
+            connection.close()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._connections.clear()
+        self._processes.clear()
+        self._capture = None
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
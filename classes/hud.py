@@ -8,11 +8,13 @@ import math
 import operator
 import os
 from datetime import timedelta
-from typing import TYPE_CHECKING, ClassVar, Iterable, List, Optional, Tuple, Union, cast
+from typing import TYPE_CHECKING, ClassVar, Dict, Iterable, List, Optional, Tuple, Union, cast
 
 import carla
 import pygame
 
+from agents.tools.timings import timings
+from classes.information_manager import InformationManager
 from classes.keyboard_controls import RSSKeyboardControl
 from classes.rss_visualization import RssStateVisualizer
 
@@ -35,10 +37,20 @@ def get_actor_display_name(actor: carla.Actor, truncate: int = 250):
 
 
 class HUD:
-    """Class for HUD text"""
+    """
+    Class for HUD text
+    
+    The info text is updated by :py:meth:`tick` at most **refresh_rate** times per second,
+    the rendered lines are reused until their text changes.
+    While the :py:data:`~agents.tools.timings.timings` are enabled it shows the slowest timed sections.
+    """
     default_font: ClassVar[str] = 'ubuntumono'
+    
+    timing_rows: ClassVar[int] = 5
+    """Number of the slowest timed sections that are shown while the :py:data:`.timings` are enabled."""
 
-    def __init__(self, width: int, height: int, world: carla.World, help_text: Optional[str] = RSSKeyboardControl.__doc__):
+    def __init__(self, width: int, height: int, world: carla.World,
+                 help_text: Optional[str] = RSSKeyboardControl.__doc__, *, refresh_rate: float = 10.0):
         """Constructor method"""
         self.dim = (width, height)
         self._world = world
@@ -57,6 +69,13 @@ class HUD:
         self.simulation_time = 0
         self._show_info = True
         self._info_text = []
+        self._refresh_interval = 1000 / refresh_rate if refresh_rate > 0 else 0
+        """Milliseconds between two updates of the info text"""
+        self._next_refresh = 0
+        self._text_surfaces: Dict[str, pygame.Surface] = {}
+        """Rendered lines of the info text"""
+        self._info_surface = pygame.Surface((220, height))
+        self._info_surface.set_alpha(100)
         self._server_clock = pygame.time.Clock()
         # RSS
         self.original_vehicle_control: Optional[carla.VehicleControl] = None
@@ -73,16 +92,24 @@ class HUD:
         self.frame = timestamp.frame
         self.simulation_time = timestamp.timestamp.elapsed_seconds
 
-    def tick(self, world: "WorldModel", clock: pygame.time.Clock, obstacles: Optional[Iterable[carla.Actor]] = None):
+    def tick(self, world: "WorldModel", clock: pygame.time.Clock, obstacles: Optional[Iterable[carla.Actor]] = None,
+             *, information: Optional[InformationManager] = None):
         """
         HUD method for every tick
         
         If obstacles is passed these will be displayed in the HUD,
         if not the closest vehicles will be displayed.
+        
+        If the **information** of the agent is passed, its :py:attr:`~.InformationManager.obstacles_nearby`
+        and :py:attr:`~.InformationManager.distances` are displayed instead of calculating the distances.
         """
         self._notifications.tick(clock)
         if not self._show_info:
             return
+        now = pygame.time.get_ticks()
+        if now < self._next_refresh:
+            return
+        self._next_refresh = now + self._refresh_interval
         player = cast("carla.Walker | carla.Vehicle", world.player)
         
         transform = player.get_transform()
@@ -94,14 +121,22 @@ class HUD:
         heading += 'E' if 179.5 > transform.rotation.yaw > 0.5 else ''
         heading += 'W' if -0.5 > transform.rotation.yaw > -179.5 else ''
         colhist = world.collision_sensor.get_collision_history()
-        collision = [colhist[x + self.frame - 200] for x in range(200)]
+        collision = [colhist.get(x + self.frame - 200, 0.0) for x in range(200)]
         max_col = max(1.0, max(collision))  # noqa: PLW3301
         collision = [x / max_col for x in collision]
-        obstacles = obstacles or world.world.get_actors().filter('vehicle.*')
         
-        # TODO: could also get ready distances from InformationManager, needs access to agent instance
-        # cached info would also prevent x from being destroyed in a different thread
-        obstacles_distances: "list[tuple[float, carla.Actor]]" = [(x.get_location().distance(location), x) for x in obstacles if x.id != world.player.id and x.is_alive]
+        obstacles_distances: "list[tuple[float, carla.Actor]]"
+        if information is not None:
+            # Already calculated and sorted by the agent; only contains the actors within the nearby distances
+            obstacles = obstacles or InformationManager.obstacles
+            number_of_obstacles = sum(1 for x in obstacles if x.id != player.id)
+            distances = information.distances
+            obstacles_distances = [(distances[x], x) for x in information.obstacles_nearby[:20]]
+        else:
+            obstacles = obstacles or world.world.get_actors().filter('vehicle.*')
+            obstacles_distances = sorted(((x.get_location().distance(location), x) for x in obstacles
+                                          if x.id != player.id and x.is_alive), key=operator.itemgetter(0))
+            number_of_obstacles = len(obstacles_distances)
 
         self._info_text: list[Union[
             str,
@@ -159,21 +194,31 @@ class HUD:
             '',
             'Collision:',
             collision,
-            '',
-            f'Number of vehicles: {len(obstacles_distances): 8d}']
+            '']
+        if timings.enabled:
+            self._info_text.append('Slowest     p50 / p95 ms')
+            for row in timings.slowest(self.timing_rows):
+                self._info_text.append(f"{row['name'][:13]:<13s}{row['p50_ms']:6.2f}{row['p95_ms']:7.2f}")
+            self._info_text.append('')
+        self._info_text.append(f'Number of vehicles: {number_of_obstacles: 8d}')
 
         if len(obstacles_distances) > 1:
             self._info_text += ['Nearby obstacles:']
 
-        for distance, vehicle in sorted(obstacles_distances, key=operator.itemgetter(0))[:20]:  # display at most 20 actors
+        for distance, vehicle in obstacles_distances[:20]:  # display at most 20 actors
             if distance > 200.0:
                 break
             vehicle_type = get_actor_display_name(vehicle, truncate=22)
             self._info_text.append(f'{distance:>4.0f}m {vehicle_type}')
+        
+        # Keep the rendered lines that are still used
+        lines = {item if isinstance(item, str) else item[0] for item in self._info_text if not isinstance(item, list)}
+        self._text_surfaces = {text: surface for text, surface in self._text_surfaces.items() if text in lines}
 
     def toggle_info(self):
         """Toggle info on or off"""
         self._show_info = not self._show_info
+        self._next_refresh = 0
 
     def notification(self, text: str, seconds: float = 2.0):
         """Notification text"""
@@ -186,9 +231,7 @@ class HUD:
     def render(self, display: pygame.Surface):
         """Render for HUD class"""
         if self._show_info:
-            info_surface = pygame.Surface((220, self.dim[1]))
-            info_surface.set_alpha(100)
-            display.blit(info_surface, (0, 0))
+            display.blit(self._info_surface, (0, 0))
             v_offset = 4
             bar_h_offset = 100
             bar_width = 106
@@ -256,7 +299,10 @@ class HUD:
                 else:
                     render_item = item
                 if render_item:  # At this point has to be a str
-                    surface = self._font_mono.render(render_item, True, text_color)
+                    surface = self._text_surfaces.get(render_item)
+                    if surface is None:
+                        surface = self._font_mono.render(render_item, True, text_color)
+                        self._text_surfaces[render_item] = surface
                     display.blit(surface, (8, v_offset))
                 v_offset += 18
 
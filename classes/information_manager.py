@@ -8,15 +8,35 @@ i.e. distill the information from the data and return high level information
 from __future__ import annotations
 
 # todo: maybe find another name for this module
+from bisect import bisect_left, bisect_right
+from enum import IntEnum
 from fnmatch import fnmatch
 from functools import wraps
-from typing import TYPE_CHECKING, Callable, ClassVar, Dict, List, NamedTuple, Optional, TypeVar, Union, cast
+from operator import attrgetter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 
 import carla
-from cachetools import cached
+import numpy as np
 from typing_extensions import Concatenate, ParamSpec, Self
 
 from agents.tools.logs import logger
+from agents.tools.timings import timed
 from classes.constants import AgentState
 from launch_tools import CarlaDataProvider
 
@@ -30,6 +50,505 @@ DRIVING_SPEED_THRESHOLD = 0.05  # m/s >= check
 STOPPED_SPEED_THRESHOLD = 0.05  # m/s < check
 
 
+class ActorCategory(IntEnum):
+    """Type codes of the actors stored in an :py:class:`ActorSnapshotTable`."""
+    
+    VEHICLE = 0
+    WALKER = 1
+    STATIC_OBSTACLE = 2
+    OTHER = 3
+
+
+class UniformGridIndex:
+    """
+    Static spatial index over a set of points that answers radius queries.
+    
+    Points are bucketed into square cells of :code:`cell_size` meters in the x-y plane;
+    the cell keys are kept sorted so that a query only needs a binary search per
+    column of cells it overlaps, i.e. O(log n + k).
+    """
+    
+    __slots__ = ("_keys", "_order", "cell_size", "locations")
+    
+    _KEY_SHIFT: ClassVar[int] = 2 ** 21
+    """Combines a cell (cx, cy) to the key cx * _KEY_SHIFT + cy; supports about +-1e6 cells per axis."""
+    
+    def __init__(self, locations: np.ndarray, cell_size: float = 25.0):
+        self.cell_size = cell_size
+        self.locations = locations
+        keys = self._cell_keys(locations[:, 0], locations[:, 1])
+        self._order = np.argsort(keys, kind="stable")
+        self._keys = keys[self._order]
+    
+    def __len__(self) -> int:
+        return len(self._order)
+    
+    def _cells(self, values: "np.ndarray | float") -> np.ndarray:
+        return np.floor(np.asarray(values) / self.cell_size).astype(np.int64)
+    
+    def _cell_keys(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return self._cells(x) * self._KEY_SHIFT + self._cells(y)
+    
+    def query_radius(self, location: carla.Location, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Indices and euclidean distances of all points that are closer than **radius**
+        to **location**.
+        
+        Returns:
+            Tuple of (indices, distances), both are unsorted.
+        """
+        if not len(self._order) or radius <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+        cx0, cx1 = self._cells((location.x - radius, location.x + radius))
+        cy0, cy1 = self._cells((location.y - radius, location.y + radius))
+        columns = np.arange(cx0, cx1 + 1, dtype=np.int64) * self._KEY_SHIFT
+        starts = np.searchsorted(self._keys, columns + cy0, side="left")
+        ends = np.searchsorted(self._keys, columns + cy1, side="right")
+        candidates = np.concatenate([self._order[a:b] for a, b in zip(starts.tolist(), ends.tolist()) if b > a]
+                                    or [np.empty(0, dtype=np.intp)])
+        distances = np.linalg.norm(self.locations[candidates] - (location.x, location.y, location.z), axis=1)
+        inside = distances < radius
+        return candidates[inside], distances[inside]
+
+
+class ActorSnapshotTable:
+    """
+    Structure-of-arrays view of the tracked obstacles for a single frame.
+    
+    Built once per frame by :py:meth:`InformationManager.global_tick` from the
+    :py:class:`carla.WorldSnapshot`, so that the agents can compute distances, filters
+    and sorts in one vectorized pass instead of querying every actor.
+    
+    Row :code:`i` of every array belongs to :code:`actors[i]`.
+    """
+    
+    __slots__ = ("actors", "extents", "frame", "ids", "index", "locations", "type_codes", "velocities", "yaw")
+    
+    frame: Optional[int]
+    actors: List[carla.Actor]
+    ids: np.ndarray
+    """int64 actor ids, shape (n,)"""
+    type_codes: np.ndarray
+    """int8 :py:class:`ActorCategory` codes, shape (n,)"""
+    locations: np.ndarray
+    """x, y, z positions, shape (n, 3)"""
+    yaw: np.ndarray
+    """yaw in degrees, shape (n,)"""
+    velocities: np.ndarray
+    """x, y, z velocities in m/s, shape (n, 3)"""
+    extents: np.ndarray
+    """Bounding box extents, shape (n, 3)"""
+    index: UniformGridIndex
+    """Spatial index over the :py:attr:`locations`"""
+    
+    def __init__(self, frame: Optional[int], actors: List[carla.Actor],
+                 ids: np.ndarray, type_codes: np.ndarray, locations: np.ndarray,
+                 yaw: np.ndarray, velocities: np.ndarray, extents: np.ndarray, cell_size: float = 25.0):
+        self.frame = frame
+        self.actors = actors
+        self.ids = ids
+        self.type_codes = type_codes
+        self.locations = locations
+        self.yaw = yaw
+        self.velocities = velocities
+        self.extents = extents
+        self.index = UniformGridIndex(locations, cell_size)
+    
+    def __len__(self) -> int:
+        return len(self.actors)
+    
+    @classmethod
+    def build(cls,
+              frame: Optional[int],
+              actors: Sequence[carla.Actor],
+              categories: Sequence[int],
+              world_snapshot: Optional[carla.WorldSnapshot],
+              extents: Dict[int, Tuple[float, float, float]],
+              cell_size: float = 25.0,
+              dead_ids: Optional[List[int]] = None) -> "ActorSnapshotTable":
+        """
+        Fills the arrays from the :py:class:`carla.ActorSnapshot` objects of **world_snapshot**.
+        
+        Actors that are not part of the snapshot, e.g. spawned during this frame, fall back
+        to the :py:class:`.CarlaDataProvider` or a direct query.
+        
+        Parameters:
+            extents: Cache of bounding box extents by actor id; missing entries are added.
+            cell_size: Cell size of the spatial :py:attr:`index`.
+            dead_ids: If given, actors that are not part of the snapshot and are not alive
+                anymore are skipped and their ids are appended to this list.
+        """
+        n = len(actors)
+        ids = np.empty(n, dtype=np.int64)
+        codes = np.empty(n, dtype=np.int8)
+        transforms = np.empty((n, 7), dtype=np.float64)  # x, y, z, yaw, vx, vy, vz
+        extent_rows = np.empty((n, 3), dtype=np.float64)
+        kept: List[carla.Actor] = []
+        for actor, category in zip(actors, categories):
+            actor_id = actor.id
+            actor_snapshot = world_snapshot.find(actor_id) if world_snapshot is not None else None
+            if actor_snapshot is not None:
+                transform = actor_snapshot.get_transform()
+                velocity = actor_snapshot.get_velocity()
+            else:
+                if dead_ids is not None and not actor.is_alive:
+                    dead_ids.append(actor_id)
+                    continue
+                transform = CarlaDataProvider.get_transform(actor) or actor.get_transform()
+                velocity = actor.get_velocity()
+            i = len(kept)
+            kept.append(actor)
+            ids[i] = actor_id
+            codes[i] = category
+            location = transform.location
+            transforms[i] = (location.x, location.y, location.z, transform.rotation.yaw,
+                             velocity.x, velocity.y, velocity.z)
+            try:
+                extent_rows[i] = extents[actor_id]
+            except KeyError:
+                extent = actor.bounding_box.extent
+                extent_rows[i] = extents[actor_id] = (extent.x, extent.y, extent.z)
+        n = len(kept)
+        return cls(frame, kept, ids[:n], codes[:n],
+                   transforms[:n, 0:3], transforms[:n, 3], transforms[:n, 4:7], extent_rows[:n], cell_size)
+    
+    @classmethod
+    def empty(cls, frame: Optional[int] = None) -> "ActorSnapshotTable":
+        return cls.build(frame, (), (), None, {})
+    
+    def distances_to(self, location: carla.Location) -> np.ndarray:
+        """Euclidean distances of all actors to **location**."""
+        return np.linalg.norm(self.locations - (location.x, location.y, location.z), axis=1)
+    
+    def select_sorted(self, indices: np.ndarray, distances: np.ndarray, mask: np.ndarray) -> List[carla.Actor]:
+        """
+        Actors of **indices** where **mask** is set, sorted by **distances**.
+        
+        **distances** and **mask** are aligned with **indices**.
+        """
+        selected = np.flatnonzero(mask)
+        selected = selected[np.argsort(distances[selected], kind="stable")]
+        return [self.actors[i] for i in indices[selected]]
+
+
+class _NearbyDistances(Dict["carla.Actor", float]):
+    """
+    Distances of actors to a location.
+    
+    Filled with the actors found by a radius query; distances to other actors
+    are only computed on access.
+    """
+    
+    def __init__(self, location: carla.Location):
+        super().__init__()
+        self._location = location
+    
+    def __missing__(self, actor: carla.Actor) -> float:
+        distance = self[actor] = actor.get_location().distance(self._location)
+        return distance
+
+
+class ActorRegistry:
+    """
+    Incremental classification of the actors in the :py:class:`.CarlaDataProvider` actor pool.
+    
+    Actors are classified once when they are added, the per category views are kept
+    in sync and the actors spawned or destroyed since the last :py:meth:`sync` are
+    available as :py:attr:`spawned` and :py:attr:`destroyed`.
+    
+    :py:meth:`sync` removes registered actors that left the pool or are dead, dead actors are
+    removed from the pool as well. Only when afterwards the size of the pool differs from the number
+    of registered actors, the ids are compared to find the new actors.
+    """
+    
+    def __init__(self):
+        self.categories: Dict[int, ActorCategory] = {}
+        """Category of the registered actors by their id"""
+        self.views: Tuple[Dict[int, carla.Actor], ...] = tuple({} for _ in ActorCategory)
+        """Registered actors by their id for each :py:class:`ActorCategory`, indexed by its value."""
+        self.extents: Dict[int, Tuple[float, float, float]] = {}
+        """Bounding box extents of the registered actors, filled by :py:meth:`ActorSnapshotTable.build`"""
+        self.spawned: List[carla.Actor] = []
+        """Actors added during the last :py:meth:`sync`"""
+        self.destroyed: List[int] = []
+        """Ids of the actors removed since the previous :py:meth:`sync`"""
+        self.version = 0
+        """Incremented on each change, to detect if the views changed."""
+        self._removed_since_sync: List[int] = []
+        self._dirty = True
+    
+    @staticmethod
+    def categorize(type_id: str) -> ActorCategory:
+        if fnmatch(type_id, "vehicle*"):
+            return ActorCategory.VEHICLE
+        if fnmatch(type_id, "walker.pedestrian*"):
+            return ActorCategory.WALKER
+        if fnmatch(type_id, InformationManager.OBSTACLE_FILTER):
+            return ActorCategory.STATIC_OBSTACLE
+        return ActorCategory.OTHER
+    
+    def add(self, actor: carla.Actor) -> None:
+        actor_id = actor.id
+        if actor_id in self.categories:
+            return
+        category = self.categorize(actor.type_id)
+        self.categories[actor_id] = category
+        self.views[category][actor_id] = actor
+        self.spawned.append(actor)
+        self.version += 1
+    
+    def remove(self, actor_id: int) -> None:
+        category = self.categories.pop(actor_id, None)
+        if category is None:
+            return
+        del self.views[category][actor_id]
+        self.extents.pop(actor_id, None)
+        self._removed_since_sync.append(actor_id)
+        self.version += 1
+    
+    def discard_dead(self, actor_ids: List[int]) -> None:
+        """Removes actors that were detected dead during the current frame and adds them to :py:attr:`destroyed`."""
+        for actor_id in actor_ids:
+            self.remove(actor_id)
+        self.destroyed.extend(self._removed_since_sync)
+        self._removed_since_sync.clear()
+    
+    def mark_dirty(self) -> None:
+        """Reconcile with the actor pool on the next :py:meth:`sync`, even if the ids did not change."""
+        self._dirty = True
+    
+    def sync(self, pool: Dict[int, carla.Actor]) -> bool:
+        """
+        Reconciles the registry with the actor **pool** and updates the frame delta
+        :py:attr:`spawned` and :py:attr:`destroyed`.
+        
+        Returns:
+            True if the registered actors changed.
+        """
+        version = self.version
+        self.spawned = []
+        for actor_id in list(self.categories):
+            actor = pool.get(actor_id)  # might be deleted in parallel
+            if actor is None or not actor.is_alive:  # pyright: ignore[reportUnnecessaryComparison]
+                if pool.pop(actor_id, None) is not None:
+                    logger.debug("Detected dead actor in the pool. %s", (actor_id, actor.type_id))  # pyright: ignore[reportOptionalMemberAccess]
+                self.remove(actor_id)
+        if self._dirty or len(pool) != len(self.categories):
+            self._dirty = False
+            # Use copy because of updates could be done by threads in parallel
+            for actor_id in pool.copy().keys() - self.categories.keys():
+                actor = pool.get(actor_id)
+                if actor is None or not actor.is_alive:  # pyright: ignore[reportUnnecessaryComparison]
+                    pool.pop(actor_id, None)
+                    continue
+                self.add(actor)
+        self.destroyed = self._removed_since_sync
+        self._removed_since_sync = []
+        return version != self.version or bool(self.destroyed)
+    
+    def clear(self) -> None:
+        self._removed_since_sync.extend(self.categories)
+        self.categories.clear()
+        for view in self.views:
+            view.clear()
+        self.extents.clear()
+        self.version += 1
+        self._dirty = True
+
+
+class TrafficLightTrigger(NamedTuple):
+    """Entry of the :py:class:`TrafficLightTriggerIndex`."""
+    
+    s: float
+    """s value of the trigger waypoint along its road."""
+    traffic_light: carla.TrafficLight
+    waypoint: carla.Waypoint
+    """The trigger waypoint, see :py:meth:`InformationManager.get_trafficlight_trigger_waypoint`."""
+
+
+class TrafficLightTriggerIndex:
+    """
+    Map-constant index of the trigger waypoints of the traffic lights.
+    
+    Maps (road id, lane id) to the triggers on that lane ordered by their s value,
+    so that the traffic lights ahead of a waypoint are found by a lookup instead of a
+    geometric check of all lights.
+    
+    The stop signs use the same index, see :py:meth:`InformationManager.get_stop_sign_trigger_index`.
+    """
+    
+    __slots__ = ("_directions", "lanes")
+    
+    def __init__(self, triggers: Iterable[Tuple[carla.TrafficLight, carla.Waypoint]]):
+        self.lanes: Dict[Tuple[int, int], List[TrafficLightTrigger]] = {}
+        """Triggers per (road id, lane id), ordered by s."""
+        
+        # Triggers of all lanes of a road with the same driving direction, keyed by (road id, lane id < 0)
+        directions: Dict[Tuple[int, bool], List[TrafficLightTrigger]] = {}
+        for traffic_light, waypoint in triggers:
+            trigger = TrafficLightTrigger(waypoint.s, traffic_light, waypoint)
+            self.lanes.setdefault((waypoint.road_id, waypoint.lane_id), []).append(trigger)
+            directions.setdefault((waypoint.road_id, waypoint.lane_id < 0), []).append(trigger)
+        for entries in self.lanes.values():
+            entries.sort(key=attrgetter("s"))
+        self._directions: Dict[Tuple[int, bool], Tuple[List[float], List[TrafficLightTrigger]]] = {}
+        for key, entries in directions.items():
+            entries.sort(key=attrgetter("s"))
+            self._directions[key] = ([trigger.s for trigger in entries], entries)
+    
+    def lights_on_lane(self, road_id: int, lane_id: int) -> List[TrafficLightTrigger]:
+        """Triggers on the given lane ordered by s."""
+        return self.lanes.get((road_id, lane_id), [])
+    
+    def lights_ahead(self, waypoint: carla.Waypoint) -> Iterator[TrafficLightTrigger]:
+        """
+        Triggers on the road of **waypoint** ahead of it in its driving direction, nearest first.
+        
+        Lanes with a negative id follow the direction of the road, i.e. increasing s,
+        lanes with a positive id the opposite one. Triggers of all lanes with the same
+        direction are considered.
+        """
+        forward = waypoint.lane_id < 0
+        entry = self._directions.get((waypoint.road_id, forward))
+        if entry is None:
+            return iter(())
+        s_values, triggers = entry
+        if forward:
+            return iter(triggers[bisect_left(s_values, waypoint.s):])
+        return reversed(triggers[:bisect_right(s_values, waypoint.s)])
+    
+    def triggers_between(self, start: Optional[carla.Waypoint], end: carla.Waypoint) -> List[TrafficLightTrigger]:
+        """
+        Triggers that are passed when driving from **start** to **end**, in driving order.
+        
+        If **start** is on another road or has another driving direction, the triggers from
+        the beginning of the road of **end** are returned. If **start** is None, only triggers
+        exactly at **end** are returned.
+        """
+        forward = end.lane_id < 0
+        entry = self._directions.get((end.road_id, forward))
+        if entry is None:
+            return []
+        s_values, triggers = entry
+        if start is None:
+            return triggers[bisect_left(s_values, end.s):bisect_right(s_values, end.s)]
+        same_road = start.road_id == end.road_id and (start.lane_id < 0) == forward
+        if forward:
+            return triggers[bisect_right(s_values, start.s) if same_road else 0:bisect_right(s_values, end.s)]
+        passed = triggers[bisect_left(s_values, end.s):bisect_left(s_values, start.s) if same_road else None]
+        passed.reverse()
+        return passed
+
+
+class RouteStop(NamedTuple):
+    """A traffic light or stop sign along a :py:class:`RouteTrafficLights` route."""
+    
+    plan_index: int
+    """Index of the first waypoint of the plan after the trigger."""
+    route_distance: float
+    """Distance of the trigger along the plan, measured from its first waypoint."""
+    actor: carla.Actor
+    """The :py:class:`carla.TrafficLight` or stop sign."""
+
+
+class RouteTrafficLights:
+    """
+    The traffic lights and stop signs along a plan of the local planner with their distance along the route.
+    
+    Computed once when the plan is set, see :py:meth:`.LunaticAgent.set_global_plan`. During the drive
+    the next light is found by advancing an index while the local planner removes the passed waypoints
+    from its queue.
+    """
+    
+    __slots__ = ("_cumulative", "_next_light", "_next_stop_sign", "_plan_indices", "complete",
+                 "stop_signs", "traffic_lights")
+    
+    def __init__(self, plan: Iterable[Tuple[carla.Waypoint, Any]], *, complete: bool = True):
+        """
+        Parameters:
+            plan: The entries of the queue of the local planner.
+            complete: Whether the plan is not extended by the planner, i.e. there are no further
+                lights after the last one.
+        """
+        self.complete = complete
+        self.traffic_lights: List[RouteStop] = []
+        self.stop_signs: List[RouteStop] = []
+        self._plan_indices: Dict[int, Tuple[int, Tuple[carla.Waypoint, Any]]] = {}
+        """Position of the entries of the plan by their id; the entries are kept to not reuse their ids."""
+        self._cumulative: List[float] = []
+        self._next_light = 0
+        self._next_stop_sign = 0
+        
+        light_index = InformationManager.get_traffic_light_trigger_index()
+        stop_sign_index = InformationManager.get_stop_sign_trigger_index()
+        previous: Optional[carla.Waypoint] = None
+        previous_location: Optional[carla.Location] = None
+        distance = 0.0
+        for i, entry in enumerate(plan):
+            waypoint = entry[0]
+            location = waypoint.transform.location
+            if previous_location is not None:
+                distance += location.distance(previous_location)
+            self._cumulative.append(distance)
+            # The entries of the queue are the objects of the plan, their id identifies the position
+            self._plan_indices[id(entry)] = (i, entry)
+            for index, stops in ((light_index, self.traffic_lights), (stop_sign_index, self.stop_signs)):
+                for trigger in index.triggers_between(previous, waypoint):
+                    # The trigger lies between the previous and this waypoint
+                    before = min(abs(waypoint.s - trigger.s), distance - (self._cumulative[i - 1] if i else 0.0))
+                    stops.append(RouteStop(i, distance - before, trigger.traffic_light))
+            previous, previous_location = waypoint, location
+    
+    def _next(self, stops: List[RouteStop], pointer: int, plan: Sequence[Tuple[carla.Waypoint, Any]],
+              location: carla.Location) -> Tuple[Optional[Tuple[Optional[carla.Actor], float]], int]:
+        if not plan:
+            return None, pointer
+        found = self._plan_indices.get(id(plan[0]))
+        if found is None or found[1] is not plan[0]:
+            # Not the plan of this route anymore
+            return None, pointer
+        plan_index = found[0]
+        while pointer < len(stops) and stops[pointer].plan_index < plan_index:
+            pointer += 1
+        if pointer == len(stops):
+            return ((None, float("inf")) if self.complete else None), pointer
+        stop = stops[pointer]
+        distance = stop.route_distance - self._cumulative[plan_index] + plan[0][0].transform.location.distance(location)
+        return (stop.actor, max(distance, 0.0)), pointer
+    
+    def next_traffic_light(self, plan: Sequence[Tuple[carla.Waypoint, Any]],
+                           location: carla.Location) -> Optional[Tuple[Optional[carla.TrafficLight], float]]:
+        """
+        The next traffic light along the route and its distance along the route from **location**.
+        
+        Parameters:
+            plan: The current queue of the local planner.
+            location: The location of the vehicle.
+        
+        Returns:
+            :python:`(None, float("inf"))` if there is no further light on a complete route;
+            :python:`None` if the route cannot answer, e.g. the plan has been replaced.
+        """
+        result, self._next_light = self._next(self.traffic_lights, self._next_light, plan, location)
+        return result  # pyright: ignore[reportReturnType]
+    
+    def next_stop_sign(self, plan: Sequence[Tuple[carla.Waypoint, Any]],
+                       location: carla.Location) -> Optional[Tuple[Optional[carla.Actor], float]]:
+        """Like :py:meth:`next_traffic_light` for the stop signs."""
+        result, self._next_stop_sign = self._next(self.stop_signs, self._next_stop_sign, plan, location)
+        return result
+
+
+class WaypointCacheInfo(NamedTuple):
+    """Statistics of the waypoint cache of the :py:class:`InformationManager` for one frame."""
+    
+    frame: Optional[int]
+    hits: int
+    """Number of waypoints returned from the cache; each saved one projection on the map."""
+    misses: int
+    """Number of waypoints that had to be calculated."""
+
+
 class InformationManager:
     """
     Tracks global information, e.g. all actors, traffic lights, etc. as well as
@@ -46,7 +565,10 @@ class InformationManager:
     
     # Instance Variables
     relevant_traffic_light: Union[carla.TrafficLight, None] = None
-    """Result of :py:meth:`.CarlaDataProvider.get_next_traffic_light`"""
+    """
+    The nearest traffic light ahead on the current road from the :py:class:`TrafficLightTriggerIndex`,
+    otherwise the result of :py:meth:`.CarlaDataProvider.get_next_traffic_light`.
+    """
     
     relevant_traffic_light_distance: float = float('inf')
     """
@@ -84,9 +606,43 @@ class InformationManager:
     obstacles: ClassVar["list[carla.Actor]"]
     """Union of :py:attr:`vehicles`, py:attr:`walkers` and py:attr:`static_obstacles`"""
     
+    _other_actors: ClassVar["list[carla.Actor]"] = []
+    _obstacle_categories: ClassVar["list[ActorCategory]"] = []
+    """Categories aligned with :py:attr:`obstacles`"""
+    
     lights_map: ClassVar["Dict[int, carla.Waypoint]"] = {}
     """Map of traffic lights to their trigger waypoints"""
     
+    actor_table: ClassVar[Optional[ActorSnapshotTable]] = None
+    """
+    Positions, velocities and extents of the :py:attr:`obstacles` for the current frame.
+    
+    Rebuilt once per frame in :py:meth:`global_tick`, :python:`None` before the first call
+    and after :py:meth:`cleanup`.
+    """
+    
+    registry: ClassVar[ActorRegistry] = ActorRegistry()
+    """
+    Classification of the actors in the :py:class:`.CarlaDataProvider` actor pool.
+    
+    Provides the actors :py:attr:`ActorRegistry.spawned` and :py:attr:`ActorRegistry.destroyed`
+    during the current frame.
+    """
+    
+    _registry_version: ClassVar[int] = -1
+    
+    _traffic_light_index: ClassVar["Tuple[int, List[carla.TrafficLight], UniformGridIndex] | None"] = None
+    """Spatial index of the map-constant traffic lights, keyed by the id of the traffic light map."""
+    
+    _traffic_light_trigger_index: ClassVar["Tuple[int, int, TrafficLightTriggerIndex] | None"] = None
+    """Trigger index of the traffic lights, keyed by the id and size of the traffic light map."""
+    
+    _stop_sign_trigger_index: ClassVar["Tuple[int, TrafficLightTriggerIndex] | None"] = None
+    """Trigger index of the stop signs, keyed by the id of the map."""
+    
+    GRID_CELL_SIZE: ClassVar[float] = 25.0
+    """Cell size in meters of the :py:class:`UniformGridIndex` used for nearby queries."""
+    
     frame: ClassVar["int | None"] = None
     """
     Last frame the InformationManager was updated.
@@ -94,6 +650,26 @@ class InformationManager:
     The current frame of the world should be passed to the global_tick method.
     """
     
+    _waypoint_cache: ClassVar[Dict[Tuple[Any, ...], Optional[carla.Waypoint]]] = {}
+    """Waypoints of the actors for :py:attr:`_waypoint_cache_frame`, see :py:meth:`get_waypoint`."""
+    
+    _waypoint_cache_frame: ClassVar[Optional[int]] = None
+    """
+    Frame of the entries in the waypoint cache.
+    
+    Advanced by a :py:meth:`carla.World.on_tick` callback as soon as the world ticks,
+    and by :py:meth:`global_tick` as a fallback.
+    """
+    
+    _waypoint_cache_callback: ClassVar[Optional[Tuple[carla.World, int]]] = None
+    """The world and the id of the on_tick callback that clears the waypoint cache."""
+    
+    _waypoint_cache_hits: ClassVar[int] = 0
+    _waypoint_cache_misses: ClassVar[int] = 0
+    
+    last_waypoint_cache_info: ClassVar[WaypointCacheInfo] = WaypointCacheInfo(None, 0, 0)
+    """Statistics of the waypoint cache for the previous frame, see :py:meth:`waypoint_cache_info`."""
+    
     # ---- Agent Specific Information ----
     
     def __init__(self, agent: "LunaticAgent", update_information: bool = True):
@@ -197,7 +773,15 @@ class InformationManager:
     
     def _get_next_traffic_light(self) -> Optional[carla.TrafficLight]:
         # TODO: Do not use the CDP but use the planned route instead.
-        self.relevant_traffic_light = CarlaDataProvider.get_next_traffic_light(self._vehicle)
+        # The nearest trigger ahead on the current road, the CDP follows the lane up to the next junction
+        current_waypoint = InformationManager.get_waypoint(self._vehicle)
+        trigger = None
+        if current_waypoint is not None:
+            trigger = next(InformationManager.get_traffic_light_trigger_index().lights_ahead(current_waypoint), None)
+        if trigger is not None:
+            self.relevant_traffic_light = trigger.traffic_light
+        else:
+            self.relevant_traffic_light = CarlaDataProvider.get_next_traffic_light(self._vehicle)
         if self.relevant_traffic_light:
             self._relevant_traffic_light_location = self.relevant_traffic_light.get_location()
             self.relevant_traffic_light_distance = self._relevant_traffic_light_location.distance(
@@ -213,10 +797,23 @@ class InformationManager:
         Set the :py:attr:`relevant_traffic_light` and :py:attr:`relevant_traffic_light_distance` if not set.
         
         Note:
-            Does not check for planned path but current route along waypoints, might not be exact.
+            If the local planner has the :py:class:`RouteTrafficLights` of its current plan,
+            the next light along the plan and the distance along the route are used.
+            Otherwise the next light on the current road is searched, which might not be exact.
             
             **This function is automatically called in :py:meth:`tick`**
         """
+        local_planner = getattr(self._agent, "_local_planner", None)  # not set during the agent's __init__
+        route_lights: Optional[RouteTrafficLights] = getattr(local_planner, "route_traffic_lights", None)
+        if route_lights is not None:
+            next_light = route_lights.next_traffic_light(local_planner.get_plan(),  # pyright: ignore[reportOptionalMemberAccess]
+                                                         self.live_info.current_location)
+            if next_light is not None:
+                self.relevant_traffic_light, self.relevant_traffic_light_distance = next_light
+                self._relevant_traffic_light_location = (self.relevant_traffic_light.get_location()  # type: ignore[assignment]
+                                                         if self.relevant_traffic_light else None)
+                return
+        
         if self.relevant_traffic_light_distance < float('inf'):
             tlight_distance = self._relevant_traffic_light_location.distance(self.live_info.current_location)
         else:
@@ -234,12 +831,13 @@ class InformationManager:
     
     # ---- Tick ----
         
+    @timed()
     def tick(self):
         """
         Tick the information manager and update the information for the corresponding agent.
         """
         snapshot = CarlaDataProvider.get_world().get_snapshot()
-        self.global_tick(snapshot.frame)
+        self.global_tick(snapshot.frame, snapshot)
         
         # --- Vehicle Information ---
         self.live_info.last_applied_controls = self._vehicle.get_control()
@@ -259,7 +857,7 @@ class InformationManager:
         self.live_info.current_location = _current_loc = CarlaDataProvider.get_location(self._vehicle)  # NOTE: is None if past run not cleaned # noqa: E501 # type: ignore
         # Only exact waypoint. TODO: update in agent
         # Comment should be visible in traceback.
-        current_waypoint = cast(carla.Waypoint, CarlaDataProvider.get_map().get_waypoint(_current_loc))  # NOTE: Might throw error if past run was not cleaned; or the world did not tick yet. # noqa: E501 # pyright: ignore[reportCallIssue, reportArgumentType]
+        current_waypoint = cast(carla.Waypoint, InformationManager.get_waypoint(self._vehicle, location=_current_loc))  # NOTE: Might throw error if past run was not cleaned; or the world did not tick yet. # noqa: E501 # pyright: ignore[reportCallIssue, reportArgumentType]
         
         # Traffic Light
         # NOTE: Must be AFTER the location update
@@ -268,48 +866,39 @@ class InformationManager:
         self.live_info.next_traffic_light_distance = self.relevant_traffic_light_distance
         
         # Nearby actors
-        self.distances: Dict[carla.Actor, float] = {}
-        
-        @cached(cache=self.distances)
-        def dist(v: carla.Actor):
-            if not v.is_alive:
-                logger.warning("Actor is not alive - this should not happen.")
-                return _v_filter_dist  # filter out
-            return v.get_location().distance(_current_loc)  # pyright: ignore[reportArgumentType]
-        
-        # Filter nearby
-        # Vehicles
+        # One radius query on the per-frame actor table, distances to further actors are lazy
+        table = cast(ActorSnapshotTable, InformationManager.actor_table)  # built by global_tick
+        self.distances: Dict[carla.Actor, float] = _NearbyDistances(_current_loc)  # pyright: ignore[reportArgumentType]
         _v_filter_dist = self._agent.config.obstacles.nearby_vehicles_max_distance
-        self.vehicles_nearby: List[carla.Vehicle] = []
-        for v in self.vehicles:
-            if v.id != self._vehicle.id and dist(v) < _v_filter_dist:
-                self.vehicles_nearby.append(v)
-        self.vehicles_nearby = sorted(self.vehicles_nearby, key=dist)
-        
-        # Static obstacles
-        self.static_obstacles_nearby: list[carla.Actor] = []
-        for o in self.static_obstacles:
-            if dist(o) < _v_filter_dist:
-                self.static_obstacles_nearby.append(o)
-        self.static_obstacles_nearby = sorted(self.static_obstacles_nearby, key=dist)
+        # in case of a different distance for walkers.
+        _w_filter_dist = self._agent.config.obstacles.nearby_walkers_max_distance
+        indices, distances = table.index.query_radius(_current_loc, max(_v_filter_dist, _w_filter_dist))  # pyright: ignore[reportArgumentType]
+        self.distances.update(zip([table.actors[i] for i in indices], distances.tolist()))
+        codes = table.type_codes[indices]
         
+        # Filter nearby
+        # Vehicles & Static obstacles
+        vehicles_mask = ((codes == ActorCategory.VEHICLE)
+                         & (table.ids[indices] != self._vehicle.id)
+                         & (distances < _v_filter_dist))
+        static_mask = (codes == ActorCategory.STATIC_OBSTACLE) & (distances < _v_filter_dist)
         # Walkers
-        _v_filter_dist = self._agent.config.obstacles.nearby_walkers_max_distance  # in case of a different distance for walkers.
-        self.walkers_nearby: list[carla.Walker] = []
-        for w in self.walkers:
-            if dist(w) < _v_filter_dist:
-                self.walkers_nearby.append(w)
+        walkers_mask = (codes == ActorCategory.WALKER) & (distances < _w_filter_dist)
         
-        self.walkers_nearby = sorted(self.walkers_nearby, key=dist)
+        self.vehicles_nearby: List[carla.Vehicle] = table.select_sorted(indices, distances, vehicles_mask)  # pyright: ignore[reportAttributeAccessIssue]
+        self.static_obstacles_nearby: List[carla.Actor] = table.select_sorted(indices, distances, static_mask)
+        self.walkers_nearby: List[carla.Walker] = table.select_sorted(indices, distances, walkers_mask)  # pyright: ignore[reportAttributeAccessIssue]
         # All actors to be tracked
-        self.obstacles_nearby = self.walkers_nearby + self.static_obstacles_nearby + self.vehicles_nearby
-        self.obstacles_nearby = sorted(self.obstacles_nearby, key=dist)
+        self.obstacles_nearby = table.select_sorted(indices, distances, vehicles_mask | static_mask | walkers_mask)
         
         # Nearby Traffic lights
         # By default this checks for 5 seconds range + 10 m
-        self.traffic_lights_nearby = [tl for tl in InformationManager.get_traffic_lights()
-                                      if dist(tl) < self._agent.config.obstacles.nearby_tlights_max_distance]
-        self.traffic_lights_nearby = sorted(self.traffic_lights_nearby, key=dist)
+        traffic_lights, tl_index = InformationManager._get_traffic_light_index()
+        tl_indices, tl_distances = tl_index.query_radius(_current_loc,  # pyright: ignore[reportArgumentType]
+                                                         self._agent.config.obstacles.nearby_tlights_max_distance)
+        order = np.argsort(tl_distances, kind="stable")
+        self.traffic_lights_nearby: List[carla.TrafficLight] = [traffic_lights[i] for i in tl_indices[order]]
+        self.distances.update(zip(self.traffic_lights_nearby, tl_distances[order].tolist()))
         
         self.check_states()
         
@@ -366,7 +955,11 @@ class InformationManager:
         traffic_lights_nearby: List[carla.TrafficLight]
         
         distances: Dict[carla.Actor, float]
-        """Distances to all actors in :py:attr:`obstacles`"""
+        """
+        Distances to the actors in :py:attr:`obstacles` and traffic lights.
+        
+        Contains the nearby actors, distances to further actors are calculated on access.
+        """
 
     # ---- Global Information ----
     
@@ -380,6 +973,62 @@ class InformationManager:
     def get_traffic_lights() -> Dict[carla.TrafficLight, carla.Transform]:
         return CarlaDataProvider._traffic_light_map
     
+    @staticmethod
+    def _get_traffic_light_index() -> Tuple[List[carla.TrafficLight], UniformGridIndex]:
+        """
+        The traffic lights and a spatial index over their locations.
+        
+        Traffic lights are map-constant, the index is only rebuilt when the traffic light map changes.
+        """
+        light_map = CarlaDataProvider._traffic_light_map
+        cached = InformationManager._traffic_light_index
+        if cached is not None and cached[0] == id(light_map) and len(cached[1]) == len(light_map):
+            return cached[1], cached[2]
+        traffic_lights = list(light_map.keys())
+        locations = np.array([(t.location.x, t.location.y, t.location.z) for t in light_map.values()],
+                             dtype=np.float64).reshape(-1, 3)
+        index = UniformGridIndex(locations, InformationManager.GRID_CELL_SIZE)
+        InformationManager._traffic_light_index = (id(light_map), traffic_lights, index)
+        return traffic_lights, index
+    
+    @staticmethod
+    def get_traffic_light_trigger_index() -> TrafficLightTriggerIndex:
+        """
+        The :py:class:`TrafficLightTriggerIndex` of the traffic lights of the current map.
+        
+        Built once from :py:attr:`.CarlaDataProvider._traffic_light_map` and rebuilt only
+        when the traffic light map changes.
+        """
+        light_map = CarlaDataProvider._traffic_light_map
+        cached = InformationManager._traffic_light_trigger_index
+        if cached is not None and cached[0] == id(light_map) and cached[1] == len(light_map):
+            return cached[2]
+        index = TrafficLightTriggerIndex(
+            (traffic_light, InformationManager.get_trafficlight_trigger_waypoint(traffic_light))
+            for traffic_light in light_map)
+        InformationManager._traffic_light_trigger_index = (id(light_map), len(light_map), index)
+        return index
+    
+    @staticmethod
+    def get_stop_sign_trigger_index() -> TrafficLightTriggerIndex:
+        """
+        A :py:class:`TrafficLightTriggerIndex` of the stop signs of the current map,
+        built once per map from the centers of their trigger volumes.
+        """
+        world_map = CarlaDataProvider.get_map()
+        cached = InformationManager._stop_sign_trigger_index
+        if cached is not None and cached[0] == id(world_map):
+            return cached[1]
+        triggers = []
+        for stop_sign in CarlaDataProvider.get_all_actors().filter("traffic.stop"):
+            trigger_location = carla.Location(stop_sign.get_transform().transform(stop_sign.trigger_volume.location))
+            trigger_wp = world_map.get_waypoint(trigger_location)
+            if trigger_wp is not None:
+                triggers.append((stop_sign, trigger_wp))
+        index = TrafficLightTriggerIndex(triggers)
+        InformationManager._stop_sign_trigger_index = (id(world_map), index)
+        return index
+    
     @staticmethod
     def get_trafficlight_trigger_waypoint(traffic_light: "carla.TrafficLight") -> carla.Waypoint:
         """
@@ -393,7 +1042,7 @@ class InformationManager:
         return trigger_wp
 
     @staticmethod
-    def global_tick(frame: Optional[int] = None) -> None:
+    def global_tick(frame: Optional[int] = None, world_snapshot: Optional[carla.WorldSnapshot] = None) -> None:
         """
         Update global information that is constant for the current tick and not agent specific.
         
@@ -402,58 +1051,167 @@ class InformationManager:
             - :py:attr:`walkers`
             - :py:attr:`static_obstacles`
             - :py:attr:`obstacles`
+            - :py:attr:`registry`
+            - :py:attr:`actor_table`
             - :py:attr:`frame`
+            - The waypoint cache of :py:meth:`get_waypoint`
         
         Parameters:
             frame: The id of the current frame. If None retrieves the id from the current
                 :py:class:`carla.WorldSnapshot`. Multiple calls with the same frame are ignored.
                 (default: None)
+            world_snapshot: The snapshot to read the actor transforms and velocities from.
+                If None retrieves the current :py:class:`carla.WorldSnapshot`.
         """
         # Assure to call this only once
-        if frame is None:
-            frame = CarlaDataProvider.get_world().get_snapshot().frame
-        else:
-            # DEBUG; TEMP
-            snap_frame = CarlaDataProvider.get_world().get_snapshot().frame
-            if frame != snap_frame:
-                logger.warning(f"Frame {frame} does not match snapshot frame {snap_frame}")
-        if frame == InformationManager.frame:
+        if frame is not None and frame == InformationManager.frame:
             return
+        if world_snapshot is None:
+            world_snapshot = CarlaDataProvider.get_world().get_snapshot()
+        if frame is None:
+            frame = world_snapshot.frame
+            if frame == InformationManager.frame:
+                return
+        elif frame != world_snapshot.frame:
+            logger.debug("Frame %s does not match snapshot frame %s", frame, world_snapshot.frame)
+        InformationManager._register_waypoint_cache_callback()
+        InformationManager._advance_waypoint_cache(frame)
         InformationManager.frame = frame
 
-        # Filter vehicles
-        InformationManager.vehicles = []
-        InformationManager.walkers = []
-        InformationManager.static_obstacles = []
-        InformationManager._other_actors: List[carla.Actor] = []
-        # For traffic lights use: InformationManager.get_traffic_lights(), which is map-constant
+        # Classify new actors, only needs work when the actor pool changed
+        registry = InformationManager.registry
+        if (registry.sync(CarlaDataProvider._carla_actor_pool)
+                or registry.version != InformationManager._registry_version):
+            InformationManager._update_category_lists()
         
-        # Use copy and check for None because of updates could be done by threads in parallel
-        for actor_id in CarlaDataProvider._carla_actor_pool.copy():
-            try:
-                actor = CarlaDataProvider._carla_actor_pool[actor_id]  # might be deleted in parallel
-                if actor is None or not actor.is_alive:  # pyright: ignore[reportUnnecessaryComparison]
-                    logger.debug("Detected dead actor in the pool. %s", (actor.id,
-                                                                         actor.type_id,
-                                                                         actor.attributes))  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
-                    del CarlaDataProvider._carla_actor_pool[actor_id]
-                    continue
-            except KeyError:
-                # actor was deleted in parallel
-                print("KeyError", actor_id)
-                continue
-            if fnmatch(actor.type_id, "vehicle*"):
-                InformationManager.vehicles.append(actor)  # pyright: ignore[reportArgumentType]]
-            elif fnmatch(actor.type_id, "walker.pedestrian*"):
-                InformationManager.walkers.append(actor)  # pyright: ignore[reportArgumentType]
-            # TODO: we could assume that these actors are mostly constant and only created in slow intervals
-            elif fnmatch(actor.type_id, InformationManager.OBSTACLE_FILTER):
-                InformationManager.static_obstacles.append(actor)
-            else:
-                InformationManager._other_actors.append(actor)
-
+        # For traffic lights use: InformationManager.get_traffic_lights(), which is map-constant
+        dead_ids: List[int] = []
+        InformationManager.actor_table = ActorSnapshotTable.build(
+            frame,
+            InformationManager.obstacles,
+            InformationManager._obstacle_categories,
+            world_snapshot,
+            registry.extents,
+            InformationManager.GRID_CELL_SIZE,
+            dead_ids,
+        )
+        if dead_ids:
+            for actor_id in dead_ids:
+                actor = CarlaDataProvider._carla_actor_pool.pop(actor_id, None)
+                if actor is not None:
+                    logger.debug("Detected dead actor in the pool. %s", (actor_id, actor.type_id))
+            registry.discard_dead(dead_ids)
+            InformationManager._update_category_lists()
+    
+    @staticmethod
+    def _update_category_lists() -> None:
+        """Rebuilds :py:attr:`vehicles`, :py:attr:`walkers`, ... from the :py:attr:`registry` views."""
+        registry = InformationManager.registry
+        InformationManager._registry_version = registry.version
+        InformationManager.vehicles = list(registry.views[ActorCategory.VEHICLE].values())  # pyright: ignore[reportAttributeAccessIssue]
+        InformationManager.walkers = list(registry.views[ActorCategory.WALKER].values())  # pyright: ignore[reportAttributeAccessIssue]
+        InformationManager.static_obstacles = list(registry.views[ActorCategory.STATIC_OBSTACLE].values())
+        InformationManager._other_actors = list(registry.views[ActorCategory.OTHER].values())
         InformationManager.obstacles = InformationManager.walkers + InformationManager.static_obstacles + InformationManager.vehicles
+        InformationManager._obstacle_categories = (
+            [ActorCategory.WALKER] * len(InformationManager.walkers)
+            + [ActorCategory.STATIC_OBSTACLE] * len(InformationManager.static_obstacles)
+            + [ActorCategory.VEHICLE] * len(InformationManager.vehicles))
+        
+    @staticmethod
+    def get_waypoint(actor: carla.Actor,
+                     lane_type: carla.LaneType = carla.LaneType.Driving,
+                     *,
+                     location: Optional[carla.Location] = None) -> Optional[carla.Waypoint]:
+        """
+        The waypoint of the **actor** projected to the road, like :py:meth:`carla.Map.get_waypoint`.
+        
+        The waypoints are cached by (actor id, lane_type, location) for the current frame
+        so that the different users, e.g. the obstacle detection and the detection matrix,
+        share one projection per actor and frame. The cache is cleared when the world ticks,
+        see :py:attr:`_waypoint_cache_frame`. Before the first :py:meth:`global_tick`
+        nothing is cached.
+        
+        Parameters:
+            actor: The actor to get the waypoint for.
+            lane_type: The lane types to project to.
+            location: The location of the actor in the current frame if it is already known.
+                By default :py:meth:`carla.Actor.get_location` is used.
+        """
+        cache = InformationManager._waypoint_cache
+        if location is None:
+            key = (actor.id, lane_type)
+        else:
+            key = (actor.id, lane_type, location.x, location.y, location.z)
+        if InformationManager._waypoint_cache_frame is not None and key in cache:
+            InformationManager._waypoint_cache_hits += 1
+            return cache[key]
+        InformationManager._waypoint_cache_misses += 1
+        waypoint = CarlaDataProvider.get_map().get_waypoint(location or actor.get_location(), lane_type=lane_type)
+        if InformationManager._waypoint_cache_frame is not None:
+            # A new frame replaces the dict, a calculation that overlaps a new frame is not stored there
+            cache[key] = waypoint
+        return waypoint
+    
+    @staticmethod
+    def waypoint_cache_info() -> WaypointCacheInfo:
+        """
+        Statistics of the waypoint cache for the current frame.
+        
+        See Also:
+            :py:attr:`last_waypoint_cache_info` for the previous frame.
+        """
+        return WaypointCacheInfo(InformationManager._waypoint_cache_frame,
+                                 InformationManager._waypoint_cache_hits,
+                                 InformationManager._waypoint_cache_misses)
+    
+    @staticmethod
+    def _reset_waypoint_cache() -> None:
+        InformationManager.last_waypoint_cache_info = InformationManager.waypoint_cache_info()
+        InformationManager._waypoint_cache = {}
+        InformationManager._waypoint_cache_hits = 0
+        InformationManager._waypoint_cache_misses = 0
+    
+    @staticmethod
+    def _advance_waypoint_cache(frame: int) -> None:
+        """Clears the waypoint cache if **frame** is a new frame."""
+        if frame != InformationManager._waypoint_cache_frame:
+            InformationManager._reset_waypoint_cache()
+            InformationManager._waypoint_cache_frame = frame
+    
+    @staticmethod
+    def _on_world_tick(world_snapshot: carla.WorldSnapshot) -> None:
+        # Called by the client when the world ticked, possibly from another thread.
+        InformationManager._advance_waypoint_cache(world_snapshot.frame)
+    
+    @staticmethod
+    def _register_waypoint_cache_callback() -> None:
+        """
+        Registers :py:meth:`_on_world_tick` at the current world, once per world.
         
+        Between :py:meth:`carla.World.tick` and :py:meth:`global_tick` the actors already moved,
+        the callback clears the cached waypoints when the frame changes and not only
+        when the information of the new frame is gathered.
+        """
+        world = CarlaDataProvider.get_world()
+        registered = InformationManager._waypoint_cache_callback
+        if world is None or (registered is not None and registered[0] is world):
+            return
+        InformationManager._remove_waypoint_cache_callback()
+        InformationManager._waypoint_cache_callback = (world, world.on_tick(InformationManager._on_world_tick))
+    
+    @staticmethod
+    def _remove_waypoint_cache_callback() -> None:
+        registered = InformationManager._waypoint_cache_callback
+        InformationManager._waypoint_cache_callback = None
+        if registered is None:
+            return
+        world, callback_id = registered
+        try:
+            world.remove_on_tick(callback_id)
+        except RuntimeError:
+            logger.debug("Could not remove the waypoint cache callback from the world.")
+    
     @staticmethod
     def get_vehicles() -> List[carla.Vehicle]:
         return InformationManager.vehicles
@@ -470,5 +1228,15 @@ class InformationManager:
         InformationManager.static_obstacles.clear()
         InformationManager.obstacles.clear()
         InformationManager._other_actors.clear()
+        InformationManager._obstacle_categories.clear()
+        InformationManager.registry.clear()
+        InformationManager._registry_version = -1
+        InformationManager._traffic_light_index = None
+        InformationManager._traffic_light_trigger_index = None
+        InformationManager._stop_sign_trigger_index = None
+        InformationManager.actor_table = None
         InformationManager.frame = None
+        InformationManager._remove_waypoint_cache_callback()
+        InformationManager._reset_waypoint_cache()
+        InformationManager._waypoint_cache_frame = None
         InformationManager._tick = 0
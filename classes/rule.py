@@ -7,6 +7,7 @@
 
 from __future__ import annotations
 
+import copy
 import inspect
 
 import random
@@ -15,6 +16,7 @@ from dataclasses import is_dataclass
 from functools import partial, update_wrapper, wraps
 from inspect import isclass
 from itertools import accumulate
+from time import perf_counter_ns
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -35,7 +37,7 @@ from typing import (
 from weakref import CallableProxyType, WeakSet, proxy
 
 import pygame
-from omegaconf import DictConfig, OmegaConf
+from omegaconf import DictConfig, OmegaConf, flag_override
 from typing_extensions import (
     Annotated,
     Concatenate,
@@ -49,7 +51,9 @@ from typing_extensions import (
     overload,
 )
 
+from agents.tools.config_creation import ConfigView
 from agents.tools.logs import logger
+from agents.tools.timings import timings
 from classes.constants import READTHEDOCS, Hazard, HazardSeverity, Phase, RulePriority, RuleResult
 from classes.evaluation_function import ConditionFunction
 from classes.exceptions import DoNotEvaluateChildRules, UnblockRuleException
@@ -85,7 +89,12 @@ class Context(CarlaDataProvider):
     """Backreference to the agent."""
     
     config: "ContextSettings"
-    """A copy of the agents config. Overwritten by the condition's settings."""
+    """
+    A copy of the agents config. Overwritten by the condition's settings.
+    
+    Note:
+        :py:attr:`.LunaticAgentSettings.live_info` is not copied but shared with the agent's config.
+    """
     
     evaluation_results: dict[Phase, Hashable]  # ambiguous wording, which result? here evaluation result
     """
@@ -149,21 +158,42 @@ class Context(CarlaDataProvider):
     
     :meta hide-value:
     """
+    
+    _phase_results_template: ClassVar[Dict[Phase, Any]] = {}
+    _hazards_info_template: ClassVar[Dict[Hazard, HazardSeverity]] = dict.fromkeys(Hazard, HazardSeverity.NONE)
 
-    def __init__(self, agent: "LunaticAgent", **kwargs: Any):
+    def __init__(self, agent: "LunaticAgent", *, reuse: Optional["Context"] = None, **kwargs: Any):
         """
         Its recommended to initialize the context object with :py:meth:`.LunaticAgent._make_context`.
+        
+        Parameters:
+            reuse: A context that is not used anymore. Its :py:attr:`phase_results`,
+                :py:attr:`detected_hazards` and :py:attr:`detected_hazards_info` containers
+                are reset and reused by this context.
         """
         self.agent = agent
         self._control = kwargs.pop("control", None)
         self._init_arguments = kwargs
-        self.phase_results = dict.fromkeys(Phase.get_phases(), Context.PHASE_NOT_EXECUTED)
+        if not Context._phase_results_template:
+            Context._phase_results_template = dict.fromkeys(Phase.get_phases(), Context.PHASE_NOT_EXECUTED)
         
-        self.config: "ContextSettings" = agent.config.copy()  # type: ignore
-        self.config._content["live_info"] = agent.live_info  # not a copy! # pyright: ignore
+        # live_info is not copied but shared with the agent's config
+        live_info = agent.live_info
+        self.config: "ContextSettings" = copy.deepcopy(agent.config, {id(live_info): live_info})  # type: ignore
         
-        self.detected_hazards = set()
-        self.detected_hazards_info = dict.fromkeys(Hazard, HazardSeverity.NONE)
+        if reuse is not None:
+            self.phase_results = reuse.phase_results
+            self.phase_results.clear()
+            self.phase_results.update(Context._phase_results_template)
+            self.detected_hazards = reuse._detected_hazards
+            self._detected_hazards.clear()
+            self.detected_hazards_info = reuse.detected_hazards_info
+            self.detected_hazards_info.clear()
+            self.detected_hazards_info.update(Context._hazards_info_template)
+        else:
+            self.phase_results = Context._phase_results_template.copy()
+            self.detected_hazards = set()
+            self.detected_hazards_info = Context._hazards_info_template.copy()
         self.__dict__.update(kwargs)
         
         # Less used attributes
@@ -306,6 +336,21 @@ def always_execute(ctx: Context) -> Literal[True]:  # pylint: disable=unused-arg
     return True
 
 
+def _merge_nodes(config: DictConfig, settings: Mapping[str, Any]) -> None:
+    """
+    Merges the settings into the top-level nodes of the config one by one.
+    
+    Unlike :py:meth:`DictConfig.merge_with` on the root only the merged nodes
+    are re-parented afterwards and not the whole config.
+    """
+    for key, value in settings.items():
+        node = config[key] if key in config else None  # missing values are not in the config
+        if isinstance(node, DictConfig) and isinstance(value, Mapping):
+            node.merge_with(value)
+        else:
+            config[key] = value
+
+
 def _use_temporary_config(func: Callable[Concatenate[_Rule,
                                                      "Context",
                                                      Optional[Dict[str, Any]], _P], _T]
@@ -313,6 +358,11 @@ def _use_temporary_config(func: Callable[Concatenate[_Rule,
     """
     During the condition evaluation the ctx.config should have the overwrite settings applied
     but not in a permanent way.
+    
+    Instead of merging the whole config into a temporary copy the rule's ``self`` node is inserted into
+    :py:attr:`Context.config` and only the top-level nodes named in the overwrite settings are merged in place.
+    These nodes are restored and ``self`` is reset to ``???`` afterwards.
+    During the evaluation the config is read-only, only the rule's :py:attr:`Rule.self_config` can be changed.
     """
     # TODO: To avoid unused argument error, consume the dict; however this might be harder to understand
     
@@ -321,20 +371,35 @@ def _use_temporary_config(func: Callable[Concatenate[_Rule,
         settings = self.overwrite_settings.copy()  # Dict with "self" : SelfConfig
         if overwrite:
             settings.update(overwrite)
+        self_config = settings.pop("self")
+        if not isinstance(self_config, DictConfig):
+            self_config = OmegaConf.create(self_config, flags={"allow_objects": True})
         
-        original_ctx_config = ctx.config
-        ctx.config["self"] = "???"  # do not merge old self_config
-        
-        temp: "ContextSettings" = OmegaConf.merge(ctx.config, settings)  # type: ignore
-        
-        OmegaConf.set_readonly(temp, True)
-        ctx.config = temp
-        self.self_config = self.overwrite_settings["self"] = ctx.config["self"]
+        config = ctx.config
+        original_nodes = OmegaConf.masked_copy(config, list(settings)) if settings else None
+        with flag_override(config, "readonly", False):
+            config["self"] = "???"  # do not merge old self_config
+            if settings:
+                _merge_nodes(config, settings)
+                ConfigView.invalidate()
+        # Like in OmegaConf.unsafe_merge the rule's self node is inserted and not copied
+        with flag_override(config, ["readonly", "no_deepcopy_set_nodes"], [False, True]):
+            config["self"] = self_config
+        self.self_config = self.overwrite_settings["self"] = config["self"]
         OmegaConf.set_readonly(self.self_config, False)  # The Rule's settings should still be dynamic; expected in overwrite
         try:
-            return func(self, ctx, overwrite, *args, **kwargs)
+            # live_info is shared with the agent's config and not a child of ctx.config
+            with flag_override(config, "readonly", True), flag_override(config.live_info, "readonly", True):
+                return func(self, ctx, overwrite, *args, **kwargs)
         finally:
-            ctx.config = original_ctx_config
+            # The rule's node is detached, assigning "???" to it would overwrite its value
+            with flag_override(config, ["readonly", "struct"], [False, False]):
+                if original_nodes is not None:
+                    for key, node in original_nodes.items():
+                        config[key] = node
+                    ConfigView.invalidate()
+                del config["self"]
+                config["self"] = "???"
     return wrapper
 
 
@@ -359,11 +424,20 @@ class _CountdownRule:
     _instances: ClassVar["WeakSet[_CountdownRule]"] = WeakSet()
     """Keep track of all Rule instances for the cooldowns"""
     
+    _state_version: ClassVar[int] = 0
+    """
+    Incremented when a change of the cooldown, :py:attr:`enabled` or :py:attr:`blocked` state can change
+    the readiness of a rule; counting down a cooldown only does so when it reaches 0.
+    
+    Allows to cache the results of :py:meth:`is_ready`, see :py:attr:`.LunaticAgent.compiled_dispatch`.
+    
+    :meta private:
+    """
+    
     _cooldown: int
     """If 0 the rule is ready to be executed."""
     
-    blocked: bool = False  # NOTE: not a property
-    """Indicates if the rule is blocked for this tick only. Is reset to False after the tick."""
+    _blocked: bool = False
 
     if TYPE_CHECKING:
         class _InitParameters(TypedDict):
@@ -376,6 +450,7 @@ class _CountdownRule:
         self._cooldown = self.start_cooldown
         self.max_cooldown = cooldown_reset_value if cooldown_reset_value is not None else self.DEFAULT_COOLDOWN_RESET
         self._enabled = enabled
+        _CountdownRule._state_version += 1
 
     def is_ready(self) -> bool:
         """Group aware check if a rule is ready."""
@@ -388,6 +463,7 @@ class _CountdownRule:
             self._cooldown = int(value)
         else:
             raise ValueError("Cooldown value must be a None or a non-negative integer.")
+        _CountdownRule._state_version += 1
 
     @property
     def cooldown(self) -> int:
@@ -399,6 +475,7 @@ class _CountdownRule:
     @cooldown.setter
     def cooldown(self, value: int):
         self._cooldown = value
+        _CountdownRule._state_version += 1
     
     def update_cooldown(self):
         """
@@ -408,6 +485,8 @@ class _CountdownRule:
         """
         if self._cooldown > 0:
             self._cooldown -= 1
+            if self._cooldown == 0:
+                _CountdownRule._state_version += 1
     
     @classmethod
     def update_all_cooldowns(cls):
@@ -419,7 +498,19 @@ class _CountdownRule:
     def unblock_all_rules(cls):
         """Unblocks all rules"""
         for instance in cls._instances:
-            instance.blocked = False
+            if instance._blocked:
+                instance._blocked = False
+                _CountdownRule._state_version += 1
+    
+    @property
+    def blocked(self) -> bool:
+        """Indicates if the rule is blocked for this tick only. Is reset to False after the tick."""
+        return self._blocked
+    
+    @blocked.setter
+    def blocked(self, value: bool):
+        self._blocked = value
+        _CountdownRule._state_version += 1
             
     @property
     def enabled(self) -> bool:
@@ -429,10 +520,12 @@ class _CountdownRule:
     @enabled.setter
     def enabled(self, value: bool):
         self._enabled = value
+        _CountdownRule._state_version += 1
     
     def set_active(self, value: bool):
         """Enables or disables the rule. Contrary to :py:attr:`blocked` it will not be reset after the tick."""
         self._enabled = value
+        _CountdownRule._state_version += 1
     
     class CooldownFramework:
         """
@@ -513,6 +606,7 @@ class _GroupRule(_CountdownRule):
     def cooldown(self, value: int):
         if self.group:
             _GroupRule._group_instances[self.group]["cooldown"] = value
+            _CountdownRule._state_version += 1
             return
         super().cooldown = value
     
@@ -525,6 +619,7 @@ class _GroupRule(_CountdownRule):
             self._group_instances[self.group]["cooldown"] = self._group_instances[self.group]["max_cooldown"]  # set to max
         else:
             self._group_instances[self.group]["cooldown"] = value
+        _CountdownRule._state_version += 1
 
     def reset_cooldown(self, value: Optional[int] = None):
         """Reset or set the cooldown; for a group rule it resets the group cooldown."""
@@ -538,6 +633,7 @@ class _GroupRule(_CountdownRule):
         """Updates the cooldown of the specified group to a specific value"""
         if group in cls._group_instances:
             cls._group_instances[group]["cooldown"] = value
+            _CountdownRule._state_version += 1
         else:
             raise ValueError(f"Group {group} does not exist.")
 
@@ -554,8 +650,12 @@ class _GroupRule(_CountdownRule):
         for instance_data in cls._group_instances.values():
             if instance_data["cooldown"] > 0:
                 instance_data["cooldown"] -= 1
+                if instance_data["cooldown"] == 0:
+                    _CountdownRule._state_version += 1
         for instance in filter(cls.__filter_not_ready_instances, cls._instances):
             instance._cooldown -= 1
+            if instance._cooldown == 0:
+                _CountdownRule._state_version += 1
 
 
 class Rule(_GroupRule):
@@ -1241,29 +1341,52 @@ class Rule(_GroupRule):
 
         exception = None
         result = Rule.NO_RESULT
+        start = evaluated = perf_counter_ns() if timings.enabled else 0
         try:
             result = self.evaluate(ctx, overwrite)
         except BaseException as e:
             exception = e
         else:
+            if start:
+                evaluated = perf_counter_ns()
+                timings.record("condition", self._timing_name(), evaluated - start)
             ctx.evaluation_results[ctx.agent.current_phase] = result
             if result in self.actions:
                 self.reset_cooldown()
                 # Apply overwrite settings permanently
-                ctx.config.merge_with(self.overwrite_settings)
+                ctx.config["self"] = "???"  # do not merge old self_config
+                _merge_nodes(ctx.config, self.overwrite_settings)
                 if overwrite:
-                    ctx.config.merge_with(overwrite)
+                    _merge_nodes(ctx.config, overwrite)
+                ConfigView.invalidate()
                 
-                action_result = self.actions[result](ctx)  # todo allow priority, random chance  # pyright: ignore[reportCallIssue]
+                try:
+                    action_result = self.actions[result](ctx)  # todo allow priority, random chance  # pyright: ignore[reportCallIssue]
+                finally:
+                    ConfigView.invalidate()  # the action might have changed the config directly
+                if start:
+                    timings.record("action", self._timing_name(), perf_counter_ns() - evaluated)
                 ctx.action_results[ctx.agent.current_phase] = action_result
                 return action_result
             return RuleResult.NOT_APPLICABLE  # No action was executed
         finally:
             self._ctx = None
+            if start:
+                timings.record("rule", self._timing_name(), perf_counter_ns() - start)
             if exception:
                 self.reset_cooldown()  #
                 raise exception
     
+    def _timing_name(self) -> str:
+        """
+        Name of the rule in the :py:data:`~agents.tools.timings.timings`;
+        the class name or the description for instances of the generic rule classes.
+        """
+        cls = type(self)
+        if cls.__module__ == __name__ and self.description:
+            return f"{cls.__name__}({self.description})"
+        return cls.__name__
+
     def __str__(self) -> str:
         try:
             if isinstance(self.condition, partial):
@@ -1716,7 +1839,7 @@ class BlockingRule(Rule, metarule=True):
         else:
             world_model = ctx.agent._world_model  # pyright: ignore[reportPrivateUsage]
             display = GameFramework.display
-            world_model.tick(GameFramework.clock)  # does not tick the world!
+            world_model.tick(GameFramework.clock, ctx.agent.information_manager)  # does not tick the world!
             world_model.render(display, finalize=False)
             try:
                 world_model.controller.render(display)  # type: ignore[attr-defined]  # noqa: SIM105
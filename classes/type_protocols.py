@@ -21,7 +21,7 @@ from typing_extensions import Concatenate, Literal, ParamSpec, Protocol, TypeAli
 if TYPE_CHECKING:
     from agents.dynamic_planning.dynamic_local_planner import DynamicLocalPlanner  # noqa: F401
     from agents.navigation.local_planner import LocalPlanner
-    from agents.tools.config_creation import AgentConfig, BehaviorAgentSettings, LunaticAgentSettings  # noqa: F401
+    from agents.tools.config_creation import AgentConfig, BehaviorAgentSettings, ConfigView, LunaticAgentSettings  # noqa: F401
     from classes.constants import AgentState
     from classes.evaluation_function import ConditionFunction
     from classes.rule import Context, Rule
@@ -273,6 +273,9 @@ class Has_Vehicle(Protocol):
 
 class UseableWithDynamicPlanner(HasPlannerWithConfig, Has_Vehicle, HasContext, Protocol):
     """Can be used with :py:class:`.DynamicLocalPlanner`."""
+    
+    ctx_config_view: "ConfigView"
+    """Read-only view of :python:`ctx.config` used by the controllers."""
 
 
 class CanDetectObstacles(Has_Vehicle, HasPlanner,
@@ -622,7 +622,8 @@ class GameFramework(AccessCarlaMixin, CarlaDataProvider):
         Note:
             This is the preferred method to update the world and render the camera.
         """
-        self.world_model.tick(self.clock)  # NOTE: Ticks WorldMODEL not CARLA WORLD!  # pyright: ignore[reportOptionalMemberAccess]
+        information = self.agent.information_manager if self.agent else None
+        self.world_model.tick(self.clock, information)  # NOTE: Ticks WorldMODEL not CARLA WORLD!  # pyright: ignore[reportOptionalMemberAccess]
         self.world_model.render(self.display, finalize=False)  # pyright: ignore[reportOptionalMemberAccess]
         self.controller.render(self.display)
         # These two types must be in sync:
@@ -885,7 +886,8 @@ class WorldModel(AccessCarlaMixin, CarlaDataProvider):
             args.externalActor = not (player is not None or agent is not None)  # TEMP: Remove to force clean config.
         self._args: LaunchConfig = assure_type(LaunchConfig, args)
         
-        self.hud: HUD = HUD(self._args.width, self._args.height, self.world)
+        self.hud: HUD = HUD(self._args.width, self._args.height, self.world,
+                            refresh_rate=self._args.camera.hud.refresh_rate)
         """The :py:class:`HUD` that is managed."""
         
         self.sync: Optional[bool] = self._args.sync
@@ -1297,9 +1299,14 @@ class WorldModel(AccessCarlaMixin, CarlaDataProvider):
     #def tick(self, clock):
     #    self.hud.tick(self.player, clock) # RSS example. TODO: Check which has to be used!
 
-    def tick(self, clock: "pygame.time.Clock"):
-        """Method for every tick"""
-        self.hud.tick(self, clock, InformationManager.obstacles)
+    def tick(self, clock: "pygame.time.Clock", information: Optional[InformationManager] = None):
+        """
+        Method for every tick
+        
+        Passing the :py:class:`.InformationManager` of the agent allows the :py:class:`.HUD`
+        to reuse its distances to the nearby actors.
+        """
+        self.hud.tick(self, clock, InformationManager.obstacles, information=information)
 
     def next_weather(self, reverse: bool = False) -> None:
         """Get next weather setting"""
@@ -0,0 +1,87 @@
+"""
+Microbenchmark of the per-tick creation of a :py:class:`.Context`.
+
+Compares the previous approach, a full copy of the agent's config and new phase and hazard
+dictionaries, with the snapshot that shares live_info through the deepcopy memo and the reused containers.
+Each simulated tick reads the config subtrees that the local planner and the controllers use.
+
+Does not need a running CARLA server nor the carla python package.
+
+Usage:
+    python examples/benchmark_context_creation.py --ticks 2000
+"""
+
+import os
+
+# Must be set before anything imports carla
+os.environ.setdefault("LUNATIC_OFFLINE_CARLA", "1")
+
+import __allow_imports_from_root  # noqa: E402, F401
+
+import argparse  # noqa: E402
+import time  # noqa: E402
+import tracemalloc  # noqa: E402
+from types import SimpleNamespace  # noqa: E402
+
+from agents.tools.config_creation import LunaticAgentSettings  # noqa: E402
+from classes.constants import Hazard, HazardSeverity, Phase  # noqa: E402
+from classes.rule import Context  # noqa: E402
+
+
+def read_hot_config(config) -> None:
+    """Config reads done by the planner and controllers every tick."""
+    config.speed.target_speed  # noqa: B018
+    config.planner.sampling_resolution  # noqa: B018
+    config.controls.max_steering  # noqa: B018
+
+
+def legacy_tick(agent, _last):
+    config = agent.config.copy()
+    config._content["live_info"] = agent.live_info
+    phase_results = dict.fromkeys(Phase.get_phases(), Context.PHASE_NOT_EXECUTED)
+    detected_hazards = set()
+    detected_hazards_info = dict.fromkeys(Hazard, HazardSeverity.NONE)
+    read_hot_config(config)
+    return SimpleNamespace(config=config, phase_results=phase_results,
+                           detected_hazards=detected_hazards, detected_hazards_info=detected_hazards_info)
+
+
+def context_tick(agent, last):
+    ctx = Context(agent, reuse=last)
+    read_hot_config(ctx.config)
+    return ctx
+
+
+def measure(tick, agent, ticks: int):
+    contexts = [None, None]  # keep the last context alive like the agent does
+    start = time.perf_counter()
+    for i in range(ticks):
+        contexts[i % 2] = tick(agent, contexts[i % 2])
+    duration = (time.perf_counter() - start) / ticks
+
+    tracemalloc.start()
+    snapshot_start = tracemalloc.take_snapshot()
+    for i in range(100):
+        contexts[i % 2] = tick(agent, contexts[i % 2])
+    allocated = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(snapshot_start, "filename"))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return duration, allocated / 100, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--ticks", type=int, default=2000)
+    args = parser.parse_args()
+
+    config = LunaticAgentSettings.create()
+    agent = SimpleNamespace(config=config, live_info=config.live_info)
+
+    for name, tick in (("full copy", legacy_tick), ("snapshot", context_tick)):
+        duration, allocated, peak = measure(tick, agent, args.ticks)
+        print(f"{name:>15}: {duration * 1e6:9.1f} us/tick, "
+              f"{allocated / 1024:8.1f} KiB retained/tick, {peak / 1024:8.1f} KiB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark of the complete loop of several :py:class:`.BasicAgent` and :py:class:`.LunaticAgent` objects
+on the offline CARLA stand-in.
+
+The agents drive on the synthetic ring road of :py:mod:`launch_tools.offline_carla`,
+each run reloads the world. As the stand-in is deterministic all runs have to end with
+the same checksum of the vehicle locations.
+The loop of the :py:class:`.LunaticAgent` includes the :py:class:`.InformationManager`,
+the rules and the :py:class:`.DetectionMatrix` in synchronous mode.
+Does not need a running CARLA server nor the carla python package.
+
+Usage:
+    python examples/benchmark_offline_agents.py --agents 10 --steps 1000 --lunatic-agents 2 --lunatic-steps 200
+"""
+
+import os
+
+# Must be set before anything imports carla
+os.environ.setdefault("LUNATIC_OFFLINE_CARLA", "1")
+
+import __allow_imports_from_root  # noqa: E402, F401
+
+import argparse  # noqa: E402
+import time  # noqa: E402
+
+import launch_tools  # noqa: E402
+from agents.lunatic_agent import LunaticAgent  # noqa: E402
+from agents.navigation.basic_agent import BasicAgent  # noqa: E402
+from agents.tools.config_creation import LunaticAgentSettings  # noqa: E402
+from classes.camera_manager import CameraManager  # noqa: E402
+from classes.information_manager import InformationManager  # noqa: E402
+from launch_tools import CarlaDataProvider  # noqa: E402
+
+carla = launch_tools.carla
+
+
+def location_checksum(vehicles) -> float:
+    checksum = 0.0
+    for vehicle in vehicles:
+        location = vehicle.get_location()
+        checksum += location.x + 2 * location.y
+    return round(checksum, 6)
+
+
+def run(client, agents: int, steps: int, map_name: str):
+    world = client.load_world(map_name)
+    world_map = world.get_map()
+    blueprint = world.get_blueprint_library().find("vehicle.tesla.model3")
+    spawn_points = world_map.get_spawn_points()
+    stride = max(len(spawn_points) // agents, 1)
+    pairs = []
+    for spawn_point in spawn_points[::stride][:agents]:
+        vehicle = world.spawn_actor(blueprint, spawn_point)
+        agent = BasicAgent(vehicle, 50, map_inst=world_map)
+        agent.set_destination(world_map.get_waypoint(spawn_point.location).next(1000)[0].transform.location)
+        pairs.append((vehicle, agent))
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        for vehicle, agent in pairs:
+            vehicle.apply_control(agent.run_step())
+        world.tick()
+    elapsed = time.perf_counter() - start
+    return elapsed / steps, location_checksum(vehicle for vehicle, _ in pairs), len(pairs)
+
+
+def run_lunatic(client, agents: int, steps: int, map_name: str):
+    # Headless the spectator threads of the camera managers would only compete for the GIL
+    CameraManager.stop_following_actor()
+    world = client.load_world(map_name)
+    settings = world.get_settings()
+    settings.synchronous_mode = True
+    settings.fixed_delta_seconds = 0.05
+    world.apply_settings(settings)
+    CarlaDataProvider.set_client(client)
+    CarlaDataProvider.set_world(world)
+    world_map = CarlaDataProvider.get_map()
+    blueprint = world.get_blueprint_library().find("vehicle.tesla.model3")
+    spawn_points = world_map.get_spawn_points()
+    stride = max(len(spawn_points) // agents, 1)
+    vehicles = [world.spawn_actor(blueprint, spawn_point) for spawn_point in spawn_points[::stride][:agents]]
+    world.tick()
+    CarlaDataProvider.on_carla_tick()
+    lunatic_agents = []
+    try:
+        for vehicle in vehicles:
+            agent = LunaticAgent(LunaticAgentSettings.create(), vehicle=vehicle)
+            agent.set_destination(world_map.get_waypoint(vehicle.get_location()).next(1000)[0].transform.location)
+            lunatic_agents.append(agent)
+
+        start = time.perf_counter()
+        for _ in range(steps):
+            for agent in lunatic_agents:
+                agent.run_step()
+                agent.apply_control()
+            world.tick()
+            CarlaDataProvider.on_carla_tick()
+        elapsed = time.perf_counter() - start
+        return elapsed / steps, location_checksum(vehicles), len(vehicles)
+    finally:
+        for agent in lunatic_agents:
+            agent.destroy()
+        InformationManager.cleanup()
+        CarlaDataProvider.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--agents", type=int, default=10)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--lunatic-agents", type=int, default=2)
+    parser.add_argument("--lunatic-steps", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=2)
+    parser.add_argument("--map", default="Ring", help="name of a synthetic map or path of an .xodr file")
+    args = parser.parse_args()
+
+    client = carla.Client("localhost", 2000)
+    for name, run_agents, agents, steps in (("BasicAgent", run, args.agents, args.steps),
+                                            ("LunaticAgent", run_lunatic, args.lunatic_agents, args.lunatic_steps)):
+        if agents <= 0:
+            continue
+        checksums = set()
+        for i in range(args.runs):
+            per_step, checksum, spawned = run_agents(client, agents, steps, args.map)
+            checksums.add(checksum)
+            print(f"{name} run {i}: {spawned} agents, {per_step * 1e3:8.3f} ms/step, "
+                  f"{per_step / spawned * 1e3:6.3f} ms/agent, checksum {checksum}")
+        print(f"{name} deterministic:", len(checksums) == 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark of the per-tick rule overhead of :py:meth:`.LunaticAgent.execute_phase`
+with and without :py:attr:`.LunaticAgent.compiled_dispatch`.
+
+Does not need a running CARLA server, but the carla python package has to be importable.
+The agent is not fully initialized, only the attributes needed by execute_phase are set.
+
+Usage:
+    python examples/benchmark_phase_dispatch.py --rules 120 --ticks 2000
+"""
+
+import __allow_imports_from_root  # noqa: F401
+
+import argparse
+import time
+
+from omegaconf import OmegaConf
+
+from agents.lunatic_agent import LunaticAgent
+from classes.constants import Phase
+from classes.rule import Context, Rule
+
+
+def make_agent(num_rules: int, *, compiled: bool, idle: bool = False) -> LunaticAgent:
+    agent = LunaticAgent.__new__(LunaticAgent)
+    agent.config = OmegaConf.create({"live_info": {"current_speed": 0.0}})
+    agent.rules = {phase: [] for phase in Phase.get_phases()}
+    agent._phase_dispatch = {}
+    agent.compiled_dispatch = compiled
+    agent.current_phase = Phase.NONE
+
+    phases = [phase for phase in Phase.get_phases() if phase is not Phase.NONE]
+    rules = []
+    for i in range(num_rules):
+        # A third of the rules are disabled, a third is on a long cooldown after the first tick,
+        # the rest evaluate their condition every tick. If idle all enabled rules are on cooldown.
+        rules.append(Rule([phases[i % len(phases)]],
+                          condition=lambda ctx, i=i: idle or i % 3 == 1,
+                          action=lambda ctx: None,
+                          cooldown_reset_value=1_000_000,
+                          enabled=i % 3 != 0,
+                          description=f"Benchmark rule {i}"))
+    agent.add_rules(rules)
+    agent.ctx = Context(agent)
+    return agent
+
+
+def run(agent: LunaticAgent, ticks: int) -> float:
+    phases = [phase for phase in Phase.get_phases() if phase is not Phase.NONE]
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for phase in phases:
+            agent.current_phase = phase
+            agent.execute_phase(phase, prior_results=None)
+        Rule.CooldownFramework.tick()
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rules", type=int, default=120)
+    parser.add_argument("--ticks", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{args.rules} rules, {args.ticks} ticks")
+    for idle in (False, True):
+        legacy = run(make_agent(args.rules, compiled=False, idle=idle), args.ticks)
+        compiled = run(make_agent(args.rules, compiled=True, idle=idle), args.ticks)
+        print("no rule is ready after the first tick:" if idle else "a third of the rules is evaluated each tick:")
+        print(f"  execute_phase per tick (legacy):   {legacy * 1e6:10.1f} us")
+        print(f"  execute_phase per tick (compiled): {compiled * 1e6:10.1f} us")
+        print(f"  speedup: {legacy / compiled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark of the PID controllers of many vehicles: one :py:class:`.PIDLateralController` and
+:py:class:`.PIDLongitudinalController` per vehicle compared to a single :py:class:`.PIDControllerBank`.
+
+The vehicles and their target waypoints are random, transforms and waypoints are replaced by
+simple objects with the same attributes.
+Does not need a running CARLA server, but the carla python package has to be importable.
+
+Usage:
+    python examples/benchmark_pid_controllers.py --vehicles 50 --steps 200
+"""
+
+import __allow_imports_from_root  # noqa: F401
+
+import argparse
+import math
+import random
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from agents.navigation.controller import PIDControllerBank, PIDLateralController, PIDLongitudinalController
+
+ARGS_LATERAL = {"K_P": 1.95, "K_I": 0.05, "K_D": 0.2, "dt": 0.05}
+ARGS_LONGITUDINAL = {"K_P": 1.0, "K_I": 0.05, "K_D": 0.0, "dt": 0.05}
+
+
+class _Transform(SimpleNamespace):
+
+    def get_forward_vector(self):
+        return self.forward
+
+    def get_right_vector(self):
+        return self.right
+
+
+def make_steps(vehicles: int, steps: int, seed: int):
+    rng = random.Random(seed)
+    data = []
+    for _ in range(steps):
+        locations = np.array([(rng.uniform(-100, 100), rng.uniform(-100, 100)) for _ in range(vehicles)])
+        yaw = np.array([rng.uniform(-math.pi, math.pi) for _ in range(vehicles)])
+        forward = np.stack([np.cos(yaw), np.sin(yaw)], axis=1)
+        targets = locations + np.array([(rng.uniform(-5, 5), rng.uniform(-5, 5)) for _ in range(vehicles)])
+        speeds = np.array([(rng.uniform(0, 60), rng.uniform(0, 60)) for _ in range(vehicles)])
+        transforms = [_Transform(location=SimpleNamespace(x=x, y=y), forward=SimpleNamespace(x=fx, y=fy))
+                      for (x, y), (fx, fy) in zip(locations.tolist(), forward.tolist())]
+        waypoints = [SimpleNamespace(transform=_Transform(location=SimpleNamespace(x=x, y=y)))
+                     for x, y in targets.tolist()]
+        data.append((locations, forward, targets, speeds, transforms, waypoints))
+    return data
+
+
+def run_single(data, vehicles: int) -> float:
+    lateral = [PIDLateralController(None, **ARGS_LATERAL) for _ in range(vehicles)]
+    longitudinal = [PIDLongitudinalController(None, **ARGS_LONGITUDINAL) for _ in range(vehicles)]
+    start = time.perf_counter()
+    for _, _, _, speeds, transforms, waypoints in data:
+        for i in range(vehicles):
+            longitudinal[i]._pid_control(speeds[i, 0], speeds[i, 1])
+            lateral[i]._pid_control(waypoints[i], transforms[i])
+    return (time.perf_counter() - start) / len(data)
+
+
+def run_bank(data, vehicles: int) -> float:
+    bank = PIDControllerBank(vehicles, ARGS_LATERAL, ARGS_LONGITUDINAL)
+    start = time.perf_counter()
+    for locations, forward, targets, speeds, _, _ in data:
+        bank.run_step(speeds[:, 0], speeds[:, 1], locations, forward, targets)
+    return (time.perf_counter() - start) / len(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--vehicles", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    data = make_steps(args.vehicles, args.steps, args.seed)
+    single = run_single(data, args.vehicles)
+    bank = run_bank(data, args.vehicles)
+    print(f"{args.vehicles} vehicles, {args.steps} steps")
+    print(f"single controllers: {single * 1e6:10.1f} us/step, {single / args.vehicles * 1e6:6.2f} us/vehicle")
+    print(f"controller bank:    {bank * 1e6:10.1f} us/step, {bank / args.vehicles * 1e6:6.2f} us/vehicle")
+    print(f"speedup: {single / bank:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
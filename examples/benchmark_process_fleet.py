@@ -0,0 +1,118 @@
+"""
+Benchmark of the :py:class:`.ProcessFleet` compared to the single process :py:class:`.Fleet`.
+
+Spawns the same vehicles on the offline CARLA stand-in for each run and steps their :py:class:`.LunaticAgent`
+objects in synchronous mode, first in the main process and then with an increasing number of worker processes.
+Only the main process has a world, the workers step their agents on the snapshots it sends.
+With near-linear scaling the time per step drops with the number of processes until the
+ticks of the world, the snapshots or the batch of the main process dominate.
+Does not need a running CARLA server nor the carla python package.
+
+Usage:
+    python examples/benchmark_process_fleet.py --agents 16 --steps 300 --processes 1 2 4 8
+"""
+
+import os
+
+# Must be set before anything imports carla, the worker processes inherit it
+os.environ.setdefault("LUNATIC_OFFLINE_CARLA", "1")
+
+import __allow_imports_from_root  # noqa: E402, F401
+
+import argparse  # noqa: E402
+import time  # noqa: E402
+
+import launch_tools  # noqa: E402
+from agents.lunatic_agent import LunaticAgent  # noqa: E402
+from agents.tools.config_creation import LunaticAgentSettings  # noqa: E402
+from classes.camera_manager import CameraManager  # noqa: E402
+from classes.fleet import Fleet, ProcessFleet  # noqa: E402
+from classes.information_manager import InformationManager  # noqa: E402
+from launch_tools import CarlaDataProvider  # noqa: E402
+
+carla = launch_tools.carla
+
+
+def make_agent(vehicle):
+    """Agent factory of the workers, has to be defined at module level to be picklable."""
+    # Headless the spectator threads of the camera managers would only compete for the GIL
+    CameraManager.stop_following_actor()
+    agent = LunaticAgent(LunaticAgentSettings.create(), vehicle=vehicle)
+    world_map = CarlaDataProvider.get_map()
+    agent.set_destination(world_map.get_waypoint(vehicle.get_location()).next(1000)[0].transform.location)
+    return agent
+
+
+def location_checksum(vehicles) -> float:
+    checksum = 0.0
+    for vehicle in vehicles:
+        location = vehicle.get_location()
+        checksum += location.x + 2 * location.y
+    return round(checksum, 6)
+
+
+def setup_world(client, agents: int, map_name: str):
+    """Loads a new world in synchronous mode and spawns the vehicles."""
+    CameraManager.stop_following_actor()
+    world = client.load_world(map_name)
+    settings = world.get_settings()
+    settings.synchronous_mode = True
+    settings.fixed_delta_seconds = 0.05
+    world.apply_settings(settings)
+    CarlaDataProvider.set_client(client)
+    CarlaDataProvider.set_world(world)
+    blueprint = world.get_blueprint_library().find("vehicle.tesla.model3")
+    spawn_points = CarlaDataProvider.get_map().get_spawn_points()
+    stride = max(len(spawn_points) // agents, 1)
+    vehicles = [world.spawn_actor(blueprint, spawn_point) for spawn_point in spawn_points[::stride][:agents]]
+    Fleet.tick_world()
+    return vehicles
+
+
+def run_fleet(client, agents: int, steps: int, map_name: str):
+    vehicles = setup_world(client, agents, map_name)
+    fleet = Fleet([make_agent(vehicle) for vehicle in vehicles])
+    try:
+        start = time.perf_counter()
+        for _ in range(steps):
+            fleet.run_step()
+            Fleet.tick_world()
+        return (time.perf_counter() - start) / steps, location_checksum(vehicles), len(vehicles)
+    finally:
+        fleet.destroy()
+        InformationManager.cleanup()
+        CarlaDataProvider.cleanup()
+
+
+def run_process_fleet(client, agents: int, steps: int, processes: int, map_name: str):
+    vehicles = setup_world(client, agents, map_name)
+    try:
+        with ProcessFleet(make_agent, vehicles, processes) as fleet:
+            start = time.perf_counter()
+            for _ in range(steps):
+                fleet.run_step()
+                fleet.tick_world()
+            return (time.perf_counter() - start) / steps, location_checksum(vehicles), len(vehicles)
+    finally:
+        CarlaDataProvider.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--agents", type=int, default=16)
+    parser.add_argument("--steps", type=int, default=300)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--map", default="Ring", help="name of a synthetic map or path of an .xodr file")
+    args = parser.parse_args()
+
+    client = carla.Client("localhost", 2000)
+    baseline, checksum, agents = run_fleet(client, args.agents, args.steps, args.map)
+    print(f"Fleet:           {agents} agents, {baseline * 1e3:8.3f} ms/step, checksum {checksum}")
+    for processes in args.processes:
+        per_step, checksum, agents = run_process_fleet(client, args.agents, args.steps, processes, args.map)
+        print(f"ProcessFleet {processes:>2}: {agents} agents, {per_step * 1e3:8.3f} ms/step, "
+              f"speedup {baseline / per_step:5.2f}, checksum {checksum}")
+
+
+if __name__ == "__main__":
+    main()
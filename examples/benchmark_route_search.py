@@ -0,0 +1,82 @@
+"""
+Benchmark of the graph search of the :py:class:`.GlobalRoutePlanner` with the
+networkx and the CSR :py:attr:`~.GlobalRoutePlanner.search_backend` on the same route set.
+
+The road graph is a synthetic town: a grid of junctions with slightly displaced locations
+and both driving directions on each road.
+Does not need a running CARLA server, but the carla python package has to be importable.
+The planner is not fully initialized, only the graph is set.
+
+Usage:
+    python examples/benchmark_route_search.py --size 40 --routes 500
+"""
+
+import __allow_imports_from_root  # noqa: F401
+
+import argparse
+import random
+import time
+
+import networkx as nx
+
+from agents.navigation.global_route_planner import GlobalRoutePlanner
+
+
+def make_planner(size: int, seed: int) -> GlobalRoutePlanner:
+    rng = random.Random(seed)
+    graph = nx.DiGraph()
+    spacing = 80.0
+    for x in range(size):
+        for y in range(size):
+            node = x * size + y
+            graph.add_node(node, vertex=(x * spacing + rng.uniform(-5, 5), y * spacing + rng.uniform(-5, 5), 0.0))
+    for x in range(size):
+        for y in range(size):
+            node = x * size + y
+            for dx, dy in ((1, 0), (0, 1)):
+                if x + dx < size and y + dy < size:
+                    neighbor = (x + dx) * size + y + dy
+                    # length is the number of waypoints of the edge
+                    graph.add_edge(node, neighbor, length=rng.randint(30, 50))
+                    graph.add_edge(neighbor, node, length=rng.randint(30, 50))
+    planner = GlobalRoutePlanner.__new__(GlobalRoutePlanner)
+    planner._graph = graph
+    planner._csr_graph = None
+    return planner
+
+
+def run(search, routes) -> "tuple[float, list[list[int]]]":
+    start = time.perf_counter()
+    paths = [search(source, target) for source, target in routes]
+    return (time.perf_counter() - start) / len(routes), paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=40, help="Junctions per side of the grid")
+    parser.add_argument("--routes", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    planner = make_planner(args.size, args.seed)
+    rng = random.Random(args.seed)
+    nodes = list(planner._graph.nodes)
+    routes = [tuple(rng.sample(nodes, 2)) for _ in range(args.routes)]
+
+    start = time.perf_counter()
+    planner._search_csr(*routes[0])  # builds the arrays
+    build = time.perf_counter() - start
+
+    networkx_time, networkx_paths = run(planner._search_networkx, routes)
+    csr_time, csr_paths = run(planner._search_csr, routes)
+    different = sum(a != b for a, b in zip(networkx_paths, csr_paths))
+    print(f"{planner._graph.number_of_nodes()} nodes, {planner._graph.number_of_edges()} edges, "
+          f"{args.routes} routes")
+    print(f"CSR arrays built in {build * 1e3:.1f} ms")
+    print(f"search per route (networkx): {networkx_time * 1e6:10.1f} us")
+    print(f"search per route (csr):      {csr_time * 1e6:10.1f} us")
+    print(f"speedup: {networkx_time / csr_time:.2f}x, different paths: {different}")
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,12 @@ __all__ = [  # noqa: RUF022
 import logging
 import os
 
+# Run without a CARLA server, the value can also be a map name or the path of an .xodr file
+if os.environ.get("LUNATIC_OFFLINE_CARLA", "0").lower() not in ("", "0", "false"):
+    from launch_tools import offline_carla as _offline_carla
+    _offline_map = os.environ["LUNATIC_OFFLINE_CARLA"]
+    _offline_carla.install(None if _offline_map.lower() in ("1", "true") else _offline_map)
+
 # If carla is not installed try to find the .egg file
 try:
     import carla
@@ -0,0 +1,170 @@
+"""
+An in-process stand-in for the :py:mod:`carla` module to run and profile the agent stack
+without a CARLA server.
+
+It implements the part of the API that the :py:class:`CarlaDataProvider`, the
+:py:class:`.InformationManager`, the :py:class:`.GlobalRoutePlanner`, the :py:class:`.LocalPlanner`,
+the :py:class:`.DetectionMatrix` and the :py:class:`.LunaticAgent` use:
+
+- The map is read from an OpenDRIVE file or created by :py:func:`ring_road_opendrive`.
+  Waypoints, lane changes, lane markings, junctions and the topology follow the conventions of CARLA.
+- Vehicles follow a kinematic bicycle model that is controlled by :py:class:`VehicleControl`,
+  walkers move with their :py:class:`WalkerControl`. Dynamic signals of the map become traffic lights.
+  Like on CARLA, a spawned vehicle is slightly off its spawn rotation.
+- Collision, GNSS and IMU sensors produce data, all other sensors, e.g. cameras, stay silent.
+- Each tick advances the world by the fixed time step, independent of the wall clock and of
+  :py:attr:`WorldSettings.synchronous_mode`. Equal inputs therefore give equal results.
+
+All :py:class:`Client` objects of a process share one world. The world is not shared between processes,
+for example the workers of a :py:class:`.ProcessFleet` cannot connect to it.
+
+Usage:
+    Call :py:func:`install` before anything imports :py:mod:`carla`, or set the environment variable
+    ``LUNATIC_OFFLINE_CARLA=1`` (or to the path of an .xodr file) to let :py:mod:`launch_tools` do it.
+
+    .. code-block:: python
+
+        from launch_tools import offline_carla
+        offline_carla.install()
+
+        import carla
+        client = carla.Client("localhost", 2000)
+        world = client.get_world()  # the synthetic ring road
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Optional
+
+from . import command
+from ._geometry import BoundingBox, Color, GeoLocation, Location, Rotation, Transform, Vector2D, Vector3D
+from ._map import Junction, Map, Waypoint
+from ._opendrive import ring_road_opendrive
+from ._types import (
+    AttachmentType,
+    LaneChange,
+    LaneMarking,
+    LaneMarkingColor,
+    LaneMarkingType,
+    LaneType,
+    TrafficLightState,
+    VehicleControl,
+    VehicleLightState,
+    VehiclePhysicsControl,
+    WalkerControl,
+    WeatherParameters,
+    WheelPhysicsControl,
+)
+from ._world import (
+    Actor,
+    ActorAttribute,
+    ActorBlueprint,
+    ActorList,
+    ActorSnapshot,
+    BlueprintLibrary,
+    Client,
+    CollisionEvent,
+    DebugHelper,
+    GnssMeasurement,
+    IMUMeasurement,
+    Sensor,
+    SensorData,
+    Timestamp,
+    TrafficLight,
+    TrafficManager,
+    Vehicle,
+    Walker,
+    WalkerAIController,
+    World,
+    WorldSettings,
+    WorldSnapshot,
+    _default_map,
+)
+from ._world import _SYNTHETIC_MAPS as _SYNTHETIC_MAPS
+
+__all__ = [  # noqa: RUF022
+    "install",
+    "ring_road_opendrive",
+    "command",
+
+    "BoundingBox", "Color", "GeoLocation", "Location", "Rotation", "Transform", "Vector2D", "Vector3D",
+    "Junction", "Map", "Waypoint",
+    "AttachmentType", "LaneChange", "LaneMarking", "LaneMarkingColor", "LaneMarkingType", "LaneType",
+    "TrafficLightState", "VehicleControl", "VehicleLightState", "VehiclePhysicsControl", "WalkerControl",
+    "WeatherParameters", "WheelPhysicsControl",
+    "Actor", "ActorAttribute", "ActorBlueprint", "ActorList", "ActorSnapshot", "BlueprintLibrary", "Client",
+    "CollisionEvent", "DebugHelper", "GnssMeasurement", "IMUMeasurement", "Sensor", "SensorData", "Timestamp",
+    "TrafficLight", "TrafficManager", "Vehicle", "Walker", "WalkerAIController", "World", "WorldSettings",
+    "WorldSnapshot",
+]
+
+__version__ = "0.9.15-offline"
+
+
+class _Placeholder:
+    """Types that only appear in annotations or are never created without a server."""
+
+
+class LaneInvasionEvent(SensorData):
+    pass
+
+
+class Image(SensorData):
+    pass
+
+
+class RadarMeasurement(SensorData):
+    pass
+
+
+class Landmark(_Placeholder):
+    pass
+
+
+class TrafficSign(Actor):
+    pass
+
+
+class ColorConverter:
+    Raw = 0
+    Depth = 1
+    LogarithmicDepth = 2
+    CityScapesPalette = 3
+
+
+class MapLayer:
+    NONE = 0
+    Buildings = 0x1
+    Decals = 0x1 << 1
+    Foliage = 0x1 << 2
+    Ground = 0x1 << 3
+    ParkedVehicles = 0x1 << 4
+    Particles = 0x1 << 5
+    Props = 0x1 << 6
+    StreetLights = 0x1 << 7
+    Walls = 0x1 << 8
+    All = 0xFFFF
+
+
+class VehicleDoor:
+    FL = 0
+    FR = 1
+    RL = 2
+    RR = 3
+    All = 6
+
+
+def install(default_map: Optional[str] = None) -> None:
+    """
+    Registers this package as the :py:mod:`carla` and :py:mod:`carla.command` modules.
+
+    Args:
+        default_map: Map that :py:meth:`Client.get_world` loads if no world exists yet; the name
+            of a synthetic map, e.g. ``"Ring"``, or the path of an OpenDRIVE file.
+    """
+    if default_map:
+        _default_map["name"] = default_map
+    module = sys.modules[__name__]
+    sys.modules["carla"] = module
+    sys.modules["carla.command"] = command
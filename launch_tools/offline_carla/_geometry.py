@@ -0,0 +1,267 @@
+"""Vectors, rotations, transforms and bounding boxes with the conventions of CARLA (left-handed, degrees)."""
+
+from __future__ import annotations
+
+import math
+from typing import List, Optional
+
+__all__ = [
+    "BoundingBox",
+    "Color",
+    "GeoLocation",
+    "Location",
+    "Rotation",
+    "Transform",
+    "Vector2D",
+    "Vector3D",
+]
+
+
+class Vector3D:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0):
+        if isinstance(x, Vector3D):  # like carla.Location(vector)
+            x, y, z = x.x, x.y, x.z
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def _new(self, x: float, y: float, z: float):
+        return self.__class__(x, y, z)
+
+    def __add__(self, other: Vector3D):
+        return self._new(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other: Vector3D):
+        return self._new(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __mul__(self, factor: float):
+        return self._new(self.x * factor, self.y * factor, self.z * factor)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor: float):
+        return self._new(self.x / divisor, self.y / divisor, self.z / divisor)
+
+    def __neg__(self):
+        return self._new(-self.x, -self.y, -self.z)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Vector3D):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y and self.z == other.z
+
+    def __ne__(self, other: object) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None  # type: ignore[assignment] # mutable like the carla classes
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(x={self.x:.6f}, y={self.y:.6f}, z={self.z:.6f})"
+
+    def length(self) -> float:
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def squared_length(self) -> float:
+        return self.x * self.x + self.y * self.y + self.z * self.z
+
+    def make_unit_vector(self) -> Vector3D:
+        length = self.length()
+        if length == 0:
+            return Vector3D(self.x, self.y, self.z)
+        return Vector3D(self.x / length, self.y / length, self.z / length)
+
+    def dot(self, other: Vector3D) -> float:
+        return self.x * other.x + self.y * other.y + self.z * other.z
+
+    def dot_2d(self, other: Vector3D) -> float:
+        return self.x * other.x + self.y * other.y
+
+    def cross(self, other: Vector3D) -> Vector3D:
+        return Vector3D(self.y * other.z - self.z * other.y,
+                        self.z * other.x - self.x * other.z,
+                        self.x * other.y - self.y * other.x)
+
+    def distance(self, other: Vector3D) -> float:
+        return math.sqrt((self.x - other.x) ** 2 + (self.y - other.y) ** 2 + (self.z - other.z) ** 2)
+
+    def distance_squared(self, other: Vector3D) -> float:
+        return (self.x - other.x) ** 2 + (self.y - other.y) ** 2 + (self.z - other.z) ** 2
+
+    def distance_2d(self, other: Vector3D) -> float:
+        return math.hypot(self.x - other.x, self.y - other.y)
+
+    def distance_squared_2d(self, other: Vector3D) -> float:
+        return (self.x - other.x) ** 2 + (self.y - other.y) ** 2
+
+    def get_vector_angle(self, other: Vector3D) -> float:
+        lengths = self.length() * other.length()
+        if lengths == 0:
+            return 0.0
+        return math.acos(max(-1.0, min(1.0, self.dot(other) / lengths)))
+
+
+class Location(Vector3D):
+    __slots__ = ()
+
+
+class Vector2D:
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: float = 0.0, y: float = 0.0):
+        self.x = float(x)
+        self.y = float(y)
+
+    def length(self) -> float:
+        return math.hypot(self.x, self.y)
+
+    def __repr__(self) -> str:
+        return f"Vector2D(x={self.x:.6f}, y={self.y:.6f})"
+
+
+class Rotation:
+    __slots__ = ("pitch", "roll", "yaw")
+
+    def __init__(self, pitch: float = 0.0, yaw: float = 0.0, roll: float = 0.0):
+        self.pitch = float(pitch)
+        self.yaw = float(yaw)
+        self.roll = float(roll)
+
+    def _trigonometry(self):
+        cy, sy = math.cos(math.radians(self.yaw)), math.sin(math.radians(self.yaw))
+        cr, sr = math.cos(math.radians(self.roll)), math.sin(math.radians(self.roll))
+        cp, sp = math.cos(math.radians(self.pitch)), math.sin(math.radians(self.pitch))
+        return cy, sy, cr, sr, cp, sp
+
+    def get_forward_vector(self) -> Vector3D:
+        cy, sy, _, _, cp, sp = self._trigonometry()
+        return Vector3D(cp * cy, cp * sy, sp)
+
+    def get_right_vector(self) -> Vector3D:
+        cy, sy, cr, sr, cp, sp = self._trigonometry()
+        return Vector3D(cy * sp * sr - sy * cr, sy * sp * sr + cy * cr, -cp * sr)
+
+    def get_up_vector(self) -> Vector3D:
+        cy, sy, cr, sr, cp, sp = self._trigonometry()
+        return Vector3D(-cy * sp * cr - sy * sr, -sy * sp * cr + cy * sr, cp * cr)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Rotation):
+            return NotImplemented
+        return self.pitch == other.pitch and self.yaw == other.yaw and self.roll == other.roll
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"Rotation(pitch={self.pitch:.6f}, yaw={self.yaw:.6f}, roll={self.roll:.6f})"
+
+
+class Transform:
+    __slots__ = ("location", "rotation")
+
+    def __init__(self, location: Optional[Location] = None, rotation: Optional[Rotation] = None):
+        self.location = location if location is not None else Location()
+        self.rotation = rotation if rotation is not None else Rotation()
+
+    def get_forward_vector(self) -> Vector3D:
+        return self.rotation.get_forward_vector()
+
+    def get_right_vector(self) -> Vector3D:
+        return self.rotation.get_right_vector()
+
+    def get_up_vector(self) -> Vector3D:
+        return self.rotation.get_up_vector()
+
+    def transform(self, in_point: Vector3D) -> Location:
+        """Transforms a point from the local coordinates of this transform to world coordinates."""
+        forward, right, up = self.get_forward_vector(), self.get_right_vector(), self.get_up_vector()
+        x, y, z = in_point.x, in_point.y, in_point.z
+        location = self.location
+        return Location(x * forward.x + y * right.x + z * up.x + location.x,
+                        x * forward.y + y * right.y + z * up.y + location.y,
+                        x * forward.z + y * right.z + z * up.z + location.z)
+
+    def transform_vector(self, in_vector: Vector3D) -> Vector3D:
+        forward, right, up = self.get_forward_vector(), self.get_right_vector(), self.get_up_vector()
+        x, y, z = in_vector.x, in_vector.y, in_vector.z
+        return Vector3D(x * forward.x + y * right.x + z * up.x,
+                        x * forward.y + y * right.y + z * up.y,
+                        x * forward.z + y * right.z + z * up.z)
+
+    def inverse_transform(self, in_point: Vector3D) -> Location:
+        """Transforms a point from world coordinates to the local coordinates of this transform."""
+        offset = Vector3D(in_point.x - self.location.x, in_point.y - self.location.y, in_point.z - self.location.z)
+        return Location(offset.dot(self.get_forward_vector()), offset.dot(self.get_right_vector()),
+                        offset.dot(self.get_up_vector()))
+
+    def get_matrix(self) -> List[List[float]]:
+        forward, right, up = self.get_forward_vector(), self.get_right_vector(), self.get_up_vector()
+        location = self.location
+        return [[forward.x, right.x, up.x, location.x],
+                [forward.y, right.y, up.y, location.y],
+                [forward.z, right.z, up.z, location.z],
+                [0.0, 0.0, 0.0, 1.0]]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Transform):
+            return NotImplemented
+        return self.location == other.location and self.rotation == other.rotation
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"Transform({self.location}, {self.rotation})"
+
+
+class BoundingBox:
+    __slots__ = ("extent", "location", "rotation")
+
+    def __init__(self, location: Optional[Location] = None, extent: Optional[Vector3D] = None,
+                 rotation: Optional[Rotation] = None):
+        self.location = location if location is not None else Location()
+        self.extent = extent if extent is not None else Vector3D()
+        self.rotation = rotation if rotation is not None else Rotation()
+
+    def get_local_vertices(self) -> List[Location]:
+        """The eight corners relative to the parent, in the same order as CARLA."""
+        own = Transform(self.location, self.rotation)
+        ext = self.extent
+        return [own.transform(Vector3D(sx * ext.x, sy * ext.y, sz * ext.z))
+                for sx in (-1, 1) for sy in (-1, 1) for sz in (-1, 1)]
+
+    def get_world_vertices(self, transform: Transform) -> List[Location]:
+        return [transform.transform(vertex) for vertex in self.get_local_vertices()]
+
+    def contains(self, world_point: Vector3D, transform: Transform) -> bool:
+        local = Transform(self.location, self.rotation).inverse_transform(transform.inverse_transform(world_point))
+        return abs(local.x) <= self.extent.x and abs(local.y) <= self.extent.y and abs(local.z) <= self.extent.z
+
+    def __repr__(self) -> str:
+        return (f"BoundingBox({self.location}, "
+                f"Extent(x={self.extent.x:.6f}, y={self.extent.y:.6f}, z={self.extent.z:.6f}), {self.rotation})")
+
+
+class Color:
+    __slots__ = ("a", "b", "g", "r")
+
+    def __init__(self, r: int = 0, g: int = 0, b: int = 0, a: int = 255):
+        self.r, self.g, self.b, self.a = r, g, b, a
+
+    def __repr__(self) -> str:
+        return f"Color({self.r}, {self.g}, {self.b}, {self.a})"
+
+
+class GeoLocation:
+    __slots__ = ("altitude", "latitude", "longitude")
+
+    def __init__(self, latitude: float = 0.0, longitude: float = 0.0, altitude: float = 0.0):
+        self.latitude, self.longitude, self.altitude = latitude, longitude, altitude
+
+    def __repr__(self) -> str:
+        return (f"GeoLocation(latitude={self.latitude:.6f}, longitude={self.longitude:.6f}, "
+                f"altitude={self.altitude:.6f})")
@@ -0,0 +1,409 @@
+"""
+:py:class:`Map`, :py:class:`Waypoint` and :py:class:`Junction` on top of an :py:class:`.OpenDrive` road network.
+
+The lanes are nodes of a graph that is built once per map; a waypoint is a lane and a
+position `s` along its road. Lookups by location use lane center samples in a grid.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+from ._geometry import BoundingBox, GeoLocation, Location, Rotation, Transform
+from ._opendrive import Lane, LaneSection, OpenDrive, Road
+from ._types import LaneChange, LaneMarking, LaneType
+
+if TYPE_CHECKING:
+    from ._opendrive import Signal
+
+__all__ = ["Junction", "Map", "Waypoint"]
+
+_LaneKey = Tuple[int, int, int]
+"""Road id, index of the lane section and lane id"""
+
+_SAMPLE_DISTANCE = 2.0
+_GRID_SIZE = 10.0
+_EPSILON = 1e-6
+_DEFAULT_SPEED_LIMIT = 30.0
+_NO_MARKING = LaneMarking()
+
+
+class _LaneNode:
+    """A lane of one lane section; vehicles drive along +s on lanes with negative ids."""
+
+    __slots__ = ("entry", "exit", "forward", "key", "lane", "length", "predecessors", "road", "section",
+                 "successors")
+
+    def __init__(self, road: Road, section: LaneSection, lane: Lane):
+        self.road = road
+        self.section = section
+        self.lane = lane
+        self.key: _LaneKey = (road.id, section.index, lane.id)
+        self.forward = lane.id < 0
+        self.entry, self.exit = (section.s, section.s_end) if self.forward else (section.s_end, section.s)
+        self.length = section.s_end - section.s
+        self.successors: List[_LaneNode] = []
+        self.predecessors: List[_LaneNode] = []
+
+    def advance(self, s: float, distance: float) -> float:
+        return s + distance if self.forward else s - distance
+
+    def remaining(self, s: float) -> float:
+        return max(self.exit - s if self.forward else s - self.exit, 0.0)
+
+    def travelled(self, s: float) -> float:
+        return max(s - self.entry if self.forward else self.entry - s, 0.0)
+
+
+class Junction:
+
+    def __init__(self, carla_map: Map, junction_id: int):
+        self._map = carla_map
+        self.id = junction_id
+        nodes = [node for node in carla_map._nodes.values() if node.road.junction == junction_id]
+        self._nodes = nodes
+        points = [carla_map._lane_position(node, s)[0].location for node in nodes
+                  for s in (node.entry, (node.entry + node.exit) / 2, node.exit)]
+        if points:
+            low = Location(min(p.x for p in points), min(p.y for p in points), min(p.z for p in points))
+            high = Location(max(p.x for p in points), max(p.y for p in points), max(p.z for p in points))
+        else:
+            low = high = Location()
+        self.bounding_box = BoundingBox((low + high) / 2, (high - low) / 2)
+
+    def get_waypoints(self, lane_type: LaneType = LaneType.Driving) -> List[Tuple[Waypoint, Waypoint]]:
+        return [(Waypoint(self._map, node, node.entry), Waypoint(self._map, node, node.exit))
+                for node in self._nodes if node.lane.type & lane_type]
+
+    def __repr__(self) -> str:
+        return f"Junction(id={self.id})"
+
+
+class Waypoint:
+
+    __slots__ = ("_map", "_node", "id", "is_junction", "junction_id", "lane_id", "lane_type", "lane_width",
+                 "road_id", "s", "section_id", "transform")
+
+    def __init__(self, carla_map: Map, node: _LaneNode, s: float):
+        self._map = carla_map
+        self._node = node
+        self.road_id, self.section_id, self.lane_id = node.key
+        self.s = s
+        self.id = hash((node.key, round(s, 4))) & 0xFFFFFFFFFFFF
+        self.is_junction = node.road.junction != -1
+        self.junction_id = node.road.junction
+        self.lane_type = node.lane.type
+        self.transform, self.lane_width = carla_map._lane_position(node, s)
+
+    @property
+    def is_intersection(self) -> bool:
+        return self.is_junction
+
+    def _marking(self, lane_id: int) -> LaneMarking:
+        lane = self._node.section.lanes.get(lane_id)
+        mark = lane.road_mark(self.s - self._node.section.s) if lane is not None else None
+        if mark is None:
+            return _NO_MARKING
+        return LaneMarking(mark.type, mark.color, mark.lane_change, mark.width)
+
+    @property
+    def right_lane_marking(self) -> LaneMarking:
+        return self._marking(self.lane_id)
+
+    @property
+    def left_lane_marking(self) -> LaneMarking:
+        return self._marking(self.lane_id + 1 if self.lane_id < 0 else self.lane_id - 1)
+
+    @property
+    def lane_change(self) -> LaneChange:
+        change = LaneChange.NONE
+        if self.right_lane_marking.lane_change & LaneChange.Both:
+            change |= LaneChange.Right
+        if self.left_lane_marking.lane_change & LaneChange.Both:
+            change |= LaneChange.Left
+        return change
+
+    def _neighbour(self, lane_id: int) -> Optional[Waypoint]:
+        node = self._map._nodes.get((self.road_id, self.section_id, lane_id))
+        if node is None:
+            return None
+        return Waypoint(self._map, node, self.s)
+
+    def get_left_lane(self) -> Optional[Waypoint]:
+        if self.lane_id < 0:
+            return self._neighbour(self.lane_id + 1 if self.lane_id != -1 else 1)
+        return self._neighbour(self.lane_id - 1 if self.lane_id != 1 else -1)
+
+    def get_right_lane(self) -> Optional[Waypoint]:
+        return self._neighbour(self.lane_id - 1 if self.lane_id < 0 else self.lane_id + 1)
+
+    def next(self, distance: float) -> List[Waypoint]:
+        """Waypoints `distance` meters ahead, one for each branch of the road."""
+        return [Waypoint(self._map, node, s) for node, s in self._map._walk(self._node, self.s, distance, True)]
+
+    def previous(self, distance: float) -> List[Waypoint]:
+        return [Waypoint(self._map, node, s) for node, s in self._map._walk(self._node, self.s, distance, False)]
+
+    def next_until_lane_end(self, distance: float) -> List[Waypoint]:
+        node, s = self._node, self.s
+        result = []
+        while node.remaining(s) > distance:
+            s = node.advance(s, distance)
+            result.append(Waypoint(self._map, node, s))
+        result.append(Waypoint(self._map, node, node.exit))
+        return result
+
+    def previous_until_lane_start(self, distance: float) -> List[Waypoint]:
+        node, s = self._node, self.s
+        result = []
+        while node.travelled(s) > distance:
+            s = node.advance(s, -distance)
+            result.append(Waypoint(self._map, node, s))
+        result.append(Waypoint(self._map, node, node.entry))
+        return result
+
+    def get_junction(self) -> Optional[Junction]:
+        if not self.is_junction:
+            return None
+        return self._map._junction(self.junction_id)
+
+    def get_landmarks(self, distance: float, stop_at_junction: bool = False) -> list:  # noqa: ARG002
+        return []
+
+    def get_landmarks_of_type(self, distance: float, landmark_type: str, stop_at_junction: bool = False) -> list:  # noqa: ARG002
+        return []
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Waypoint):
+            return NotImplemented
+        return self.id == other.id
+
+    def __hash__(self) -> int:
+        return self.id
+
+    def __repr__(self) -> str:
+        return (f"Waypoint(road_id={self.road_id}, section_id={self.section_id}, lane_id={self.lane_id}, "
+                f"s={self.s:.6f}, {self.transform})")
+
+
+class Map:
+    """
+    A road network read from an OpenDRIVE document, e.g. one created by
+    :py:func:`~launch_tools.offline_carla.ring_road_opendrive`.
+    """
+
+    def __init__(self, name: str, xodr_content: str):
+        self.name = name
+        self._opendrive = OpenDrive(xodr_content)
+        self._nodes: Dict[_LaneKey, _LaneNode] = {}
+        for road in self._opendrive.roads.values():
+            for section in road.sections:
+                for lane in section.lanes.values():
+                    if lane.id != 0:
+                        self._nodes[(road.id, section.index, lane.id)] = _LaneNode(road, section, lane)
+        for node in self._nodes.values():
+            node.successors = [self._nodes[key] for key in self._successor_keys(node) if key in self._nodes]
+            for successor in node.successors:
+                successor.predecessors.append(node)
+        self._junctions: Dict[int, Junction] = {}
+        self._grid: Dict[Tuple[int, int], List[Tuple[float, float, float, float, _LaneNode, float]]] = {}
+        for node in self._nodes.values():
+            count = max(int(math.ceil(node.length / _SAMPLE_DISTANCE)), 1)
+            for i in range(count + 1):
+                s = node.section.s + node.length * i / count
+                transform, _ = self._lane_position(node, s)
+                location, forward = transform.location, transform.get_forward_vector()
+                cell = (int(math.floor(location.x / _GRID_SIZE)), int(math.floor(location.y / _GRID_SIZE)))
+                self._grid.setdefault(cell, []).append((location.x, location.y, forward.x, forward.y, node, s))
+        cells = list(self._grid) or [(0, 0)]
+        self._grid_bounds = (min(x for x, _ in cells), max(x for x, _ in cells),
+                             min(y for _, y in cells), max(y for _, y in cells))
+
+    # ------------------------------------------------------------------------
+
+    def _successor_keys(self, node: _LaneNode) -> List[_LaneKey]:
+        road, section, lane = node.road, node.section, node.lane
+        if node.forward:
+            if section.index + 1 < len(road.sections):
+                lane_id = lane.successor if lane.successor is not None else lane.id
+                return [(road.id, section.index + 1, lane_id)]
+            link, lane_link = road.successor, lane.successor
+        else:
+            if section.index > 0:
+                lane_id = lane.predecessor if lane.predecessor is not None else lane.id
+                return [(road.id, section.index - 1, lane_id)]
+            link, lane_link = road.predecessor, lane.predecessor
+        if link is None:
+            return []
+        if link.element_type == "road":
+            other = self._opendrive.roads.get(link.element_id)
+            if other is None or lane_link is None:
+                return []
+            index = 0 if link.contact_point == "start" else len(other.sections) - 1
+            return [(other.id, index, lane_link)]
+        junction = self._opendrive.junctions.get(link.element_id)
+        if junction is None:
+            return []
+        keys = []
+        for incoming, connecting, contact_point, lane_links in junction.connections:
+            other = self._opendrive.roads.get(connecting)
+            if incoming != road.id or other is None:
+                continue
+            index = 0 if contact_point == "start" else len(other.sections) - 1
+            keys.extend((connecting, index, to_lane) for from_lane, to_lane in lane_links if from_lane == lane.id)
+        return keys
+
+    def _lane_position(self, node: _LaneNode, s: float) -> Tuple[Transform, float]:
+        """Transform of the lane center at `s` in CARLA coordinates and the width of the lane."""
+        x, y, z, hdg = node.road.reference(s)
+        t, width = node.section.lane_offset(node.lane.id, s)
+        yaw = -math.degrees(hdg) + (0.0 if node.forward else 180.0)
+        yaw = (yaw + 180.0) % 360.0 - 180.0
+        return Transform(Location(x - t * math.sin(hdg), -(y + t * math.cos(hdg)), z), Rotation(yaw=yaw)), width
+
+    def _walk(self, node: _LaneNode, s: float, distance: float, forward: bool) -> Iterator[Tuple[_LaneNode, float]]:
+        visited = 0
+        pending = [(node, s, distance)]
+        while pending:
+            node, s, distance = pending.pop()
+            available = node.remaining(s) if forward else node.travelled(s)
+            if distance <= available + _EPSILON or visited > 1000:
+                yield node, node.advance(s, min(distance, available) if forward else -min(distance, available))
+                continue
+            following = node.successors if forward else node.predecessors
+            if not following and available > _EPSILON:
+                yield node, node.exit if forward else node.entry
+            for other in reversed(following):
+                visited += 1
+                pending.append((other, other.entry if forward else other.exit, distance - available))
+
+    def _junction(self, junction_id: int) -> Junction:
+        junction = self._junctions.get(junction_id)
+        if junction is None:
+            junction = self._junctions[junction_id] = Junction(self, junction_id)
+        return junction
+
+    def _speed_limit(self, waypoint: Waypoint) -> float:
+        return waypoint._node.road.speed_limit(waypoint.s, _DEFAULT_SPEED_LIMIT)
+
+    def _signals(self) -> Iterator[Signal]:
+        for road in self._opendrive.roads.values():
+            yield from road.signals
+
+    def _signal_waypoints(self, signal: Signal) -> List[Waypoint]:
+        """Waypoints of the driving lanes that a signal faces."""
+        section = signal.road.section_at(signal.s)
+        negative = signal.orientation != "-"
+        return [Waypoint(self, self._nodes[(signal.road.id, section.index, lane.id)], signal.s)
+                for lane in section.lanes.values()
+                if lane.id != 0 and (lane.id < 0) == negative and lane.type & LaneType.Driving]
+
+    def _signal_transform(self, signal: Signal) -> Transform:
+        x, y, z, hdg = signal.road.reference(signal.s)
+        t = signal.road.lane_offset(signal.s) + signal.t
+        yaw = -math.degrees(hdg) + (0.0 if signal.orientation != "-" else 180.0)
+        return Transform(Location(x - t * math.sin(hdg), -(y + t * math.cos(hdg)), z + signal.z_offset),
+                         Rotation(yaw=yaw))
+
+    # ------------------------------------------------------------------------
+
+    def get_waypoint(self, location: Location, project_to_road: bool = True,
+                     lane_type: LaneType = LaneType.Driving) -> Optional[Waypoint]:
+        """The waypoint at the center of the closest lane of type `lane_type`."""
+        cell_x, cell_y = int(math.floor(location.x / _GRID_SIZE)), int(math.floor(location.y / _GRID_SIZE))
+        best = None
+        best_score = math.inf
+        radius = 0
+        min_x, max_x, min_y, max_y = self._grid_bounds
+        max_radius = max(cell_x - min_x, max_x - cell_x, cell_y - min_y, max_y - cell_y, 0)
+        while radius <= max_radius:
+            for dx in range(-radius, radius + 1):
+                for dy in range(-radius, radius + 1):
+                    if max(abs(dx), abs(dy)) != radius:
+                        continue
+                    for x, y, fx, fy, node, s in self._grid.get((cell_x + dx, cell_y + dy), ()):
+                        if not node.lane.type & lane_type:
+                            continue
+                        ox, oy = location.x - x, location.y - y
+                        along = ox * fx + oy * fy
+                        lateral = ox * fy - oy * fx
+                        overshoot = max(abs(along) - _SAMPLE_DISTANCE / 2, 0.0)
+                        score = lateral * lateral + overshoot * overshoot
+                        if score < best_score:
+                            best_score, best = score, (node, s, along)
+            # samples in the next ring are at least `radius` cells away
+            if best is not None and best_score <= max(radius * _GRID_SIZE - _SAMPLE_DISTANCE / 2, 0.0) ** 2:
+                break
+            radius += 1
+        if best is None:
+            return None
+        node, s, along = best
+        low, high = node.section.s, node.section.s_end
+        for _ in range(2):
+            s = min(max(s + (along if node.forward else -along), low), high)
+            transform, width = self._lane_position(node, s)
+            forward = transform.get_forward_vector()
+            along = (location.x - transform.location.x) * forward.x + (location.y - transform.location.y) * forward.y
+        waypoint = Waypoint(self, node, s)
+        if not project_to_road:
+            offset = location - waypoint.transform.location
+            forward = waypoint.transform.get_forward_vector()
+            if abs(offset.x * forward.y - offset.y * forward.x) > waypoint.lane_width / 2:
+                return None
+        return waypoint
+
+    def get_waypoint_xodr(self, road_id: int, lane_id: int, s: float) -> Optional[Waypoint]:
+        road = self._opendrive.roads.get(road_id)
+        if road is None or not 0 <= s <= road.length:
+            return None
+        node = self._nodes.get((road_id, road.section_at(s).index, lane_id))
+        return Waypoint(self, node, s) if node is not None else None
+
+    def get_topology(self) -> List[Tuple[Waypoint, Waypoint]]:
+        """Pairs of the first and last waypoint of each driving lane."""
+        return [(Waypoint(self, node, node.entry), Waypoint(self, node, node.exit))
+                for node in self._nodes.values() if node.lane.type & LaneType.Driving]
+
+    def generate_waypoints(self, distance: float) -> List[Waypoint]:
+        waypoints = []
+        for node in self._nodes.values():
+            if not node.lane.type & LaneType.Driving:
+                continue
+            travelled = 0.0
+            while travelled <= node.length:
+                waypoints.append(Waypoint(self, node, node.advance(node.entry, travelled)))
+                travelled += distance
+        return waypoints
+
+    def get_spawn_points(self) -> List[Transform]:
+        """Transforms on the driving lanes outside of junctions, every 25 meters."""
+        spawn_points = []
+        for waypoint in self.generate_waypoints(25.0):
+            if waypoint.is_junction or waypoint._node.remaining(waypoint.s) < 5.0:
+                continue
+            location = waypoint.transform.location
+            spawn_points.append(Transform(Location(location.x, location.y, location.z + 0.3),
+                                          Rotation(yaw=waypoint.transform.rotation.yaw)))
+        return spawn_points
+
+    def get_all_landmarks(self) -> list:
+        return []
+
+    def get_all_landmarks_of_type(self, landmark_type: str) -> list:  # noqa: ARG002
+        return []
+
+    def get_crosswalks(self) -> List[Location]:
+        return []
+
+    def to_opendrive(self) -> str:
+        return self._opendrive.xodr
+
+    def transform_to_geolocation(self, location: Location) -> GeoLocation:
+        """Simple equirectangular projection around latitude and longitude 0."""
+        earth_radius = 6378137.0
+        return GeoLocation(math.degrees(-location.y / earth_radius), math.degrees(location.x / earth_radius),
+                           location.z)
+
+    def __repr__(self) -> str:
+        return f"Map(name={self.name})"
@@ -0,0 +1,485 @@
+"""
+A reader for the parts of OpenDRIVE (.xodr) that CARLA uses to build its road network and
+a generator for a small synthetic map.
+
+Coordinates of this module are OpenDRIVE coordinates (right-handed, radians),
+:py:mod:`._map` converts them to CARLA's conventions.
+"""
+
+from __future__ import annotations
+
+import math
+import xml.etree.ElementTree as ET
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from ._types import LaneChange, LaneMarkingColor, LaneMarkingType, LaneType
+
+__all__ = ["OpenDrive", "ring_road_opendrive"]
+
+_TABLE_STEP = 0.1
+"""Resolution in meters of the geometries that are not evaluated analytically"""
+
+_LANE_TYPES = {
+    "none": LaneType.NONE, "driving": LaneType.Driving, "stop": LaneType.Stop, "shoulder": LaneType.Shoulder,
+    "biking": LaneType.Biking, "sidewalk": LaneType.Sidewalk, "walking": LaneType.Sidewalk,
+    "border": LaneType.Border, "restricted": LaneType.Restricted, "parking": LaneType.Parking,
+    "bidirectional": LaneType.Bidirectional, "median": LaneType.Median, "special1": LaneType.Special1,
+    "special2": LaneType.Special2, "special3": LaneType.Special3, "roadworks": LaneType.RoadWorks,
+    "tram": LaneType.Tram, "rail": LaneType.Rail, "entry": LaneType.Entry, "exit": LaneType.Exit,
+    "offramp": LaneType.OffRamp, "onramp": LaneType.OnRamp,
+}
+
+_MARKING_TYPES = {
+    "none": LaneMarkingType.NONE, "solid": LaneMarkingType.Solid, "broken": LaneMarkingType.Broken,
+    "solid solid": LaneMarkingType.SolidSolid, "solid broken": LaneMarkingType.SolidBroken,
+    "broken solid": LaneMarkingType.BrokenSolid, "broken broken": LaneMarkingType.BrokenBroken,
+    "botts dots": LaneMarkingType.BottsDots, "grass": LaneMarkingType.Grass, "curb": LaneMarkingType.Curb,
+}
+
+_MARKING_COLORS = {
+    "standard": LaneMarkingColor.Standard, "white": LaneMarkingColor.White, "blue": LaneMarkingColor.Blue,
+    "green": LaneMarkingColor.Green, "red": LaneMarkingColor.Red, "yellow": LaneMarkingColor.Yellow,
+}
+
+_CROSSABLE_MARKINGS = (LaneMarkingType.NONE, LaneMarkingType.Broken, LaneMarkingType.BrokenBroken,
+                       LaneMarkingType.BottsDots)
+
+
+def _float(element: ET.Element, name: str, default: float = 0.0) -> float:
+    value = element.get(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _poly(records: List[Tuple[float, float, float, float, float]], s: float) -> Tuple[float, float]:
+    """Value and derivative of the cubic polynomial records ``(s, a, b, c, d)`` at `s`."""
+    if not records:
+        return 0.0, 0.0
+    index = max(bisect_right(records, (s, math.inf)) - 1, 0)
+    start, a, b, c, d = records[index]
+    ds = s - start
+    return a + ds * (b + ds * (c + ds * d)), b + ds * (2 * c + 3 * d * ds)
+
+
+class _Geometry:
+    """A piece of the reference line; lines and arcs are exact, other shapes use a table."""
+
+    __slots__ = ("_curvature", "_table", "hdg", "length", "s", "x", "y")
+
+    def __init__(self, s: float, x: float, y: float, hdg: float, length: float, curvature: float = 0.0,
+                 table: Optional[List[Tuple[float, float, float]]] = None):
+        self.s = s
+        self.x = x
+        self.y = y
+        self.hdg = hdg
+        self.length = length
+        self._curvature = curvature
+        self._table = table
+
+    def evaluate(self, ds: float) -> Tuple[float, float, float]:
+        ds = min(max(ds, 0.0), self.length)
+        if self._table is not None:
+            position = ds / _TABLE_STEP
+            index = min(int(position), len(self._table) - 2)
+            fraction = position - index
+            x0, y0, h0 = self._table[index]
+            x1, y1, h1 = self._table[index + 1]
+            dh = (h1 - h0 + math.pi) % (2 * math.pi) - math.pi
+            return x0 + (x1 - x0) * fraction, y0 + (y1 - y0) * fraction, h0 + dh * fraction
+        k = self._curvature
+        if k == 0.0:
+            return self.x + ds * math.cos(self.hdg), self.y + ds * math.sin(self.hdg), self.hdg
+        hdg = self.hdg + k * ds
+        return (self.x + (math.sin(hdg) - math.sin(self.hdg)) / k,
+                self.y - (math.cos(hdg) - math.cos(self.hdg)) / k, hdg)
+
+    @classmethod
+    def spiral(cls, s: float, x: float, y: float, hdg: float, length: float, curv_start: float, curv_end: float):
+        rate = (curv_end - curv_start) / length if length else 0.0
+        steps = max(int(math.ceil(length / _TABLE_STEP)), 1)
+        table = [(x, y, hdg)]
+        px, py = x, y
+        for i in range(1, steps + 1):
+            u0, u1 = (i - 1) * _TABLE_STEP, min(i * _TABLE_STEP, length)
+            middle = (u0 + u1) / 2
+            heading = hdg + curv_start * middle + rate * middle * middle / 2
+            px += (u1 - u0) * math.cos(heading)
+            py += (u1 - u0) * math.sin(heading)
+            table.append((px, py, hdg + curv_start * u1 + rate * u1 * u1 / 2))
+        table.append(table[-1])
+        return cls(s, x, y, hdg, length, table=table)
+
+    @classmethod
+    def parametric(cls, s: float, x: float, y: float, hdg: float, length: float,
+                   u: Tuple[float, float, float, float], v: Tuple[float, float, float, float], p_max: float):
+        """Samples the local cubic curves ``u(p), v(p)`` and resamples them by arc length."""
+        cos_h, sin_h = math.cos(hdg), math.sin(hdg)
+        fine = max(int(math.ceil(length / _TABLE_STEP)) * 8, 8)
+        points = []
+        for i in range(fine + 1):
+            p = p_max * i / fine
+            lu = u[0] + p * (u[1] + p * (u[2] + p * u[3]))
+            lv = v[0] + p * (v[1] + p * (v[2] + p * v[3]))
+            du = u[1] + p * (2 * u[2] + 3 * u[3] * p)
+            dv = v[1] + p * (2 * v[2] + 3 * v[3] * p)
+            points.append((x + lu * cos_h - lv * sin_h, y + lu * sin_h + lv * cos_h, hdg + math.atan2(dv, du)))
+        table = [points[0]]
+        travelled, target, index = 0.0, _TABLE_STEP, 1
+        while index < len(points) and target <= length:
+            (x0, y0, h0), (x1, y1, h1) = points[index - 1], points[index]
+            segment = math.hypot(x1 - x0, y1 - y0)
+            if travelled + segment >= target and segment > 0:
+                fraction = (target - travelled) / segment
+                table.append((x0 + (x1 - x0) * fraction, y0 + (y1 - y0) * fraction, h0 + (h1 - h0) * fraction))
+                target += _TABLE_STEP
+                continue
+            travelled += segment
+            index += 1
+        table.append(points[-1])
+        table.append(points[-1])
+        return cls(s, x, y, hdg, length, table=table)
+
+
+class RoadMark:
+    __slots__ = ("color", "lane_change", "s_offset", "type", "width")
+
+    def __init__(self, s_offset: float, marking_type: LaneMarkingType, color: LaneMarkingColor,
+                 lane_change: Optional[str], width: float):
+        self.s_offset = s_offset
+        self.type = marking_type
+        self.color = color
+        self.width = width
+        if lane_change is None:
+            self.lane_change = LaneChange.Both if marking_type in _CROSSABLE_MARKINGS else LaneChange.NONE
+        else:
+            # increase / decrease refer to the lane ids, both directions are treated the same here
+            self.lane_change = LaneChange.NONE if lane_change == "none" else LaneChange.Both
+
+
+class Lane:
+    __slots__ = ("id", "predecessor", "road_marks", "successor", "type", "widths")
+
+    def __init__(self, lane_id: int, lane_type: LaneType):
+        self.id = lane_id
+        self.type = lane_type
+        self.widths: List[Tuple[float, float, float, float, float]] = []
+        self.road_marks: List[RoadMark] = []
+        self.predecessor: Optional[int] = None
+        self.successor: Optional[int] = None
+
+    def width(self, ds: float) -> float:
+        return max(_poly(self.widths, ds)[0], 0.0)
+
+    def road_mark(self, ds: float) -> Optional[RoadMark]:
+        mark = None
+        for candidate in self.road_marks:
+            if candidate.s_offset > ds:
+                break
+            mark = candidate
+        return mark
+
+
+class LaneSection:
+    __slots__ = ("index", "lanes", "road", "s", "s_end")
+
+    def __init__(self, road: Road, index: int, s: float):
+        self.road = road
+        self.index = index
+        self.s = s
+        self.s_end = s
+        self.lanes: Dict[int, Lane] = {}
+
+    def lane_offset(self, lane_id: int, s: float) -> Tuple[float, float]:
+        """Lateral position of the center of the lane and its width; positive is left of the reference line."""
+        ds = s - self.s
+        sign = 1 if lane_id > 0 else -1
+        inner = 0.0
+        for i in range(1, abs(lane_id)):
+            lane = self.lanes.get(sign * i)
+            if lane is not None:
+                inner += lane.width(ds)
+        width = self.lanes[lane_id].width(ds)
+        return self.road.lane_offset(s) + sign * (inner + width / 2), width
+
+
+class RoadLink:
+    __slots__ = ("contact_point", "element_id", "element_type")
+
+    def __init__(self, element: ET.Element):
+        self.element_type = element.get("elementType", "road")
+        self.element_id = int(element.get("elementId"))
+        self.contact_point = element.get("contactPoint", "start")
+
+
+class Road:
+
+    def __init__(self, road_id: int, length: float, junction: int, name: str = ""):
+        self.id = road_id
+        self.length = length
+        self.junction = junction
+        self.name = name
+        self.geometries: List[_Geometry] = []
+        self.lane_offsets: List[Tuple[float, float, float, float, float]] = []
+        self.elevations: List[Tuple[float, float, float, float, float]] = []
+        self.sections: List[LaneSection] = []
+        self.speeds: List[Tuple[float, float]] = []
+        """Pairs of start and speed limit in km/h"""
+        self.signals: List[Signal] = []
+        self.predecessor: Optional[RoadLink] = None
+        self.successor: Optional[RoadLink] = None
+        self._geometry_starts: List[float] = []
+
+    def reference(self, s: float) -> Tuple[float, float, float, float]:
+        """Position ``(x, y, z, heading)`` of the reference line."""
+        index = max(bisect_right(self._geometry_starts, s) - 1, 0)
+        geometry = self.geometries[index]
+        x, y, hdg = geometry.evaluate(s - geometry.s)
+        return x, y, _poly(self.elevations, s)[0], hdg
+
+    def lane_offset(self, s: float) -> float:
+        return _poly(self.lane_offsets, s)[0]
+
+    def section_at(self, s: float) -> LaneSection:
+        index = 0
+        for section in self.sections:
+            if section.s > s:
+                break
+            index = section.index
+        return self.sections[index]
+
+    def speed_limit(self, s: float, default: float) -> float:
+        limit = default
+        for start, speed in self.speeds:
+            if start > s:
+                break
+            limit = speed
+        return limit
+
+
+class Junction:
+
+    def __init__(self, junction_id: int, name: str = ""):
+        self.id = junction_id
+        self.name = name
+        self.connections: List[Tuple[int, int, str, List[Tuple[int, int]]]] = []
+        """Tuples ``(incoming road, connecting road, contact point, [(from lane, to lane), ...])``"""
+
+
+class Signal:
+    __slots__ = ("dynamic", "id", "name", "orientation", "road", "s", "subtype", "t", "type", "z_offset")
+
+    def __init__(self, road: Road, element: ET.Element):
+        self.road = road
+        self.id = element.get("id", "")
+        self.name = element.get("name", "")
+        self.s = _float(element, "s")
+        self.t = _float(element, "t")
+        self.z_offset = _float(element, "zOffset")
+        self.orientation = element.get("orientation", "+")
+        self.dynamic = element.get("dynamic", "no") == "yes"
+        self.type = element.get("type", "")
+        self.subtype = element.get("subtype", "")
+
+    @property
+    def is_traffic_light(self) -> bool:
+        return self.dynamic and self.type == "1000001"
+
+
+class OpenDrive:
+    """The roads, lanes, junctions and signals of an OpenDRIVE document."""
+
+    def __init__(self, xodr: str):
+        self.xodr = xodr
+        self.roads: Dict[int, Road] = {}
+        self.junctions: Dict[int, Junction] = {}
+        root = ET.fromstring(xodr)
+        header = root.find("header")
+        self.name = header.get("name", "") if header is not None else ""
+        for element in root.iter("road"):
+            road = self._parse_road(element)
+            self.roads[road.id] = road
+        for element in root.iter("junction"):
+            junction = Junction(int(element.get("id")), element.get("name", ""))
+            for connection in element.iter("connection"):
+                lane_links = [(int(link.get("from")), int(link.get("to"))) for link in connection.iter("laneLink")]
+                junction.connections.append((int(connection.get("incomingRoad")),
+                                             int(connection.get("connectingRoad")),
+                                             connection.get("contactPoint", "start"), lane_links))
+            self.junctions[junction.id] = junction
+
+    @staticmethod
+    def _parse_road(element: ET.Element) -> Road:
+        road = Road(int(element.get("id")), _float(element, "length"), int(element.get("junction", "-1")),
+                    element.get("name", ""))
+        link = element.find("link")
+        if link is not None:
+            if link.find("predecessor") is not None:
+                road.predecessor = RoadLink(link.find("predecessor"))
+            if link.find("successor") is not None:
+                road.successor = RoadLink(link.find("successor"))
+        for road_type in element.findall("type"):
+            speed = road_type.find("speed")
+            if speed is not None and speed.get("max") not in (None, "no limit", "undefined"):
+                factor = {"m/s": 3.6, "mph": 1.609344}.get(speed.get("unit", "km/h"), 1.0)
+                road.speeds.append((_float(road_type, "s"), float(speed.get("max")) * factor))
+        for geometry in element.iter("geometry"):
+            s, x, y, hdg, length = (_float(geometry, name) for name in ("s", "x", "y", "hdg", "length"))
+            shape = geometry[0] if len(geometry) else None
+            tag = shape.tag if shape is not None else "line"
+            if tag == "arc":
+                road.geometries.append(_Geometry(s, x, y, hdg, length, _float(shape, "curvature")))
+            elif tag == "spiral":
+                road.geometries.append(_Geometry.spiral(s, x, y, hdg, length, _float(shape, "curvStart"),
+                                                        _float(shape, "curvEnd")))
+            elif tag == "poly3":
+                coefficients = tuple(_float(shape, name) for name in "abcd")
+                # v(u) with u along the heading, u is approximately the arc length
+                road.geometries.append(_Geometry.parametric(s, x, y, hdg, length, (0.0, 1.0, 0.0, 0.0),
+                                                            coefficients, length))
+            elif tag == "paramPoly3":
+                u = tuple(_float(shape, name) for name in ("aU", "bU", "cU", "dU"))
+                v = tuple(_float(shape, name) for name in ("aV", "bV", "cV", "dV"))
+                p_max = 1.0 if shape.get("pRange", "arcLength") == "normalized" else length
+                road.geometries.append(_Geometry.parametric(s, x, y, hdg, length, u, v, p_max))
+            else:
+                road.geometries.append(_Geometry(s, x, y, hdg, length))
+        road.geometries.sort(key=lambda g: g.s)
+        road._geometry_starts = [g.s for g in road.geometries]
+        road.elevations = sorted(tuple(_float(e, name) for name in ("s", "a", "b", "c", "d"))  # type: ignore[misc]
+                                 for e in element.iter("elevation"))
+        lanes = element.find("lanes")
+        if lanes is None:
+            return road
+        road.lane_offsets = sorted(tuple(_float(e, name) for name in ("s", "a", "b", "c", "d"))  # type: ignore[misc]
+                                   for e in lanes.findall("laneOffset"))
+        for index, section_element in enumerate(sorted(lanes.findall("laneSection"), key=lambda e: _float(e, "s"))):
+            section = LaneSection(road, index, _float(section_element, "s"))
+            for lane_element in section_element.iter("lane"):
+                lane = Lane(int(lane_element.get("id")), _LANE_TYPES.get(lane_element.get("type", "none").lower(),
+                                                                         LaneType.NONE))
+                lane.widths = sorted(tuple(_float(w, name)  # type: ignore[misc]
+                                           for name in ("sOffset", "a", "b", "c", "d"))
+                                     for w in lane_element.findall("width"))
+                for mark in lane_element.findall("roadMark"):
+                    lane.road_marks.append(RoadMark(_float(mark, "sOffset"),
+                                                    _MARKING_TYPES.get(mark.get("type", "none"), LaneMarkingType.Other),
+                                                    _MARKING_COLORS.get(mark.get("color", "standard"),
+                                                                        LaneMarkingColor.Other),
+                                                    mark.get("laneChange"), _float(mark, "width")))
+                lane.road_marks.sort(key=lambda m: m.s_offset)
+                lane_link = lane_element.find("link")
+                if lane_link is not None:
+                    if lane_link.find("predecessor") is not None:
+                        lane.predecessor = int(lane_link.find("predecessor").get("id"))
+                    if lane_link.find("successor") is not None:
+                        lane.successor = int(lane_link.find("successor").get("id"))
+                section.lanes[lane.id] = lane
+            road.sections.append(section)
+        for section, following in zip(road.sections, road.sections[1:]):
+            section.s_end = following.s
+        if road.sections:
+            road.sections[-1].s_end = road.length
+        signals = element.find("signals")
+        if signals is not None:
+            road.signals = [Signal(road, signal) for signal in signals.findall("signal")]
+        return road
+
+
+# ---------------------------------------------------------------------------
+# Synthetic map
+
+def _lane_xml(lane_id: int, lane_type: str, width: float, mark: str, color: str = "standard") -> str:
+    link = f'<link><predecessor id="{lane_id}"/><successor id="{lane_id}"/></link>' if lane_id else ""
+    width_xml = f'<width sOffset="0" a="{width}" b="0" c="0" d="0"/>' if lane_id else ""
+    return (f'<lane id="{lane_id}" type="{lane_type}" level="false">{link}{width_xml}'
+            f'<roadMark sOffset="0" type="{mark}" color="{color}" width="0.15"/></lane>')
+
+
+def ring_road_opendrive(length: float = 300.0, width: float = 200.0, radius: float = 30.0, lanes: int = 2,
+                        lane_width: float = 3.5, speed: float = 50.0, traffic_lights: bool = True,
+                        name: str = "Ring") -> str:
+    """
+    Creates a rectangular ring road with rounded corners and `lanes` lanes per direction.
+
+    The ring consists of four straight roads and four arcs, the arcs are junctions like the
+    corners of a town. Each road has sidewalks on both sides. With `traffic_lights` there is a traffic light
+    for each direction in the middle of the first and the fifth road.
+
+    Args:
+        length: Extent of the ring along x in meters.
+        width: Extent of the ring along y in meters.
+        radius: Radius of the corners.
+        lanes: Driving lanes per direction.
+        lane_width: Width of the driving lanes.
+        speed: Speed limit in km/h.
+        traffic_lights: Adds traffic light signals.
+        name: Name of the map.
+
+    Returns:
+        The map as OpenDRIVE document.
+    """
+    if min(length, width) <= 2 * radius:
+        raise ValueError("length and width have to be larger than two times the radius")
+    pieces = []
+    x, y, hdg = radius, 0.0, 0.0
+    for straight in (length - 2 * radius, width - 2 * radius) * 2:
+        pieces.append((x, y, hdg, straight, 0.0))
+        x, y = x + straight * math.cos(hdg), y + straight * math.sin(hdg)
+        arc = math.pi / 2 * radius
+        pieces.append((x, y, hdg, arc, 1 / radius))
+        x, y = x + radius * (math.cos(hdg) - math.sin(hdg)), y + radius * (math.sin(hdg) + math.cos(hdg))
+        hdg += math.pi / 2
+
+    roads = []
+    junctions = []
+    count = len(pieces)
+    for index, (x, y, hdg, piece_length, curvature) in enumerate(pieces):
+        road_id = index + 1
+        predecessor = (index - 1) % count + 1
+        successor = (index + 1) % count + 1
+        # the corners are junctions with a single connection per direction
+        if curvature:
+            junction_id = 100 + road_id
+            links = (f'<predecessor elementType="road" elementId="{predecessor}" contactPoint="end"/>'
+                     f'<successor elementType="road" elementId="{successor}" contactPoint="start"/>')
+            driving = range(1, lanes + 1)
+            junctions.append(
+                f'<junction id="{junction_id}" name="Corner {road_id}">'
+                f'<connection id="0" incomingRoad="{predecessor}" connectingRoad="{road_id}" contactPoint="start">'
+                + "".join(f'<laneLink from="{-lane}" to="{-lane}"/>' for lane in driving) + "</connection>"
+                f'<connection id="1" incomingRoad="{successor}" connectingRoad="{road_id}" contactPoint="end">'
+                + "".join(f'<laneLink from="{lane}" to="{lane}"/>' for lane in driving) + "</connection></junction>")
+        else:
+            junction_id = -1
+            links = (f'<predecessor elementType="junction" elementId="{100 + predecessor}"/>'
+                     f'<successor elementType="junction" elementId="{100 + successor}"/>')
+        shape = f'<arc curvature="{curvature!r}"/>' if curvature else "<line/>"
+        left = [_lane_xml(lanes + 1, "sidewalk", 2.0, "curb")]
+        right = []
+        for lane in range(lanes, 0, -1):
+            left.append(_lane_xml(lane, "driving", lane_width, "solid" if lane == lanes else "broken"))
+        for lane in range(1, lanes + 1):
+            right.append(_lane_xml(-lane, "driving", lane_width, "solid" if lane == lanes else "broken"))
+        right.append(_lane_xml(-lanes - 1, "sidewalk", 2.0, "curb"))
+        signals = ""
+        if traffic_lights and road_id in (1, 5):
+            offset = lanes * lane_width + 1.0
+            signals = "<signals>" + "".join(
+                f'<signal s="{piece_length / 2 + shift!r}" t="{t!r}" id="{road_id}{suffix}" name="TrafficLight" '
+                f'dynamic="yes" orientation="{orientation}" zOffset="3" type="1000001" subtype="-1" '
+                f'country="OpenDRIVE"/>'
+                for orientation, t, shift, suffix in (("+", -offset, -2.0, "0"), ("-", offset, 2.0, "1"))
+            ) + "</signals>"
+        roads.append(
+            f'<road name="Road {road_id}" length="{piece_length!r}" id="{road_id}" junction="{junction_id}">'
+            f'<link>{links}</link>'
+            f'<type s="0" type="town"><speed max="{speed!r}" unit="km/h"/></type>'
+            f'<planView><geometry s="0" x="{x!r}" y="{y!r}" hdg="{hdg!r}" length="{piece_length!r}">{shape}'
+            f'</geometry></planView>'
+            f'<elevationProfile><elevation s="0" a="0" b="0" c="0" d="0"/></elevationProfile>'
+            f'<lanes><laneSection s="0"><left>{"".join(left)}</left>'
+            f'<center>{_lane_xml(0, "none", 0.0, "solid solid", "yellow")}</center>'
+            f'<right>{"".join(right)}</right></laneSection></lanes>{signals}</road>')
+    return ('<?xml version="1.0" standalone="yes"?>\n<OpenDRIVE>'
+            f'<header revMajor="1" revMinor="4" name="{name}" version="1.00"/>' + "".join(roads) + "".join(junctions)
+            + "</OpenDRIVE>")
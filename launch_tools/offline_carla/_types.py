@@ -0,0 +1,218 @@
+"""Enumerations, controls and small data classes of the carla module."""
+
+from __future__ import annotations
+
+from enum import IntEnum, IntFlag
+from typing import Optional
+
+from ._geometry import Vector3D
+
+__all__ = [
+    "AttachmentType",
+    "LaneChange",
+    "LaneMarking",
+    "LaneMarkingColor",
+    "LaneMarkingType",
+    "LaneType",
+    "TrafficLightState",
+    "VehicleControl",
+    "VehicleLightState",
+    "VehiclePhysicsControl",
+    "WalkerControl",
+    "WeatherParameters",
+    "WheelPhysicsControl",
+]
+
+
+class LaneType(IntFlag):
+    NONE = 0x1
+    Driving = 0x1 << 1
+    Stop = 0x1 << 2
+    Shoulder = 0x1 << 3
+    Biking = 0x1 << 4
+    Sidewalk = 0x1 << 5
+    Border = 0x1 << 6
+    Restricted = 0x1 << 7
+    Parking = 0x1 << 8
+    Bidirectional = 0x1 << 9
+    Median = 0x1 << 10
+    Special1 = 0x1 << 11
+    Special2 = 0x1 << 12
+    Special3 = 0x1 << 13
+    RoadWorks = 0x1 << 14
+    Tram = 0x1 << 15
+    Rail = 0x1 << 16
+    Entry = 0x1 << 17
+    Exit = 0x1 << 18
+    OffRamp = 0x1 << 19
+    OnRamp = 0x1 << 20
+    Any = 0xFFFFFFFE
+
+
+class LaneChange(IntFlag):
+    NONE = 0
+    Right = 1
+    Left = 2
+    Both = 3
+
+
+class LaneMarkingType(IntEnum):
+    NONE = 0
+    Other = 1
+    Broken = 2
+    Solid = 3
+    SolidSolid = 4
+    SolidBroken = 5
+    BrokenSolid = 6
+    BrokenBroken = 7
+    BottsDots = 8
+    Grass = 9
+    Curb = 10
+
+
+class LaneMarkingColor(IntEnum):
+    Standard = 0
+    Blue = 1
+    Green = 2
+    Red = 3
+    White = 0
+    Yellow = 4
+    Other = 5
+
+
+class TrafficLightState(IntEnum):
+    Red = 0
+    Yellow = 1
+    Green = 2
+    Off = 3
+    Unknown = 4
+
+
+class VehicleLightState(IntFlag):
+    NONE = 0
+    Position = 0x1
+    LowBeam = 0x1 << 1
+    HighBeam = 0x1 << 2
+    Brake = 0x1 << 3
+    RightBlinker = 0x1 << 4
+    LeftBlinker = 0x1 << 5
+    Reverse = 0x1 << 6
+    Fog = 0x1 << 7
+    Interior = 0x1 << 8
+    Special1 = 0x1 << 9
+    Special2 = 0x1 << 10
+    All = 0xFFFFFFFF
+
+
+class AttachmentType(IntEnum):
+    Rigid = 0
+    SpringArm = 1
+    SpringArmGhost = 2
+
+
+class LaneMarking:
+    __slots__ = ("color", "lane_change", "type", "width")
+
+    def __init__(self, marking_type: LaneMarkingType = LaneMarkingType.NONE,
+                 color: LaneMarkingColor = LaneMarkingColor.Standard,
+                 lane_change: LaneChange = LaneChange.NONE, width: float = 0.0):
+        self.type = marking_type
+        self.color = color
+        self.lane_change = lane_change
+        self.width = width
+
+    def __repr__(self) -> str:
+        return f"LaneMarking(type={self.type.name}, color={self.color.name}, lane_change={self.lane_change!r})"
+
+
+class VehicleControl:
+    __slots__ = ("brake", "gear", "hand_brake", "manual_gear_shift", "reverse", "steer", "throttle")
+
+    def __init__(self, throttle: float = 0.0, steer: float = 0.0, brake: float = 0.0, hand_brake: bool = False,
+                 reverse: bool = False, manual_gear_shift: bool = False, gear: int = 0):
+        self.throttle = throttle
+        self.steer = steer
+        self.brake = brake
+        self.hand_brake = hand_brake
+        self.reverse = reverse
+        self.manual_gear_shift = manual_gear_shift
+        self.gear = gear
+
+    def _copy(self) -> VehicleControl:
+        return VehicleControl(self.throttle, self.steer, self.brake, self.hand_brake, self.reverse,
+                              self.manual_gear_shift, self.gear)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, VehicleControl):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (f"VehicleControl(throttle={self.throttle:.6f}, steer={self.steer:.6f}, brake={self.brake:.6f}, "
+                f"hand_brake={self.hand_brake}, reverse={self.reverse}, manual_gear_shift={self.manual_gear_shift}, "
+                f"gear={self.gear})")
+
+
+class WalkerControl:
+    __slots__ = ("direction", "jump", "speed")
+
+    def __init__(self, direction: Optional[Vector3D] = None, speed: float = 0.0, jump: bool = False):
+        self.direction = direction if direction is not None else Vector3D(1.0, 0.0, 0.0)
+        self.speed = speed
+        self.jump = jump
+
+    def __repr__(self) -> str:
+        return f"WalkerControl(direction={self.direction}, speed={self.speed:.6f}, jump={self.jump})"
+
+
+class WheelPhysicsControl:
+
+    def __init__(self, max_steer_angle: float = 70.0, radius: float = 37.0, tire_friction: float = 3.5):
+        self.max_steer_angle = max_steer_angle
+        self.radius = radius
+        self.tire_friction = tire_friction
+
+
+class VehiclePhysicsControl:
+    """Only the values that the kinematic model uses."""
+
+    def __init__(self, mass: float = 1500.0, max_steer_angle: float = 40.0, wheelbase: float = 2.9,
+                 max_acceleration: float = 4.0, max_deceleration: float = 8.0):
+        self.mass = mass
+        self.wheelbase = wheelbase
+        """Distance of the axles in meters"""
+        self.max_acceleration = max_acceleration
+        """Acceleration in m/s^2 at full throttle"""
+        self.max_deceleration = max_deceleration
+        """Deceleration in m/s^2 at full brake"""
+        self.wheels = [WheelPhysicsControl(max_steer_angle), WheelPhysicsControl(max_steer_angle),
+                       WheelPhysicsControl(0.0), WheelPhysicsControl(0.0)]
+
+
+class WeatherParameters:
+
+    def __init__(self, cloudiness: float = 0.0, precipitation: float = 0.0, precipitation_deposits: float = 0.0,
+                 wind_intensity: float = 0.0, sun_azimuth_angle: float = 0.0, sun_altitude_angle: float = 0.0,
+                 fog_density: float = 0.0, fog_distance: float = 0.0, wetness: float = 0.0):
+        self.cloudiness = cloudiness
+        self.precipitation = precipitation
+        self.precipitation_deposits = precipitation_deposits
+        self.wind_intensity = wind_intensity
+        self.sun_azimuth_angle = sun_azimuth_angle
+        self.sun_altitude_angle = sun_altitude_angle
+        self.fog_density = fog_density
+        self.fog_distance = fog_distance
+        self.wetness = wetness
+
+    def __repr__(self) -> str:
+        return "WeatherParameters({})".format(", ".join(f"{key}={value}" for key, value in vars(self).items()))
+
+
+WeatherParameters.Default = WeatherParameters(sun_altitude_angle=45.0)  # type: ignore[attr-defined]
+WeatherParameters.ClearNoon = WeatherParameters(cloudiness=5.0, sun_altitude_angle=45.0)  # type: ignore[attr-defined]
+WeatherParameters.CloudyNoon = WeatherParameters(cloudiness=60.0, sun_altitude_angle=45.0)  # type: ignore[attr-defined]
+WeatherParameters.WetNoon = WeatherParameters(cloudiness=5.0, wetness=50.0, sun_altitude_angle=45.0)  # type: ignore[attr-defined]
+WeatherParameters.ClearSunset = WeatherParameters(cloudiness=5.0, sun_altitude_angle=15.0)  # type: ignore[attr-defined]
+WeatherParameters.ClearNight = WeatherParameters(cloudiness=5.0, sun_altitude_angle=-90.0)  # type: ignore[attr-defined]
@@ -0,0 +1,1318 @@
+"""
+Actors, the :py:class:`World` and the :py:class:`Client`.
+
+Vehicles follow a kinematic bicycle model, walkers move with their control, traffic lights
+cycle through their states. Each tick advances the simulation by
+:py:attr:`WorldSettings.fixed_delta_seconds` (default 0.05 s), independent of the wall clock.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import os
+import random
+from fnmatch import fnmatchcase
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from . import command as _command
+from ._geometry import BoundingBox, Color, GeoLocation, Location, Rotation, Transform, Vector3D
+from ._map import Map, Waypoint
+from ._opendrive import ring_road_opendrive
+from ._types import (
+    AttachmentType,
+    LaneType,
+    TrafficLightState,
+    VehicleControl,
+    VehicleLightState,
+    VehiclePhysicsControl,
+    WalkerControl,
+    WeatherParameters,
+)
+
+__all__ = [
+    "Actor",
+    "ActorAttribute",
+    "ActorBlueprint",
+    "ActorList",
+    "ActorSnapshot",
+    "BlueprintLibrary",
+    "Client",
+    "CollisionEvent",
+    "DebugHelper",
+    "GnssMeasurement",
+    "IMUMeasurement",
+    "Sensor",
+    "SensorData",
+    "Timestamp",
+    "TrafficLight",
+    "TrafficManager",
+    "Vehicle",
+    "Walker",
+    "WalkerAIController",
+    "World",
+    "WorldSettings",
+    "WorldSnapshot",
+]
+
+_DEFAULT_DELTA_SECONDS = 0.05
+_TOP_SPEED = 50.0
+"""Speed in m/s at which the throttle does not accelerate anymore"""
+_ROLLING_RESISTANCE = 0.3
+_DRAG = 0.0004
+_SPAWN_YAW_NOISE = 0.01
+"""
+Largest yaw offset in degrees of a spawned vehicle, see :py:meth:`Vehicle._settle`.
+"""
+
+# ---------------------------------------------------------------------------
+# Blueprints
+
+
+class ActorAttribute:
+
+    def __init__(self, attribute_id: str, value: str, recommended_values: Sequence[str] = (),
+                 is_modifiable: bool = True):
+        self.id = attribute_id
+        self.type = "string"
+        self.recommended_values = list(recommended_values)
+        self.is_modifiable = is_modifiable
+        self._value = value
+
+    def as_str(self) -> str:
+        return self._value
+
+    def as_bool(self) -> bool:
+        return self._value.lower() in ("true", "1")
+
+    def as_int(self) -> int:
+        return int(self._value)
+
+    def as_float(self) -> float:
+        return float(self._value)
+
+    def as_color(self) -> Color:
+        r, g, b = (int(part) for part in self._value.split(","))
+        return Color(r, g, b)
+
+    def __str__(self) -> str:
+        return self._value
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ActorAttribute):
+            return self._value == other._value
+        if isinstance(other, bool):
+            return self.as_bool() == other
+        return self._value == str(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"ActorAttribute(id={self.id}, value={self._value})"
+
+
+class ActorBlueprint:
+
+    def __init__(self, blueprint_id: str, tags: Sequence[str], attributes: Sequence[ActorAttribute],
+                 extent: Tuple[float, float, float] = (0.0, 0.0, 0.0)):
+        self.id = blueprint_id
+        self.tags = list(tags)
+        self._attributes = {attribute.id: attribute for attribute in attributes}
+        self._extent = extent
+
+    def has_attribute(self, attribute_id: str) -> bool:
+        return attribute_id in self._attributes
+
+    def get_attribute(self, attribute_id: str) -> ActorAttribute:
+        try:
+            return self._attributes[attribute_id]
+        except KeyError:
+            raise IndexError(f"blueprint '{self.id}' does not have the attribute '{attribute_id}'") from None
+
+    def set_attribute(self, attribute_id: str, value: str) -> None:
+        attribute = self.get_attribute(attribute_id)
+        if not attribute.is_modifiable:
+            raise IndexError(f"attribute '{attribute_id}' of '{self.id}' is not modifiable")
+        self._attributes[attribute_id] = ActorAttribute(attribute_id, str(value), attribute.recommended_values)
+
+    def has_tag(self, tag: str) -> bool:
+        return tag in self.tags
+
+    def matches_tags(self, wildcard_pattern: str) -> bool:
+        return any(fnmatchcase(tag, wildcard_pattern) for tag in self.tags)
+
+    def _copy(self) -> ActorBlueprint:
+        return ActorBlueprint(self.id, self.tags, list(self._attributes.values()), self._extent)
+
+    def __iter__(self) -> Iterator[ActorAttribute]:
+        return iter(list(self._attributes.values()))
+
+    def __len__(self) -> int:
+        return len(self._attributes)
+
+    def __repr__(self) -> str:
+        return f"ActorBlueprint(id={self.id}, tags={self.tags})"
+
+
+class BlueprintLibrary:
+
+    def __init__(self, blueprints: Iterable[ActorBlueprint]):
+        self._blueprints = list(blueprints)
+
+    def find(self, blueprint_id: str) -> ActorBlueprint:
+        for blueprint in self._blueprints:
+            if blueprint.id == blueprint_id:
+                return blueprint._copy()
+        raise IndexError(f"blueprint '{blueprint_id}' not found")
+
+    def filter(self, wildcard_pattern: str) -> BlueprintLibrary:
+        return BlueprintLibrary(blueprint for blueprint in self._blueprints
+                                if fnmatchcase(blueprint.id, wildcard_pattern)
+                                or blueprint.matches_tags(wildcard_pattern))
+
+    def filter_by_attribute(self, name: str, value: str) -> BlueprintLibrary:
+        return BlueprintLibrary(blueprint for blueprint in self._blueprints
+                                if blueprint.has_attribute(name) and blueprint.get_attribute(name) == value)
+
+    def __getitem__(self, index: int) -> ActorBlueprint:
+        return self._blueprints[index]._copy()
+
+    def __iter__(self) -> Iterator[ActorBlueprint]:
+        return (blueprint._copy() for blueprint in self._blueprints)
+
+    def __len__(self) -> int:
+        return len(self._blueprints)
+
+    def __repr__(self) -> str:
+        return f"BlueprintLibrary({[blueprint.id for blueprint in self._blueprints]})"
+
+
+_COLORS = ("255,255,255", "0,0,0", "180,20,20", "20,60,180", "120,120,120", "220,200,40")
+
+_VEHICLE_BLUEPRINTS = (
+    # id, extent, base type, number of wheels, generation
+    ("vehicle.tesla.model3", (2.40, 1.08, 0.75), "car", 4, 2),
+    ("vehicle.lincoln.mkz_2020", (2.45, 1.07, 0.75), "car", 4, 2),
+    ("vehicle.audi.a2", (1.85, 0.90, 0.78), "car", 4, 1),
+    ("vehicle.nissan.patrol_2021", (2.78, 1.07, 1.06), "car", 4, 2),
+    ("vehicle.carlamotors.carlacola", (2.60, 1.28, 1.28), "truck", 4, 1),
+    ("vehicle.kawasaki.ninja", (1.02, 0.40, 0.72), "motorcycle", 2, 1),
+    ("vehicle.diamondback.century", (0.82, 0.19, 0.55), "bicycle", 2, 1),
+)
+
+_SENSOR_BLUEPRINTS = (
+    "sensor.camera.rgb", "sensor.camera.depth", "sensor.camera.semantic_segmentation",
+    "sensor.camera.instance_segmentation", "sensor.camera.dvs", "sensor.camera.optical_flow",
+    "sensor.lidar.ray_cast", "sensor.lidar.ray_cast_semantic", "sensor.other.radar",
+    "sensor.other.collision", "sensor.other.lane_invasion", "sensor.other.obstacle", "sensor.other.gnss",
+    "sensor.other.imu", "sensor.other.rss",
+)
+
+
+def _create_blueprints() -> List[ActorBlueprint]:
+    blueprints = []
+    for blueprint_id, extent, base_type, wheels, generation in _VEHICLE_BLUEPRINTS:
+        blueprints.append(ActorBlueprint(blueprint_id, blueprint_id.split(".")[1:], [
+            ActorAttribute("role_name", "autopilot"),
+            ActorAttribute("color", _COLORS[len(blueprints) % len(_COLORS)], _COLORS),
+            ActorAttribute("number_of_wheels", str(wheels), is_modifiable=False),
+            ActorAttribute("generation", str(generation), is_modifiable=False),
+            ActorAttribute("base_type", base_type, is_modifiable=False),
+            ActorAttribute("has_lights", "true", is_modifiable=False),
+            ActorAttribute("sticky_control", "true"),
+            ActorAttribute("terramechanics", "false"),
+        ], extent))
+    for number in ("0001", "0002", "0003"):
+        blueprints.append(ActorBlueprint(f"walker.pedestrian.{number}", ["pedestrian", number], [
+            ActorAttribute("role_name", "walker"),
+            ActorAttribute("is_invincible", "true"),
+            ActorAttribute("speed", "1.4", ("1.4", "2.8"), is_modifiable=False),
+            ActorAttribute("generation", "1", is_modifiable=False),
+            ActorAttribute("age", "adult", is_modifiable=False),
+        ], (0.18, 0.18, 0.93)))
+    blueprints.append(ActorBlueprint("controller.ai.walker", ["ai", "walker"], [ActorAttribute("role_name", "")]))
+    for blueprint_id in _SENSOR_BLUEPRINTS:
+        attributes = [ActorAttribute("role_name", "front"), ActorAttribute("sensor_tick", "0.0")]
+        if ".camera." in blueprint_id:
+            attributes += [ActorAttribute("image_size_x", "800"), ActorAttribute("image_size_y", "600"),
+                           ActorAttribute("fov", "90.0"), ActorAttribute("gamma", "2.2"),
+                           ActorAttribute("lens_circle_multiplier", "0.0"),
+                           ActorAttribute("lens_circle_falloff", "5.0")]
+        elif ".lidar." in blueprint_id:
+            attributes += [ActorAttribute("range", "50"), ActorAttribute("channels", "32"),
+                           ActorAttribute("points_per_second", "56000"), ActorAttribute("rotation_frequency", "10")]
+        blueprints.append(ActorBlueprint(blueprint_id, blueprint_id.split(".")[1:], attributes))
+    for blueprint_id, extent in (("static.prop.constructioncone", (0.17, 0.17, 0.36)),
+                                 ("static.prop.trafficcone01", (0.23, 0.23, 0.55)),
+                                 ("static.prop.streetbarrier", (0.5, 0.17, 0.5)),
+                                 ("static.prop.warningconstruction", (0.4, 0.5, 1.1))):
+        blueprints.append(ActorBlueprint(blueprint_id, ["prop", blueprint_id.split(".")[-1]], [
+            ActorAttribute("role_name", "prop"), ActorAttribute("size", "small", is_modifiable=False)], extent))
+    return blueprints
+
+
+# ---------------------------------------------------------------------------
+# Sensor data
+
+
+class Timestamp:
+    __slots__ = ("delta_seconds", "elapsed_seconds", "frame", "frame_count", "platform_timestamp")
+
+    def __init__(self, frame: int, elapsed_seconds: float, delta_seconds: float):
+        self.frame = self.frame_count = frame
+        self.elapsed_seconds = elapsed_seconds
+        self.delta_seconds = delta_seconds
+        self.platform_timestamp = elapsed_seconds
+
+    def __repr__(self) -> str:
+        return f"Timestamp(frame={self.frame}, elapsed_seconds={self.elapsed_seconds:.6f})"
+
+
+class SensorData:
+
+    def __init__(self, frame: int, timestamp: float, transform: Transform):
+        self.frame = frame
+        self.timestamp = timestamp
+        self.transform = transform
+
+
+class CollisionEvent(SensorData):
+
+    def __init__(self, frame: int, timestamp: float, transform: Transform, actor: Actor, other_actor: Actor,
+                 normal_impulse: Vector3D):
+        super().__init__(frame, timestamp, transform)
+        self.actor = actor
+        self.other_actor = other_actor
+        self.normal_impulse = normal_impulse
+
+
+class GnssMeasurement(SensorData):
+
+    def __init__(self, frame: int, timestamp: float, transform: Transform, geolocation: GeoLocation):
+        super().__init__(frame, timestamp, transform)
+        self.latitude = geolocation.latitude
+        self.longitude = geolocation.longitude
+        self.altitude = geolocation.altitude
+
+
+class IMUMeasurement(SensorData):
+
+    def __init__(self, frame: int, timestamp: float, transform: Transform, accelerometer: Vector3D,
+                 gyroscope: Vector3D):
+        super().__init__(frame, timestamp, transform)
+        self.accelerometer = accelerometer
+        self.gyroscope = gyroscope
+        self.compass = math.radians((transform.rotation.yaw + 90.0) % 360.0)
+
+
+# ---------------------------------------------------------------------------
+# Actors
+
+
+class Actor:
+    """Base of all actors; actors without a parent keep their own transform."""
+
+    def __init__(self, world: World, actor_id: int, type_id: str, transform: Transform,
+                 attributes: Optional[Dict[str, str]] = None, extent: Tuple[float, float, float] = (0.0, 0.0, 0.0),
+                 parent: Optional[Actor] = None):
+        self._world = world
+        self.id = actor_id
+        self.type_id = type_id
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+        self.semantic_tags: List[int] = []
+        self.is_alive = True
+        self.is_active = True
+        self.is_dormant = False
+        self.bounding_box = BoundingBox(Location(0.0, 0.0, extent[2]), Vector3D(*extent))
+        self._transform = _copy_transform(transform)
+        self._velocity = Vector3D()
+        self._angular_velocity = Vector3D()
+        self._acceleration = Vector3D()
+        self._simulate_physics = True
+
+    # state
+
+    def get_world(self) -> World:
+        return self._world
+
+    def get_transform(self) -> Transform:
+        if self.parent is None:
+            return _copy_transform(self._transform)
+        parent = self.parent.get_transform()
+        relative = self._transform
+        return Transform(parent.transform(relative.location),
+                         Rotation(parent.rotation.pitch + relative.rotation.pitch,
+                                  parent.rotation.yaw + relative.rotation.yaw,
+                                  parent.rotation.roll + relative.rotation.roll))
+
+    def get_location(self) -> Location:
+        return self.get_transform().location
+
+    def get_velocity(self) -> Vector3D:
+        return Vector3D(self._velocity.x, self._velocity.y, self._velocity.z)
+
+    def get_angular_velocity(self) -> Vector3D:
+        return Vector3D(self._angular_velocity.x, self._angular_velocity.y, self._angular_velocity.z)
+
+    def get_acceleration(self) -> Vector3D:
+        return Vector3D(self._acceleration.x, self._acceleration.y, self._acceleration.z)
+
+    def set_transform(self, transform: Transform) -> None:
+        self._transform = _copy_transform(transform)
+
+    def set_location(self, location: Location) -> None:
+        self._transform.location = Location(location.x, location.y, location.z)
+
+    def set_target_velocity(self, velocity: Vector3D) -> None:
+        self._velocity = Vector3D(velocity.x, velocity.y, velocity.z)
+
+    def set_target_angular_velocity(self, angular_velocity: Vector3D) -> None:
+        self._angular_velocity = Vector3D(angular_velocity.x, angular_velocity.y, angular_velocity.z)
+
+    def set_simulate_physics(self, enabled: bool = True) -> None:
+        self._simulate_physics = enabled
+
+    def set_enable_gravity(self, enabled: bool = True) -> None:
+        pass
+
+    def add_impulse(self, impulse: Vector3D) -> None:
+        pass
+
+    def add_force(self, force: Vector3D) -> None:
+        pass
+
+    def add_angular_impulse(self, angular_impulse: Vector3D) -> None:
+        pass
+
+    def add_torque(self, torque: Vector3D) -> None:
+        pass
+
+    def enable_constant_velocity(self, velocity: Vector3D) -> None:
+        self.set_target_velocity(velocity)
+
+    def disable_constant_velocity(self) -> None:
+        pass
+
+    def destroy(self) -> bool:
+        if not self.is_alive:
+            return False
+        self.is_alive = False
+        self._world._remove_actor(self)
+        return True
+
+    def _step(self, delta_seconds: float) -> None:
+        if self.parent is None and self._simulate_physics and self._velocity.squared_length() > 0:
+            location = self._transform.location
+            self._transform.location = Location(location.x + self._velocity.x * delta_seconds,
+                                                location.y + self._velocity.y * delta_seconds,
+                                                location.z + self._velocity.z * delta_seconds)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Actor):
+            return NotImplemented
+        return self.id == other.id
+
+    def __hash__(self) -> int:
+        return self.id
+
+    def __repr__(self) -> str:
+        return f"Actor(id={self.id}, type={self.type_id})"
+
+
+class Vehicle(Actor):
+    """
+    Kinematic bicycle model: throttle and brake change the speed along the heading,
+    the steering angle of the front wheels turns the vehicle around its rear axle.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._control = VehicleControl()
+        self._physics = VehiclePhysicsControl(wheelbase=max(self.bounding_box.extent.x * 1.2, 0.8))
+        self._speed = 0.0
+        self._light_state = VehicleLightState.NONE
+        self._autopilot = False
+        self._speed_limit: Tuple[int, float] = (-1, 30.0)
+
+    def apply_control(self, control: VehicleControl) -> None:
+        self._control = control._copy()
+
+    def get_control(self) -> VehicleControl:
+        return self._control._copy()
+
+    def get_physics_control(self) -> VehiclePhysicsControl:
+        return self._physics
+
+    def apply_physics_control(self, physics_control: VehiclePhysicsControl) -> None:
+        self._physics = physics_control
+
+    def set_autopilot(self, enabled: bool = True, tm_port: int = 8000) -> None:  # noqa: ARG002
+        self._autopilot = enabled
+
+    def set_light_state(self, light_state: VehicleLightState) -> None:
+        self._light_state = VehicleLightState(int(light_state))
+
+    def get_light_state(self) -> VehicleLightState:
+        return self._light_state
+
+    def get_speed_limit(self) -> float:
+        frame, limit = self._speed_limit
+        if frame != self._world._frame:
+            waypoint = self._world._map.get_waypoint(self._transform.location)
+            limit = self._world._map._speed_limit(waypoint) if waypoint is not None else limit
+            self._speed_limit = (self._world._frame, limit)
+        return limit
+
+    def get_traffic_light(self) -> Optional[TrafficLight]:
+        location = self._transform.location
+        for traffic_light in self._world._traffic_lights:
+            if traffic_light.trigger_volume.contains(location, traffic_light.get_transform()):
+                return traffic_light
+        return None
+
+    def get_traffic_light_state(self) -> TrafficLightState:
+        traffic_light = self.get_traffic_light()
+        return traffic_light.state if traffic_light is not None else TrafficLightState.Green
+
+    def is_at_traffic_light(self) -> bool:
+        return self.get_traffic_light() is not None
+
+    def get_wheel_steer_angle(self, wheel_location: int = 0) -> float:  # noqa: ARG002
+        return self._control.steer * self._physics.wheels[0].max_steer_angle
+
+    def open_door(self, door_idx: int = 0) -> None:
+        pass
+
+    def close_door(self, door_idx: int = 0) -> None:
+        pass
+
+    def show_debug_telemetry(self, enabled: bool = True) -> None:
+        pass
+
+    def get_failure_state(self) -> int:
+        return 0
+
+    def set_target_velocity(self, velocity: Vector3D) -> None:
+        super().set_target_velocity(velocity)
+        self._speed = self._transform.get_forward_vector().dot(velocity)
+
+    def _settle(self) -> None:
+        """
+        Turns the spawned vehicle by a small yaw offset that only depends on its id.
+
+        On CARLA the physics never leave a vehicle exactly at its spawn rotation. Without the offset
+        vehicles on a straight lane would be exactly aligned, a vehicle ahead at an angle of exactly
+        0 degrees does not occur on the server.
+        """
+        rng = random.Random(self.id)
+        offset = _SPAWN_YAW_NOISE * rng.uniform(0.5, 1.0) * rng.choice((-1.0, 1.0))
+        rotation = self._transform.rotation
+        yaw = (rotation.yaw + offset + 180.0) % 360.0 - 180.0
+        self._transform.rotation = Rotation(rotation.pitch, yaw, rotation.roll)
+
+    def _step(self, delta_seconds: float) -> None:
+        if not self._simulate_physics:
+            return
+        if self._autopilot:
+            self._control = self._world._autopilot_control(self)
+        control = self._control
+        physics = self._physics
+        speed = self._speed
+        throttle = min(max(control.throttle, 0.0), 1.0)
+        direction = -1.0 if control.reverse else 1.0
+        acceleration = direction * throttle * physics.max_acceleration * max(1.0 - abs(speed) / _TOP_SPEED, 0.0)
+        speed += acceleration * delta_seconds
+        brake = min(max(control.brake, 0.0), 1.0) + (1.0 if control.hand_brake else 0.0)
+        resistance = (brake * physics.max_deceleration + _ROLLING_RESISTANCE + _DRAG * speed * speed) * delta_seconds
+        speed = 0.0 if abs(speed) <= resistance else speed - math.copysign(resistance, speed)
+
+        steer_angle = math.radians(min(max(control.steer, -1.0), 1.0) * physics.wheels[0].max_steer_angle)
+        yaw_rate = speed / physics.wheelbase * math.tan(steer_angle)
+        transform = self._transform
+        yaw = math.radians(transform.rotation.yaw)
+        middle = yaw + yaw_rate * delta_seconds / 2
+        location = transform.location
+        transform.location = Location(location.x + speed * delta_seconds * math.cos(middle),
+                                      location.y + speed * delta_seconds * math.sin(middle), location.z)
+        yaw += yaw_rate * delta_seconds
+        transform.rotation = Rotation(transform.rotation.pitch, (math.degrees(yaw) + 180.0) % 360.0 - 180.0,
+                                      transform.rotation.roll)
+        forward_x, forward_y = math.cos(yaw), math.sin(yaw)
+        longitudinal = (speed - self._speed) / delta_seconds
+        lateral = speed * yaw_rate
+        self._acceleration = Vector3D(longitudinal * forward_x - lateral * forward_y,
+                                      longitudinal * forward_y + lateral * forward_x, 0.0)
+        self._velocity = Vector3D(speed * forward_x, speed * forward_y, 0.0)
+        self._angular_velocity = Vector3D(0.0, 0.0, math.degrees(yaw_rate))
+        self._speed = speed
+
+    def __repr__(self) -> str:
+        return f"Vehicle(id={self.id}, type={self.type_id})"
+
+
+class Walker(Actor):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._control = WalkerControl()
+
+    def apply_control(self, control: WalkerControl) -> None:
+        self._control = WalkerControl(control.direction, control.speed, control.jump)
+
+    def get_control(self) -> WalkerControl:
+        return WalkerControl(self._control.direction, self._control.speed, self._control.jump)
+
+    def _step(self, delta_seconds: float) -> None:
+        direction = self._control.direction.make_unit_vector()
+        self._velocity = Vector3D(direction.x * self._control.speed, direction.y * self._control.speed, 0.0)
+        if self._control.speed > 0:
+            self._transform.rotation = Rotation(yaw=math.degrees(math.atan2(direction.y, direction.x)))
+        super()._step(delta_seconds)
+
+    def __repr__(self) -> str:
+        return f"Walker(id={self.id}, type={self.type_id})"
+
+
+class WalkerAIController(Actor):
+    """Moves its parent walker straight to the target location."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._target: Optional[Location] = None
+        self._max_speed = 1.4
+        self._running = False
+
+    def start(self) -> None:
+        self._running = True
+
+    def stop(self) -> None:
+        self._running = False
+        if isinstance(self.parent, Walker):
+            self.parent.apply_control(WalkerControl(speed=0.0))
+
+    def go_to_location(self, destination: Location) -> None:
+        self._target = Location(destination.x, destination.y, destination.z)
+
+    def set_max_speed(self, speed: float = 1.4) -> None:
+        self._max_speed = speed
+
+    def _step(self, delta_seconds: float) -> None:  # noqa: ARG002
+        walker = self.parent
+        if not self._running or self._target is None or not isinstance(walker, Walker) or not walker.is_alive:
+            return
+        offset = self._target - walker._transform.location
+        offset.z = 0.0
+        speed = 0.0 if offset.length() < 0.5 else self._max_speed
+        walker.apply_control(WalkerControl(offset.make_unit_vector(), speed))
+
+
+class Sensor(Actor):
+    """Only collision, GNSS and IMU sensors produce data."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._callback: Optional[Callable[[SensorData], None]] = None
+
+    def listen(self, callback: Callable[[SensorData], None]) -> None:
+        self._callback = callback
+
+    def stop(self) -> None:
+        self._callback = None
+
+    def is_listening(self) -> bool:
+        return self._callback is not None
+
+    def _emit(self, data: SensorData) -> None:
+        if self._callback is not None:
+            self._callback(data)
+
+    def _measure(self, timestamp: Timestamp) -> None:
+        if self._callback is None or self.parent is None:
+            return
+        if self.type_id == "sensor.other.gnss":
+            transform = self.get_transform()
+            self._emit(GnssMeasurement(timestamp.frame, timestamp.elapsed_seconds, transform,
+                                       self._world._map.transform_to_geolocation(transform.location)))
+        elif self.type_id == "sensor.other.imu":
+            angular = self.parent._angular_velocity
+            self._emit(IMUMeasurement(timestamp.frame, timestamp.elapsed_seconds, self.get_transform(),
+                                      self.parent.get_acceleration() + Vector3D(0.0, 0.0, 9.81),
+                                      Vector3D(math.radians(angular.x), math.radians(angular.y),
+                                               math.radians(angular.z))))
+
+    def __repr__(self) -> str:
+        return f"Sensor(id={self.id}, type={self.type_id})"
+
+
+class TrafficLight(Actor):
+    """A traffic light for the lanes of a signal; cycles green, yellow and red unless frozen."""
+
+    def __init__(self, *args, stop_waypoints: Sequence[Waypoint] = (), opendrive_id: str = "", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.state = TrafficLightState.Red
+        self._times = {TrafficLightState.Green: 10.0, TrafficLightState.Yellow: 3.0, TrafficLightState.Red: 10.0}
+        self._elapsed = 0.0
+        self._frozen = False
+        self._stop_waypoints = list(stop_waypoints)
+        self._opendrive_id = opendrive_id
+        transform = self._transform
+        if self._stop_waypoints:
+            # like in the CARLA towns the trigger volume begins a few meters in front of the stop line
+            locations = [(waypoint.previous(3.0) or [waypoint])[0].transform.location
+                         for waypoint in self._stop_waypoints]
+            center = sum(locations[1:], locations[0]) / len(locations)
+            half_width = sum(waypoint.lane_width for waypoint in self._stop_waypoints) / 2
+            relative_yaw = self._stop_waypoints[0].transform.rotation.yaw - transform.rotation.yaw
+            self.trigger_volume = BoundingBox(transform.inverse_transform(center), Vector3D(1.5, half_width, 1.0),
+                                              Rotation(yaw=relative_yaw))
+        else:
+            self.trigger_volume = BoundingBox(Location(), Vector3D(1.5, 1.5, 1.0))
+
+    def get_state(self) -> TrafficLightState:
+        return self.state
+
+    def set_state(self, state: TrafficLightState) -> None:
+        self.state = state
+        self._elapsed = 0.0
+
+    def get_elapsed_time(self) -> float:
+        return self._elapsed
+
+    def get_green_time(self) -> float:
+        return self._times[TrafficLightState.Green]
+
+    def get_yellow_time(self) -> float:
+        return self._times[TrafficLightState.Yellow]
+
+    def get_red_time(self) -> float:
+        return self._times[TrafficLightState.Red]
+
+    def set_green_time(self, green_time: float) -> None:
+        self._times[TrafficLightState.Green] = green_time
+
+    def set_yellow_time(self, yellow_time: float) -> None:
+        self._times[TrafficLightState.Yellow] = yellow_time
+
+    def set_red_time(self, red_time: float) -> None:
+        self._times[TrafficLightState.Red] = red_time
+
+    def freeze(self, freeze: bool) -> None:
+        self._frozen = freeze
+
+    def is_frozen(self) -> bool:
+        return self._frozen
+
+    def reset_group(self) -> None:
+        self.set_state(TrafficLightState.Red)
+
+    def get_group_traffic_lights(self) -> List[TrafficLight]:
+        return [self]
+
+    def get_pole_index(self) -> int:
+        return 0
+
+    def get_opendrive_id(self) -> str:
+        return self._opendrive_id
+
+    def get_stop_waypoints(self) -> List[Waypoint]:
+        return list(self._stop_waypoints)
+
+    def get_affected_lane_waypoints(self) -> List[Waypoint]:
+        return list(self._stop_waypoints)
+
+    def get_light_boxes(self) -> List[BoundingBox]:
+        return []
+
+    def _step(self, delta_seconds: float) -> None:
+        if self._frozen or self.state not in self._times:
+            return
+        self._elapsed += delta_seconds
+        if self._elapsed >= self._times[self.state]:
+            self._elapsed -= self._times[self.state]
+            self.state = {TrafficLightState.Green: TrafficLightState.Yellow,
+                          TrafficLightState.Yellow: TrafficLightState.Red,
+                          TrafficLightState.Red: TrafficLightState.Green}[self.state]
+
+    def __repr__(self) -> str:
+        return f"TrafficLight(id={self.id}, state={self.state.name})"
+
+
+class ActorList(list):
+
+    def filter(self, wildcard_pattern: str) -> ActorList:
+        return ActorList(actor for actor in self if fnmatchcase(actor.type_id, wildcard_pattern))
+
+    def find(self, actor_id: int) -> Optional[Actor]:
+        for actor in self:
+            if actor.id == actor_id:
+                return actor
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Snapshots
+
+
+class ActorSnapshot:
+    __slots__ = ("_acceleration", "_angular_velocity", "_transform", "_velocity", "id")
+
+    def __init__(self, actor: Actor):
+        self.id = actor.id
+        self._transform = actor.get_transform()
+        self._velocity = actor._velocity
+        self._angular_velocity = actor._angular_velocity
+        self._acceleration = actor._acceleration
+
+    def get_transform(self) -> Transform:
+        return _copy_transform(self._transform)
+
+    def get_velocity(self) -> Vector3D:
+        return Vector3D(self._velocity.x, self._velocity.y, self._velocity.z)
+
+    def get_angular_velocity(self) -> Vector3D:
+        return Vector3D(self._angular_velocity.x, self._angular_velocity.y, self._angular_velocity.z)
+
+    def get_acceleration(self) -> Vector3D:
+        return Vector3D(self._acceleration.x, self._acceleration.y, self._acceleration.z)
+
+
+class WorldSnapshot:
+
+    def __init__(self, world_id: int, timestamp: Timestamp, actors: Iterable[Actor]):
+        self.id = world_id
+        self.timestamp = timestamp
+        self.frame = timestamp.frame
+        self._actors = {actor.id: ActorSnapshot(actor) for actor in actors}
+
+    def find(self, actor_id: int) -> Optional[ActorSnapshot]:
+        return self._actors.get(actor_id)
+
+    def has_actor(self, actor_id: int) -> bool:
+        return actor_id in self._actors
+
+    def __iter__(self) -> Iterator[ActorSnapshot]:
+        return iter(list(self._actors.values()))
+
+    def __len__(self) -> int:
+        return len(self._actors)
+
+
+# ---------------------------------------------------------------------------
+# World
+
+
+class WorldSettings:
+
+    def __init__(self, synchronous_mode: bool = False, no_rendering_mode: bool = False,
+                 fixed_delta_seconds: Optional[float] = None, substepping: bool = True,
+                 max_substep_delta_time: float = 0.01, max_substeps: int = 10, max_culling_distance: float = 0.0,
+                 deterministic_ragdolls: bool = False, tile_stream_distance: float = 3000.0,
+                 actor_active_distance: float = 2000.0, spectator_as_ego: bool = True):
+        self.synchronous_mode = synchronous_mode
+        self.no_rendering_mode = no_rendering_mode
+        self.fixed_delta_seconds = fixed_delta_seconds
+        self.substepping = substepping
+        self.max_substep_delta_time = max_substep_delta_time
+        self.max_substeps = max_substeps
+        self.max_culling_distance = max_culling_distance
+        self.deterministic_ragdolls = deterministic_ragdolls
+        self.tile_stream_distance = tile_stream_distance
+        self.actor_active_distance = actor_active_distance
+        self.spectator_as_ego = spectator_as_ego
+
+    def _copy(self) -> WorldSettings:
+        settings = WorldSettings()
+        settings.__dict__.update(self.__dict__)
+        return settings
+
+    def __repr__(self) -> str:
+        return "WorldSettings({})".format(", ".join(f"{key}={value}" for key, value in vars(self).items()))
+
+
+class DebugHelper:
+    """Drawing is a no-op without a server."""
+
+    def draw_point(self, location, size=0.1, color=None, life_time=-1.0, persistent_lines=True) -> None:
+        pass
+
+    def draw_line(self, begin, end, thickness=0.1, color=None, life_time=-1.0, persistent_lines=True) -> None:
+        pass
+
+    def draw_arrow(self, begin, end, thickness=0.1, arrow_size=0.1, color=None, life_time=-1.0,
+                   persistent_lines=True) -> None:
+        pass
+
+    def draw_box(self, box, rotation, thickness=0.1, color=None, life_time=-1.0, persistent_lines=True) -> None:
+        pass
+
+    def draw_string(self, location, text, draw_shadow=False, color=None, life_time=-1.0,
+                    persistent_lines=True) -> None:
+        pass
+
+    draw_hud_point = draw_point
+    draw_hud_line = draw_line
+    draw_hud_arrow = draw_arrow
+    draw_hud_box = draw_box
+
+
+class World:
+    """Holds the actors and advances them by a fixed time step on each tick."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, carla_map: Map):
+        self.id = next(World._ids)
+        self._map = carla_map
+        self._actor_ids = itertools.count(1)
+        self._actors: Dict[int, Actor] = {}
+        self._traffic_lights: List[TrafficLight] = []
+        self._settings = WorldSettings()
+        self._weather = WeatherParameters.Default  # type: ignore[attr-defined]
+        self._frame = 0
+        self._elapsed_seconds = 0.0
+        self._tick_callbacks: Dict[int, Callable[[WorldSnapshot], None]] = {}
+        self._callback_ids = itertools.count(1)
+        self._blueprints = BlueprintLibrary(_create_blueprints())
+        self._random = random.Random(self.id)
+        self.debug = DebugHelper()
+        self._spectator = self._add_actor(Actor, "spectator", Transform())
+        for index, signal in enumerate(sorted(carla_map._signals(), key=lambda signal: (signal.road.id, signal.id))):
+            if not signal.is_traffic_light:
+                continue
+            traffic_light = self._add_actor(TrafficLight, "traffic.traffic_light", carla_map._signal_transform(signal),
+                                            extent=(0.3, 0.3, 2.0), stop_waypoints=carla_map._signal_waypoints(signal),
+                                            opendrive_id=signal.id)
+            # start the lights at different points of their cycle
+            traffic_light.state = (TrafficLightState.Green, TrafficLightState.Red)[index % 2]
+        self._snapshot = self._create_snapshot(0.0)
+
+    def _add_actor(self, actor_class, type_id: str, transform: Transform, **kwargs) -> Actor:
+        actor = actor_class(self, next(self._actor_ids), type_id, transform, **kwargs)
+        self._actors[actor.id] = actor
+        if isinstance(actor, TrafficLight):
+            self._traffic_lights.append(actor)
+        return actor
+
+    def _remove_actor(self, actor: Actor) -> None:
+        self._actors.pop(actor.id, None)
+        if isinstance(actor, TrafficLight):
+            self._traffic_lights.remove(actor)
+
+    def _create_snapshot(self, delta_seconds: float) -> WorldSnapshot:
+        return WorldSnapshot(self.id, Timestamp(self._frame, self._elapsed_seconds, delta_seconds),
+                             self._actors.values())
+
+    # ------------------------------------------------------------------------
+    # Simulation
+
+    def _step(self) -> WorldSnapshot:
+        delta_seconds = self._settings.fixed_delta_seconds or _DEFAULT_DELTA_SECONDS
+        actors = list(self._actors.values())
+        for actor in actors:
+            if isinstance(actor, WalkerAIController):
+                actor._step(delta_seconds)
+        for actor in actors:
+            if not isinstance(actor, WalkerAIController):
+                actor._step(delta_seconds)
+        self._frame += 1
+        self._elapsed_seconds += delta_seconds
+        self._snapshot = self._create_snapshot(delta_seconds)
+        timestamp = self._snapshot.timestamp
+        for actor in actors:
+            if isinstance(actor, Sensor) and actor.is_alive:
+                actor._measure(timestamp)
+        self._detect_collisions(timestamp)
+        for callback in list(self._tick_callbacks.values()):
+            callback(self._snapshot)
+        return self._snapshot
+
+    def _detect_collisions(self, timestamp: Timestamp) -> None:
+        sensors = [actor for actor in self._actors.values()
+                   if actor.type_id == "sensor.other.collision" and isinstance(actor, Sensor) and actor.is_listening()
+                   and actor.parent is not None]
+        if not sensors:
+            return
+        bodies = [actor for actor in self._actors.values()
+                  if isinstance(actor, (Vehicle, Walker)) or actor.type_id.startswith("static.")]
+        for sensor in sensors:
+            parent = sensor.parent
+            for other in bodies:
+                if other.id != parent.id and _overlap(parent, other):
+                    mass = parent.get_physics_control().mass if isinstance(parent, Vehicle) else 80.0
+                    impulse = (other._velocity - parent._velocity) * mass
+                    sensor._emit(CollisionEvent(timestamp.frame, timestamp.elapsed_seconds, sensor.get_transform(),
+                                                parent, other, impulse))
+
+    def _autopilot_control(self, vehicle: Vehicle) -> VehicleControl:
+        """Follows the lane at 90% of the speed limit and stops for vehicles ahead and red lights."""
+        transform = vehicle._transform
+        speed = vehicle._speed
+        waypoint = self._map.get_waypoint(transform.location)
+        if waypoint is None:
+            return VehicleControl(brake=1.0)
+        target = waypoint.next(max(5.0, speed * 0.8))
+        target_location = (target[0] if target else waypoint).transform.location
+        yaw = math.radians(transform.rotation.yaw)
+        dx, dy = target_location.x - transform.location.x, target_location.y - transform.location.y
+        angle = math.atan2(dy, dx) - yaw
+        angle = (angle + math.pi) % (2 * math.pi) - math.pi
+        steer = min(max(angle * 1.5, -1.0), 1.0)
+
+        target_speed = self._map._speed_limit(waypoint) / 3.6 * 0.9
+        forward_x, forward_y = math.cos(yaw), math.sin(yaw)
+        for other in self._actors.values():
+            if other is vehicle or not isinstance(other, (Vehicle, Walker)):
+                continue
+            ox = other._transform.location.x - transform.location.x
+            oy = other._transform.location.y - transform.location.y
+            ahead = ox * forward_x + oy * forward_y
+            if 0.0 < ahead < 12.0 + speed and abs(ox * forward_y - oy * forward_x) < 2.0:
+                target_speed = 0.0
+                break
+        if target_speed > 0.0:
+            for traffic_light in self._traffic_lights:
+                if traffic_light.state == TrafficLightState.Green:
+                    continue
+                for stop in traffic_light._stop_waypoints:
+                    if stop.road_id == waypoint.road_id and stop.lane_id == waypoint.lane_id:
+                        distance = (stop.s - waypoint.s) if waypoint.lane_id < 0 else (waypoint.s - stop.s)
+                        if 0.0 < distance < 5.0 + speed:
+                            target_speed = 0.0
+        if speed < target_speed:
+            return VehicleControl(throttle=min((target_speed - speed) * 0.5 + 0.3, 1.0), steer=steer)
+        return VehicleControl(brake=min((speed - target_speed) * 0.5, 1.0), steer=steer)
+
+    def tick(self, seconds: float = 10.0) -> int:  # noqa: ARG002
+        return self._step().frame
+
+    def wait_for_tick(self, seconds: float = 10.0) -> WorldSnapshot:  # noqa: ARG002
+        """Without a server that ticks on its own, this advances the world by one step."""
+        return self._step()
+
+    def on_tick(self, callback: Callable[[WorldSnapshot], None]) -> int:
+        callback_id = next(self._callback_ids)
+        self._tick_callbacks[callback_id] = callback
+        return callback_id
+
+    def remove_on_tick(self, callback_id: int) -> None:
+        self._tick_callbacks.pop(callback_id, None)
+
+    def get_snapshot(self) -> WorldSnapshot:
+        return self._snapshot
+
+    # ------------------------------------------------------------------------
+    # Actors
+
+    def get_blueprint_library(self) -> BlueprintLibrary:
+        return self._blueprints
+
+    def spawn_actor(self, blueprint: ActorBlueprint, transform: Transform, attach_to: Optional[Actor] = None,
+                    attachment_type: AttachmentType = AttachmentType.Rigid) -> Actor:  # noqa: ARG002
+        actor = self.try_spawn_actor(blueprint, transform, attach_to)
+        if actor is None:
+            raise RuntimeError("Spawn failed because of collision at spawn position")
+        return actor
+
+    def try_spawn_actor(self, blueprint: ActorBlueprint, transform: Transform, attach_to: Optional[Actor] = None,
+                        attachment_type: AttachmentType = AttachmentType.Rigid) -> Optional[Actor]:  # noqa: ARG002
+        blueprint_id = blueprint.id
+        if blueprint_id.startswith("vehicle."):
+            actor_class = Vehicle
+        elif blueprint_id.startswith("walker."):
+            actor_class = Walker
+        elif blueprint_id.startswith("sensor."):
+            actor_class = Sensor
+        elif blueprint_id == "controller.ai.walker":
+            actor_class = WalkerAIController
+        else:
+            actor_class = Actor
+        attributes = {attribute.id: attribute.as_str() for attribute in blueprint}
+        actor = actor_class(self, 0, blueprint_id, transform, attributes, blueprint._extent, attach_to)
+        if actor_class in (Vehicle, Walker) and any(
+                _overlap(actor, other) for other in self._actors.values() if isinstance(other, (Vehicle, Walker))):
+            return None
+        actor.id = next(self._actor_ids)
+        self._actors[actor.id] = actor
+        if actor_class is Vehicle:
+            actor._settle()
+        return actor
+
+    def get_actors(self, actor_ids: Optional[Iterable[int]] = None) -> ActorList:
+        if actor_ids is None:
+            return ActorList(self._actors.values())
+        return ActorList(self._actors[actor_id] for actor_id in actor_ids if actor_id in self._actors)
+
+    def get_actor(self, actor_id: int) -> Optional[Actor]:
+        return self._actors.get(actor_id)
+
+    def get_spectator(self) -> Actor:
+        return self._spectator
+
+    def get_traffic_light(self, landmark) -> Optional[TrafficLight]:
+        for traffic_light in self._traffic_lights:
+            if traffic_light.get_opendrive_id() == getattr(landmark, "id", None):
+                return traffic_light
+        return None
+
+    def get_traffic_lights_from_waypoint(self, waypoint: Waypoint, distance: float) -> List[TrafficLight]:
+        result = []
+        for traffic_light in self._traffic_lights:
+            for stop in traffic_light._stop_waypoints:
+                if stop.road_id == waypoint.road_id and stop.lane_id == waypoint.lane_id:
+                    ahead = (stop.s - waypoint.s) if waypoint.lane_id < 0 else (waypoint.s - stop.s)
+                    if 0.0 <= ahead <= distance:
+                        result.append(traffic_light)
+                        break
+        return result
+
+    def get_traffic_lights_in_junction(self, junction_id: int) -> List[TrafficLight]:  # noqa: ARG002
+        return []
+
+    def freeze_all_traffic_lights(self, frozen: bool) -> None:
+        for traffic_light in self._traffic_lights:
+            traffic_light.freeze(frozen)
+
+    def reset_all_traffic_lights(self) -> None:
+        for traffic_light in self._traffic_lights:
+            traffic_light.reset_group()
+
+    def get_vehicles_light_states(self) -> Dict[int, VehicleLightState]:
+        return {actor.id: actor.get_light_state() for actor in self._actors.values() if isinstance(actor, Vehicle)}
+
+    def get_random_location_from_navigation(self) -> Location:
+        """A location on a sidewalk, or on any lane if the map has no sidewalks."""
+        waypoints = self._map.generate_waypoints(5.0)
+        sidewalks = [self._map.get_waypoint(waypoint.transform.location, lane_type=LaneType.Sidewalk)
+                     for waypoint in waypoints[::10]]
+        candidates = [waypoint for waypoint in sidewalks if waypoint is not None] or waypoints
+        return self._random.choice(candidates).transform.location
+
+    # ------------------------------------------------------------------------
+    # Settings and environment
+
+    def get_map(self) -> Map:
+        return self._map
+
+    def get_settings(self) -> WorldSettings:
+        return self._settings._copy()
+
+    def apply_settings(self, world_settings: WorldSettings) -> int:
+        self._settings = world_settings._copy()
+        return self._frame
+
+    def get_weather(self) -> WeatherParameters:
+        return self._weather
+
+    def set_weather(self, weather: WeatherParameters) -> None:
+        self._weather = weather
+
+    def load_map_layer(self, map_layers) -> None:
+        pass
+
+    def unload_map_layer(self, map_layers) -> None:
+        pass
+
+    def set_pedestrians_cross_factor(self, percentage: float) -> None:
+        pass
+
+    def set_pedestrians_seed(self, seed: int) -> None:
+        self._random.seed(seed)
+
+    def get_level_bbs(self, actor_type=None) -> List[BoundingBox]:  # noqa: ARG002
+        return []
+
+    def get_environment_objects(self, object_type=None) -> list:  # noqa: ARG002
+        return []
+
+    def get_names_of_all_objects(self) -> List[str]:
+        return []
+
+    def cast_ray(self, initial_location: Location, final_location: Location) -> list:  # noqa: ARG002
+        return []
+
+    def project_point(self, location: Location, direction: Vector3D, search_distance: float):  # noqa: ARG002
+        return None
+
+    def ground_projection(self, location: Location, search_distance: float):  # noqa: ARG002
+        return None
+
+    def __repr__(self) -> str:
+        return f"World(id={self.id})"
+
+
+def _copy_transform(transform: Transform) -> Transform:
+    location, rotation = transform.location, transform.rotation
+    return Transform(Location(location.x, location.y, location.z),
+                     Rotation(rotation.pitch, rotation.yaw, rotation.roll))
+
+
+def _footprint(actor: Actor) -> Tuple[float, float, float, float, float, float]:
+    transform = actor.get_transform()
+    center = transform.transform(actor.bounding_box.location)
+    yaw = math.radians(transform.rotation.yaw + actor.bounding_box.rotation.yaw)
+    return center.x, center.y, math.cos(yaw), math.sin(yaw), actor.bounding_box.extent.x, actor.bounding_box.extent.y
+
+
+def _overlap(first: Actor, second: Actor) -> bool:
+    """Separating axis test of the bounding boxes seen from above."""
+    ax, ay, afx, afy, aex, aey = _footprint(first)
+    bx, by, bfx, bfy, bex, bey = _footprint(second)
+    dx, dy = bx - ax, by - ay
+    if dx * dx + dy * dy > (math.hypot(aex, aey) + math.hypot(bex, bey)) ** 2:
+        return False
+    for ux, uy in ((afx, afy), (-afy, afx), (bfx, bfy), (-bfy, bfx)):
+        projection_a = aex * abs(afx * ux + afy * uy) + aey * abs(-afy * ux + afx * uy)
+        projection_b = bex * abs(bfx * ux + bfy * uy) + bey * abs(-bfy * ux + bfx * uy)
+        if abs(dx * ux + dy * uy) > projection_a + projection_b:
+            return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Client
+
+
+class TrafficManager:
+    """Accepts the settings of the traffic manager; autopilot vehicles use the simple lane following of the world."""
+
+    def __init__(self, port: int = 8000):
+        self._port = port
+
+    def get_port(self) -> int:
+        return self._port
+
+    def _ignore(self, *args, **kwargs) -> None:
+        pass
+
+    set_synchronous_mode = set_random_device_seed = set_hybrid_physics_mode = set_hybrid_physics_radius = _ignore
+    set_global_distance_to_leading_vehicle = global_percentage_speed_difference = _ignore
+    vehicle_percentage_speed_difference = distance_to_leading_vehicle = auto_lane_change = force_lane_change = _ignore
+    ignore_lights_percentage = ignore_signs_percentage = ignore_vehicles_percentage = _ignore
+    ignore_walkers_percentage = set_desired_speed = set_path = set_route = update_vehicle_lights = _ignore
+    set_respawn_dormant_vehicles = set_boundaries_respawn_dormant_vehicles = set_osm_mode = _ignore
+    keep_right_rule_percentage = random_left_lanechange_percentage = random_right_lanechange_percentage = _ignore
+    vehicle_lane_offset = global_lane_offset = collision_detection = shut_down = _ignore
+
+
+_SYNTHETIC_MAPS: Dict[str, Callable[[], str]] = {"Ring": ring_road_opendrive}
+_state: Dict[str, Optional[World]] = {"world": None}
+_default_map = {"name": "Ring"}
+"""Map of the first :py:meth:`Client.get_world`, see :py:func:`launch_tools.offline_carla.install`"""
+
+
+def _read_opendrive(map_name: str) -> Tuple[str, str]:
+    short_name = map_name.rsplit("/", 1)[-1]
+    if short_name in _SYNTHETIC_MAPS:
+        return "Offline/Maps/" + short_name, _SYNTHETIC_MAPS[short_name]()
+    if map_name.endswith(".xodr") and os.path.isfile(map_name):
+        with open(map_name, encoding="utf-8") as file:
+            return "Offline/Maps/" + os.path.splitext(short_name)[0], file.read()
+    raise RuntimeError(f"map '{map_name}' not found, available are {sorted(_SYNTHETIC_MAPS)} or paths to .xodr files")
+
+
+class Client:
+    """
+    Entry point like :py:class:`carla.Client`. All clients of a process share the same world,
+    host and port are ignored.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 2000, worker_threads: int = 0):  # noqa: ARG002
+        self._timeout = 10.0
+        self._traffic_managers: Dict[int, TrafficManager] = {}
+
+    def set_timeout(self, seconds: float) -> None:
+        self._timeout = seconds
+
+    def get_client_version(self) -> str:
+        return "0.9.15-offline"
+
+    def get_server_version(self) -> str:
+        return "0.9.15-offline"
+
+    def get_world(self) -> World:
+        world = _state["world"]
+        if world is None:
+            world = self.load_world(_default_map["name"])
+        return world
+
+    def get_available_maps(self) -> List[str]:
+        return ["/Game/Offline/Maps/" + name for name in _SYNTHETIC_MAPS]
+
+    def load_world(self, map_name: str, reset_settings: bool = True, map_layers=None) -> World:  # noqa: ARG002
+        """Loads one of :py:meth:`get_available_maps` or an OpenDRIVE file."""
+        name, xodr = _read_opendrive(map_name)
+        return self._replace_world(name, xodr, reset_settings)
+
+    def reload_world(self, reset_settings: bool = True) -> World:
+        world = self.get_world()
+        return self._replace_world(world._map.name, world._map.to_opendrive(), reset_settings)
+
+    def generate_opendrive_world(self, opendrive: str, parameters=None, reset_settings: bool = True) -> World:  # noqa: ARG002
+        return self._replace_world("Offline/Maps/OpenDriveMap", opendrive, reset_settings)
+
+    @staticmethod
+    def _replace_world(name: str, xodr: str, reset_settings: bool) -> World:
+        previous = _state["world"]
+        world = World(Map(name, xodr))
+        if previous is not None and not reset_settings:
+            world._settings = previous._settings._copy()
+        _state["world"] = world
+        return world
+
+    def get_trafficmanager(self, client_connection: int = 8000) -> TrafficManager:
+        if client_connection not in self._traffic_managers:
+            self._traffic_managers[client_connection] = TrafficManager(client_connection)
+        return self._traffic_managers[client_connection]
+
+    def apply_batch(self, commands: Sequence) -> None:
+        self.apply_batch_sync(commands)
+
+    def apply_batch_sync(self, commands: Sequence, due_tick_cue: bool = False) -> List[_command.Response]:
+        world = self.get_world()
+        responses = [_execute(world, command) for command in commands]
+        if due_tick_cue:
+            world.tick()
+        return responses
+
+    def start_recorder(self, filename: str, additional_data: bool = False) -> str:  # noqa: ARG002
+        return ""
+
+    def stop_recorder(self) -> None:
+        pass
+
+    def __repr__(self) -> str:
+        return "Client(offline)"
+
+
+def _execute(world: World, command) -> _command.Response:
+    if isinstance(command, _command.SpawnActor):
+        actor = world.try_spawn_actor(command.blueprint, command.transform, world.get_actor(command.parent_id))
+        if actor is None:
+            return _command.Response(error="Spawn failed because of collision at spawn position")
+        for follow_up in command.do_after:
+            if getattr(follow_up, "actor_id", None) == 0:
+                follow_up.actor_id = actor.id
+            _execute(world, follow_up)
+        return _command.Response(actor.id)
+    actor = world.get_actor(command.actor_id)
+    if actor is None:
+        return _command.Response(command.actor_id, f"actor {command.actor_id} not found")
+    if isinstance(command, (_command.ApplyVehicleControl, _command.ApplyWalkerControl)):
+        actor.apply_control(command.control)  # type: ignore[attr-defined]
+    elif isinstance(command, _command.SetVehicleLightState):
+        actor.set_light_state(command.light_state)  # type: ignore[attr-defined]
+    elif isinstance(command, _command.DestroyActor):
+        actor.destroy()
+    elif isinstance(command, _command.SetAutopilot):
+        actor.set_autopilot(command.enabled, command.port)  # type: ignore[attr-defined]
+    elif isinstance(command, _command.ApplyTransform):
+        actor.set_transform(command.transform)
+    elif isinstance(command, _command.ApplyTargetVelocity):
+        actor.set_target_velocity(command.velocity)
+    elif isinstance(command, _command.SetSimulatePhysics) and not isinstance(
+            command, (_command.SetEnableGravity, _command.ShowDebugTelemetry)):
+        actor.set_simulate_physics(command.enabled)
+    elif not isinstance(command, (_command.SetEnableGravity, _command.ShowDebugTelemetry)):
+        return _command.Response(command.actor_id, f"command {type(command).__name__} is not supported")
+    return _command.Response(command.actor_id)
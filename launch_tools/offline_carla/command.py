@@ -0,0 +1,139 @@
+"""
+The batch commands of :py:mod:`carla.command`.
+
+They are plain records, :py:meth:`.Client.apply_batch` executes them.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Union
+
+if TYPE_CHECKING:
+    from ._geometry import Transform, Vector3D
+    from ._types import VehicleControl, VehicleLightState, WalkerControl
+    from ._world import Actor, ActorBlueprint
+
+__all__ = [
+    "ApplyTargetVelocity",
+    "ApplyTransform",
+    "ApplyVehicleControl",
+    "ApplyWalkerControl",
+    "DestroyActor",
+    "FutureActor",
+    "Response",
+    "SetAutopilot",
+    "SetEnableGravity",
+    "SetSimulatePhysics",
+    "SetVehicleLightState",
+    "ShowDebugTelemetry",
+    "SpawnActor",
+]
+
+
+def _actor_id(actor: Union[Actor, int, type[FutureActor]]) -> int:
+    if actor is FutureActor or isinstance(actor, FutureActor):
+        return 0  # replaced by the id of the spawned actor
+    return actor if isinstance(actor, int) else actor.id
+
+
+class FutureActor:
+    """Placeholder for the actor of a preceding :py:class:`SpawnActor` in :py:meth:`SpawnActor.then`."""
+
+
+class _ActorCommand:
+    actor_id: int
+
+    def __init__(self, actor: Union[Actor, int]):
+        self.actor_id = _actor_id(actor)
+
+    def __repr__(self) -> str:
+        return "{}({})".format(self.__class__.__name__, ", ".join(f"{k}={v!r}" for k, v in vars(self).items()))
+
+
+class ApplyVehicleControl(_ActorCommand):
+
+    def __init__(self, actor: Union[Actor, int], control: VehicleControl):
+        super().__init__(actor)
+        self.control = control
+
+
+class ApplyWalkerControl(_ActorCommand):
+
+    def __init__(self, actor: Union[Actor, int], control: WalkerControl):
+        super().__init__(actor)
+        self.control = control
+
+
+class ApplyTransform(_ActorCommand):
+
+    def __init__(self, actor: Union[Actor, int], transform: Transform):
+        super().__init__(actor)
+        self.transform = transform
+
+
+class ApplyTargetVelocity(_ActorCommand):
+
+    def __init__(self, actor: Union[Actor, int], velocity: Vector3D):
+        super().__init__(actor)
+        self.velocity = velocity
+
+
+class SetVehicleLightState(_ActorCommand):
+
+    def __init__(self, actor: Union[Actor, int], light_state: VehicleLightState):
+        super().__init__(actor)
+        self.light_state = light_state
+
+
+class SetAutopilot(_ActorCommand):
+
+    def __init__(self, actor: Union[Actor, int], enabled: bool, port: int = 8000):
+        super().__init__(actor)
+        self.enabled = enabled
+        self.port = port
+
+
+class SetSimulatePhysics(_ActorCommand):
+
+    def __init__(self, actor: Union[Actor, int], enabled: bool):
+        super().__init__(actor)
+        self.enabled = enabled
+
+
+class SetEnableGravity(SetSimulatePhysics):
+    pass
+
+
+class ShowDebugTelemetry(SetSimulatePhysics):
+    pass
+
+
+class DestroyActor(_ActorCommand):
+    pass
+
+
+class SpawnActor:
+
+    def __init__(self, blueprint: ActorBlueprint, transform: Transform, parent: Optional[Union[Actor, int]] = None):
+        self.blueprint = blueprint
+        self.transform = transform
+        self.parent_id = 0 if parent is None else _actor_id(parent)
+        self.do_after = []
+
+    def then(self, command) -> SpawnActor:
+        """Executes `command` after the spawn, :py:class:`FutureActor` is replaced by the new actor."""
+        self.do_after.append(command)
+        return self
+
+
+class Response:
+
+    def __init__(self, actor_id: int = 0, error: str = ""):
+        self.actor_id = actor_id
+        self.error = error
+
+    def has_error(self) -> bool:
+        return bool(self.error)
+
+    def __repr__(self) -> str:
+        return f"Response(actor_id={self.actor_id}, error={self.error!r})"
@@ -0,0 +1,11 @@
+"""
+Shared setup of the tests.
+
+The tests run on the offline CARLA stand-in of :py:mod:`launch_tools.offline_carla`,
+they need neither a running CARLA server nor the carla python package.
+"""
+
+import os
+
+# Must be set before anything imports carla
+os.environ.setdefault("LUNATIC_OFFLINE_CARLA", "1")
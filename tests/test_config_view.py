@@ -0,0 +1,60 @@
+"""Tests of the read-only :py:class:`agents.tools.config_creation.ConfigView`."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from agents.tools.config_creation import ConfigView, LunaticAgentSettings
+from classes.constants import Phase
+from classes.rule import Context, Rule
+
+
+@pytest.fixture
+def config():
+    return LunaticAgentSettings.create()
+
+
+def test_selected_values_are_resolved(config):
+    view = ConfigView.create(config, keys=("controls.max_brake", "emergency"))
+    assert view.controls.max_brake == config.controls.max_brake
+    assert view.emergency.max_emergency_brake == config.emergency.max_emergency_brake
+    with pytest.raises(AttributeError):
+        view.controls.max_throttle  # noqa: B018
+    with pytest.raises(AttributeError):
+        view.speed  # noqa: B018
+
+
+def test_view_is_read_only(config):
+    view = ConfigView.create(config, keys=("controls",))
+    with pytest.raises(AttributeError):
+        view.controls.max_brake = 0.25
+
+
+def test_invalidate_outdates_existing_views(config):
+    view = ConfigView.create(config, keys=("controls",))
+    assert view.is_current(config)
+    config.controls.max_brake = 0.25
+    assert view.controls.max_brake != 0.25  # not updated until rebuilt
+    ConfigView.invalidate()
+    assert not view.is_current(config)
+    view = ConfigView.create(config, keys=("controls",))
+    assert view.is_current(config)
+    assert view.controls.max_brake == 0.25
+
+
+def test_view_of_another_config_is_not_current(config):
+    view = ConfigView.create(config, keys=("controls",))
+    assert not view.is_current(LunaticAgentSettings.create())
+
+
+def test_rule_overwrite_settings_invalidate(config):
+    agent = SimpleNamespace(config=config, live_info=config.live_info, current_phase=Phase.TURNING_AT_JUNCTION)
+    ctx = Context(agent)
+    view = ConfigView.create(ctx.config, keys=("speed",))
+    seen = []
+    rule = Rule([Phase.TURNING_AT_JUNCTION], condition=lambda ctx: True,
+                action=lambda ctx: seen.append(view.is_current(ctx.config)),
+                overwrite_settings={"speed": {"target_speed": 42.0}})
+    rule(ctx)
+    assert seen == [False]
+    assert ConfigView.create(ctx.config, keys=("speed",)).speed.target_speed == 42.0
@@ -0,0 +1,62 @@
+"""Tests of the per-tick config snapshot of :py:class:`classes.rule.Context`."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from agents.tools.config_creation import LunaticAgentSettings
+from classes.constants import HazardSeverity
+from classes.rule import Context
+
+
+@pytest.fixture
+def agent():
+    config = LunaticAgentSettings.create()
+    return SimpleNamespace(config=config, live_info=config.live_info)
+
+
+def test_writes_do_not_reach_the_agent_config(agent):
+    target_speed = agent.config.speed.target_speed
+    ctx = Context(agent)
+    ctx.config.speed.target_speed = target_speed + 10
+    ctx.config.merge_with({"controls": {"max_brake": 0.25}})
+    assert agent.config.speed.target_speed == target_speed
+    assert agent.config.controls.max_brake != 0.25
+
+
+def test_agent_changes_after_creation_are_not_visible(agent):
+    ctx = Context(agent)
+    target_speed = ctx.config.speed.target_speed
+    agent.config.speed.target_speed = target_speed + 10
+    assert ctx.config.speed.target_speed == target_speed
+
+
+def test_live_info_is_shared(agent):
+    ctx = Context(agent)
+    assert ctx.config.live_info is agent.config.live_info
+    agent.live_info.current_speed = 42.0
+    assert ctx.config.live_info.current_speed == 42.0
+
+
+def test_interpolations_resolve_in_the_snapshot(agent):
+    ctx = Context(agent)
+    ctx.config.controls.max_brake = 0.25
+    assert ctx.config.emergency.max_emergency_brake == 0.25
+    assert agent.config.emergency.max_emergency_brake != 0.25
+
+
+def test_interpolations_to_live_info_follow_the_agent(agent):
+    ctx = Context(agent)
+    agent.live_info.current_speed_limit = 70.0
+    assert ctx.config.speed.current_speed_limit == 70.0
+
+
+def test_reused_containers_are_reset(agent):
+    last = Context(agent)
+    hazard = next(iter(last.detected_hazards_info))
+    last.add_hazard(hazard)
+    ctx = Context(agent, reuse=last)
+    assert ctx.detected_hazards is last.detected_hazards
+    assert not ctx.detected_hazards
+    assert ctx.detected_hazards_info[hazard] == HazardSeverity.NONE
+    assert all(result is Context.PHASE_NOT_EXECUTED for result in ctx.phase_results.values())
@@ -0,0 +1,82 @@
+"""Tests of the data that :py:class:`classes.fleet.ProcessFleet` sends between its processes."""
+
+import pickle
+
+import pytest
+
+import launch_tools
+from classes._fleet_world import FrameCapture, WorldProxy
+from classes.fleet import _decode_commands, _encode_commands
+
+carla = launch_tools.carla
+
+
+def test_commands_survive_encoding():
+    control = carla.VehicleControl(throttle=0.5, steer=-0.25, brake=0.0, hand_brake=False,
+                                   reverse=True, manual_gear_shift=True, gear=-1)
+    lights = carla.VehicleLightState.Brake | carla.VehicleLightState.Reverse
+    commands = [carla.command.ApplyVehicleControl(7, control), carla.command.SetVehicleLightState(8, lights)]
+
+    encoded = pickle.loads(pickle.dumps(_encode_commands(commands)))
+    decoded = _decode_commands(encoded)
+
+    assert isinstance(decoded[0], carla.command.ApplyVehicleControl)
+    assert decoded[0].actor_id == 7
+    assert decoded[0].control == control
+    assert isinstance(decoded[1], carla.command.SetVehicleLightState)
+    assert decoded[1].actor_id == 8
+    assert decoded[1].light_state == lights
+
+
+@pytest.fixture
+def world():
+    world = carla.Client("localhost", 2000).load_world("Ring")
+    settings = world.get_settings()
+    settings.synchronous_mode = True
+    settings.fixed_delta_seconds = 0.05
+    world.apply_settings(settings)
+    return world
+
+
+def test_proxy_follows_the_frames(world):
+    blueprint = world.get_blueprint_library().find("vehicle.tesla.model3")
+    spawn_points = world.get_map().get_spawn_points()
+    vehicle = world.spawn_actor(blueprint, spawn_points[0])
+    world.tick()
+    capture = FrameCapture(world)
+    proxy = WorldProxy(pickle.loads(pickle.dumps(capture.describe_world())))
+    frames = []
+    proxy.on_tick(lambda snapshot: frames.append(snapshot.frame))
+
+    vehicle.apply_control(carla.VehicleControl(throttle=1.0))
+    other = world.spawn_actor(blueprint, spawn_points[len(spawn_points) // 2])
+    for _ in range(3):
+        world.tick()
+        proxy.apply_frame(pickle.loads(pickle.dumps(capture.capture())))
+    assert frames[-1] == world.get_snapshot().frame
+
+    vehicle_proxy = proxy.get_actor(vehicle.id)
+    assert vehicle_proxy.get_transform().location.distance(vehicle.get_location()) < 1e-6
+    assert vehicle_proxy.get_velocity().length() == pytest.approx(vehicle.get_velocity().length())
+    assert vehicle_proxy.get_control().throttle == 1.0
+    assert proxy.get_actor(other.id) is not None
+    assert proxy.get_snapshot().find(vehicle.id).get_transform().location == vehicle_proxy.get_location()
+    assert len(proxy.get_actors().filter("vehicle.*")) == 2
+    traffic_lights = proxy.get_actors().filter("traffic.traffic_light")
+    assert traffic_lights
+    for traffic_light in traffic_lights:
+        assert traffic_light.state == world.get_actor(traffic_light.id).state
+        assert traffic_light.get_stop_waypoints()
+
+    other.destroy()
+    world.tick()
+    added, removed = proxy.apply_frame(capture.capture())
+    assert not added
+    assert [actor.id for actor in removed] == [other.id]
+    assert proxy.get_actor(other.id) is None
+
+    with pytest.raises(RuntimeError):
+        vehicle_proxy.apply_control(carla.VehicleControl())
+    sensor = proxy.spawn_actor(proxy.get_blueprint_library().find("sensor.other.collision"),
+                               carla.Transform(), attach_to=vehicle_proxy)
+    assert sensor.get_location() == vehicle_proxy.get_location()
@@ -0,0 +1,73 @@
+"""Tests of the compiled per-phase rule dispatch of :py:class:`agents.lunatic_agent.LunaticAgent`."""
+
+from typing import List
+
+import pytest
+
+from agents.lunatic_agent import LunaticAgent
+from agents.tools.config_creation import LunaticAgentSettings
+from classes.constants import Phase
+from classes.rule import Context, Rule
+
+PHASE = Phase.TURNING_AT_JUNCTION | Phase.BEGIN
+
+
+def make_agent(rules: List[Rule], compiled: bool) -> LunaticAgent:
+    """An agent without a vehicle that only has what the rule execution needs."""
+    agent = object.__new__(LunaticAgent)
+    agent.config = LunaticAgentSettings.create()
+    agent.rules = {PHASE: []}
+    agent._phase_dispatch = {}
+    agent._active_blocking_rules = set()
+    agent.compiled_dispatch = compiled
+    agent.add_rules(rules)
+    agent.current_phase = PHASE
+    agent.ctx = Context(agent)
+    return agent
+
+
+def run_ticks(compiled: bool, ticks: int = 4) -> List[str]:
+    calls: List[str] = []
+    rules = [
+        Rule([PHASE], condition=lambda ctx: True, action=lambda ctx: calls.append("cooldown"),
+             cooldown_reset_value=2, priority=8),
+        Rule([PHASE], condition=lambda ctx: True, action=lambda ctx: calls.append("always")),
+        Rule([PHASE], condition=lambda ctx: False, action=lambda ctx: calls.append("never")),
+    ]
+    agent = make_agent(rules, compiled)
+    for _ in range(ticks):
+        agent._execute_phase_rules(PHASE)
+        Rule.update_all_cooldowns()
+    for rule in rules:
+        rule.reset_cooldown(0)
+    return calls
+
+
+def test_compiled_dispatch_calls_the_same_rules():
+    assert run_ticks(compiled=True) == run_ticks(compiled=False)
+
+
+def test_rules_on_cooldown_are_skipped():
+    assert run_ticks(compiled=True) == ["cooldown", "always", "always", "cooldown", "always", "always"]
+
+
+@pytest.mark.parametrize("compiled", [True, False])
+def test_rule_disabled_by_a_previous_rule_is_skipped(compiled):
+    calls: List[str] = []
+    second = Rule([PHASE], condition=lambda ctx: True, action=lambda ctx: calls.append("second"))
+    first = Rule([PHASE], condition=lambda ctx: True, priority=8,
+                 action=lambda ctx: (calls.append("first"), setattr(second, "enabled", False)))
+    agent = make_agent([first, second], compiled)
+    agent._execute_phase_rules(PHASE)
+    assert calls == ["first"]
+
+
+def test_added_rules_recompile_the_dispatch():
+    calls: List[str] = []
+    agent = make_agent([], compiled=True)
+    agent._execute_phase_rules(PHASE)
+    assert agent._phase_dispatch[PHASE] == ()
+    agent.add_rule(Rule([PHASE], condition=lambda ctx: True, action=lambda ctx: calls.append("added")))
+    assert not agent._phase_dispatch
+    agent._execute_phase_rules(PHASE)
+    assert calls == ["added"]